@@ -0,0 +1,253 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import closing
+from functools import wraps
+from fastapi.concurrency import run_in_threadpool
+from dotenv import load_dotenv
+from app.database import get_connection, get_async_cursor
+
+# Charger les variables d'environnement
+load_dotenv(os.path.join(os.path.dirname(__file__), "../scripts/.env"))
+
+# Configuration du cache des réponses
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 300))
+# Durée pendant laquelle la génération lue en base est réutilisée sans nouvelle requête
+CACHE_GENERATION_CHECK_SECONDS = float(os.getenv("CACHE_GENERATION_CHECK_SECONDS", 10))
+
+# Paramètres de route exclus de la clé de cache (identité de l'appelant, objets de réponse)
+EXCLUDED_KEY_PARAMS = {"user", "response"}
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend:
+    """Cache LRU en mémoire avec expiration par entrée, sûr entre threads."""
+
+    # Les accès ne font pas d'entrée/sortie : inutile de quitter la boucle d'évènements
+    blocking = False
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class RedisCacheBackend:
+    """
+    Cache partagé reposant sur un client compatible Redis (`get`, `set(..., ex=)`).
+
+    N'importe quel objet exposant ces méthodes peut remplacer le client
+    (serveur local de substitution, client factice dans les tests).
+    """
+
+    # Les appels réseau sont exécutés hors de la boucle d'évènements
+    blocking = True
+
+    def __init__(self, client, prefix: str = "veille-ia:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=int(max(ttl, 1)))
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(f"{self.prefix}*"))
+
+
+class CacheStats:
+    """Compteurs de succès et d'échecs du cache, globaux et par espace de noms."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+            self.namespaces = {}
+
+    def record(self, namespace: str, hit: bool):
+        with self.lock:
+            counters = self.namespaces.setdefault(namespace, {"hits": 0, "misses": 0})
+            if hit:
+                self.hits += 1
+                counters["hits"] += 1
+            else:
+                self.misses += 1
+                counters["misses"] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "namespaces": {name: dict(counters) for name, counters in self.namespaces.items()},
+            }
+
+
+def create_backend():
+    """Instancie le backend configuré, avec repli sur le cache en mémoire si Redis est indisponible."""
+    if CACHE_BACKEND == "redis":
+        try:
+            import redis
+            return RedisCacheBackend(redis.Redis.from_url(CACHE_REDIS_URL))
+        except ImportError:
+            logger.warning("Module redis absent : utilisation du cache en mémoire.")
+    return MemoryCacheBackend()
+
+
+cache_backend = create_backend()
+cache_stats = CacheStats()
+
+# Dernière génération connue et instant de sa lecture
+generation_state = {"value": 0, "checked_at": float("-inf")}
+
+GENERATION_QUERY = "SELECT generation FROM cache_generation WHERE id = 1"
+
+
+def set_backend(backend):
+    """Remplace le backend du cache (client Redis, substitut local, tests)."""
+    global cache_backend
+    cache_backend = backend
+
+
+def _generation_is_fresh() -> bool:
+    return time.monotonic() - generation_state["checked_at"] < CACHE_GENERATION_CHECK_SECONDS
+
+
+def _store_generation(row):
+    if row:
+        generation_state["value"] = int(row["generation"])
+    generation_state["checked_at"] = time.monotonic()
+    return generation_state["value"]
+
+
+def get_generation() -> int:
+    """Retourne la génération des données, incrémentée par le pipeline d'ingestion à chaque écriture."""
+    if _generation_is_fresh():
+        return generation_state["value"]
+
+    connection = get_connection()
+    if not connection:
+        # Base indisponible : la dernière génération connue reste utilisée
+        return generation_state["value"]
+    try:
+        with closing(connection.cursor(dictionary=True)) as cursor:
+            cursor.execute(GENERATION_QUERY)
+            return _store_generation(cursor.fetchone())
+    except Exception as e:
+        logger.warning(f"Lecture de la génération du cache impossible : {e}")
+        return generation_state["value"]
+    finally:
+        connection.close()
+
+
+async def get_generation_async() -> int:
+    """Version asynchrone de `get_generation`, via le pool aiomysql."""
+    if _generation_is_fresh():
+        return generation_state["value"]
+
+    try:
+        async with get_async_cursor() as cursor:
+            await cursor.execute(GENERATION_QUERY)
+            return _store_generation(await cursor.fetchone())
+    except Exception as e:
+        logger.warning(f"Lecture de la génération du cache impossible : {e}")
+        return generation_state["value"]
+
+
+def build_key(namespace: str, generation: int, params: dict) -> str:
+    """Construit la clé de cache : route, génération des données et paramètres triés."""
+    key_params = {name: value for name, value in params.items() if name not in EXCLUDED_KEY_PARAMS}
+    return f"{namespace}:{generation}:{json.dumps(key_params, sort_keys=True, default=str)}"
+
+
+def cached(namespace: str, ttl: int = CACHE_DEFAULT_TTL):
+    """
+    Met en cache le résultat d'une route en lecture seule.
+
+    La clé combine `namespace`, les paramètres de la route (hors utilisateur)
+    et la génération des données : une ingestion rend donc caduques toutes
+    les entrées sans purge explicite. Les exceptions ne sont jamais mises en cache.
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = build_key(namespace, await get_generation_async(), kwargs)
+                value = await _call_backend(cache_backend.get, key)
+                cache_stats.record(namespace, value is not None)
+                if value is not None:
+                    return value
+
+                value = await func(*args, **kwargs)
+                await _call_backend(cache_backend.set, key, value, ttl)
+                return value
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = build_key(namespace, get_generation(), kwargs)
+            value = cache_backend.get(key)
+            cache_stats.record(namespace, value is not None)
+            if value is not None:
+                return value
+
+            value = func(*args, **kwargs)
+            cache_backend.set(key, value, ttl)
+            return value
+        return wrapper
+
+    return decorator
+
+
+async def _call_backend(method, *args):
+    """Appelle le backend, hors de la boucle d'évènements s'il fait des entrées/sorties."""
+    if cache_backend.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
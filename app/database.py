@@ -1,7 +1,11 @@
 import os
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import mysql.connector
 from mysql.connector import pooling
+import aiomysql
 
 # Charger les variables d'environnement
 load_dotenv(os.path.join(os.path.dirname(__file__), "../scripts/.env"))
@@ -11,6 +15,11 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
+# Paramètres du pool asynchrone
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", 5))
+
 # Configuration du pool de connexions
 db_config = {
     "host": DB_HOST,
@@ -25,6 +34,15 @@ db_config = {
 # Ne pas initialiser le pool immédiatement
 connection_pool = None
 
+# Pools asynchrones, un par boucle d'évènements (un pool aiomysql est lié à la boucle qui l'a créé)
+async_pools = weakref.WeakKeyDictionary()
+# Verrous de création des pools, un par boucle : des premières requêtes simultanées partagent un seul pool
+async_pool_locks = weakref.WeakKeyDictionary()
+
+
+class DatabaseUnavailableError(Exception):
+    """Levée lorsqu'aucune connexion saine ne peut être obtenue du pool asynchrone."""
+
 
 def get_connection():
     """Récupère une connexion depuis le pool, en l'initialisant si nécessaire."""
@@ -39,3 +57,72 @@ def get_connection():
     except mysql.connector.Error as e:
         print(f"Erreur de connexion au pool : {e}")
         return None
+
+
+async def get_async_pool():
+    """Récupère le pool asynchrone de la boucle courante, en l'initialisant si nécessaire."""
+    loop = asyncio.get_running_loop()
+    pool = async_pools.get(loop)
+    if pool is not None and not pool.closed:
+        return pool
+
+    lock = async_pool_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        # Un autre appel a pu créer le pool pendant l'attente du verrou
+        pool = async_pools.get(loop)
+        if pool is None or pool.closed:
+            pool = await aiomysql.create_pool(
+                host=DB_HOST,
+                user=DB_USER,
+                password=DB_PASSWORD or "",
+                db=DB_NAME,
+                port=3306,
+                minsize=DB_POOL_MIN_SIZE,
+                maxsize=DB_POOL_MAX_SIZE,
+                autocommit=False
+            )
+            async_pools[loop] = pool
+    return pool
+
+
+async def close_async_pool():
+    """Ferme le pool asynchrone de la boucle courante (à appeler à l'arrêt de l'application)."""
+    pool = async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        pool.close()
+        await pool.wait_closed()
+
+
+@asynccontextmanager
+async def get_async_cursor(timeout: float = DB_POOL_ACQUIRE_TIMEOUT):
+    """
+    Fournit un curseur (dictionnaire) sur une connexion du pool asynchrone.
+
+    La connexion est vérifiée (ping) avant d'être rendue à l'appelant et
+    restituée au pool à la sortie du bloc. La connexion reste accessible
+    via `cursor.connection` pour les `commit()` / `rollback()`.
+    """
+    try:
+        pool = await get_async_pool()
+        connection = await asyncio.wait_for(pool.acquire(), timeout)
+    except (asyncio.TimeoutError, aiomysql.Error, OSError) as e:
+        print(f"Erreur de connexion au pool asynchrone : {e}")
+        raise DatabaseUnavailableError(str(e)) from e
+
+    try:
+        # Vérification de l'état de la connexion avant usage
+        try:
+            await connection.ping(reconnect=True)
+        except (aiomysql.Error, OSError) as e:
+            raise DatabaseUnavailableError(str(e)) from e
+
+        async with connection.cursor(aiomysql.DictCursor) as cursor:
+            yield cursor
+    finally:
+        # Annule une éventuelle transaction laissée ouverte avant de rendre la connexion
+        if not connection.closed:
+            try:
+                await connection.rollback()
+            except (aiomysql.Error, OSError):
+                connection.close()
+        await pool.release(connection)
@@ -0,0 +1,42 @@
+import os
+import logging
+import httpx
+import numpy as np
+
+# Serveur de modèles du pipeline (scripts/model_server.py) ; vide = modèle chargé dans le processus de l'API
+MODEL_SERVER_URL = os.getenv("MODEL_SERVER_URL", "")
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", 30))
+
+# Modèles chargés localement, par nom (chargement paresseux : l'API démarre sans eux)
+_local_models = {}
+
+
+def _remote_encode(model_name, texts):
+    if MODEL_SERVER_URL.startswith("unix://"):
+        transport = httpx.HTTPTransport(uds=MODEL_SERVER_URL[len("unix://"):])
+        base_url = "http://model-server"
+    else:
+        transport = None
+        base_url = MODEL_SERVER_URL
+    with httpx.Client(base_url=base_url, transport=transport, timeout=MODEL_SERVER_TIMEOUT) as client:
+        response = client.post("/embed", json={"model": model_name, "texts": list(texts)})
+        response.raise_for_status()
+        return np.asarray(response.json()["embeddings"], dtype=np.float32)
+
+
+def encode_query(text, model_name):
+    """
+    Embedding d'une requête avec le modèle qui a construit l'index vectoriel.
+
+    Le serveur de modèles est utilisé s'il est configuré ; sinon le modèle est
+    chargé une fois dans le processus (sentence-transformers).
+    """
+    if MODEL_SERVER_URL:
+        return _remote_encode(model_name, [text])[0]
+
+    model = _local_models.get(model_name)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        logging.info(f"Chargement du modèle d'embeddings {model_name}.")
+        model = _local_models[model_name] = SentenceTransformer(model_name)
+    return np.asarray(model.encode([text], convert_to_numpy=True, show_progress_bar=False)[0], dtype=np.float32)
@@ -0,0 +1,33 @@
+# Table de liaison et clé étrangère associées à chaque table de contenu
+KEYWORD_LINK_TABLES = {
+    "articles": ("article_keywords", "article_id"),
+    "videos": ("video_keywords", "video_id"),
+    "scientific_articles": ("scientific_article_keywords", "scientific_article_id"),
+}
+
+
+def parse_keywords(value, separator=","):
+    """Découpe une liste de mots-clés saisie (séparée par `separator`) en valeurs non vides."""
+    if not value:
+        return []
+    return [keyword.strip() for keyword in value.split(separator) if keyword.strip()]
+
+
+def keyword_filter(table_name, keywords, id_column="id"):
+    """
+    Construit un filtre SQL « le contenu porte au moins un de ces mots-clés ».
+
+    Le filtre est une égalité sur le dictionnaire `keywords` jointe à la table
+    de liaison du contenu, servie par les index au lieu d'un `LIKE '%...%'`.
+
+    :return: Tuple (clause SQL, paramètres)
+    """
+    link_table, foreign_key = KEYWORD_LINK_TABLES[table_name]
+    placeholders = ", ".join(["%s"] * len(keywords))
+    clause = (
+        f"{id_column} IN ("
+        f"SELECT kl.{foreign_key} FROM {link_table} kl "
+        f"JOIN keywords k ON k.id = kl.keyword_id "
+        f"WHERE k.name IN ({placeholders}))"
+    )
+    return clause, list(keywords)
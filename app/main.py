@@ -3,9 +3,13 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from app.routes import (
     articles_route, videos_route, scientific_articles_route,
     metrics_route, trends_route, auth_route, user_preferences_route,
-    dashboard_route, user_delete_route, forgot_password_route, reset_password_route
+    dashboard_route, user_delete_route, forgot_password_route, reset_password_route,
+    search_route
 )
 from app.security.jwt_handler import jwt_required
+from app.database import close_async_pool
+from app.tasks.dashboard_snapshots import refresh_dashboard_snapshots
+from app.tasks.alert_checker import check_alerts
 import logging
 
 # Initialisation de FastAPI
@@ -26,7 +30,8 @@ protected_routes = [
     (metrics_route.router, "/metrics", "Metrics"),
     (trends_route.router, "/trends", "Trends"),
     (user_preferences_route.router, "/preferences", "User Preferences"),
-    (dashboard_route.router, "/dashboard", "Dashboard")
+    (dashboard_route.router, "/dashboard", "Dashboard"),
+    (search_route.router, "/search", "Search")
 ]
 
 # Routes protégées pour la suppression de l'utilisateur ou le reset de mot de passe
@@ -38,16 +43,13 @@ for router, prefix, tag in protected_routes:
     app.include_router(router, prefix=prefix, tags=[tag], dependencies=[Depends(jwt_required)])
 
 
-# Fonction pour vérifier les alertes
-def check_alerts():
-    """Vérifie les alertes pour les utilisateurs (remplacer par ta logique)."""
-    logger.info("Vérification des alertes en cours...")
-
-
 # Démarrage du scheduler de manière sécurisée
 try:
     scheduler = BackgroundScheduler()
-    scheduler.add_job(check_alerts, 'interval', minutes=10)
+    # Alertes : seuls les contenus ajoutés depuis la vérification précédente sont examinés
+    scheduler.add_job(check_alerts, 'interval', minutes=10, max_instances=1, coalesce=True)
+    # Recalcul des instantanés du tableau de bord dès que la génération des données change (ingestion)
+    scheduler.add_job(refresh_dashboard_snapshots, 'interval', minutes=1, max_instances=1, coalesce=True)
     scheduler.start()
     logger.info("Scheduler démarré avec succès.")
 except Exception as e:
@@ -61,6 +63,13 @@ def shutdown_scheduler():
     scheduler.shutdown()
 
 
+# Fermeture du pool de connexions asynchrone
+@app.on_event("shutdown")
+async def shutdown_database_pool():
+    logger.info("Fermeture du pool de connexions...")
+    await close_async_pool()
+
+
 # Route principale
 @app.get("/")
 async def root():
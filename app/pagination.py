@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from fastapi import HTTPException
+
+# Taille de page par défaut et plafond pour les listes paginées
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# En-tête de réponse portant le curseur de la page suivante
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(publication_date, item_id: int) -> str:
+    """
+    Encode la position (publication_date, id) du dernier élément d'une page en
+    curseur opaque ; une date NULL est encodée telle quelle (null).
+    """
+    if isinstance(publication_date, (date, datetime)):
+        publication_date = publication_date.strftime("%Y-%m-%d")
+    payload = json.dumps([publication_date, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Décode un curseur opaque en tuple (publication_date ou None, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        publication_date, item_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if publication_date is not None:
+            datetime.strptime(publication_date, "%Y-%m-%d")
+        return publication_date, int(item_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide.")
+
+
+def apply_keyset(query: str, params: list, cursor: str, page_size: int) -> str:
+    """
+    Complète une requête filtrée avec la condition de keyset, le tri et la limite.
+
+    La requête doit se terminer par ses clauses WHERE. Une ligne de plus que
+    `page_size` est demandée afin de savoir s'il existe une page suivante.
+
+    `publication_date` peut être NULL : MySQL trie ces lignes après toutes les
+    lignes datées (ordre décroissant), par id décroissant. Après une ligne
+    datée, la page suivante inclut donc toutes les lignes sans date ; après une
+    ligne sans date, seules les lignes sans date d'id inférieur restent.
+    """
+    if cursor:
+        publication_date, item_id = decode_cursor(cursor)
+        if publication_date is None:
+            query += " AND (publication_date IS NULL AND id < %s)"
+            params.append(item_id)
+        else:
+            query += " AND (publication_date < %s OR (publication_date = %s AND id < %s) OR publication_date IS NULL)"
+            params.extend([publication_date, publication_date, item_id])
+
+    query += " ORDER BY publication_date DESC, id DESC LIMIT %s"
+    params.append(page_size + 1)
+    return query
+
+
+def paginate(rows, page_size: int):
+    """Tronque les lignes à `page_size` et retourne (lignes, curseur de la page suivante ou None)."""
+    rows = list(rows)
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(last["publication_date"], last["id"])
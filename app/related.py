@@ -0,0 +1,59 @@
+import os
+from typing import Optional
+from pydantic import BaseModel
+from app.search import SEARCH_TYPES
+
+# Nombre de contenus similaires précalculés par contenu (scripts/build_related_content.py)
+RELATED_CONTENT_TOP_K = int(os.getenv("RELATED_CONTENT_TOP_K", 10))
+
+
+# Modèle de réponse d'un contenu similaire, quel que soit son type
+class RelatedContentResponse(BaseModel):
+    type: str
+    id: int
+    title: str
+    source: Optional[str]
+    publication_date: Optional[str]  # Publication date as string
+    excerpt: Optional[str]
+    url: Optional[str]
+    score: float
+
+
+def related_content_query(content_type, content_id, limit):
+    """
+    Requête des contenus similaires précalculés d'un contenu : lecture de
+    ses lignes dans `related_content` (clé primaire) jointes, par type, à la
+    table du contenu similaire.
+
+    :return: Tuple (requête SQL, paramètres)
+    """
+    selects = []
+    params = []
+    for related_type, (table_name, excerpt_column, url_column) in SEARCH_TYPES.items():
+        selects.append(
+            f"SELECT r.rank_position, r.score, '{related_type}' AS type, c.id, c.title, c.source, c.publication_date, "
+            f"c.{excerpt_column} AS excerpt, c.{url_column} AS url "
+            f"FROM related_content r JOIN {table_name} c ON c.id = r.related_id "
+            f"WHERE r.content_type = %s AND r.content_id = %s AND r.related_type = %s"
+        )
+        params.extend([content_type, content_id, related_type])
+    params.append(limit)
+    return " UNION ALL ".join(selects) + " ORDER BY rank_position LIMIT %s", params
+
+
+def format_related(rows):
+    """Lignes de `related_content_query` au format de la réponse."""
+    results = []
+    for row in rows:
+        publication_date = row["publication_date"]
+        results.append({
+            "type": row["type"],
+            "id": row["id"],
+            "title": row["title"],
+            "source": row["source"],
+            "publication_date": publication_date.strftime('%Y-%m-%d') if publication_date else None,
+            "excerpt": row["excerpt"],
+            "url": row["url"],
+            "score": float(row["score"]),
+        })
+    return results
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from app.database import get_connection
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
+from app.database import get_async_cursor, DatabaseUnavailableError
 from app.security.jwt_handler import jwt_required
-from contextlib import closing
+from app.related import RELATED_CONTENT_TOP_K, RelatedContentResponse, related_content_query, format_related
+from app.keywords import parse_keywords, keyword_filter
+from app.search import fulltext_filter
+from app.cache import cached
+from app.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, apply_keyset, paginate
+)
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
@@ -15,7 +21,7 @@ class ArticleResponse(BaseModel):
     id: int
     title: str
     source: str
-    publication_date: str   # Publication date as string
+    publication_date: Optional[str]   # Publication date as string
     keywords: Optional[str]
     summary: Optional[str]
     link: str
@@ -35,19 +41,23 @@ def validate_date(date_str):
     summary="Récupère tous les articles",
     response_model=List[ArticleResponse],
     responses={
-        200: {"description": "Liste des articles récupérés."},
+        200: {"description": "Page d'articles récupérés (curseur de la page suivante dans l'en-tête X-Next-Cursor)."},
         404: {"description": "Aucun article trouvé."},
         500: {"description": "Erreur interne."}
     }
 )
 async def get_all_articles(
+    response: Response,
     start_date: str = Query(None, description="Filtrer les articles à partir de cette date (YYYY-MM-DD)"),
     end_date: str = Query(None, description="Filtrer les articles jusqu'à cette date (YYYY-MM-DD)"),
     source: str = Query(None, description="Filtrer par source"),
     keywords: str = Query(None, description="Filtrer par mots-clés (séparés par des virgules)"),
+    q: str = Query(None, description="Recherche plein texte (titre, résumé, contenu, mots-clés)"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Nombre d'articles par page"),
+    page_cursor: str = Query(None, alias="cursor", description="Curseur opaque de la page suivante (en-tête X-Next-Cursor)"),
     user=Depends(jwt_required)
 ):
-    """Récupère les articles avec filtres dynamiques."""
+    """Récupère une page d'articles avec filtres dynamiques (pagination par curseur)."""
 
     # Initialisation de la requête de base
     query = """
@@ -69,45 +79,50 @@ async def get_all_articles(
         query += " AND source LIKE %s"
         params.append(f"%{source}%")
 
-    if keywords:
-        keyword_list = [f"%{kw.strip()}%" for kw in keywords.split(',')]
-        query += " AND (" + " OR ".join(["keywords LIKE %s"] * len(keyword_list)) + ")"
-        params.extend(keyword_list)
+    keyword_list = parse_keywords(keywords)
+    if keyword_list:
+        clause, keyword_params = keyword_filter("articles", keyword_list)
+        query += f" AND {clause}"
+        params.extend(keyword_params)
 
-    # Ajout du tri par date (du plus récent au plus ancien)
-    query += " ORDER BY publication_date DESC"
+    text_filter = fulltext_filter("articles", q)
+    if text_filter:
+        clause, text_params = text_filter
+        query += f" AND {clause}"
+        params.extend(text_params)
 
-    # Connexion à la base de données
-    connection = get_connection()
-    if not connection:
-        logging.error("Impossible de se connecter à la base de données.")
-        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
+    # Position du curseur, tri par (date, id) décroissants et limite de page
+    query = apply_keyset(query, params, page_cursor, page_size)
 
     try:
-        with closing(connection.cursor(dictionary=True)) as cursor:
+        async with get_async_cursor() as cursor:
             logging.info(f"Exécution de la requête : {query} avec les paramètres : {params}")
-            cursor.execute(query, params)
-            articles = cursor.fetchall()
+            await cursor.execute(query, params)
+            articles, next_cursor = paginate(await cursor.fetchall(), page_size)
 
             if not articles:
                 logging.warning("Aucun article trouvé.")
                 raise HTTPException(status_code=404, detail="Aucun article trouvé.")
 
+            if next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
             # Conversion de publication_date en string avant la réponse
             for article in articles:
-                article['publication_date'] = article['publication_date'].strftime('%Y-%m-%d')
+                if article['publication_date']:
+                    article['publication_date'] = article['publication_date'].strftime('%Y-%m-%d')
 
             return articles
 
+    except DatabaseUnavailableError:
+        logging.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
-    finally:
-        connection.close()
-
 
 # Route pour récupérer les derniers articles par source
 @router.get(
@@ -120,6 +135,7 @@ async def get_all_articles(
         500: {"description": "Erreur interne."}
     }
 )
+@cached("articles.latest")
 async def get_latest_articles(user=Depends(jwt_required)):
     """Récupère le(s) dernier(s) article(s) pour chaque source."""
 
@@ -137,16 +153,11 @@ async def get_latest_articles(user=Depends(jwt_required)):
         ORDER BY publication_date DESC;
     """
 
-    connection = get_connection()
-    if not connection:
-        logging.error("Impossible de se connecter à la base de données.")
-        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
-
     try:
-        with closing(connection.cursor(dictionary=True)) as cursor:
+        async with get_async_cursor() as cursor:
             logging.info(f"Exécution de la requête pour les derniers articles : {query}")
-            cursor.execute(query)
-            articles = cursor.fetchall()
+            await cursor.execute(query)
+            articles = await cursor.fetchall()
 
             if not articles:
                 logging.warning("Aucun article trouvé.")
@@ -154,18 +165,55 @@ async def get_latest_articles(user=Depends(jwt_required)):
 
             # Conversion de publication_date en string avant la réponse
             for article in articles:
-                article['publication_date'] = article['publication_date'].strftime('%Y-%m-%d')
+                if article['publication_date']:
+                    article['publication_date'] = article['publication_date'].strftime('%Y-%m-%d')
 
             return articles
 
+    except DatabaseUnavailableError:
+        logging.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+
+# Route pour récupérer les contenus similaires de l'article
+@router.get(
+    "/{article_id}/related",
+    summary="Récupère les contenus similaires de l'article",
+    response_model=List[RelatedContentResponse],
+    responses={
+        200: {"description": "Contenus similaires (articles, articles scientifiques, vidéos) par similarité décroissante."},
+        404: {"description": "Aucun contenu similaire trouvé."},
+        500: {"description": "Erreur interne."}
+    }
+)
+async def get_related_to_article(
+    article_id: int,
+    limit: int = Query(RELATED_CONTENT_TOP_K, ge=1, le=RELATED_CONTENT_TOP_K, description="Nombre de contenus similaires"),
+    user=Depends(jwt_required)
+):
+    """Récupère les contenus les plus proches de l'article, précalculés après chaque ingestion."""
+    query, params = related_content_query("articles", article_id, limit)
+
+    try:
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query, params)
+            related = format_related(await cursor.fetchall())
+
+            if not related:
+                raise HTTPException(status_code=404, detail="Aucun contenu similaire trouvé.")
+
+            return related
+
+    except DatabaseUnavailableError:
+        logging.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
-from app.database import get_connection
+from app.database import get_async_cursor, DatabaseUnavailableError
 from app.security.password_handler import hash_password, verify_password
 from app.security.jwt_handler import create_access_token
-from contextlib import closing
 
 router = APIRouter()
 
@@ -37,41 +37,35 @@ class AuthResponse(BaseModel):
 )
 async def register_user(user: UserCreate):
     """Inscrit un nouvel utilisateur et génère un token immédiatement."""
-    connection = get_connection()
-    if not connection:
-        raise HTTPException(status_code=500, detail="Erreur de connexion à la base de données.")
-
-    with closing(connection.cursor(dictionary=True)) as cursor:
-        try:
+    try:
+        async with get_async_cursor() as cursor:
             # Vérifier si l'email est déjà utilisé
-            cursor.execute("SELECT id FROM users WHERE email = %s", (user.email,))
-            if cursor.fetchone():
+            await cursor.execute("SELECT id FROM users WHERE email = %s", (user.email,))
+            if await cursor.fetchone():
                 raise HTTPException(status_code=400, detail="Email déjà utilisé.")
 
-            # Hasher le mot de passe et insérer l'utilisateur
-            hashed_password = hash_password(user.password)
-            cursor.execute(
+            # Hasher le mot de passe (bcrypt est coûteux : hors de la boucle d'évènements)
+            hashed_password = await run_in_threadpool(hash_password, user.password)
+            await cursor.execute(
                 "INSERT INTO users (username, email, password_hash) VALUES (%s, %s, %s)",
                 (user.username, user.email, hashed_password),
             )
 
             user_id = cursor.lastrowid
-            connection.commit()
+            await cursor.connection.commit()
 
-            # Générer un token JWT
-            token = create_access_token({"user_id": user_id})
-            return {"access_token": token, "token_type": "bearer"}
+        # Générer un token JWT
+        token = create_access_token({"user_id": user_id})
+        return {"access_token": token, "token_type": "bearer"}
 
-        except HTTPException:
-            raise
+    except DatabaseUnavailableError:
+        raise HTTPException(status_code=500, detail="Erreur de connexion à la base de données.")
 
-        except Exception as e:
-            connection.rollback()
-            raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
+    except HTTPException:
+        raise
 
-        finally:
-            if connection:
-                connection.close()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
 
 @router.post(
@@ -86,29 +80,24 @@ async def register_user(user: UserCreate):
 )
 async def login_user(user: UserLogin):
     """Connecte un utilisateur et retourne un token JWT."""
-    connection = get_connection()
-    if not connection:
-        raise HTTPException(status_code=500, detail="Erreur de connexion à la base de données.")
-
-    with closing(connection.cursor(dictionary=True)) as cursor:
-        try:
+    try:
+        async with get_async_cursor() as cursor:
             # Récupérer l'utilisateur en base
-            cursor.execute("SELECT id, password_hash FROM users WHERE email = %s", (user.email,))
-            db_user = cursor.fetchone()
+            await cursor.execute("SELECT id, password_hash FROM users WHERE email = %s", (user.email,))
+            db_user = await cursor.fetchone()
 
-            if not db_user or not verify_password(user.password, db_user["password_hash"]):
-                raise HTTPException(status_code=401, detail="Identifiants invalides.")
+        if not db_user or not await run_in_threadpool(verify_password, user.password, db_user["password_hash"]):
+            raise HTTPException(status_code=401, detail="Identifiants invalides.")
 
-            # Générer un token JWT
-            token = create_access_token({"user_id": db_user["id"]})
-            return {"access_token": token, "token_type": "bearer"}
+        # Générer un token JWT
+        token = create_access_token({"user_id": db_user["id"]})
+        return {"access_token": token, "token_type": "bearer"}
 
-        except HTTPException:
-            raise
+    except DatabaseUnavailableError:
+        raise HTTPException(status_code=500, detail="Erreur de connexion à la base de données.")
 
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
+    except HTTPException:
+        raise
 
-        finally:
-            if connection:
-                connection.close()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
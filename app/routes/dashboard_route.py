@@ -1,15 +1,19 @@
+import asyncio
 from collections import defaultdict
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
-from app.database import get_connection
+from app.database import get_async_cursor, DatabaseUnavailableError
 from app.security.jwt_handler import jwt_required
-from contextlib import closing
+from app.keywords import keyword_filter
+from app.cache import get_generation_async
+from app.tasks.dashboard_snapshots import load_snapshot, store_snapshot
+import logging
 
 router = APIRouter()
 
 
 @router.get("/")
-def get_dashboard(
+async def get_dashboard(
     user=Depends(jwt_required),
     limit: int = Query(10, ge=1, le=50, description="Nombre d'éléments à récupérer (1-50)"),
     days_range: int = Query(90, ge=30, le=365, description="Plage de jours à analyser (30-365)")
@@ -19,137 +23,126 @@ def get_dashboard(
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token: user_id not found")
 
-    with closing(get_connection()) as conn, conn.cursor(dictionary=True) as cursor:
+    try:
         #  Récupérer les préférences de l'utilisateur
-        cursor.execute(
+        user_prefs = await fetch_one(
             "SELECT source_preferences, video_channel_preferences, keyword_preferences "
             "FROM user_preferences WHERE user_id = %s", (user_id,)
         )
-        user_prefs = cursor.fetchone()
         if not user_prefs:
             raise HTTPException(status_code=404, detail="No preferences found for user")
 
-        sources = user_prefs["source_preferences"].split(";") if user_prefs["source_preferences"] else []
-        channels = user_prefs["video_channel_preferences"].split(";") if user_prefs["video_channel_preferences"] else []
-        keywords = user_prefs["keyword_preferences"].split(";") if user_prefs["keyword_preferences"] else []
-
-        #  Récupérer les derniers articles en fonction des sources
-        latest_articles_by_source = []
-        articles_count = 0
-        if sources:
-            query = f"""
-                SELECT id, title, source, link, publication_date, keywords
-                FROM articles 
-                WHERE source IN ({",".join(["%s"] * len(sources))}) 
-                ORDER BY publication_date DESC 
-                LIMIT %s
-            """
-            cursor.execute(query, sources + [limit])
-            latest_articles_by_source = cursor.fetchall()
-
-            query = f"SELECT COUNT(*) AS count FROM articles WHERE source IN ({','.join(['%s'] * len(sources))})"
-            cursor.execute(query, sources)
-            articles_count = cursor.fetchone()["count"]
-
-        #  Récupérer les articles liés aux mots-clés préférés
-        latest_articles_by_keywords = []
-        latest_scientific_articles_by_keywords = []
-        scientific_articles_count = 0
-        if keywords:
-            keyword_filters = " OR ".join(["keywords LIKE %s"] * len(keywords))
-            params = [f"%{kw}%" for kw in keywords]
-
-            query = f"""
-                SELECT id, title, source, link, publication_date, keywords 
-                FROM articles 
-                WHERE {keyword_filters} 
-                ORDER BY publication_date DESC 
-                LIMIT %s
-            """
-            cursor.execute(query, params + [limit])
-            latest_articles_by_keywords = cursor.fetchall()
-
-            query = f"SELECT COUNT(*) AS count FROM articles WHERE {keyword_filters}"
-            cursor.execute(query, params)
-            articles_count += cursor.fetchone()["count"]
-
-            query = f"""
-                SELECT id, title, abstract, article_url, publication_date, keywords, authors
-                FROM scientific_articles 
-                WHERE {keyword_filters} 
-                ORDER BY publication_date DESC 
-                LIMIT %s
-            """
-            cursor.execute(query, params + [limit])
-            latest_scientific_articles_by_keywords = cursor.fetchall()
-
-            query = f"SELECT COUNT(*) AS count FROM scientific_articles WHERE {keyword_filters}"
-            cursor.execute(query, params)
-            scientific_articles_count = cursor.fetchone()["count"]
-
-        #  Récupérer les dernières vidéos des chaînes préférées
-        latest_videos = []
-        videos_count = 0
-        if channels:
-            query = f"""
-                SELECT id, title, source, video_url, publication_date
-                FROM videos 
-                WHERE channel_name IN ({",".join(["%s"] * len(channels))}) 
-                ORDER BY publication_date DESC 
-                LIMIT %s
-            """
-            cursor.execute(query, channels + [limit])
-            latest_videos = cursor.fetchall()
-
-            query = f"SELECT COUNT(*) AS count FROM videos WHERE source IN ({','.join(['%s'] * len(channels))})"
-            cursor.execute(query, channels)
-            videos_count = cursor.fetchone()["count"]
-
-        #  Calcul des tendances des mots-clés sur une plage dynamique
-        date_threshold = (datetime.now() - timedelta(days=days_range)).strftime("%Y-%m-%d")
-        cursor.execute(
-            "SELECT IFNULL(keywords, '') AS keywords, publication_date "
-            "FROM articles WHERE publication_date >= %s",
-            (date_threshold,)
-        )
-
-        keyword_by_date = defaultdict(lambda: defaultdict(int))
-
-        for row in cursor.fetchall():
-            keywords_list = row["keywords"].split(";") if row["keywords"] else []
+        preferences = parse_preferences(user_prefs)
 
-            publication_date = row["publication_date"]
-            if isinstance(publication_date, datetime):
-                date = publication_date.date()
-            elif isinstance(publication_date, str):
-                try:
-                    date = datetime.strptime(publication_date, "%Y-%m-%d").date()
-                except ValueError:
-                    continue
-            else:
-                continue
+        #  Instantané précalculé après la dernière ingestion, calcul direct en cas d'absence
+        dashboard = await load_cached_dashboard(preferences, limit, days_range)
+        if dashboard is None:
+            generation = await get_generation_async()
+            dashboard = await build_dashboard(preferences, limit, days_range)
+            await save_cached_dashboard(preferences, limit, days_range, dashboard, generation)
+        return dashboard
 
-            for keyword in keywords_list:
-                keyword_by_date[date][keyword] += 1
+    except DatabaseUnavailableError:
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
 
-        trending_keywords_by_date = []
-        keyword_evolution = defaultdict(list)
-        all_dates = sorted(keyword_by_date.keys())
 
-        for date in all_dates:
-            sorted_keywords = sorted(keyword_by_date[date].items(), key=lambda x: x[1], reverse=True)
-            trending_keywords_by_date.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "keywords": [{"keyword": kw, "count": count} for kw, count in sorted_keywords]
-            })
+def parse_preferences(user_prefs: dict) -> dict:
+    """Découpe les préférences ';'-séparées de la table user_preferences en listes."""
+    return {
+        "sources": user_prefs["source_preferences"].split(";") if user_prefs["source_preferences"] else [],
+        "channels": user_prefs["video_channel_preferences"].split(";") if user_prefs["video_channel_preferences"] else [],
+        "keywords": user_prefs["keyword_preferences"].split(";") if user_prefs["keyword_preferences"] else [],
+    }
 
-            for keyword in keywords:
-                keyword_evolution[keyword].append(keyword_by_date[date].get(keyword, 0))
 
-        trends_chart = {
-            "dates": [date.strftime("%Y-%m-%d") for date in all_dates],
-            "keyword_trends": [{"keyword": kw, "counts": keyword_evolution[kw]} for kw in keywords]
-        }
+async def build_dashboard(preferences: dict, limit: int, days_range: int) -> dict:
+    """
+    Construit le tableau de bord à partir de préférences déjà découpées.
+
+    Les sections sont des requêtes indépendantes exécutées simultanément sur
+    des connexions distinctes du pool ; chaque liste porte son total via
+    `COUNT(*) OVER()`, et les tendances sont lues dans le cumul quotidien
+    `keyword_daily_counts` au lieu de parcourir tous les articles de la période.
+    """
+    sources = preferences["sources"]
+    channels = preferences["channels"]
+    keywords = preferences["keywords"]
+
+    # Coroutine créée seulement pour une section sans préférence : chacune est attendue par le gather
+    async def no_rows():
+        return []
+
+    #  Derniers articles des sources préférées
+    if sources:
+        articles_by_source = fetch_all(f"""
+            SELECT id, title, source, link, publication_date, keywords, COUNT(*) OVER() AS total_count
+            FROM articles
+            WHERE source IN ({",".join(["%s"] * len(sources))})
+            ORDER BY publication_date DESC
+            LIMIT %s
+        """, sources + [limit])
+    else:
+        articles_by_source = no_rows()
+
+    #  Articles et articles scientifiques liés aux mots-clés préférés
+    if keywords:
+        article_filter, params = keyword_filter("articles", keywords)
+        articles_by_keywords = fetch_all(f"""
+            SELECT id, title, source, link, publication_date, keywords, COUNT(*) OVER() AS total_count
+            FROM articles
+            WHERE {article_filter}
+            ORDER BY publication_date DESC
+            LIMIT %s
+        """, params + [limit])
+
+        scientific_filter, params = keyword_filter("scientific_articles", keywords)
+        scientific_articles_by_keywords = fetch_all(f"""
+            SELECT id, title, abstract, article_url, publication_date, keywords, authors,
+                   COUNT(*) OVER() AS total_count
+            FROM scientific_articles
+            WHERE {scientific_filter}
+            ORDER BY publication_date DESC
+            LIMIT %s
+        """, params + [limit])
+    else:
+        articles_by_keywords = no_rows()
+        scientific_articles_by_keywords = no_rows()
+
+    #  Dernières vidéos des chaînes préférées
+    if channels:
+        latest_videos = fetch_all(f"""
+            SELECT id, title, source, video_url, publication_date, COUNT(*) OVER() AS total_count
+            FROM videos
+            WHERE channel_name IN ({",".join(["%s"] * len(channels))})
+            ORDER BY publication_date DESC
+            LIMIT %s
+        """, channels + [limit])
+    else:
+        latest_videos = no_rows()
+
+    #  Tendances des mots-clés sur une plage dynamique, depuis le cumul quotidien
+    date_threshold = (datetime.now() - timedelta(days=days_range)).strftime("%Y-%m-%d")
+    daily_counts = fetch_all("""
+        SELECT day, keyword, count
+        FROM keyword_daily_counts
+        WHERE content_type = 'articles' AND day >= %s
+        ORDER BY day, count DESC
+    """, (date_threshold,))
+
+    (
+        latest_articles_by_source, latest_articles_by_keywords,
+        latest_scientific_articles_by_keywords, latest_videos, daily_counts
+    ) = await asyncio.gather(
+        articles_by_source, articles_by_keywords,
+        scientific_articles_by_keywords, latest_videos, daily_counts
+    )
+
+    latest_articles_by_source, source_count = split_total(latest_articles_by_source)
+    latest_articles_by_keywords, keyword_count = split_total(latest_articles_by_keywords)
+    latest_scientific_articles_by_keywords, scientific_articles_count = split_total(latest_scientific_articles_by_keywords)
+    latest_videos, videos_count = split_total(latest_videos)
+
+    trending_keywords_by_date, trends_chart = build_trends(daily_counts, keywords)
 
     return {
         "articles_by_source": latest_articles_by_source,
@@ -158,9 +151,77 @@ def get_dashboard(
         "latest_videos": latest_videos,
         "trending_keywords": trending_keywords_by_date,
         "metrics": {
-            "articles_count": articles_count,
+            "articles_count": source_count + keyword_count,
             "videos_count": videos_count,
             "scientific_articles_count": scientific_articles_count,
         },
         "trends_chart": trends_chart
     }
+
+
+async def load_cached_dashboard(preferences: dict, limit: int, days_range: int):
+    """Lit l'instantané du tableau de bord ; une erreur de lecture est traitée comme une absence."""
+    try:
+        return await load_snapshot(preferences, limit, days_range)
+    except DatabaseUnavailableError:
+        raise
+    except Exception as e:
+        logging.warning(f"Lecture de l'instantané du tableau de bord impossible : {e}")
+        return None
+
+
+async def save_cached_dashboard(preferences: dict, limit: int, days_range: int, dashboard: dict, generation: int):
+    """Enregistre le tableau de bord calculé pour les requêtes suivantes, sans faire échouer la réponse."""
+    try:
+        await store_snapshot(preferences, limit, days_range, dashboard, generation)
+    except Exception as e:
+        logging.warning(f"Enregistrement de l'instantané du tableau de bord impossible : {e}")
+
+
+def split_total(rows):
+    """Retire la colonne `total_count` (COUNT(*) OVER()) des lignes et retourne (lignes, total)."""
+    total = int(rows[0]["total_count"]) if rows else 0
+    for row in rows:
+        row.pop("total_count", None)
+    return list(rows), total
+
+
+def build_trends(daily_counts, keywords):
+    """Construit les mots-clés tendance par date et les séries du graphique à partir du cumul quotidien."""
+    keyword_by_date = defaultdict(dict)
+    for row in daily_counts:
+        keyword_by_date[row["day"]][row["keyword"]] = int(row["count"])
+
+    trending_keywords_by_date = []
+    keyword_evolution = defaultdict(list)
+    all_dates = sorted(keyword_by_date.keys())
+
+    for date in all_dates:
+        sorted_keywords = sorted(keyword_by_date[date].items(), key=lambda x: x[1], reverse=True)
+        trending_keywords_by_date.append({
+            "date": date.strftime("%Y-%m-%d"),
+            "keywords": [{"keyword": kw, "count": count} for kw, count in sorted_keywords]
+        })
+
+        for keyword in keywords:
+            keyword_evolution[keyword].append(keyword_by_date[date].get(keyword, 0))
+
+    trends_chart = {
+        "dates": [date.strftime("%Y-%m-%d") for date in all_dates],
+        "keyword_trends": [{"keyword": kw, "counts": keyword_evolution[kw]} for kw in keywords]
+    }
+    return trending_keywords_by_date, trends_chart
+
+
+async def fetch_all(query: str, params):
+    """Exécute une requête sur sa propre connexion du pool (requêtes exécutables en parallèle)."""
+    async with get_async_cursor() as cursor:
+        await cursor.execute(query, params)
+        return await cursor.fetchall()
+
+
+async def fetch_one(query: str, params):
+    """Exécute une requête et retourne la première ligne."""
+    async with get_async_cursor() as cursor:
+        await cursor.execute(query, params)
+        return await cursor.fetchone()
@@ -1,6 +1,7 @@
 import os
 from fastapi import APIRouter, HTTPException, Depends
 from app.database import get_connection
+from app.cache import cached, cache_stats
 from contextlib import closing
 from app.security.jwt_handler import jwt_required
 from typing import List, Dict, Any
@@ -47,8 +48,21 @@ class MonitoringLog(BaseModel):
     average_summary_word_count: float | None = None
 
 
+class CacheNamespaceStats(BaseModel):
+    hits: int
+    misses: int
+
+
+class CacheStatsMetrics(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+    namespaces: Dict[str, CacheNamespaceStats]
+
+
 # Nombre d'articles par source
 @router.get("/articles-by-source", response_model=List[SourceMetrics])
+@cached("metrics.articles_by_source")
 def get_articles_by_source(user=Depends(jwt_required)):
     query = """
         SELECT source, COUNT(*) as count
@@ -73,6 +87,7 @@ def get_scientific_keyword_frequency(user=Depends(jwt_required)):
 
 # Nombre de vidéos par source
 @router.get("/videos-by-source", response_model=List[SourceMetrics])
+@cached("metrics.videos_by_source")
 def get_videos_by_source(user=Depends(jwt_required)):
     query = """
         SELECT source, COUNT(*) as count
@@ -106,21 +121,23 @@ def get_monitoring_logs(user=Depends(jwt_required)):
     return rows
 
 
+# Compteurs du cache des réponses (succès / échecs par route)
+@router.get("/cache-stats", response_model=CacheStatsMetrics)
+def get_cache_stats(user=Depends(jwt_required)):
+    return cache_stats.snapshot()
+
+
 # Fonction générique pour la fréquence des mots-clés
 def get_keyword_frequency_generic(table_name: str) -> List[Dict[str, Any]]:
-    query = f"""
-        SELECT keyword, COUNT(*) as count
-        FROM (
-            SELECT TRIM(REGEXP_SUBSTR(keywords, '[^;]+', 1, n)) AS keyword
-            FROM {table_name}
-            JOIN (SELECT 1 AS n UNION SELECT 2 UNION SELECT 3 UNION SELECT 4 UNION SELECT 5) numbers
-            ON CHAR_LENGTH(keywords) - CHAR_LENGTH(REPLACE(keywords, ';', '')) >= n - 1
-        ) AS exploded_keywords
-        WHERE keyword IS NOT NULL
+    # Agrégation du cumul quotidien maintenu à l'ingestion (content_type = nom de la table)
+    query = """
+        SELECT keyword, CAST(SUM(count) AS SIGNED) AS count
+        FROM keyword_daily_counts
+        WHERE content_type = %s
         GROUP BY keyword
         ORDER BY count DESC
     """
-    return execute_query(query)
+    return execute_query(query, (table_name,))
 
 
 # Fonction générique pour exécuter une requête SQL
@@ -139,4 +156,4 @@ def execute_query(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
     finally:
-        pass
+        connection.close()
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from app.database import get_connection
-from contextlib import closing
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
+from app.database import get_async_cursor, DatabaseUnavailableError
+from app.cache import cached
 from app.security.jwt_handler import jwt_required
+from app.related import RELATED_CONTENT_TOP_K, RelatedContentResponse, related_content_query, format_related
+from app.keywords import parse_keywords, keyword_filter
+from app.search import fulltext_filter
+from app.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, apply_keyset, paginate
+)
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
@@ -16,7 +22,7 @@ class ScientificArticleResponse(BaseModel):
     title: str
     article_url: str
     authors: Optional[str]
-    publication_date: str  # Publication date as string
+    publication_date: Optional[str]  # Publication date as string
     keywords: Optional[str]
     abstract: Optional[str]
 
@@ -36,19 +42,23 @@ def validate_date(date_str):
     summary="Récupère tous les articles scientifiques avec filtres dynamiques",
     response_model=List[ScientificArticleResponse],
     responses={
-        200: {"description": "Liste des articles scientifiques récupérés."},
+        200: {"description": "Page d'articles scientifiques récupérés (curseur de la page suivante dans l'en-tête X-Next-Cursor)."},
         404: {"description": "Aucun article scientifique trouvé."},
         500: {"description": "Erreur interne."}
     }
 )
 async def get_all_scientific_articles(
+    response: Response,
     start_date: Optional[str] = Query(None, description="Filtrer les articles à partir de cette date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Filtrer les articles jusqu'à cette date (YYYY-MM-DD)"),
     authors: Optional[str] = Query(None, description="Filtrer par auteur(s) (séparés par des virgules)"),
     keywords: Optional[str] = Query(None, description="Filtrer par mots-clés (séparés par des virgules)"),
+    q: Optional[str] = Query(None, description="Recherche plein texte (titre, résumé, mots-clés)"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Nombre d'articles par page"),
+    page_cursor: Optional[str] = Query(None, alias="cursor", description="Curseur opaque de la page suivante (en-tête X-Next-Cursor)"),
     user=Depends(jwt_required)  # Dépendance pour vérifier le token JWT
 ):
-    """Récupère les articles scientifiques avec filtres dynamiques."""
+    """Récupère une page d'articles scientifiques avec filtres dynamiques (pagination par curseur)."""
     query = """
         SELECT id, title, article_url, authors, publication_date, keywords, abstract
         FROM scientific_articles
@@ -72,26 +82,29 @@ async def get_all_scientific_articles(
         query += " AND (" + " OR ".join(["authors LIKE %s"] * len(author_list)) + ")"
         params.extend(author_list)
 
-    if keywords:
-        keyword_list = [f"%{kw.strip()}%" for kw in keywords.split(',')]
-        query += " AND (" + " OR ".join(["keywords LIKE %s"] * len(keyword_list)) + ")"
-        params.extend(keyword_list)
+    keyword_list = parse_keywords(keywords)
+    if keyword_list:
+        clause, keyword_params = keyword_filter("scientific_articles", keyword_list)
+        query += f" AND {clause}"
+        params.extend(keyword_params)
+
+    text_filter = fulltext_filter("scientific_articles", q)
+    if text_filter:
+        clause, text_params = text_filter
+        query += f" AND {clause}"
+        params.extend(text_params)
 
-    # Ajout du tri par date (du plus récent au plus ancien)
-    query += " ORDER BY publication_date DESC"
+    # Position du curseur, tri par (date, id) décroissants et limite de page
+    query = apply_keyset(query, params, page_cursor, page_size)
 
     # LOG : Requête SQL générée
     print(f"Requête SQL : {query}")
     print(f"Paramètres : {params}")
 
-    connection = get_connection()
-    if not connection:
-        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
-
     try:
-        with closing(connection.cursor(dictionary=True)) as cursor:
-            cursor.execute(query, params)
-            articles = cursor.fetchall()
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query, params)
+            articles, next_cursor = paginate(await cursor.fetchall(), page_size)
 
             # LOG : Articles récupérés
             print(f"Articles récupérés : {articles}")
@@ -99,25 +112,25 @@ async def get_all_scientific_articles(
             if not articles:
                 raise HTTPException(status_code=404, detail="Aucun article scientifique trouvé.")
 
+            if next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
             # Convertir publication_date en chaîne avant de renvoyer la réponse
             for article in articles:
-                article['publication_date'] = article['publication_date'].strftime('%Y-%m-%d')
+                if article['publication_date']:
+                    article['publication_date'] = article['publication_date'].strftime('%Y-%m-%d')
 
             # Retourner la liste des articles en réponse
             return articles
 
+    except DatabaseUnavailableError:
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
-
 
 # Route pour récupérer les 5 articles scientifiques les plus récents
 @router.get(
@@ -130,6 +143,7 @@ async def get_all_scientific_articles(
         500: {"description": "Erreur interne."}
     }
 )
+@cached("scientific_articles.latest")
 async def get_latest_scientific_articles(
     user=Depends(jwt_required)  # Dépendance pour vérifier le token JWT
 ):
@@ -146,14 +160,10 @@ async def get_latest_scientific_articles(
     print(f"Requête SQL : {query}")
     print(f"Paramètres : {params}")
 
-    connection = get_connection()
-    if not connection:
-        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
-
     try:
-        with closing(connection.cursor(dictionary=True)) as cursor:
-            cursor.execute(query, params)
-            articles = cursor.fetchall()
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query, params)
+            articles = await cursor.fetchall()
 
             # LOG : Articles récupérés
             print(f"Articles récupérés : {articles}")
@@ -163,19 +173,55 @@ async def get_latest_scientific_articles(
 
             # Convertir publication_date en chaîne avant de renvoyer la réponse
             for article in articles:
-                article['publication_date'] = article['publication_date'].strftime('%Y-%m-%d')
+                if article['publication_date']:
+                    article['publication_date'] = article['publication_date'].strftime('%Y-%m-%d')
 
             # Retourner la liste des articles en réponse
             return articles
 
+    except DatabaseUnavailableError:
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
-    finally:
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+
+# Route pour récupérer les contenus similaires de l'article scientifique
+@router.get(
+    "/{article_id}/related",
+    summary="Récupère les contenus similaires de l'article scientifique",
+    response_model=List[RelatedContentResponse],
+    responses={
+        200: {"description": "Contenus similaires (articles, articles scientifiques, vidéos) par similarité décroissante."},
+        404: {"description": "Aucun contenu similaire trouvé."},
+        500: {"description": "Erreur interne."}
+    }
+)
+async def get_related_to_scientific_article(
+    article_id: int,
+    limit: int = Query(RELATED_CONTENT_TOP_K, ge=1, le=RELATED_CONTENT_TOP_K, description="Nombre de contenus similaires"),
+    user=Depends(jwt_required)
+):
+    """Récupère les contenus les plus proches de l'article scientifique, précalculés après chaque ingestion."""
+    query, params = related_content_query("scientific_articles", article_id, limit)
+
+    try:
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query, params)
+            related = format_related(await cursor.fetchall())
+
+            if not related:
+                raise HTTPException(status_code=404, detail="Aucun contenu similaire trouvé.")
+
+            return related
+
+    except DatabaseUnavailableError:
+        logging.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
@@ -0,0 +1,241 @@
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.concurrency import run_in_threadpool
+from app.database import get_async_cursor, DatabaseUnavailableError
+from app.security.jwt_handler import jwt_required
+from app.search import SEARCH_TYPES, search_terms, match_expression
+from app.vector_index import VECTOR_INDEX_NPROBE, load_current_index
+from app.embeddings import encode_query
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+import logging
+
+router = APIRouter()
+
+# Modèle de réponse commun aux trois types de contenu
+class SearchResult(BaseModel):
+    type: str
+    id: int
+    title: str
+    source: Optional[str]
+    publication_date: Optional[str]  # Publication date as string
+    excerpt: Optional[str]
+    url: Optional[str]
+    score: float
+
+
+# Fonction de validation de date
+def validate_date(date_str):
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Format de date invalide : {date_str}. Utilisez YYYY-MM-DD.")
+
+
+def parse_types(value):
+    """Types de contenu demandés (séparés par des virgules), tous par défaut."""
+    if not value:
+        return list(SEARCH_TYPES)
+    types = [content_type.strip() for content_type in value.split(",") if content_type.strip()]
+    unknown = [content_type for content_type in types if content_type not in SEARCH_TYPES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Type(s) de contenu inconnu(s) : {', '.join(unknown)}. Valeurs possibles : {', '.join(SEARCH_TYPES)}."
+        )
+    return types
+
+
+def build_search_query(types, text, limit, start_date=None, end_date=None):
+    """
+    Requête de recherche plein texte sur plusieurs types de contenu.
+
+    Chaque table est interrogée par son index FULLTEXT (mode langage naturel,
+    pertinence TF-IDF) et limitée à ses `limit` meilleurs résultats avant la
+    fusion, triée par score décroissant.
+
+    :return: Tuple (requête SQL, paramètres)
+    """
+    selects = []
+    params = []
+    for content_type in types:
+        table_name, excerpt_column, url_column = SEARCH_TYPES[content_type]
+        match = f"{match_expression(table_name)} AGAINST (%s IN NATURAL LANGUAGE MODE)"
+        select = (
+            f"(SELECT '{content_type}' AS type, id, title, source, publication_date, "
+            f"{excerpt_column} AS excerpt, {url_column} AS url, {match} AS score "
+            f"FROM {table_name} WHERE {match}"
+        )
+        params.extend([text, text])
+        if start_date:
+            select += " AND publication_date >= %s"
+            params.append(start_date)
+        if end_date:
+            select += " AND publication_date <= %s"
+            params.append(end_date)
+        select += " ORDER BY score DESC LIMIT %s)"
+        params.append(limit)
+        selects.append(select)
+
+    query = " UNION ALL ".join(selects) + " ORDER BY score DESC, publication_date DESC LIMIT %s"
+    params.append(limit)
+    return query, params
+
+
+def build_contents_query(matches):
+    """
+    Requête des contenus désignés par des résultats d'index vectoriel
+    [(type de contenu, id, score)], un accès par clé primaire par type.
+
+    :return: Tuple (requête SQL, paramètres)
+    """
+    ids_by_type = {}
+    for content_type, content_id, _ in matches:
+        ids_by_type.setdefault(content_type, []).append(content_id)
+
+    selects = []
+    params = []
+    for content_type, ids in ids_by_type.items():
+        table_name, excerpt_column, url_column = SEARCH_TYPES[content_type]
+        placeholders = ", ".join(["%s"] * len(ids))
+        selects.append(
+            f"SELECT '{content_type}' AS type, id, title, source, publication_date, "
+            f"{excerpt_column} AS excerpt, {url_column} AS url FROM {table_name} WHERE id IN ({placeholders})"
+        )
+        params.extend(ids)
+    return " UNION ALL ".join(selects), params
+
+
+def order_by_matches(rows, matches):
+    """Contenus dans l'ordre des résultats, avec leur score ; ceux supprimés depuis la construction de l'index sont omis."""
+    by_key = {(row["type"], row["id"]): row for row in rows}
+    results = []
+    for content_type, content_id, score in matches:
+        row = by_key.get((content_type, content_id))
+        if row is not None:
+            results.append({**row, "score": score})
+    return results
+
+
+# Route de recherche plein texte sur les articles, articles scientifiques et vidéos
+@router.get(
+    "/",
+    summary="Recherche plein texte dans tous les contenus",
+    response_model=List[SearchResult],
+    responses={
+        200: {"description": "Résultats classés par pertinence."},
+        400: {"description": "Recherche vide, type de contenu ou date invalide."},
+        404: {"description": "Aucun résultat trouvé."},
+        500: {"description": "Erreur interne."}
+    }
+)
+async def search_content(
+    q: str = Query(..., description="Termes recherchés dans les titres, résumés, contenus et mots-clés"),
+    types: str = Query(None, description="Types de contenu (articles, scientific_articles, videos ; séparés par des virgules)"),
+    start_date: str = Query(None, description="Filtrer les contenus à partir de cette date (YYYY-MM-DD)"),
+    end_date: str = Query(None, description="Filtrer les contenus jusqu'à cette date (YYYY-MM-DD)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Nombre maximal de résultats"),
+    user=Depends(jwt_required)
+):
+    """Recherche les contenus correspondant à `q`, classés par pertinence."""
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="La recherche ne contient aucun terme.")
+
+    query, params = build_search_query(
+        parse_types(types),
+        " ".join(terms),
+        limit,
+        validate_date(start_date) if start_date else None,
+        validate_date(end_date) if end_date else None
+    )
+
+    try:
+        async with get_async_cursor() as cursor:
+            logging.info(f"Recherche plein texte : {terms}")
+            await cursor.execute(query, params)
+            results = await cursor.fetchall()
+
+            if not results:
+                raise HTTPException(status_code=404, detail="Aucun résultat trouvé.")
+
+            # Conversion de publication_date en string avant la réponse
+            for result in results:
+                if result['publication_date']:
+                    result['publication_date'] = result['publication_date'].strftime('%Y-%m-%d')
+                result['score'] = float(result['score'])
+
+            return results
+
+    except DatabaseUnavailableError:
+        logging.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
+
+
+# Route de recherche sémantique (index vectoriel des embeddings des contenus)
+@router.get(
+    "/semantic",
+    summary="Recherche sémantique dans tous les contenus",
+    response_model=List[SearchResult],
+    responses={
+        200: {"description": "Contenus les plus proches par le sens (similarité cosinus décroissante)."},
+        400: {"description": "Recherche vide ou type de contenu invalide."},
+        404: {"description": "Aucun résultat trouvé."},
+        500: {"description": "Erreur interne."},
+        503: {"description": "Index vectoriel ou modèle d'embeddings indisponible."}
+    }
+)
+async def semantic_search(
+    q: str = Query(..., description="Texte dont on cherche les contenus de sens proche"),
+    types: str = Query(None, description="Types de contenu (articles, scientific_articles, videos ; séparés par des virgules)"),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE, description="Nombre maximal de résultats"),
+    user=Depends(jwt_required)
+):
+    """Recherche les contenus les plus proches de `q` dans l'index vectoriel (IVF)."""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="La recherche ne contient aucun terme.")
+    content_types = parse_types(types)
+
+    index = await run_in_threadpool(load_current_index)
+    if index is None:
+        raise HTTPException(status_code=503, detail="Index sémantique indisponible : lancez scripts/build_vector_index.py.")
+    try:
+        query_vector = await run_in_threadpool(encode_query, q, index.model_name)
+    except Exception as e:
+        logging.error(f"Encodage de la requête impossible : {str(e)}")
+        raise HTTPException(status_code=503, detail="Modèle d'embeddings indisponible.")
+
+    matches = await run_in_threadpool(index.search, query_vector, limit, VECTOR_INDEX_NPROBE, content_types)
+    if not matches:
+        raise HTTPException(status_code=404, detail="Aucun résultat trouvé.")
+
+    query, params = build_contents_query(matches)
+    try:
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query, params)
+            results = order_by_matches(await cursor.fetchall(), matches)
+
+            if not results:
+                raise HTTPException(status_code=404, detail="Aucun résultat trouvé.")
+
+            # Conversion de publication_date en string avant la réponse
+            for result in results:
+                if result['publication_date']:
+                    result['publication_date'] = result['publication_date'].strftime('%Y-%m-%d')
+
+            return results
+
+    except DatabaseUnavailableError:
+        logging.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
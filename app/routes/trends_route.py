@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from app.database import get_connection
-from contextlib import closing
+from app.database import get_async_cursor, DatabaseUnavailableError
+from app.cache import cached
 from datetime import datetime, timedelta
 from app.security.jwt_handler import jwt_required
 from typing import List, Dict
@@ -24,6 +24,7 @@ class TrendingKeyword(BaseModel):
         500: {"description": "Erreur interne"}
     }
 )
+@cached("trends.keywords")
 async def get_trending_keywords(
     start_date: str = Query(None, description="Date de début (YYYY-MM-DD)"),
     end_date: str = Query(None, description="Date de fin (YYYY-MM-DD)"),
@@ -37,19 +38,11 @@ async def get_trending_keywords(
     # Détermination de la plage de dates
     start_dt, end_dt = determine_date_range(start_date, end_date, last_days)
 
-    # Requête SQL optimisée
+    # Lecture du cumul quotidien : quelques lignes par jour au lieu d'un découpage de chaque article
     query = """
-        SELECT keyword, COUNT(*) as count 
-        FROM (
-            SELECT TRIM(SUBSTRING_INDEX(SUBSTRING_INDEX(keywords, ';', numbers.n), ';', -1)) AS keyword
-            FROM articles 
-            JOIN (SELECT 1 n UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL 
-                  SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL 
-                  SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9 UNION ALL SELECT 10) numbers 
-            ON CHAR_LENGTH(keywords) - CHAR_LENGTH(REPLACE(keywords, ';', '')) >= numbers.n - 1
-            WHERE publication_date BETWEEN %s AND %s
-        ) AS extracted_keywords
-        WHERE keyword != ''
+        SELECT keyword, CAST(SUM(count) AS SIGNED) AS count
+        FROM keyword_daily_counts
+        WHERE content_type = 'articles' AND day BETWEEN %s AND %s
         GROUP BY keyword
         ORDER BY count DESC
         LIMIT %s OFFSET %s;
@@ -83,17 +76,13 @@ def determine_date_range(start_date: str, end_date: str, last_days: int):
 
 async def execute_query(query: str, params: tuple) -> List[Dict]:
     """Exécute une requête SQL et retourne le résultat sous forme de liste de dictionnaires."""
-    connection = get_connection()
-    if not connection:
-        raise HTTPException(status_code=500, detail="Erreur de connexion à la base de données.")
-
     try:
-        with closing(connection.cursor(dictionary=True)) as cursor:
-            cursor.execute(query, params)
-            return cursor.fetchall()
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchall()
 
+    except DatabaseUnavailableError:
+        raise HTTPException(status_code=500, detail="Erreur de connexion à la base de données.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur SQL : {str(e)}")
 
-    finally:
-        connection.close()
@@ -23,13 +23,13 @@ def get_available_filters():
         cursor.execute("SELECT DISTINCT channel_name FROM videos")
         channels = [row["channel_name"] for row in cursor.fetchall()]
 
-        cursor.execute("SELECT DISTINCT keywords FROM articles WHERE keywords IS NOT NULL")
-        article_keywords = [keyword for row in cursor.fetchall() for keyword in row["keywords"].split(';')]
-
-        cursor.execute("SELECT DISTINCT keywords FROM scientific_articles WHERE keywords IS NOT NULL")
-        scientific_article_keywords = [keyword for row in cursor.fetchall() for keyword in row["keywords"].split(';')]
-
-        keywords = list(set(article_keywords + scientific_article_keywords))
+        # Mots-clés effectivement portés par au moins un article ou article scientifique
+        cursor.execute(
+            "SELECT k.name FROM keywords k "
+            "WHERE EXISTS (SELECT 1 FROM article_keywords ak WHERE ak.keyword_id = k.id) "
+            "OR EXISTS (SELECT 1 FROM scientific_article_keywords sk WHERE sk.keyword_id = k.id)"
+        )
+        keywords = [row["name"] for row in cursor.fetchall()]
 
     return {"articles": sources, "videos": channels, "keywords": keywords}
 
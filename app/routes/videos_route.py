@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from app.database import get_connection
-from contextlib import closing
+from fastapi import APIRouter, HTTPException, Query, Depends, Response
+from app.database import get_async_cursor, DatabaseUnavailableError
 from app.security.jwt_handler import jwt_required
+from app.related import RELATED_CONTENT_TOP_K, RelatedContentResponse, related_content_query, format_related
+from app.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, apply_keyset, paginate
+)
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
@@ -20,7 +23,7 @@ class VideoResponse(BaseModel):
     title: str
     video_url: str
     source: str
-    publication_date: str  # Format YYYY-MM-DD
+    publication_date: Optional[str]  # Format YYYY-MM-DD
     description: Optional[str]
 
 
@@ -38,18 +41,21 @@ def validate_date(date_str):
     summary="Récupère toutes les vidéos avec filtres dynamiques",
     response_model=List[VideoResponse],
     responses={
-        200: {"description": "Liste des vidéos récupérées."},
+        200: {"description": "Page de vidéos récupérées (curseur de la page suivante dans l'en-tête X-Next-Cursor)."},
         404: {"description": "Aucune vidéo trouvée."},
         500: {"description": "Erreur interne."}
     }
 )
 async def get_all_videos(
+    response: Response,
     start_date: Optional[str] = Query(None, description="Filtrer les vidéos à partir de cette date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Filtrer les vidéos jusqu'à cette date (YYYY-MM-DD)"),
     source: Optional[str] = Query(None, description="Filtrer par source (source)"),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Nombre de vidéos par page"),
+    page_cursor: Optional[str] = Query(None, alias="cursor", description="Curseur opaque de la page suivante (en-tête X-Next-Cursor)"),
     user=Depends(jwt_required)
 ):
-    """Récupère les vidéos avec filtres dynamiques."""
+    """Récupère une page de vidéos avec filtres dynamiques (pagination par curseur)."""
 
     query = """
         SELECT id, title, video_url, source, publication_date, description
@@ -72,66 +78,147 @@ async def get_all_videos(
         query += " AND source LIKE %s"
         params.append(f"%{source}%")
 
-    # Ajout du tri par date (du plus récent au plus ancien)
-    query += " ORDER BY publication_date DESC"
+    # Position du curseur, tri par (date, id) décroissants et limite de page
+    query = apply_keyset(query, params, page_cursor, page_size)
 
     logger.info(f"Requête SQL : {query}")
     logger.info(f"Paramètres : {params}")
 
-    # Connexion à la base de données
     try:
-        connection = get_connection()
-        if not connection:
-            raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query, params)
+            videos, next_cursor = paginate(await cursor.fetchall(), page_size)
+
+            if not videos:
+                raise HTTPException(status_code=404, detail="Aucune vidéo trouvée.")
+
+            if next_cursor:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+            # Conversion de publication_date en string avant la réponse
+            for video in videos:
+                if video['publication_date']:
+                    video['publication_date'] = video['publication_date'].strftime('%Y-%m-%d')
+
+            return videos
+
+    except DatabaseUnavailableError:
+        logger.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Erreur de connexion à la base de données : {e}")
-        raise HTTPException(status_code=500, detail="Erreur interne.")
+        logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
+
+
+# Route pour récupérer la dernière vidéo par source
+@router.get(
+    "/latest",
+    summary="Récupère la dernière vidéo de chaque source",
+    response_model=List[VideoResponse],
+    responses={
+        200: {"description": "Liste des dernières vidéos par source."},
+        404: {"description": "Aucune vidéo trouvée."},
+        500: {"description": "Erreur interne."}
+    }
+)
+async def get_latest_videos(user=Depends(jwt_required)):
+    """Récupère la dernière vidéo pour chaque source."""
+
+    query = """
+        WITH ranked_videos AS (
+            SELECT
+                id, title, video_url, source, publication_date, description,
+                ROW_NUMBER() OVER (PARTITION BY source ORDER BY publication_date DESC, id DESC) AS `rank`
+            FROM videos
+        )
+        SELECT id, title, video_url, source, publication_date, description
+        FROM ranked_videos
+        WHERE `rank` = 1
+        ORDER BY publication_date DESC;
+    """
 
     try:
-        with closing(connection.cursor(dictionary=True)) as cursor:
-            cursor.execute(query, params)
-            videos = cursor.fetchall()
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query)
+            videos = await cursor.fetchall()
 
             if not videos:
                 raise HTTPException(status_code=404, detail="Aucune vidéo trouvée.")
 
             # Conversion de publication_date en string avant la réponse
             for video in videos:
-                video['publication_date'] = video['publication_date'].strftime('%Y-%m-%d')
+                if video['publication_date']:
+                    video['publication_date'] = video['publication_date'].strftime('%Y-%m-%d')
 
             return videos
 
+    except DatabaseUnavailableError:
+        logger.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
-    finally:
-        connection.close()
-
 
 @router.get("/video-sources", summary="Obtenir les chaînes uniques des vidéos")
 async def get_video_sources(user=Depends(jwt_required)):
     """Récupère les sources distinctes des vidéos."""
 
-    connection = get_connection()
-    if not connection:
-        logging.error("Impossible de se connecter à la base de données.")
-        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
-
     try:
-        with closing(connection.cursor(dictionary=True)) as cursor:
-            cursor.execute("SELECT DISTINCT channel_name FROM videos WHERE channel_name IS NOT NULL")
-            channel_names = [row["channel_name"] for row in cursor.fetchall()]
+        async with get_async_cursor() as cursor:
+            await cursor.execute("SELECT DISTINCT channel_name FROM videos WHERE channel_name IS NOT NULL")
+            channel_names = [row["channel_name"] for row in await cursor.fetchall()]
 
             return {"channel_name": channel_names}
 
+    except DatabaseUnavailableError:
+        logger.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
     except HTTPException:
         raise
     except Exception as e:
         logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
 
-    finally:
-        connection.close()
+
+# Route pour récupérer les contenus similaires de la vidéo
+@router.get(
+    "/{video_id}/related",
+    summary="Récupère les contenus similaires de la vidéo",
+    response_model=List[RelatedContentResponse],
+    responses={
+        200: {"description": "Contenus similaires (articles, articles scientifiques, vidéos) par similarité décroissante."},
+        404: {"description": "Aucun contenu similaire trouvé."},
+        500: {"description": "Erreur interne."}
+    }
+)
+async def get_related_to_video(
+    video_id: int,
+    limit: int = Query(RELATED_CONTENT_TOP_K, ge=1, le=RELATED_CONTENT_TOP_K, description="Nombre de contenus similaires"),
+    user=Depends(jwt_required)
+):
+    """Récupère les contenus les plus proches de la vidéo, précalculés après chaque ingestion."""
+    query, params = related_content_query("videos", video_id, limit)
+
+    try:
+        async with get_async_cursor() as cursor:
+            await cursor.execute(query, params)
+            related = format_related(await cursor.fetchall())
+
+            if not related:
+                raise HTTPException(status_code=404, detail="Aucun contenu similaire trouvé.")
+
+            return related
+
+    except DatabaseUnavailableError:
+        logger.error("Impossible de se connecter à la base de données.")
+        raise HTTPException(status_code=500, detail="Impossible de se connecter à la base de données.")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Erreur lors de l'exécution de la requête : {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Erreur interne : {str(e)}")
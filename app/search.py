@@ -0,0 +1,47 @@
+import re
+
+# Colonnes des index FULLTEXT de chaque table de contenu (ft_<table> dans schema.sql)
+FULLTEXT_COLUMNS = {
+    "articles": ("title", "summary", "full_content", "keywords"),
+    "videos": ("title", "description", "keywords"),
+    "scientific_articles": ("title", "abstract", "keywords"),
+}
+
+# Types de contenu recherchés : table, colonne d'extrait et colonne d'URL
+SEARCH_TYPES = {
+    "articles": ("articles", "summary", "link"),
+    "scientific_articles": ("scientific_articles", "abstract", "article_url"),
+    "videos": ("videos", "description", "video_url"),
+}
+
+# Opérateurs du mode booléen de MySQL, retirés de la saisie de l'utilisateur
+BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+
+
+def search_terms(text):
+    """Découpe une recherche saisie en termes, sans les opérateurs du mode booléen."""
+    if not text:
+        return []
+    return BOOLEAN_OPERATORS.sub(" ", text).split()
+
+
+def match_expression(table_name, alias=None):
+    """Expression MATCH(...) portant exactement sur les colonnes de l'index FULLTEXT de la table."""
+    prefix = f"{alias}." if alias else ""
+    return f"MATCH({', '.join(prefix + column for column in FULLTEXT_COLUMNS[table_name])})"
+
+
+def fulltext_filter(table_name, text):
+    """
+    Construit un filtre SQL « le contenu contient tous ces termes », servi par
+    l'index FULLTEXT de la table (mode booléen, chaque terme obligatoire).
+
+    :return: Tuple (clause SQL, paramètres), ou None si la saisie ne contient aucun terme
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+    return (
+        f"{match_expression(table_name)} AGAINST (%s IN BOOLEAN MODE)",
+        [" ".join(f"+{term}" for term in terms)]
+    )
@@ -1,75 +1,158 @@
+import os
 import logging
-from apscheduler.schedulers.background import BackgroundScheduler
 from app.database import get_connection
-
-
-def check_preferences():
-    """Vérifie les préférences des utilisateurs et récupère les articles et vidéos correspondants."""
+from app.keywords import parse_keywords
+
+# Contenus lus à la fois lors du parcours des nouveautés
+ALERT_FETCH_SIZE = int(os.getenv("ALERT_FETCH_SIZE", 1000))
+
+# Repères du dernier contenu examiné, dans la table des repères du pipeline
+ALERT_WATERMARK_STAGE = "alerts"
+
+
+class AlertIndex:
+    """
+    Index inversé des préférences : source, mot-clé ou chaîne -> utilisateurs
+    qui les suivent. Un contenu est confronté à l'index (recherche « à
+    l'envers ») au lieu de lancer les requêtes de chaque utilisateur sur tout
+    le corpus : le coût d'une vérification dépend du nombre de nouveautés.
+
+    Un article correspond à un utilisateur s'il vient d'une de ses sources et
+    porte un de ses mots-clés ; un critère non renseigné ne filtre pas, mais un
+    utilisateur sans source ni mot-clé ne reçoit pas d'alerte d'article.
+    """
+
+    def __init__(self, preferences_rows=()):
+        self.by_source = {}
+        self.by_keyword = {}
+        self.by_channel = {}
+        # Utilisateurs dont un seul des deux critères d'article est renseigné
+        self.any_source = set()
+        self.any_keyword = set()
+        for row in preferences_rows:
+            self.add(row)
+
+    def add(self, row):
+        """Ajoute les préférences d'un utilisateur (ligne de user_preferences)."""
+        user_id = row["user_id"]
+        sources = parse_keywords(row["source_preferences"], separator=";")
+        keywords = parse_keywords(row["keyword_preferences"], separator=";")
+        channels = parse_keywords(row["video_channel_preferences"], separator=";")
+
+        for source in sources:
+            self.by_source.setdefault(source.casefold(), set()).add(user_id)
+        for keyword in keywords:
+            self.by_keyword.setdefault(keyword.casefold(), set()).add(user_id)
+        for channel in channels:
+            self.by_channel.setdefault(channel.casefold(), set()).add(user_id)
+        if keywords and not sources:
+            self.any_source.add(user_id)
+        if sources and not keywords:
+            self.any_keyword.add(user_id)
+
+    def match_article(self, article):
+        """Utilisateurs à alerter pour un article (source, mots-clés séparés par ';')."""
+        source_users = self.by_source.get((article["source"] or "").casefold(), set()) | self.any_source
+        if not source_users:
+            return set()
+        keyword_users = set(self.any_keyword)
+        for keyword in parse_keywords(article["keywords"], separator=";"):
+            keyword_users |= self.by_keyword.get(keyword.casefold(), set())
+        return source_users & keyword_users
+
+    def match_video(self, video):
+        """Utilisateurs à alerter pour une vidéo (chaîne suivie)."""
+        return set(self.by_channel.get((video["channel_name"] or "").casefold(), set()))
+
+
+def load_last_ids(cursor):
+    """Dernier identifiant examiné de chaque table ({table: id}) ; absent avant la première vérification."""
+    cursor.execute(
+        "SELECT scope, last_id FROM pipeline_watermarks WHERE stage = %s", (ALERT_WATERMARK_STAGE,)
+    )
+    return {row["scope"]: row["last_id"] for row in cursor.fetchall()}
+
+
+def save_last_id(cursor, table_name, last_id):
+    """Enregistre le dernier identifiant examiné d'une table."""
+    cursor.execute(
+        """
+        INSERT INTO pipeline_watermarks (stage, scope, last_id, last_run_at)
+        VALUES (%s, %s, %s, NOW())
+        ON DUPLICATE KEY UPDATE last_id = VALUES(last_id), last_run_at = VALUES(last_run_at)
+        """,
+        (ALERT_WATERMARK_STAGE, table_name, last_id)
+    )
+
+
+def iter_new_rows(cursor, query, last_id, fetch_size=ALERT_FETCH_SIZE):
+    """Contenus d'identifiant supérieur à `last_id`, lus par lots dans l'ordre des identifiants."""
+    cursor.execute(query, (last_id,))
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def percolate(cursor, index, last_ids):
+    """
+    Confronte les contenus ajoutés depuis la dernière vérification à l'index.
+
+    Lors de la première vérification d'une table, seul le repère est posé :
+    le corpus existant ne déclenche pas d'alerte.
+
+    :return: Tuple ({user_id: {"articles": [ids], "videos": [ids]}}, {table: dernier id examiné})
+    """
+    sources = {
+        "articles": ("SELECT id, source, keywords FROM articles WHERE id > %s ORDER BY id", index.match_article),
+        "videos": ("SELECT id, channel_name FROM videos WHERE id > %s ORDER BY id", index.match_video),
+    }
+    alerts = {}
+    new_last_ids = {}
+    for table_name, (query, match) in sources.items():
+        last_id = last_ids.get(table_name)
+        if last_id is None:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) AS max_id FROM {table_name}")
+            new_last_ids[table_name] = cursor.fetchone()["max_id"]
+            continue
+
+        for row in iter_new_rows(cursor, query, last_id):
+            for user_id in match(row):
+                alerts.setdefault(user_id, {"articles": [], "videos": []})[table_name].append(row["id"])
+            last_id = row["id"]
+        new_last_ids[table_name] = last_id
+    return alerts, new_last_ids
+
+
+def check_alerts():
+    """Vérifie les nouveaux articles et vidéos correspondant aux préférences des utilisateurs."""
     connection = get_connection()
-    if connection:
-        try:
-            with connection.cursor(dictionary=True) as cursor:
-                # Récupération des préférences des utilisateurs
-                cursor.execute("SELECT * FROM user_preferences")
-                user_preferences = cursor.fetchall()
-
-                # Vérification des nouveaux articles et vidéos pour chaque utilisateur
-                for user_pref in user_preferences:
-                    user_id = user_pref['user_id']
-                    source_preferences = user_pref['source_preferences']
-                    video_channel_preferences = user_pref['video_channel_preferences']
-                    keyword_preferences = user_pref['keyword_preferences']
-
-                    # Vérification des nouveaux articles selon les préférences
-                    check_articles(cursor, user_id, source_preferences, keyword_preferences)
-
-                    # Vérification des nouvelles vidéos selon les préférences
-                    check_videos(cursor, user_id, video_channel_preferences)
-
-        except Exception as e:
-            logging.error(f"Erreur lors de la vérification des préférences des utilisateurs : {str(e)}")
-        finally:
-            connection.close()
-
-
-def check_articles(cursor, user_id, source_preferences, keyword_preferences):
-    """Vérifie les nouveaux articles selon les préférences de l'utilisateur."""
-    query = "SELECT * FROM articles WHERE 1=1"
-    params = []
-
-    if source_preferences:
-        query += " AND source IN (%s)"
-        params.append(source_preferences)
-
-    if keyword_preferences:
-        keyword_list = [f"%{kw.strip()}%" for kw in keyword_preferences.split(',')]
-        query += " AND (" + " OR ".join(["keywords LIKE %s"] * len(keyword_list)) + ")"
-        params.extend(keyword_list)
-
-    cursor.execute(query, params)
-    new_articles = cursor.fetchall()
-
-    if new_articles:
-        logging.info(f"Nouveaux articles pour l'utilisateur {user_id} : {len(new_articles)} nouveaux articles trouvés.")
-
-
-def check_videos(cursor, user_id, video_channel_preferences):
-    """Vérifie les nouvelles vidéos selon les préférences de l'utilisateur."""
-    query = "SELECT * FROM videos WHERE 1=1"
-    params = []
-
-    if video_channel_preferences:
-        query += " AND channel_name IN (%s)"
-        params.append(video_channel_preferences)
-
-    cursor.execute(query, params)
-    new_videos = cursor.fetchall()
-
-    if new_videos:
-        logging.info(f"Nouvelles vidéos pour l'utilisateur {user_id} : {len(new_videos)} nouvelles vidéos trouvées.")
-
-
-# Initialisation du scheduler pour exécuter la vérification toutes les 10 minutes
-scheduler = BackgroundScheduler()
-scheduler.add_job(check_preferences, 'interval', minutes=10)
-scheduler.start()
+    if not connection:
+        return {}
+    try:
+        with connection.cursor(dictionary=True) as cursor:
+            cursor.execute(
+                "SELECT user_id, source_preferences, video_channel_preferences, keyword_preferences "
+                "FROM user_preferences"
+            )
+            index = AlertIndex(cursor.fetchall())
+            alerts, last_ids = percolate(cursor, index, load_last_ids(cursor))
+
+            for user_id, matches in alerts.items():
+                logging.info(
+                    f"Nouveautés pour l'utilisateur {user_id} : {len(matches['articles'])} article(s), "
+                    f"{len(matches['videos'])} vidéo(s)."
+                )
+
+            # Le repère n'avance qu'une fois tous les nouveaux contenus examinés
+            for table_name, last_id in last_ids.items():
+                save_last_id(cursor, table_name, last_id)
+            connection.commit()
+            return alerts
+
+    except Exception as e:
+        logging.error(f"Erreur lors de la vérification des alertes : {str(e)}")
+        return {}
+    finally:
+        connection.close()
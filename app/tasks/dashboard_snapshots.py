@@ -0,0 +1,123 @@
+import os
+import json
+import asyncio
+import hashlib
+import logging
+from dotenv import load_dotenv
+from app.database import get_async_cursor, close_async_pool
+from app.cache import get_generation_async
+
+# Charger les variables d'environnement
+load_dotenv(os.path.join(os.path.dirname(__file__), "../../scripts/.env"))
+
+# Combinaisons (limit, days_range) précalculées : celles du frontend Flask par défaut
+SNAPSHOT_VARIANTS = [(10, 90)]
+# Âge maximal d'un instantané : la fenêtre des tendances glisse avec le temps même sans ingestion
+SNAPSHOT_MAX_AGE_MINUTES = int(os.getenv("DASHBOARD_SNAPSHOT_MAX_AGE_MINUTES", 360))
+
+# Dernière génération de données pour laquelle les instantanés ont été recalculés
+refresh_state = {"generation": None}
+
+
+def preferences_hash(preferences: dict) -> str:
+    """Empreinte SHA-256 des préférences découpées : des préférences identiques partagent un instantané."""
+    payload = json.dumps(
+        [preferences["sources"], preferences["channels"], preferences["keywords"]],
+        ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def load_snapshot(preferences: dict, limit: int, days_range: int):
+    """Retourne le tableau de bord précalculé pour ces préférences s'il est à jour, sinon None."""
+    generation = await get_generation_async()
+    async with get_async_cursor() as cursor:
+        await cursor.execute(
+            """
+            SELECT payload FROM dashboard_snapshots
+            WHERE preferences_hash = %s AND limit_count = %s AND days_range = %s
+              AND generation = %s AND created_at >= NOW() - INTERVAL %s MINUTE
+            """,
+            (preferences_hash(preferences), limit, days_range, generation, SNAPSHOT_MAX_AGE_MINUTES)
+        )
+        row = await cursor.fetchone()
+    return json.loads(row["payload"]) if row else None
+
+
+async def store_snapshot(preferences: dict, limit: int, days_range: int, dashboard: dict, generation: int):
+    """Enregistre (ou remplace) l'instantané du tableau de bord de ces préférences."""
+    async with get_async_cursor() as cursor:
+        await cursor.execute(
+            """
+            INSERT INTO dashboard_snapshots (preferences_hash, limit_count, days_range, generation, payload, created_at)
+            VALUES (%s, %s, %s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE generation = VALUES(generation), payload = VALUES(payload), created_at = NOW()
+            """,
+            (preferences_hash(preferences), limit, days_range, generation, json.dumps(dashboard, default=str))
+        )
+        await cursor.connection.commit()
+
+
+async def refresh_snapshots(force: bool = False) -> int:
+    """
+    Recalcule les instantanés de tous les jeux de préférences distincts.
+
+    Le recalcul n'a lieu que si la génération des données a changé depuis le
+    dernier passage (c'est-à-dire après une exécution du pipeline), sauf `force`.
+
+    :return: Nombre d'instantanés écrits
+    """
+    # Import local : la route importe ce module pour servir les instantanés
+    from app.routes.dashboard_route import build_dashboard, parse_preferences
+
+    generation = await get_generation_async()
+    if not force and refresh_state["generation"] == generation:
+        return 0
+
+    async with get_async_cursor() as cursor:
+        await cursor.execute(
+            "SELECT DISTINCT source_preferences, video_channel_preferences, keyword_preferences FROM user_preferences"
+        )
+        rows = await cursor.fetchall()
+
+    distinct_preferences = {}
+    for row in rows:
+        preferences = parse_preferences(row)
+        distinct_preferences[preferences_hash(preferences)] = preferences
+
+    written = 0
+    for preferences in distinct_preferences.values():
+        for limit, days_range in SNAPSHOT_VARIANTS:
+            dashboard = await build_dashboard(preferences, limit, days_range)
+            await store_snapshot(preferences, limit, days_range, dashboard, generation)
+            written += 1
+
+    # Les instantanés des générations précédentes ne seront plus jamais servis
+    async with get_async_cursor() as cursor:
+        await cursor.execute("DELETE FROM dashboard_snapshots WHERE generation <> %s", (generation,))
+        await cursor.connection.commit()
+
+    refresh_state["generation"] = generation
+    logging.info(f"{written} instantané(s) de tableau de bord recalculé(s) pour la génération {generation}.")
+    return written
+
+
+async def run_refresh(force: bool = False) -> int:
+    """Recalcule les instantanés puis ferme le pool de la boucle d'évènements courante."""
+    try:
+        return await refresh_snapshots(force)
+    finally:
+        await close_async_pool()
+
+
+def refresh_dashboard_snapshots():
+    """Point d'entrée du scheduler (thread dédié, donc boucle d'évènements propre à chaque passage)."""
+    try:
+        asyncio.run(run_refresh())
+    except Exception as e:
+        logging.error(f"Erreur lors du recalcul des instantanés du tableau de bord : {e}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_refresh(force=True))
@@ -0,0 +1,274 @@
+import os
+import shutil
+import logging
+from datetime import datetime
+import numpy as np
+
+# Dossier de l'index vectoriel, écrit par scripts/build_vector_index.py et lu par l'API
+VECTOR_INDEX_DIR = os.getenv(
+    "VECTOR_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vector_index")
+)
+# Nombre de listes inversées parcourues par requête (rappel contre latence)
+VECTOR_INDEX_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", 8))
+# Taille de l'échantillon d'apprentissage des centroïdes
+VECTOR_INDEX_TRAINING_SAMPLE = int(os.getenv("VECTOR_INDEX_TRAINING_SAMPLE", 50000))
+
+# Types de contenu indexés ; leur position est le code stocké dans l'index
+CONTENT_TYPES = ("articles", "scientific_articles", "videos")
+
+# Fichier désignant la version publiée de l'index (dossier horodaté)
+CURRENT_FILE = "CURRENT"
+# Lignes traitées par opération matricielle lors de la construction
+ASSIGN_CHUNK_SIZE = 65536
+# Lignes comparées à la fois par la recherche exacte : bloc de scores (requêtes × lignes) de quelques dizaines de Mo
+TOP_K_CHUNK_SIZE = 8192
+# Requêtes comparées à la fois par max_similarity
+QUERY_CHUNK_SIZE = 1024
+
+
+def default_nlist(count):
+    """Nombre de listes inversées : environ 4·√N, pour des listes de quelques centaines de vecteurs."""
+    return max(1, min(count, int(4 * np.sqrt(count))))
+
+
+def normalize(vectors):
+    """Normalise chaque ligne (norme L2) : le produit scalaire devient la similarité cosinus."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def train_centroids(sample, nlist, iterations=10, seed=0):
+    """
+    Centroïdes des listes inversées par k-means sphérique sur un échantillon
+    de vecteurs normalisés (affectation au centroïde de plus grand produit scalaire).
+    """
+    sample = normalize(sample)
+    rng = np.random.default_rng(seed)
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        filled = np.bincount(labels, minlength=nlist) > 0
+        # Une liste vide garde son centroïde précédent
+        centroids[filled] = normalize(sums[filled])
+    return centroids
+
+
+def assign_lists(vectors, centroids, chunk_size=ASSIGN_CHUNK_SIZE):
+    """Liste inversée (centroïde le plus proche) de chaque vecteur, calculée par blocs."""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), chunk_size):
+        block = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        labels[start:start + chunk_size] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def build_index(vectors, content_types, content_ids, model_name, root=VECTOR_INDEX_DIR, nlist=None, seed=0):
+    """
+    Construit et publie un index IVF (listes inversées sur NumPy).
+
+    Les vecteurs sont réécrits en float16 dans `vectors.npy`, regroupés par
+    liste inversée : une liste est une tranche contiguë du fichier, lue par
+    projection mémoire. `index.npz` contient les centroïdes, les bornes des
+    listes et la correspondance ligne -> (type de contenu, id). La nouvelle
+    version n'est visible qu'une fois complète (fichier CURRENT).
+
+    :param vectors: matrice (N, dimension) normalisée, éventuellement projetée en mémoire
+    :param content_types: codes des types de contenu (position dans CONTENT_TYPES)
+    :return: dossier de la version publiée
+    """
+    count = len(vectors)
+    nlist = min(nlist or default_nlist(count), count)
+    rng = np.random.default_rng(seed)
+    sample_rows = np.sort(rng.choice(count, size=min(count, VECTOR_INDEX_TRAINING_SAMPLE), replace=False))
+    centroids = train_centroids(np.asarray(vectors[sample_rows], dtype=np.float32), nlist, seed=seed)
+
+    labels = assign_lists(vectors, centroids)
+    order = np.argsort(labels, kind="stable")
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(labels, minlength=nlist))
+
+    version = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    directory = os.path.join(root, version)
+    os.makedirs(directory)
+    output = np.lib.format.open_memmap(
+        os.path.join(directory, "vectors.npy"), mode="w+", dtype=np.float16, shape=(count, vectors.shape[1])
+    )
+    for start in range(0, count, ASSIGN_CHUNK_SIZE):
+        output[start:start + ASSIGN_CHUNK_SIZE] = vectors[order[start:start + ASSIGN_CHUNK_SIZE]]
+    output.flush()
+    del output
+
+    np.savez(
+        os.path.join(directory, "index.npz"),
+        centroids=centroids,
+        offsets=offsets,
+        content_types=np.asarray(content_types, dtype=np.int8)[order],
+        content_ids=np.asarray(content_ids, dtype=np.int64)[order],
+        model_name=np.array(model_name)
+    )
+    publish(root, version)
+    logging.info(f"Index vectoriel publié : {count} vecteur(s), {nlist} liste(s) inversée(s) ({directory}).")
+    return directory
+
+
+def publish(root, version, keep=2):
+    """Désigne `version` comme index courant puis supprime les versions les plus anciennes."""
+    temporary_path = os.path.join(root, f"{CURRENT_FILE}.tmp")
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(temporary_path, os.path.join(root, CURRENT_FILE))
+
+    versions = sorted(name for name in os.listdir(root) if os.path.isdir(os.path.join(root, name)))
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def current_version(root=VECTOR_INDEX_DIR):
+    """Version publiée de l'index, ou None s'il n'a jamais été construit."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class VectorIndex:
+    """Index IVF en lecture : centroïdes en mémoire, vecteurs float16 projetés en mémoire."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with np.load(os.path.join(directory, "index.npz")) as data:
+            self.centroids = data["centroids"]
+            self.offsets = data["offsets"]
+            self.content_types = data["content_types"]
+            self.content_ids = data["content_ids"]
+            self.model_name = str(data["model_name"])
+        self.vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+
+    def __len__(self):
+        return len(self.content_ids)
+
+    def search(self, query, k=10, nprobe=VECTOR_INDEX_NPROBE, types=None):
+        """
+        Contenus les plus proches de `query` (similarité cosinus) parmi les
+        `nprobe` listes inversées dont le centroïde est le plus proche.
+
+        :param types: noms des types de contenu retenus (tous par défaut)
+        :return: [(type de contenu, id, score)] par score décroissant
+        """
+        query = normalize(query).reshape(-1)
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        allowed = None if not types else np.array([CONTENT_TYPES.index(name) for name in types], dtype=np.int8)
+
+        rows = []
+        scores = []
+        for probe in probes:
+            start, end = self.offsets[probe], self.offsets[probe + 1]
+            if start == end:
+                continue
+            list_rows = np.arange(start, end)
+            if allowed is not None:
+                list_rows = list_rows[np.isin(self.content_types[start:end], allowed)]
+                if not len(list_rows):
+                    continue
+                list_scores = np.asarray(self.vectors[list_rows], dtype=np.float32) @ query
+            else:
+                list_scores = np.asarray(self.vectors[start:end], dtype=np.float32) @ query
+            rows.append(list_rows)
+            scores.append(list_scores)
+
+        if not rows:
+            return []
+        rows = np.concatenate(rows)
+        scores = np.concatenate(scores)
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (CONTENT_TYPES[self.content_types[row]], int(self.content_ids[row]), float(score))
+            for row, score in zip(rows[top], scores[top])
+        ]
+
+
+def exact_top_k(vectors, queries, k, exclude=None, chunk_size=TOP_K_CHUNK_SIZE):
+    """
+    k plus proches voisins exacts (similarité cosinus) de chaque requête dans
+    `vectors`, parcourus par blocs : les k meilleures lignes de chaque bloc
+    (argpartition) sont fusionnées avec les k meilleures déjà retenues, sans
+    matrice d'indices de la taille du bloc.
+
+    :param queries: matrice (q, dimension) normalisée
+    :param exclude: ligne de `vectors` à ignorer pour chaque requête (elle-même), ou None
+    :return: Tuple (lignes (q, k), scores (q, k)) par score décroissant ; -1 là où il y a moins de k voisins
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    best_rows = np.full((len(queries), k), -1, dtype=np.int64)
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    for start in range(0, len(vectors), chunk_size):
+        block = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        scores = queries @ block.T
+        if exclude is not None:
+            inside = (exclude >= start) & (exclude < start + len(block))
+            scores[np.flatnonzero(inside), exclude[inside] - start] = -np.inf
+
+        if len(block) > k:
+            columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            block_scores = np.take_along_axis(scores, columns, axis=1)
+        else:
+            columns = np.broadcast_to(np.arange(len(block)), scores.shape)
+            block_scores = scores
+        del scores
+
+        merged_scores = np.concatenate([best_scores, block_scores], axis=1)
+        merged_rows = np.concatenate([best_rows, columns + start], axis=1)
+        top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_rows = np.take_along_axis(merged_rows, top, axis=1)
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_rows = np.take_along_axis(best_rows, order, axis=1)
+    best_rows[~np.isfinite(best_scores)] = -1
+    return best_rows, best_scores
+
+
+def max_similarity(vectors, queries, chunk_size=TOP_K_CHUNK_SIZE, query_chunk_size=QUERY_CHUNK_SIZE):
+    """
+    Pour chaque ligne de `vectors`, la plus grande similarité avec l'une des
+    requêtes. Lignes et requêtes sont parcourues par blocs : la mémoire ne
+    dépend pas du nombre de requêtes.
+    """
+    best = np.full(len(vectors), -np.inf, dtype=np.float32)
+    for start in range(0, len(vectors), chunk_size):
+        block = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        block_best = best[start:start + len(block)]
+        for query_start in range(0, len(queries), query_chunk_size):
+            scores = np.asarray(queries[query_start:query_start + query_chunk_size], dtype=np.float32) @ block.T
+            np.maximum(block_best, scores.max(axis=0), out=block_best)
+    return best
+    for start in range(0, len(vectors), chunk_size):
+        block = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        best[start:start + len(block)] = (queries @ block.T).max(axis=0)
+    return best
+
+
+# Index chargé par le processus de l'API, rechargé quand une nouvelle version est publiée
+_loaded = {"version": None, "index": None}
+
+
+def load_current_index(root=VECTOR_INDEX_DIR):
+    """Index publié (rechargé si sa version a changé), ou None s'il n'existe pas."""
+    version = current_version(root)
+    if version is None:
+        return None
+    if _loaded["version"] != version:
+        _loaded["index"] = VectorIndex(os.path.join(root, version))
+        _loaded["version"] = version
+    return _loaded["index"]
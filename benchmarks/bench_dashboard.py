@@ -0,0 +1,184 @@
+"""
+Benchmark du tableau de bord : implémentation historique (requêtes séquentielles
+et tendances calculées en Python) contre `build_dashboard` (requêtes parallèles
+et cumul quotidien des mots-clés).
+
+Le corpus synthétique est écrit dans la base BENCH_DB_NAME (recréée à partir de
+schema.sql) avec les identifiants DB_* de scripts/.env :
+
+    python benchmarks/bench_dashboard.py --sizes 10000 100000 1000000 --runs 50
+"""
+import argparse
+import asyncio
+import random
+from collections import defaultdict
+from contextlib import closing
+from datetime import date, datetime, timedelta
+
+from common import (
+    use_bench_database, connect_bench_database, reset_bench_database,
+    percentiles, time_calls, print_table
+)
+
+use_bench_database()
+
+from app.database import close_async_pool  # noqa: E402
+from app.routes.dashboard_route import build_dashboard  # noqa: E402
+from keyword_store import sync_keywords, rebuild_daily_counts  # noqa: E402
+
+INSERT_CHUNK_SIZE = 5000
+SOURCES = [f"source_{i}" for i in range(20)]
+CHANNELS = [f"channel_{i}" for i in range(20)]
+VOCABULARY = [f"keyword_{i}" for i in range(500)]
+
+PREFERENCES = {
+    "sources": SOURCES[:3],
+    "channels": CHANNELS[:3],
+    "keywords": VOCABULARY[:5],
+}
+
+
+def random_keywords(rng):
+    return ";".join(rng.sample(VOCABULARY, rng.randint(3, 6)))
+
+
+def random_day(rng, today):
+    return today - timedelta(days=rng.randint(0, 365))
+
+
+def populate(connection, articles_count, seed=42):
+    """Insère un corpus synthétique : articles, 1/5 d'articles scientifiques, 1/10 de vidéos."""
+    rng = random.Random(seed)
+    today = date.today()
+    cursor = connection.cursor()
+
+    def insert(table, query, make_row, count):
+        for start in range(0, count, INSERT_CHUNK_SIZE):
+            rows = [make_row(start + i) for i in range(min(INSERT_CHUNK_SIZE, count - start))]
+            cursor.executemany(query, rows)
+            connection.commit()
+
+        # Tables de liaison mot-clé puis cumul quotidien, comme après une ingestion
+        last_id = 0
+        while True:
+            cursor.execute(f"SELECT id, keywords FROM {table} WHERE id > %s ORDER BY id LIMIT %s", (last_id, INSERT_CHUNK_SIZE))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            sync_keywords(cursor, table, rows)
+            connection.commit()
+            last_id = rows[-1][0]
+        rebuild_daily_counts(cursor, table)
+        connection.commit()
+
+    insert(
+        "articles",
+        "INSERT INTO articles (title, source, publication_date, summary, full_content, language, link, author, keywords) "
+        "VALUES (%s, %s, %s, %s, %s, 'en', %s, 'bench', %s)",
+        lambda i: (f"Article {i}", rng.choice(SOURCES), random_day(rng, today), "Résumé", "Contenu",
+                   f"https://example.com/articles/{i}", random_keywords(rng)),
+        articles_count
+    )
+    insert(
+        "scientific_articles",
+        "INSERT INTO scientific_articles (title, authors, publication_date, abstract, article_url, source, external_id, keywords) "
+        "VALUES (%s, 'bench', %s, 'Abstract', %s, 'arxiv', %s, %s)",
+        lambda i: (f"Paper {i}", random_day(rng, today), f"https://example.com/papers/{i}", f"bench.{i}", random_keywords(rng)),
+        articles_count // 5
+    )
+    insert(
+        "videos",
+        "INSERT INTO videos (title, description, publication_date, source, video_url, channel_name, channel_id, keywords) "
+        "VALUES (%s, 'Description', %s, 'YouTube', %s, %s, %s, %s)",
+        lambda i: (f"Video {i}", random_day(rng, today), f"https://example.com/videos/{i}", rng.choice(CHANNELS),
+                   f"channel-{i % 20}", random_keywords(rng)),
+        articles_count // 10
+    )
+    cursor.close()
+
+
+def legacy_dashboard(conn, limit, days_range):
+    """Reproduction de l'implémentation historique : huit requêtes séquentielles et tendances en Python."""
+    sources, channels, keywords = PREFERENCES["sources"], PREFERENCES["channels"], PREFERENCES["keywords"]
+    placeholders = ", ".join(["%s"] * len(keywords))
+    keyword_clause = (
+        f"id IN (SELECT kl.article_id FROM article_keywords kl JOIN keywords k ON k.id = kl.keyword_id "
+        f"WHERE k.name IN ({placeholders}))"
+    )
+    scientific_clause = (
+        f"id IN (SELECT kl.scientific_article_id FROM scientific_article_keywords kl JOIN keywords k "
+        f"ON k.id = kl.keyword_id WHERE k.name IN ({placeholders}))"
+    )
+
+    with closing(conn.cursor(dictionary=True)) as cursor:
+        in_sources = ",".join(["%s"] * len(sources))
+        cursor.execute(f"SELECT id, title, source, link, publication_date, keywords FROM articles "
+                       f"WHERE source IN ({in_sources}) ORDER BY publication_date DESC LIMIT %s", sources + [limit])
+        cursor.fetchall()
+        cursor.execute(f"SELECT COUNT(*) AS count FROM articles WHERE source IN ({in_sources})", sources)
+        cursor.fetchone()
+
+        cursor.execute(f"SELECT id, title, source, link, publication_date, keywords FROM articles "
+                       f"WHERE {keyword_clause} ORDER BY publication_date DESC LIMIT %s", keywords + [limit])
+        cursor.fetchall()
+        cursor.execute(f"SELECT COUNT(*) AS count FROM articles WHERE {keyword_clause}", keywords)
+        cursor.fetchone()
+
+        cursor.execute(f"SELECT id, title, abstract, article_url, publication_date, keywords, authors "
+                       f"FROM scientific_articles WHERE {scientific_clause} ORDER BY publication_date DESC LIMIT %s",
+                       keywords + [limit])
+        cursor.fetchall()
+        cursor.execute(f"SELECT COUNT(*) AS count FROM scientific_articles WHERE {scientific_clause}", keywords)
+        cursor.fetchone()
+
+        in_channels = ",".join(["%s"] * len(channels))
+        cursor.execute(f"SELECT id, title, source, video_url, publication_date FROM videos "
+                       f"WHERE channel_name IN ({in_channels}) ORDER BY publication_date DESC LIMIT %s", channels + [limit])
+        cursor.fetchall()
+        cursor.execute(f"SELECT COUNT(*) AS count FROM videos WHERE source IN ({in_channels})", channels)
+        cursor.fetchone()
+
+        date_threshold = (datetime.now() - timedelta(days=days_range)).strftime("%Y-%m-%d")
+        cursor.execute("SELECT IFNULL(keywords, '') AS keywords, publication_date FROM articles "
+                       "WHERE publication_date >= %s", (date_threshold,))
+        keyword_by_date = defaultdict(lambda: defaultdict(int))
+        for row in cursor.fetchall():
+            for keyword in row["keywords"].split(";") if row["keywords"] else []:
+                keyword_by_date[row["publication_date"]][keyword] += 1
+        for day in sorted(keyword_by_date):
+            sorted(keyword_by_date[day].items(), key=lambda x: x[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--days-range", type=int, default=90)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    results = []
+    for size in args.sizes:
+        print(f"Préparation d'un corpus de {size} articles...")
+        reset_bench_database()
+        with closing(connect_bench_database()) as connection:
+            populate(connection, size)
+
+            # Connexion réutilisée, comme avec le pool de l'implémentation historique
+            legacy = time_calls(lambda: legacy_dashboard(connection, args.limit, args.days_range), args.runs)
+        current = time_calls(
+            lambda: loop.run_until_complete(build_dashboard(PREFERENCES, args.limit, args.days_range)),
+            args.runs
+        )
+        for name, samples in (("historique", legacy), ("parallèle + cumul", current)):
+            p50, p95 = percentiles(samples)
+            results.append([size, name, f"{p50:.1f}", f"{p95:.1f}"])
+
+    loop.run_until_complete(close_async_pool())
+    loop.close()
+    print_table(["articles", "implémentation", "p50 (ms)", "p95 (ms)"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark de l'extraction de mots-clés sur CPU (articles par seconde) :
+boucle historique (un appel au modèle par article) contre encodage par lots
+triés par longueur, avec un cache d'embeddings vide puis rempli.
+
+Le corpus est lu dans un fichier JSONL (ou JSON) d'articles (champ full_content) ou généré :
+
+    python benchmarks/bench_keywords.py --articles 500 --batch-sizes 16 32 64
+    python benchmarks/bench_keywords.py --input articles.jsonl --threads 4
+"""
+import argparse
+import random
+import tempfile
+import time
+
+import torch
+from sentence_transformers import util
+
+from common import print_table
+
+from jsonl_io import iter_records
+from embedding_cache import EmbeddingCache, load_candidate_embeddings
+from generate_keywords import (
+    MODEL_NAME, SIMILARITY_THRESHOLD, keyword_list, get_model, extract_keywords_batch, rank_keywords
+)
+
+FILLER = "the of and to in a is that for on with as by this from are was it be".split()
+
+
+def synthetic_corpus(count, seed=42):
+    """Textes de longueurs variées (50 à 600 mots) mêlant mots-clés et mots vides."""
+    generator = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = [
+            generator.choice(keyword_list) if generator.random() < 0.1 else generator.choice(FILLER)
+            for _ in range(generator.randint(50, 600))
+        ]
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def load_corpus(path):
+    return [article["full_content"] for article in iter_records(path) if (article.get("full_content") or "").strip()]
+
+
+def legacy_extraction(model, texts, keyword_embeddings):
+    """Implémentation historique : un encodage par article et embeddings torch."""
+    results = []
+    for text in texts:
+        text_embedding = model.encode(text, convert_to_tensor=True)
+        scores = util.cos_sim(text_embedding, keyword_embeddings)[0]
+        results.append(rank_keywords(scores.cpu().numpy(), keyword_list, SIMILARITY_THRESHOLD))
+    return results
+
+
+def throughput(func, count):
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    return duration, count / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="Fichier JSON d'articles (défaut : corpus synthétique)")
+    parser.add_argument("--articles", type=int, default=300, help="Taille du corpus synthétique")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 32, 64])
+    parser.add_argument("--threads", type=int, help="Nombre de threads CPU utilisés par torch")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    texts = load_corpus(args.input) if args.input else synthetic_corpus(args.articles)
+    model = get_model()
+    keyword_embeddings = model.encode(keyword_list, convert_to_tensor=True)
+
+    results = []
+    duration, rate = throughput(lambda: legacy_extraction(model, texts, keyword_embeddings), len(texts))
+    results.append(["historique", "-", f"{duration:.2f}", f"{rate:.1f}"])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        candidate_embeddings = load_candidate_embeddings(model, MODEL_NAME, keyword_list, cache_dir=cache_dir)
+        for batch_size in args.batch_sizes:
+            cache = EmbeddingCache(f"{cache_dir}/embeddings_{batch_size}.npz")
+            for label in ("lots, cache vide", "lots, cache rempli"):
+                duration, rate = throughput(
+                    lambda: extract_keywords_batch(
+                        texts, cache, candidate_embeddings, keyword_list, SIMILARITY_THRESHOLD, batch_size
+                    ),
+                    len(texts)
+                )
+                results.append([label, batch_size, f"{duration:.2f}", f"{rate:.1f}"])
+
+    print(f"{len(texts)} article(s), {torch.get_num_threads()} thread(s) CPU")
+    print_table(["implémentation", "lot", "durée (s)", "articles/s"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark de la recherche plein texte : filtre historique `LIKE '%terme%'`
+contre la route /search (index FULLTEXT, classement par pertinence) sur les
+trois types de contenu.
+
+Le corpus synthétique (vocabulaire à distribution de Zipf) est écrit dans la
+base BENCH_DB_NAME (recréée à partir de schema.sql) avec les identifiants DB_*
+de scripts/.env ; les index FULLTEXT sont construits après le chargement :
+
+    python benchmarks/bench_search.py --sizes 10000 100000 1000000 --runs 50
+"""
+import argparse
+import asyncio
+import random
+import time
+from contextlib import closing
+from datetime import date, timedelta
+
+from common import (
+    use_bench_database, connect_bench_database, reset_bench_database,
+    percentiles, time_calls, print_table
+)
+
+use_bench_database()
+
+from app.database import close_async_pool  # noqa: E402
+from app.search import FULLTEXT_COLUMNS  # noqa: E402
+from app.routes.search_route import search_content  # noqa: E402
+
+INSERT_CHUNK_SIZE = 5000
+SOURCES = [f"source_{i}" for i in range(20)]
+VOCABULARY = [f"term{i}" for i in range(20000)]
+# Poids de Zipf : quelques termes très fréquents, une longue traîne de termes rares
+ZIPF_WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+# Objectif de latence de la recherche (p95, millisecondes)
+TARGET_P95_MS = 100
+
+
+def random_text(rng, words):
+    return " ".join(rng.choices(VOCABULARY, weights=ZIPF_WEIGHTS, k=words))
+
+
+def random_day(rng, today):
+    return today - timedelta(days=rng.randint(0, 365))
+
+
+def populate(connection, articles_count, seed=42):
+    """Insère un corpus synthétique : articles, 1/5 d'articles scientifiques, 1/10 de vidéos."""
+    rng = random.Random(seed)
+    today = date.today()
+    cursor = connection.cursor()
+
+    def insert(query, make_row, count):
+        for start in range(0, count, INSERT_CHUNK_SIZE):
+            rows = [make_row(start + i) for i in range(min(INSERT_CHUNK_SIZE, count - start))]
+            cursor.executemany(query, rows)
+            connection.commit()
+
+    insert(
+        "INSERT INTO articles (title, source, publication_date, summary, full_content, language, link, author, keywords) "
+        "VALUES (%s, %s, %s, %s, %s, 'en', %s, 'bench', %s)",
+        lambda i: (random_text(rng, 8), rng.choice(SOURCES), random_day(rng, today), random_text(rng, 40),
+                   random_text(rng, 300), f"https://example.com/articles/{i}", random_text(rng, 4).replace(" ", ";")),
+        articles_count
+    )
+    insert(
+        "INSERT INTO scientific_articles (title, authors, publication_date, abstract, article_url, source, external_id, keywords) "
+        "VALUES (%s, 'bench', %s, %s, %s, 'arxiv', %s, %s)",
+        lambda i: (random_text(rng, 10), random_day(rng, today), random_text(rng, 150), f"https://example.com/papers/{i}",
+                   f"bench.{i}", random_text(rng, 4).replace(" ", ";")),
+        articles_count // 5
+    )
+    insert(
+        "INSERT INTO videos (title, description, publication_date, source, video_url, channel_name, channel_id, keywords) "
+        "VALUES (%s, %s, %s, 'YouTube', %s, 'channel', 'channel-id', %s)",
+        lambda i: (random_text(rng, 8), random_text(rng, 60), random_day(rng, today), f"https://example.com/videos/{i}",
+                   random_text(rng, 4).replace(" ", ";")),
+        articles_count // 10
+    )
+    cursor.close()
+
+
+def rebuild_fulltext_indexes(connection, build):
+    """Supprime (build=False) ou construit les index FULLTEXT : un chargement sans index est bien plus rapide."""
+    cursor = connection.cursor()
+    for table_name, columns in FULLTEXT_COLUMNS.items():
+        if build:
+            cursor.execute(f"ALTER TABLE {table_name} ADD FULLTEXT INDEX ft_{table_name} ({', '.join(columns)})")
+        else:
+            cursor.execute(f"ALTER TABLE {table_name} DROP INDEX ft_{table_name}")
+    connection.commit()
+    cursor.close()
+
+
+def legacy_search(connection, term, limit):
+    """Reproduction du filtre historique : `LIKE '%terme%'` sur chaque table, sans classement."""
+    with closing(connection.cursor(dictionary=True)) as cursor:
+        for table_name, columns in FULLTEXT_COLUMNS.items():
+            clause = " OR ".join(f"{column} LIKE %s" for column in columns)
+            cursor.execute(
+                f"SELECT id, title, publication_date FROM {table_name} WHERE {clause} "
+                f"ORDER BY publication_date DESC LIMIT %s",
+                [f"%{term}%"] * len(columns) + [limit]
+            )
+            cursor.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-legacy", action="store_true", help="Ne pas mesurer le filtre LIKE (lent sur un gros corpus)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    loop = asyncio.new_event_loop()
+    results = []
+    for size in args.sizes:
+        print(f"Préparation d'un corpus de {size} articles...")
+        reset_bench_database()
+        with closing(connect_bench_database()) as connection:
+            rebuild_fulltext_indexes(connection, build=False)
+            populate(connection, size)
+            start = time.perf_counter()
+            rebuild_fulltext_indexes(connection, build=True)
+            print(f"Index FULLTEXT construits en {time.perf_counter() - start:.1f} s")
+
+            # Requêtes d'un à trois termes de fréquence moyenne, tirées au hasard à chaque appel
+            def next_query():
+                return " ".join(rng.sample(VOCABULARY[50:2000], rng.randint(1, 3)))
+
+            if not args.skip_legacy:
+                legacy = time_calls(lambda: legacy_search(connection, next_query().split()[0], args.limit), args.runs)
+                p50, p95 = percentiles(legacy)
+                results.append([size, "LIKE '%terme%'", f"{p50:.1f}", f"{p95:.1f}", "-"])
+
+        async def fulltext_search():
+            try:
+                await search_content(q=next_query(), types=None, start_date=None, end_date=None, limit=args.limit, user=None)
+            except Exception as e:
+                # Une requête sans résultat (404) reste une mesure valide
+                if getattr(e, "status_code", None) != 404:
+                    raise
+
+        current = time_calls(lambda: loop.run_until_complete(fulltext_search()), args.runs)
+        p50, p95 = percentiles(current)
+        verdict = "ok" if p95 < TARGET_P95_MS else "au-delà"
+        results.append([size, "FULLTEXT /search", f"{p50:.1f}", f"{p95:.1f}", verdict])
+
+    loop.run_until_complete(close_async_pool())
+    loop.close()
+    print_table(["articles", "implémentation", "p50 (ms)", "p95 (ms)", f"p95 < {TARGET_P95_MS} ms"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark des backends de résumé : qualité (ROUGE-1/2/L F1 contre les résumés
+existants), latence et pic de mémoire (RSS) de chaque backend.
+
+Chaque backend s'exécute dans son propre processus pour que le pic de RSS
+mesuré soit le sien. Les articles de référence sont lus dans un fichier JSONL
+ou JSON (champs full_content et summary), éventuellement filtrés par source :
+
+    python benchmarks/bench_summarizers.py --input articles.jsonl --limit 50
+    python benchmarks/bench_summarizers.py --input articles.jsonl --source TechCrunch --backends distilbart textrank
+"""
+import argparse
+import multiprocessing
+import re
+import resource
+import time
+from collections import Counter
+
+from common import print_table
+
+from jsonl_io import iter_records
+from summarization_engine import summary_max_length
+from summarizers import BACKENDS, get_summarizer
+
+MISSING_SUMMARIES = (None, "", "No summary available.")
+
+
+def tokenize(text):
+    return re.findall(r"\w+", (text or "").lower())
+
+
+def f1(overlap, candidate_count, reference_count):
+    if not overlap:
+        return 0.0
+    precision = overlap / candidate_count
+    recall = overlap / reference_count
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(candidate, reference, n):
+    candidate_ngrams = Counter(zip(*(candidate[i:] for i in range(n))))
+    reference_ngrams = Counter(zip(*(reference[i:] for i in range(n))))
+    overlap = sum((candidate_ngrams & reference_ngrams).values())
+    return f1(overlap, sum(candidate_ngrams.values()), sum(reference_ngrams.values()))
+
+
+def rouge_l(candidate, reference):
+    previous = [0] * (len(reference) + 1)
+    for token in candidate:
+        current = [0]
+        for j, reference_token in enumerate(reference):
+            current.append(previous[j] + 1 if token == reference_token else max(previous[j + 1], current[j]))
+        previous = current
+    return f1(previous[-1], len(candidate), len(reference))
+
+
+def rouge_scores(candidates, references):
+    """Moyennes des F1 ROUGE-1, ROUGE-2 et ROUGE-L."""
+    totals = [0.0, 0.0, 0.0]
+    for candidate, reference in zip(candidates, references):
+        candidate_tokens, reference_tokens = tokenize(candidate), tokenize(reference)
+        totals[0] += rouge_n(candidate_tokens, reference_tokens, 1)
+        totals[1] += rouge_n(candidate_tokens, reference_tokens, 2)
+        totals[2] += rouge_l(candidate_tokens, reference_tokens)
+    return [total / len(references) for total in totals] if references else totals
+
+
+def run_backend(name, texts, queue):
+    """Processus fils : résume `texts` et renvoie (résumés, durée en s, pic de RSS en Mo)."""
+    summarizer = get_summarizer(name)
+    max_lengths = [summary_max_length(len(text.split())) for text in texts]
+    # Un premier résumé charge le modèle : il n'entre pas dans la mesure de latence
+    summarizer.summarize(texts[:1], max_lengths[:1])
+    start = time.perf_counter()
+    summaries = summarizer.summarize(texts, max_lengths)
+    duration = time.perf_counter() - start
+    queue.put((summaries, duration, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def measure(name, texts):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=run_backend, args=(name, texts, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def load_references(path, source, limit):
+    selected = [
+        article for article in iter_records(path)
+        if (article.get("full_content") or "").strip() and article.get("summary") not in MISSING_SUMMARIES
+        and (source is None or article.get("source") == source)
+    ]
+    return selected[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", required=True, help="Fichier JSON d'articles déjà résumés")
+    parser.add_argument("--source", help="Ne garder que les articles de cette source")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    args = parser.parse_args()
+
+    articles = load_references(args.input, args.source, args.limit)
+    if not articles:
+        print("Aucun article avec contenu et résumé de référence.")
+        return
+    texts = [article["full_content"] for article in articles]
+    references = [article["summary"] for article in articles]
+
+    results = []
+    for name in args.backends:
+        summaries, duration, peak_rss = measure(name, texts)
+        rouge_1, rouge_2, rouge_long = rouge_scores([summary or "" for summary in summaries], references)
+        results.append([
+            name, f"{rouge_1:.3f}", f"{rouge_2:.3f}", f"{rouge_long:.3f}",
+            f"{duration * 1000 / len(texts):.0f}", f"{len(texts) / duration:.2f}", f"{peak_rss:.0f}"
+        ])
+
+    print(f"{len(texts)} article(s){f' de {args.source}' if args.source else ''}")
+    print_table(["backend", "ROUGE-1", "ROUGE-2", "ROUGE-L", "ms/article", "articles/s", "pic RSS (Mo)"], results)
+
+
+if __name__ == "__main__":
+    main()
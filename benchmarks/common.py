@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import statistics
+import mysql.connector
+from dotenv import load_dotenv
+
+# Racine du dépôt (pour importer `app` et les modules du dossier scripts)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SCRIPTS_DIR = os.path.join(PROJECT_ROOT, "scripts")
+for path in (PROJECT_ROOT, SCRIPTS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+load_dotenv(os.path.join(SCRIPTS_DIR, ".env"))
+
+# Base dédiée aux benchmarks : elle est recréée à partir de schema.sql, jamais la base de production
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "veille_ia_bench")
+
+
+def use_bench_database():
+    """Redirige la configuration de l'API (app.database) vers la base de benchmark avant son import."""
+    os.environ["DB_NAME"] = BENCH_DB_NAME
+
+
+def connect_bench_database(database=BENCH_DB_NAME):
+    """Ouvre une connexion MySQL sur la base de benchmark (ou sur le serveur si database=None)."""
+    return mysql.connector.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=database
+    )
+
+
+def split_sql_script(script):
+    """Découpe un script SQL en instructions, en ignorant les ';' des chaînes et des commentaires."""
+    statements = []
+    current = []
+    quote = None
+    i = 0
+    while i < len(script):
+        char = script[i]
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = None
+        elif char in ("'", '"', "`"):
+            quote = char
+            current.append(char)
+        elif script.startswith("--", i):
+            end = script.find("\n", i)
+            i = len(script) if end == -1 else end
+            continue
+        elif char == ";":
+            statement = "".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+        else:
+            current.append(char)
+        i += 1
+
+    statement = "".join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def reset_bench_database():
+    """Recrée la base de benchmark avec le schéma du dépôt (schema.sql)."""
+    connection = connect_bench_database(database=None)
+    cursor = connection.cursor()
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{BENCH_DB_NAME}`")
+    cursor.execute(f"USE `{BENCH_DB_NAME}`")
+
+    with open(os.path.join(PROJECT_ROOT, "schema.sql"), encoding="utf-8") as f:
+        for statement in split_sql_script(f.read()):
+            cursor.execute(statement)
+    connection.commit()
+    cursor.close()
+    connection.close()
+
+
+def percentiles(samples):
+    """Retourne (p50, p95) en millisecondes d'une liste de durées en secondes."""
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    if len(samples_ms) == 1:
+        return samples_ms[0], samples_ms[0]
+    cut_points = statistics.quantiles(samples_ms, n=100, method="inclusive")
+    return cut_points[49], cut_points[94]
+
+
+def time_calls(func, runs, warmup=2):
+    """Mesure `runs` appels de `func` après quelques appels de chauffe ; retourne les durées en secondes."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def print_table(headers, rows):
+    """Affiche un tableau texte aligné."""
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for line in [headers] + rows:
+        print("  ".join(str(value).rjust(width) for value, width in zip(line, widths)))
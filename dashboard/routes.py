@@ -165,44 +165,20 @@ def resources():
     resources_data = {"videos": [], "articles": [], "scientific_articles": []}
 
     try:
-        # Récupérer toutes les vidéos disponibles
-        response = requests.get(f"{API_URL}/videos", headers=headers)
+        # Récupérer la vidéo la plus récente de chaque chaîne
+        response = requests.get(f"{API_URL}/videos/latest", headers=headers)
         if response.status_code == 200:
-            all_videos = format_dates(response.json())
+            resources_data["videos"] = format_dates(response.json())
 
-            # Sélectionner la vidéo la plus récente par chaîne
-            latest_videos = {}
-            for video in all_videos:
-                channel = video["source"]
-                if channel not in latest_videos or video["publication_date"] > latest_videos[channel]["publication_date"]:
-                    latest_videos[channel] = video
-
-            resources_data["videos"] = list(latest_videos.values())
-
-        # Récupérer tous les articles disponibles
-        response_articles = requests.get(f"{API_URL}/articles", headers=headers)
+        # Récupérer l'article le plus récent de chaque source
+        response_articles = requests.get(f"{API_URL}/articles/latest", headers=headers)
         if response_articles.status_code == 200:
-            all_articles = format_dates(response_articles.json())
-
-            # Sélectionner l'article le plus récent par source
-            latest_articles = {}
-            for article in all_articles:
-                source = article["source"]
-                if source not in latest_articles or article["publication_date"] > latest_articles[source]["publication_date"]:
-                    latest_articles[source] = article
-
-            resources_data["articles"] = list(latest_articles.values())
+            resources_data["articles"] = format_dates(response_articles.json())
 
         # Récupérer les 5 derniers articles scientifiques
-        response_scientific_articles = requests.get(f"{API_URL}/scientific-articles", headers=headers)
+        response_scientific_articles = requests.get(f"{API_URL}/scientific-articles/latest", headers=headers)
         if response_scientific_articles.status_code == 200:
-            all_scientific_articles = format_dates(response_scientific_articles.json())
-
-            # Trier par date de publication (en ordre décroissant)
-            sorted_scientific_articles = sorted(all_scientific_articles, key=lambda x: x["publication_date"], reverse=True)
-
-            # Récupérer les 5 derniers
-            resources_data["scientific_articles"] = sorted_scientific_articles[:5]
+            resources_data["scientific_articles"] = format_dates(response_scientific_articles.json())
 
     except requests.exceptions.RequestException:
         flash("Erreur de connexion au serveur.", "danger")
@@ -217,11 +193,12 @@ def search():
     if not headers:
         return redirect(url_for("main.login"))
 
-    search_results = {"articles": [], "scientific_articles": [], "videos": []}
+    search_results = {"articles": [], "scientific_articles": [], "videos": [], "fulltext": []}
 
     if request.method == "POST":
         # Récupération des critères
-        search_type = request.form.get("search_type")  # articles, scientific_articles ou videos
+        search_type = request.form.get("search_type")  # fulltext, articles, scientific_articles ou videos
+        text = request.form.get("text", "").strip()
         source = request.form.get("source", "").strip()
         keywords = request.form.get("keywords", "").strip()
         authors = request.form.get("authors", "").strip()
@@ -231,7 +208,19 @@ def search():
         params = {"keywords": keywords, "start_date": start_date, "end_date": end_date}
 
         try:
-            if search_type == "articles":
+            if search_type == "fulltext":
+                # Recherche plein texte dans les trois types de contenu, classée par pertinence
+                if text:
+                    search_params = {"q": text, "start_date": start_date, "end_date": end_date}
+                    response = requests.get(f"{API_URL}/search", headers=headers, params=search_params)
+                    if response.status_code == 200:
+                        search_results["fulltext"] = format_dates(response.json())
+                else:
+                    flash("Saisissez un ou plusieurs termes à rechercher.", "warning")
+
+            elif search_type == "articles":
+                if text:
+                    params["q"] = text
                 if source:
                     params["source"] = source
                 response = requests.get(f"{API_URL}/articles", headers=headers, params=params)
@@ -239,6 +228,8 @@ def search():
                     search_results["articles"] = format_dates(response.json())
 
             elif search_type == "scientific_articles":
+                if text:
+                    params["q"] = text
                 if authors:
                     params["authors"] = authors
                 response = requests.get(f"{API_URL}/scientific-articles", headers=headers, params=params)
@@ -4,6 +4,15 @@ SET FOREIGN_KEY_CHECKS = 0;
 -- Supprimer les tables si elles existent déjà, dans l'ordre inverse des dépendances
 DROP TABLE IF EXISTS user_preferences;
 DROP TABLE IF EXISTS password_reset_tokens;
+DROP TABLE IF EXISTS keyword_daily_counts;
+DROP TABLE IF EXISTS cache_generation;
+DROP TABLE IF EXISTS dashboard_snapshots;
+DROP TABLE IF EXISTS pipeline_watermarks;
+DROP TABLE IF EXISTS related_content;
+DROP TABLE IF EXISTS article_keywords;
+DROP TABLE IF EXISTS video_keywords;
+DROP TABLE IF EXISTS scientific_article_keywords;
+DROP TABLE IF EXISTS keywords;
 DROP TABLE IF EXISTS articles;
 DROP TABLE IF EXISTS videos;
 DROP TABLE IF EXISTS scientific_articles;
@@ -36,7 +45,11 @@ CREATE TABLE articles (
   author VARCHAR(255),
   keywords TEXT,
   full_content LONGTEXT,
-  CONSTRAINT unique_link UNIQUE (link)
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT unique_link UNIQUE (link),
+  INDEX idx_articles_publication (publication_date, id),
+  INDEX idx_articles_updated (updated_at),
+  FULLTEXT INDEX ft_articles (title, summary, full_content, keywords)
 );
 
 -- Création de la table 'videos'
@@ -50,7 +63,11 @@ CREATE TABLE videos (
   channel_id VARCHAR(255),
   channel_name VARCHAR(255),
   keywords TEXT,
-  UNIQUE(video_url)
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  UNIQUE(video_url),
+  INDEX idx_videos_publication (publication_date, id),
+  INDEX idx_videos_updated (updated_at),
+  FULLTEXT INDEX ft_videos (title, description, keywords)
 );
 
 -- Création de la table 'scientific_articles'
@@ -64,7 +81,94 @@ CREATE TABLE scientific_articles (
   source VARCHAR(50) NOT NULL,
   external_id VARCHAR(255) NOT NULL,
   keywords TEXT,
-  CONSTRAINT unique_article UNIQUE (source, external_id)
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  CONSTRAINT unique_article UNIQUE (source, external_id),
+  INDEX idx_scientific_articles_publication (publication_date, id),
+  INDEX idx_scientific_articles_updated (updated_at),
+  FULLTEXT INDEX ft_scientific_articles (title, abstract, keywords)
+);
+
+-- Création du dictionnaire des mots-clés
+CREATE TABLE keywords (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(255) NOT NULL,
+  CONSTRAINT unique_keyword_name UNIQUE (name)
+);
+
+-- Création des tables de liaison entre contenus et mots-clés
+CREATE TABLE article_keywords (
+  article_id INT NOT NULL,
+  keyword_id INT NOT NULL,
+  PRIMARY KEY (article_id, keyword_id),
+  INDEX idx_article_keywords_keyword (keyword_id, article_id),
+  FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
+  FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE
+);
+
+CREATE TABLE video_keywords (
+  video_id INT NOT NULL,
+  keyword_id INT NOT NULL,
+  PRIMARY KEY (video_id, keyword_id),
+  INDEX idx_video_keywords_keyword (keyword_id, video_id),
+  FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
+  FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE
+);
+
+CREATE TABLE scientific_article_keywords (
+  scientific_article_id INT NOT NULL,
+  keyword_id INT NOT NULL,
+  PRIMARY KEY (scientific_article_id, keyword_id),
+  INDEX idx_scientific_article_keywords_keyword (keyword_id, scientific_article_id),
+  FOREIGN KEY (scientific_article_id) REFERENCES scientific_articles(id) ON DELETE CASCADE,
+  FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE
+);
+
+-- Cumul quotidien des mots-clés par type de contenu (tendances et métriques)
+CREATE TABLE keyword_daily_counts (
+  day DATE NOT NULL,
+  keyword VARCHAR(255) NOT NULL,
+  content_type VARCHAR(30) NOT NULL,
+  count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (content_type, day, keyword),
+  INDEX idx_keyword_daily_counts_keyword (content_type, keyword, day)
+);
+
+-- Génération des données, incrémentée à chaque ingestion pour invalider le cache de l'API
+CREATE TABLE cache_generation (
+  id TINYINT PRIMARY KEY,
+  generation BIGINT NOT NULL DEFAULT 0
+);
+
+-- Tableaux de bord précalculés, partagés par les utilisateurs aux préférences identiques
+CREATE TABLE dashboard_snapshots (
+  preferences_hash CHAR(64) NOT NULL,
+  limit_count INT NOT NULL,
+  days_range INT NOT NULL,
+  generation BIGINT NOT NULL,
+  payload LONGTEXT NOT NULL,
+  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (preferences_hash, limit_count, days_range)
+);
+
+-- Repères des étapes du pipeline (dernière date de publication, dernier id, début de la dernière exécution réussie)
+CREATE TABLE pipeline_watermarks (
+  stage VARCHAR(50) NOT NULL,
+  scope VARCHAR(255) NOT NULL,
+  last_publication_date DATE,
+  last_id INT NOT NULL DEFAULT 0,
+  last_run_at DATETIME,
+  PRIMARY KEY (stage, scope)
+);
+
+-- Contenus similaires précalculés après chaque ingestion (scripts/build_related_content.py)
+CREATE TABLE related_content (
+  content_type VARCHAR(32) NOT NULL,
+  content_id INT NOT NULL,
+  rank_position TINYINT NOT NULL,
+  related_type VARCHAR(32) NOT NULL,
+  related_id INT NOT NULL,
+  score FLOAT NOT NULL,
+  PRIMARY KEY (content_type, content_id, rank_position)
 );
 
 -- Création de la table 'user_preferences'
@@ -103,7 +207,10 @@ CREATE TABLE monitoring_logs (
   -- Champs pour articles scientifiques
   scientific_articles_count INT,
   empty_abstracts_count INT,
-  average_keywords_per_scientific_article FLOAT
+  average_keywords_per_scientific_article FLOAT,
+
+  -- Une exécution de script n'est chargée qu'une fois (INSERT IGNORE de scripts/insert_json.py)
+  CONSTRAINT unique_monitoring_entry UNIQUE (timestamp, script)
 );
 
 -- Insertion d'un utilisateur de test
@@ -159,6 +266,45 @@ VALUES (
   'RAG;QA;NLP'
 );
 
+-- Insertion des mots-clés normalisés des contenus de test
+INSERT INTO keywords (name)
+VALUES ('AI'), ('Technology'), ('2025'), ('Generative AI'), ('Deep Learning'),
+       ('Trends'), ('RAG'), ('QA'), ('NLP');
+
+INSERT INTO article_keywords (article_id, keyword_id)
+SELECT 1, id FROM keywords WHERE name IN ('AI', 'Technology', '2025');
+
+INSERT INTO video_keywords (video_id, keyword_id)
+SELECT 1, id FROM keywords WHERE name IN ('Generative AI', 'Deep Learning', 'Trends');
+
+INSERT INTO scientific_article_keywords (scientific_article_id, keyword_id)
+SELECT 1, id FROM keywords WHERE name IN ('RAG', 'QA', 'NLP');
+
+-- Cumul quotidien initial des mots-clés de test
+INSERT INTO keyword_daily_counts (day, keyword, content_type, count)
+SELECT a.publication_date, k.name, 'articles', COUNT(*)
+FROM articles a
+JOIN article_keywords ak ON ak.article_id = a.id
+JOIN keywords k ON k.id = ak.keyword_id
+GROUP BY a.publication_date, k.name;
+
+INSERT INTO keyword_daily_counts (day, keyword, content_type, count)
+SELECT v.publication_date, k.name, 'videos', COUNT(*)
+FROM videos v
+JOIN video_keywords vk ON vk.video_id = v.id
+JOIN keywords k ON k.id = vk.keyword_id
+GROUP BY v.publication_date, k.name;
+
+INSERT INTO keyword_daily_counts (day, keyword, content_type, count)
+SELECT s.publication_date, k.name, 'scientific_articles', COUNT(*)
+FROM scientific_articles s
+JOIN scientific_article_keywords sk ON sk.scientific_article_id = s.id
+JOIN keywords k ON k.id = sk.keyword_id
+GROUP BY s.publication_date, k.name;
+
+-- Génération initiale du cache
+INSERT INTO cache_generation (id, generation) VALUES (1, 0);
+
 -- Insertion d’un log de monitoring
 INSERT INTO monitoring_logs (
   timestamp, script, duration_seconds,
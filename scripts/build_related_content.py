@@ -0,0 +1,203 @@
+"""
+Précalcule les contenus similaires (routes /articles/{id}/related,
+/scientific-articles/{id}/related, /videos/{id}/related) à partir de l'index
+vectoriel, après sa construction :
+
+    python scripts/build_related_content.py          # contenus touchés depuis le dernier calcul
+    python scripts/build_related_content.py --full   # recalcul complet
+
+Les voisins sont exacts (similarité cosinus sur toute la matrice d'embeddings,
+top-k par argpartition). Sont recalculés : les contenus nouveaux ou modifiés,
+ceux dont un voisin a été supprimé, et ceux dont un contenu nouveau ou modifié
+devient plus proche que leur k-ième voisin enregistré.
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import numpy as np
+import mysql.connector
+from dotenv import load_dotenv
+
+# Rend les modules partagés du dossier scripts, et le paquet app, importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+for path in (SCRIPTS_DIR, PROJECT_ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from watermarks import load_watermarks, save_watermarks, database_now, changed_rows_condition, advance
+from app.vector_index import CONTENT_TYPES, load_current_index, exact_top_k, max_similarity
+from app.related import RELATED_CONTENT_TOP_K
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Contenus dont les voisins sont calculés puis écrits ensemble
+RELATED_CHUNK_SIZE = int(os.getenv("RELATED_CHUNK_SIZE", 1024))
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def connect_to_database():
+    """Établit une connexion à la base de données MySQL."""
+    return mysql.connector.connect(
+        host=DB_HOST,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME
+    )
+
+
+def index_positions(index):
+    """Ligne de l'index de chaque contenu : {(type, id): ligne}."""
+    return {
+        (CONTENT_TYPES[code], int(content_id)): row
+        for row, (code, content_id) in enumerate(zip(index.content_types, index.content_ids))
+    }
+
+
+def index_rows(positions, pairs):
+    """Lignes de l'index des contenus (type, id) donnés ; ceux absents de l'index sont ignorés."""
+    return np.array(sorted({positions[pair] for pair in pairs if pair in positions}), dtype=np.int64)
+
+
+def changed_contents(cursor, watermarks):
+    """Contenus (type, id) créés ou modifiés depuis le dernier calcul, et plus grand id de chaque table."""
+    pairs = set()
+    max_ids = {}
+    for table_name in CONTENT_TYPES:
+        scope, scope_params = changed_rows_condition(watermarks.get(table_name))
+        cursor.execute(f"SELECT id FROM {table_name} WHERE {scope}", tuple(scope_params))
+        ids = [row["id"] for row in cursor.fetchall()]
+        pairs.update((table_name, content_id) for content_id in ids)
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) AS max_id FROM {table_name}")
+        max_ids[table_name] = cursor.fetchone()["max_id"]
+    return pairs, max_ids
+
+
+def purge_deleted(cursor):
+    """
+    Supprime les listes des contenus supprimés et retourne les contenus
+    (type, id) dont un voisin a été supprimé (à recalculer).
+    """
+    orphans = set()
+    for table_name in CONTENT_TYPES:
+        cursor.execute(
+            f"DELETE r FROM related_content r LEFT JOIN {table_name} c ON c.id = r.content_id "
+            f"WHERE r.content_type = %s AND c.id IS NULL",
+            (table_name,)
+        )
+        cursor.execute(
+            f"SELECT DISTINCT r.content_type, r.content_id FROM related_content r "
+            f"LEFT JOIN {table_name} c ON c.id = r.related_id WHERE r.related_type = %s AND c.id IS NULL",
+            (table_name,)
+        )
+        orphans.update((row["content_type"], row["content_id"]) for row in cursor.fetchall())
+    return orphans
+
+
+def stored_thresholds(cursor, positions, size):
+    """Score du k-ième voisin enregistré de chaque ligne de l'index (-inf si sa liste est incomplète)."""
+    thresholds = np.full(size, -np.inf, dtype=np.float32)
+    cursor.execute(
+        "SELECT content_type, content_id, MIN(score) AS min_score, COUNT(*) AS neighbours "
+        "FROM related_content GROUP BY content_type, content_id"
+    )
+    for row in cursor.fetchall():
+        position = positions.get((row["content_type"], row["content_id"]))
+        if position is not None and row["neighbours"] >= RELATED_CONTENT_TOP_K:
+            thresholds[position] = row["min_score"]
+    return thresholds
+
+
+def related_rows(index, rows, neighbour_rows, neighbour_scores):
+    """Lignes à insérer dans related_content pour les contenus `rows` et leurs voisins."""
+    values = []
+    for row, neighbours, scores in zip(rows, neighbour_rows, neighbour_scores):
+        content = (CONTENT_TYPES[index.content_types[row]], int(index.content_ids[row]))
+        for rank_position, (neighbour, score) in enumerate(zip(neighbours, scores)):
+            if neighbour < 0:
+                break
+            values.append((
+                *content, rank_position,
+                CONTENT_TYPES[index.content_types[neighbour]], int(index.content_ids[neighbour]), float(score)
+            ))
+    return values
+
+
+def write_related(connection, cursor, index, rows, neighbour_rows, neighbour_scores):
+    """Remplace les listes de voisins des contenus `rows` (un commit par lot)."""
+    contents = [(CONTENT_TYPES[index.content_types[row]], int(index.content_ids[row])) for row in rows]
+    placeholders = ", ".join(["(%s, %s)"] * len(contents))
+    cursor.execute(
+        f"DELETE FROM related_content WHERE (content_type, content_id) IN ({placeholders})",
+        [value for content in contents for value in content]
+    )
+    cursor.executemany(
+        "INSERT INTO related_content (content_type, content_id, rank_position, related_type, related_id, score) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        related_rows(index, rows, neighbour_rows, neighbour_scores)
+    )
+    connection.commit()
+
+
+def build_related_content(full=False, top_k=RELATED_CONTENT_TOP_K):
+    """Recalcule les contenus similaires des contenus touchés depuis le dernier calcul (tous si `full`)."""
+    start_time = time.perf_counter()
+    index = load_current_index()
+    if index is None:
+        logging.error("Index vectoriel introuvable : lancez d'abord scripts/build_vector_index.py.")
+        return
+
+    connection = connect_to_database()
+    cursor = connection.cursor(dictionary=True)
+    watermarks = {} if full else load_watermarks(cursor, "related")
+    started_at = database_now(cursor)
+
+    changed, max_ids = changed_contents(cursor, watermarks)
+    orphans = purge_deleted(cursor)
+    connection.commit()
+
+    if full or not watermarks:
+        affected = np.arange(len(index))
+    else:
+        positions = index_positions(index)
+        changed_rows = index_rows(positions, changed)
+        affected = set(changed_rows.tolist()) | set(index_rows(positions, orphans).tolist())
+        # Contenus existants dont un contenu nouveau ou modifié dépasse le k-ième voisin enregistré
+        if len(changed_rows):
+            closest = max_similarity(index.vectors, np.asarray(index.vectors[changed_rows], dtype=np.float32))
+            affected |= set(np.flatnonzero(closest > stored_thresholds(cursor, positions, len(index))).tolist())
+        affected = np.array(sorted(affected), dtype=np.int64)
+
+    for start in range(0, len(affected), RELATED_CHUNK_SIZE):
+        rows = affected[start:start + RELATED_CHUNK_SIZE]
+        queries = np.asarray(index.vectors[rows], dtype=np.float32)
+        neighbour_rows, neighbour_scores = exact_top_k(index.vectors, queries, top_k, exclude=rows)
+        write_related(connection, cursor, index, rows, neighbour_rows, neighbour_scores)
+
+    # Le repère n'avance qu'une fois toutes les listes écrites
+    save_watermarks(cursor, "related", {
+        table_name: advance(watermarks.get(table_name), row_id=max_ids[table_name], run_at=started_at)
+        for table_name in CONTENT_TYPES
+    })
+    connection.commit()
+    cursor.close()
+    connection.close()
+    logging.info(
+        f"Contenus similaires recalculés pour {len(affected)} contenu(s) sur {len(index)} "
+        f"en {time.perf_counter() - start_time:.1f} s."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Recalculer les voisins de tous les contenus")
+    build_related_content(full=parser.parse_args().full)
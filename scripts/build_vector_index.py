@@ -0,0 +1,246 @@
+"""
+Construit l'index vectoriel de la recherche sémantique (route /search/semantic)
+à partir des contenus de la base, après l'insertion :
+
+    python scripts/build_vector_index.py          # contenus créés ou modifiés depuis la dernière construction
+    python scripts/build_vector_index.py --full   # réencodage complet
+
+Les embeddings des articles et articles scientifiques sont ceux calculés par
+l'extraction de mots-clés (cache d'embeddings, même modèle et même texte) ; les
+vecteurs des contenus inchangés sont repris de l'index précédent.
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import numpy as np
+import mysql.connector
+from dotenv import load_dotenv
+
+# Rend les modules partagés du dossier scripts, et le paquet app, importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+for path in (SCRIPTS_DIR, PROJECT_ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from embedding_cache import EmbeddingCache, EMBEDDING_BATCH_SIZE
+from model_client import MODEL_SERVER_URL, RemoteEmbeddingModel
+from watermarks import load_watermarks, save_watermarks, database_now, changed_rows_condition, advance
+from app.vector_index import (
+    VECTOR_INDEX_DIR, CONTENT_TYPES, VectorIndex, build_index, current_version, normalize
+)
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Modèle d'embeddings : celui de l'extraction de mots-clés, dont le cache est réutilisé
+MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Contenus encodés puis écrits ensemble
+VECTOR_CHUNK_SIZE = int(os.getenv("VECTOR_CHUNK_SIZE", 2000))
+
+# Colonnes lues pour chaque type de contenu (voir content_text)
+TEXT_COLUMNS = {
+    "articles": ("title", "summary", "full_content"),
+    "scientific_articles": ("title", "abstract"),
+    "videos": ("title", "description"),
+}
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def connect_to_database():
+    """Établit une connexion à la base de données MySQL."""
+    return mysql.connector.connect(
+        host=DB_HOST,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME
+    )
+
+
+# Chargement paresseux du modèle (une seule fois par processus)
+_model = None
+
+
+def get_model():
+    global _model
+    if _model is None:
+        if MODEL_SERVER_URL:
+            _model = RemoteEmbeddingModel(MODEL_NAME)
+        else:
+            from sentence_transformers import SentenceTransformer
+            logging.info("Chargement du modèle pré-entraîné.")
+            _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
+
+def content_text(content_type, row):
+    """
+    Texte encodé pour un contenu : le même que l'extraction de mots-clés
+    (contenu complet des articles, résumé des articles scientifiques), ce qui
+    permet de relire leurs embeddings dans le cache ; titre et description
+    pour les vidéos.
+    """
+    if content_type == "articles" and (row.get("full_content") or "").strip():
+        return row["full_content"]
+    if content_type == "scientific_articles" and (row.get("abstract") or "").strip():
+        return row["abstract"]
+    second = row.get("summary") if content_type == "articles" else row.get("description")
+    return ". ".join(part.strip() for part in (row.get("title"), second) if part and part.strip())
+
+
+def content_keys(content_types, content_ids):
+    """Clé entière unique (type de contenu, id) : permet les recherches vectorisées dans l'ancien index."""
+    return np.asarray(content_types, dtype=np.int64) << 32 | np.asarray(content_ids, dtype=np.int64)
+
+
+def previous_rows(previous, content_types, content_ids):
+    """Ligne de chaque contenu dans l'index précédent (-1 s'il n'y figure pas)."""
+    rows = np.full(len(content_ids), -1, dtype=np.int64)
+    if previous is None or not len(previous):
+        return rows
+    old_keys = content_keys(previous.content_types, previous.content_ids)
+    order = np.argsort(old_keys)
+    keys = content_keys(content_types, content_ids)
+    positions = np.minimum(np.searchsorted(old_keys, keys, sorter=order), len(order) - 1)
+    found = old_keys[order[positions]] == keys
+    rows[found] = order[positions[found]]
+    return rows
+
+
+def fetch_ids(cursor, table_name):
+    cursor.execute(f"SELECT id FROM {table_name} ORDER BY id")
+    return [row["id"] for row in cursor.fetchall()]
+
+
+def iter_changed_rows(cursor, table_name, watermark, chunk_size=VECTOR_CHUNK_SIZE):
+    """Contenus créés ou modifiés depuis `watermark`, par lots (parcours par id croissant)."""
+    scope, scope_params = changed_rows_condition(watermark)
+    columns = ", ".join(TEXT_COLUMNS[table_name])
+    last_id = 0
+    while True:
+        cursor.execute(
+            f"SELECT id, {columns} FROM {table_name} WHERE id > %s AND {scope} ORDER BY id LIMIT %s",
+            (last_id, *scope_params, chunk_size)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]["id"]
+
+
+def build_vector_index(full=False, root=VECTOR_INDEX_DIR):
+    """
+    Reconstruit l'index vectoriel : seuls les contenus nouveaux ou modifiés
+    depuis la dernière construction réussie sont (ré)encodés, sauf si `full`
+    ou si le modèle a changé ; les contenus supprimés disparaissent de l'index.
+    """
+    start_time = time.perf_counter()
+    connection = connect_to_database()
+    cursor = connection.cursor(dictionary=True)
+
+    version = current_version(root)
+    previous = VectorIndex(os.path.join(root, version)) if version else None
+    if previous is not None and previous.model_name != MODEL_NAME:
+        logging.info(f"Index construit avec {previous.model_name} : réencodage complet.")
+        previous = None
+    watermarks = {} if full or previous is None else load_watermarks(cursor, "vectors")
+    started_at = database_now(cursor)
+
+    # Contenus présents dans la base, dans l'ordre (type, id)
+    content_types = []
+    content_ids = []
+    max_ids = {}
+    for code, table_name in enumerate(CONTENT_TYPES):
+        ids = fetch_ids(cursor, table_name)
+        content_types.extend([code] * len(ids))
+        content_ids.extend(ids)
+        max_ids[table_name] = ids[-1] if ids else 0
+    content_types = np.asarray(content_types, dtype=np.int8)
+    content_ids = np.asarray(content_ids, dtype=np.int64)
+    if not len(content_ids):
+        logging.info("Aucun contenu à indexer.")
+        cursor.close()
+        connection.close()
+        return
+
+    old_rows = previous_rows(previous, content_types, content_ids)
+    keys = content_keys(content_types, content_ids)
+    cache = EmbeddingCache.for_model(MODEL_NAME)
+    os.makedirs(root, exist_ok=True)
+    staging_path = os.path.join(root, "staging.npy")
+    staging = None
+    encoded = 0
+    filled = np.zeros(len(content_ids), dtype=bool)
+
+    try:
+        # Contenus nouveaux ou modifiés : embeddings du cache ou encodés par lots
+        for code, table_name in enumerate(CONTENT_TYPES):
+            for rows in iter_changed_rows(cursor, table_name, watermarks.get(table_name)):
+                texts = [content_text(table_name, row) for row in rows]
+                vectors = normalize(cache.embed(get_model(), texts, EMBEDDING_BATCH_SIZE))
+                if staging is None:
+                    staging = np.lib.format.open_memmap(
+                        staging_path, mode="w+", dtype=np.float16, shape=(len(content_ids), vectors.shape[1])
+                    )
+                positions = np.searchsorted(keys, content_keys([code] * len(rows), [row["id"] for row in rows]))
+                staging[positions] = vectors
+                filled[positions] = True
+                encoded += len(rows)
+
+        # Contenus inchangés : vecteurs repris de l'index précédent
+        reused = ~filled & (old_rows >= 0)
+        if staging is None and reused.all() and len(previous) == len(content_ids):
+            logging.info("Aucun contenu nouveau, modifié ou supprimé : l'index courant est conservé.")
+            filled |= reused
+        elif staging is None:
+            staging = np.lib.format.open_memmap(
+                staging_path, mode="w+", dtype=np.float16, shape=(len(content_ids), previous.vectors.shape[1])
+            )
+        if staging is not None:
+            for start in range(0, len(content_ids), VECTOR_CHUNK_SIZE):
+                block = np.flatnonzero(reused[start:start + VECTOR_CHUNK_SIZE]) + start
+                if len(block):
+                    staging[block] = previous.vectors[old_rows[block]]
+            filled |= reused
+
+            # Un contenu absent de l'index précédent et hors du périmètre modifié est ignoré jusqu'au prochain --full
+            if not filled.all():
+                logging.warning(f"{int((~filled).sum())} contenu(s) sans embedding ignoré(s).")
+            staging.flush()
+            vectors = staging if filled.all() else staging[filled]
+            build_index(vectors, content_types[filled], content_ids[filled], MODEL_NAME, root=root)
+            del vectors
+    finally:
+        del staging
+        if os.path.exists(staging_path):
+            os.remove(staging_path)
+    cache.save()
+
+    # Les repères n'avancent qu'une fois le nouvel index publié
+    save_watermarks(cursor, "vectors", {
+        table_name: advance(watermarks.get(table_name), row_id=max_ids[table_name], run_at=started_at)
+        for table_name in CONTENT_TYPES
+    })
+    connection.commit()
+    cursor.close()
+    connection.close()
+    logging.info(
+        f"Index vectoriel : {int(filled.sum())} contenu(s), {encoded} (ré)encodé(s) ou relu(s) dans le cache, "
+        f"en {time.perf_counter() - start_time:.1f} s."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Réencoder tous les contenus")
+    build_vector_index(full=parser.parse_args().full)
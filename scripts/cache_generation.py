@@ -0,0 +1,11 @@
+def bump_cache_generation(cursor):
+    """
+    Incrémente la génération des données lue par le cache de l'API.
+
+    À appeler dans la transaction qui modifie les contenus : les réponses
+    mises en cache avec l'ancienne génération ne sont plus servies.
+    """
+    cursor.execute(
+        "INSERT INTO cache_generation (id, generation) VALUES (1, 1) "
+        "ON DUPLICATE KEY UPDATE generation = generation + 1"
+    )
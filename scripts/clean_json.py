@@ -1,9 +1,16 @@
 import os
 import re
-import json
+import sys
 import logging
 from bs4 import BeautifulSoup
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from jsonl_io import JsonlWriter, iter_records
+
 # Configuration simple du logging affiché dans le terminal
 logging.basicConfig(
     level=logging.INFO,
@@ -38,26 +45,22 @@ def clean_text(text):
 
 
 def clean_json_file(file_path, fields_to_clean):
-    """Nettoie les champs textuels dans un fichier JSON donné."""
+    """Nettoie les champs textuels d'un fichier JSONL, réécrit enregistrement par enregistrement."""
     modified_count = 0  # Compteur des modifications
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-
-        for entry in data:
-            # Nettoyage des champs spécifiques à chaque fichier
-            for field in fields_to_clean:
-                if field in entry and entry[field]:
-                    cleaned_text = clean_text(entry[field])
-                    if cleaned_text != entry[field]:
-                        entry[field] = cleaned_text
-                        modified_count += 1
-                        logging.info(f"Texte nettoyé pour l'ID {entry.get('id', 'inconnu')} dans le champ '{field}'.")
-
-        # Réécriture du fichier avec les données nettoyées
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=4)
+        # Le fichier nettoyé remplace l'original une fois entièrement écrit
+        with JsonlWriter(file_path) as writer:
+            for entry in iter_records(file_path):
+                # Nettoyage des champs spécifiques à chaque fichier
+                for field in fields_to_clean:
+                    if field in entry and entry[field]:
+                        cleaned_text = clean_text(entry[field])
+                        if cleaned_text != entry[field]:
+                            entry[field] = cleaned_text
+                            modified_count += 1
+                            logging.info(f"Texte nettoyé pour l'ID {entry.get('id', 'inconnu')} dans le champ '{field}'.")
+                writer.write(entry)
 
         logging.info(f"Nettoyage terminé pour le fichier '{file_path}'. Total des éléments modifiés : {modified_count}")
 
@@ -66,11 +69,11 @@ def clean_json_file(file_path, fields_to_clean):
 
 
 def clean_all_json_files():
-    """Nettoie tous les fichiers JSON des articles, vidéos et arxiv_articles."""
+    """Nettoie tous les fichiers JSONL des articles, vidéos et arxiv_articles."""
     files_info = {
-        "articles.json": ['summary', 'full_content'],
-        "videos.json": ['description'],
-        "arxiv_articles.json": ['abstract']
+        "articles.jsonl": ['summary', 'full_content'],
+        "videos.jsonl": ['description'],
+        "arxiv_articles.jsonl": ['abstract']
     }
 
     for json_file, fields_to_clean in files_info.items():
@@ -1,37 +1,252 @@
+"""
+Orchestrateur du pipeline : les étapes sont déclarées avec leurs dépendances
+et exécutées dès que celles-ci ont réussi, les étapes indépendantes en
+parallèle. La durée totale tend ainsi vers celle de la plus longue chaîne de
+dépendances (chemin critique), affichée en fin d'exécution :
+
+    python scripts/data_pipeline_runner.py
+    python scripts/data_pipeline_runner.py --only insert dump cleanup --full
+"""
 import os
 import sys
-import subprocess
+import time
+import asyncio
+import argparse
+
+# Dossier des scripts d'étape ; ils s'exécutent dans le répertoire courant (fichiers JSONL du pipeline)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Interpréteur des étapes : celui qui exécute l'orchestrateur, sauf indication contraire
+PIPELINE_PYTHON = os.getenv("PIPELINE_PYTHON", sys.executable)
 
-# Force l'utilisation de l'exécutable Python de l'environnement virtuel
-sys.executable = r'C:\Users\NoémieRondel\OneDrive - talan.com\Certification\Projet final\Projet Veille IA\aimonitor\Scripts\python.exe'
+# Nombre maximal d'étapes exécutées simultanément
+PIPELINE_MAX_PARALLEL = int(os.getenv("PIPELINE_MAX_PARALLEL", 4))
 
 
-def run_script(script_name):
+class Stage:
     """
-    Exécute un script Python donné et gère les erreurs.
+    Étape du pipeline : un script du dossier scripts et ses dépendances.
+
+    Une étape `optional` en échec ne bloque pas ses dépendantes (elles
+    s'exécutent sans ses données) ; `supports_full` transmet `--full` au script.
     """
-    try:
-        print(f"=== Exécution de {script_name} ===")
-        subprocess.run([sys.executable, script_name], check=True)
-        print(f"=== {script_name} terminé avec succès ===\n")
-    except subprocess.CalledProcessError as e:
-        print(f"!!! Erreur lors de l'exécution de {script_name}. Le processus est arrêté. !!!\n{e}")
-        exit(1)
 
+    def __init__(self, name, script, args=(), depends_on=(), retries=0, retry_delay=5.0,
+                 optional=False, supports_full=False):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        self.depends_on = list(depends_on)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.optional = optional
+        self.supports_full = supports_full
 
-if __name__ == "__main__":
-    # Change le répertoire de travail pour celui du script actuel
-    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    def command(self, full=False):
+        full_args = ["--full"] if full and self.supports_full else []
+        return [PIPELINE_PYTHON, os.path.join(SCRIPTS_DIR, self.script), *self.args, *full_args]
+
+
+class StageResult:
+    """Issue d'une étape : statut (ok, échec, ignorée), tentatives et instants relatifs au début du pipeline."""
+
+    def __init__(self, name, status, attempts=0, started=0.0, finished=0.0):
+        self.name = name
+        self.status = status
+        self.attempts = attempts
+        self.started = started
+        self.finished = finished
+
+    @property
+    def duration(self):
+        return self.finished - self.started
+
+
+STAGES = [
+    # Collecte : toutes les sources en parallèle (scrape_all), arXiv à part car son échec n'est pas bloquant
+    Stage("scrape", "scrape_all.py", args=["--exclude", "scrape_arxiv_ai"], retries=1),
+    Stage("scrape_arxiv", "scrape_arxiv_ai.py", retries=2, retry_delay=30.0, optional=True),
+    Stage("combine", "generate_json.py", depends_on=["scrape"]),
+    Stage("clean", "clean_json.py", depends_on=["combine", "scrape_arxiv"]),
+    # Quasi-doublons marqués avant l'enrichissement : seul l'article canonique est soumis aux modèles
+    Stage("dedup", "near_duplicates.py", depends_on=["clean"]),
+    # Résumés puis mots-clés réécrivent articles.jsonl ; les articles scientifiques sont traités en parallèle
+    Stage("summaries", "generate_summaries.py", depends_on=["dedup"]),
+    Stage("keywords", "generate_keywords.py", depends_on=["summaries"]),
+    Stage("keywords_scientific", "generate_keywords_scientific_articles.py", depends_on=["clean"]),
+    # Base de données : le dump (mysqldump --single-transaction) lit un instantané cohérent pendant le nettoyage
+    Stage("insert", "insert_json.py", depends_on=["keywords", "keywords_scientific"], retries=1, supports_full=True),
+    Stage("dump", "dump_database.py", depends_on=["insert"], supports_full=True),
+    Stage("cleanup", "database_cleanup.py", depends_on=["insert"], supports_full=True),
+    # Index de la recherche sémantique, construit sur les contenus nettoyés
+    Stage("vectors", "build_vector_index.py", depends_on=["cleanup"], supports_full=True),
+    Stage("related", "build_related_content.py", depends_on=["vectors"], supports_full=True),
+]
+
+
+def topological_order(stages):
+    """Ordre d'exécution compatible avec les dépendances ; ValueError si une dépendance est inconnue ou cyclique."""
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        unknown = [name for name in stage.depends_on if name not in by_name]
+        if unknown:
+            raise ValueError(f"Étape {stage.name} : dépendance(s) inconnue(s) {', '.join(unknown)}.")
+
+    order = []
+    state = {}
+
+    def visit(stage, path):
+        if state.get(stage.name) == "done":
+            return
+        if state.get(stage.name) == "visiting":
+            raise ValueError(f"Dépendance cyclique : {' -> '.join(path + [stage.name])}.")
+        state[stage.name] = "visiting"
+        for name in stage.depends_on:
+            visit(by_name[name], path + [stage.name])
+        state[stage.name] = "done"
+        order.append(stage)
+
+    for stage in stages:
+        visit(stage, [])
+    return order
+
+
+def select_stages(stages, names):
+    """Sous-ensemble d'étapes ; les dépendances hors sélection sont considérées comme satisfaites."""
+    selected = [stage for stage in stages if stage.name in names]
+    return [
+        Stage(stage.name, stage.script, stage.args, [name for name in stage.depends_on if name in names],
+              stage.retries, stage.retry_delay, stage.optional, stage.supports_full)
+        for stage in selected
+    ]
 
-    print("=== Début du pipeline de traitement des données ===\n")
 
-    # Étape 1 : Intégration des JSON dans la base de données
-    run_script("insert_json.py")
+async def run_stage(stage, full, clock_start):
+    """Exécute une étape (avec ses nouvelles tentatives) et retourne son résultat."""
+    started = time.perf_counter() - clock_start
+    attempts = 0
+    returncode = None
+    while attempts <= stage.retries:
+        if attempts:
+            # Attente croissante entre deux tentatives
+            await asyncio.sleep(stage.retry_delay * 2 ** (attempts - 1))
+            print(f"=== Nouvelle tentative de {stage.name} ({attempts}/{stage.retries}) ===")
+        attempts += 1
+        print(f"=== Exécution de {stage.script} ({stage.name}) ===")
+        process = await asyncio.create_subprocess_exec(*stage.command(full))
+        returncode = await process.wait()
+        if returncode == 0:
+            break
 
-    # Étape 2 : Dump de la base de données
-    run_script("dump_database.py")
+    finished = time.perf_counter() - clock_start
+    if returncode == 0:
+        print(f"=== {stage.name} terminé avec succès en {finished - started:.1f} s ===\n")
+        return StageResult(stage.name, "ok", attempts, started, finished)
+    print(f"!!! Erreur lors de l'exécution de {stage.name} (code {returncode}, {attempts} tentative(s)). !!!\n")
+    return StageResult(stage.name, "échec", attempts, started, finished)
 
-    # Étape 3 : Nettoyage de la base de données
-    run_script("database_cleanup.py")
 
+async def run_pipeline(stages, full=False, max_parallel=PIPELINE_MAX_PARALLEL):
+    """
+    Exécute les étapes dès que leurs dépendances sont terminées, au plus
+    `max_parallel` à la fois. Une étape dont une dépendance non optionnelle a
+    échoué n'est pas exécutée (statut « ignorée »).
+
+    :return: {nom: StageResult}
+    """
+    order = topological_order(stages)
+    by_name = {stage.name: stage for stage in stages}
+    results = {}
+    running = {}
+    semaphore = asyncio.Semaphore(max_parallel)
+    clock_start = time.perf_counter()
+
+    async def limited(stage):
+        async with semaphore:
+            return await run_stage(stage, full, clock_start)
+
+    while len(results) < len(order):
+        for stage in order:
+            if stage.name in results or stage.name in running:
+                continue
+            dependencies = [results.get(name) for name in stage.depends_on]
+            if any(result is None for result in dependencies):
+                continue
+            blocking = [
+                result.name for result in dependencies
+                if result.status != "ok" and not (result.status == "échec" and by_name[result.name].optional)
+            ]
+            if blocking:
+                now = time.perf_counter() - clock_start
+                print(f"--- {stage.name} ignorée : dépendance(s) en échec {', '.join(blocking)} ---")
+                results[stage.name] = StageResult(stage.name, "ignorée", 0, now, now)
+                continue
+            running[stage.name] = asyncio.create_task(limited(stage))
+
+        if not running:
+            continue
+        done, _ = await asyncio.wait(running.values(), return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            result = task.result()
+            results[result.name] = result
+            del running[result.name]
+
+    return results
+
+
+def critical_path(stages, results):
+    """Plus longue chaîne de dépendances (en durée d'exécution) : (liste des étapes, durée cumulée)."""
+    longest = {}
+    for stage in topological_order(stages):
+        previous = max(
+            (longest[name] for name in stage.depends_on),
+            key=lambda path: path[1],
+            default=([], 0.0)
+        )
+        longest[stage.name] = (previous[0] + [stage.name], previous[1] + results[stage.name].duration)
+    return max(longest.values(), key=lambda path: path[1], default=([], 0.0))
+
+
+def print_report(stages, results):
+    """Durée de chaque étape, chemin critique et gain du parallélisme."""
+    print("=== Rapport d'exécution ===")
+    for stage in topological_order(stages):
+        result = results[stage.name]
+        print(
+            f"{stage.name:<22} {result.status:<8} début +{result.started:7.1f} s  durée {result.duration:7.1f} s"
+            f"  tentative(s) {result.attempts}"
+        )
+    path, path_duration = critical_path(stages, results)
+    wall_clock = max((result.finished for result in results.values()), default=0.0)
+    total = sum(result.duration for result in results.values())
+    print(f"Chemin critique : {' -> '.join(path)} ({path_duration:.1f} s)")
+    print(f"Durée totale : {wall_clock:.1f} s (somme des étapes : {total:.1f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Retraiter toutes les données (par défaut, seules les nouveautés depuis la dernière exécution réussie)"
+    )
+    parser.add_argument("--only", nargs="+", choices=[stage.name for stage in STAGES], help="Étapes à exécuter")
+    parser.add_argument("--max-parallel", type=int, default=PIPELINE_MAX_PARALLEL)
+    args = parser.parse_args()
+
+    stages = select_stages(STAGES, args.only) if args.only else STAGES
+    print("=== Début du pipeline de traitement des données ===\n")
+    results = asyncio.run(run_pipeline(stages, full=args.full, max_parallel=args.max_parallel))
+    print_report(stages, results)
+
+    failed = [
+        stage.name for stage in stages
+        if results[stage.name].status == "ignorée" or (results[stage.name].status == "échec" and not stage.optional)
+    ]
+    if failed:
+        print(f"!!! Pipeline arrêté : étape(s) en échec ou ignorée(s) {', '.join(failed)}. !!!")
+        sys.exit(1)
     print("=== Pipeline de traitement des données terminé avec succès ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,20 @@
 import os
+import sys
+import time
 import logging
+import argparse
 import mysql.connector
 from mysql.connector import Error
 from dotenv import load_dotenv
-from urllib.parse import urlparse
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from keyword_store import refresh_daily_counts
+from cache_generation import bump_cache_generation
+from watermarks import load_watermarks, save_watermarks, database_now, changed_rows_condition, advance
 
 # Chargement des variables d'environnement
 load_dotenv()
@@ -13,6 +24,21 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
+# Largeur (en identifiants) des plages supprimées puis validées ensemble : borne la durée des verrous
+CLEANUP_BATCH_SIZE = int(os.getenv("CLEANUP_BATCH_SIZE", 5000))
+
+# Champs critiques des articles (rapport d'anomalies et suppression des articles incomplets)
+CRITICAL_FIELDS = ["title", "publication_date", "summary", "full_content", "author"]
+
+# Lien valide : un schéma suivi de « :// » et d'un hôte non vide (équivalent de urlparse scheme + netloc)
+VALID_LINK_PATTERN = "^[A-Za-z][A-Za-z0-9+.-]*://[^/?#]"
+
+# Colonnes historiques des articles, communes à 'articles' et 'irrelevant_articles'
+ARCHIVED_COLUMNS = [
+    "id", "title", "source", "publication_date", "summary",
+    "language", "link", "author", "keywords", "full_content"
+]
+
 
 # Configuration des logs
 logging.basicConfig(
@@ -35,98 +61,190 @@ def connect_to_database():
     )
 
 
-def check_empty_fields(cursor, table, fields):
-    """Vérifie les champs vides dans une table donnée et retourne les anomalies."""
-    anomalies = {}
-    for field in fields:
+def anomaly_report(cursor, watermark=None):
+    """
+    Compte les champs critiques vides des articles modifiés depuis `watermark`
+    en un seul parcours de la table : {champ: nombre d'articles}.
+    """
+    scope, scope_params = changed_rows_condition(watermark)
+    columns = []
+    for field in CRITICAL_FIELDS:
         if "date" in field.lower():  # Vérification spécifique pour les champs de type date
-            query = f"SELECT id FROM {table} WHERE {field} IS NULL;"
+            empty = f"{field} IS NULL"
         else:
-            query = f"SELECT id FROM {table} WHERE {field} IS NULL OR {field} = '';"
-        cursor.execute(query)
-        anomalies[field] = cursor.fetchall()
-    return anomalies
-
-
-def delete_invalid_links(cursor):
-    """Supprime les articles avec des liens invalides."""
-    cursor.execute("SELECT id, link FROM articles WHERE link IS NOT NULL")
-    links = cursor.fetchall()
+            empty = f"{field} IS NULL OR {field} = ''"
+        columns.append(f"COALESCE(SUM(CASE WHEN {empty} THEN 1 ELSE 0 END), 0) AS {field}")
+    cursor.execute(f"SELECT {', '.join(columns)} FROM articles WHERE {scope}", tuple(scope_params))
+    row = cursor.fetchone()
+    if not isinstance(row, dict):
+        row = dict(zip(CRITICAL_FIELDS, row))
+    return {field: int(row[field] or 0) for field in CRITICAL_FIELDS}
+
+
+def id_ranges(cursor, watermark=None, batch_size=CLEANUP_BATCH_SIZE):
+    """Plages d'identifiants [début, fin] couvrant les articles modifiés depuis `watermark`."""
+    scope, scope_params = changed_rows_condition(watermark)
+    cursor.execute(f"SELECT MIN(id) AS min_id, MAX(id) AS max_id FROM articles WHERE {scope}", tuple(scope_params))
+    row = cursor.fetchone()
+    min_id, max_id = (row["min_id"], row["max_id"]) if isinstance(row, dict) else row
+    if min_id is None:
+        return []
+    return [(start, min(start + batch_size - 1, max_id)) for start in range(min_id, max_id + 1, batch_size)]
+
+
+def collect_publication_days(cursor, source, condition, params=()):
+    """Retourne les dates de publication des articles qui vont être supprimés (cumul des mots-clés à recalculer)."""
+    cursor.execute(
+        f"SELECT DISTINCT a.publication_date FROM {source} WHERE ({condition}) AND a.publication_date IS NOT NULL",
+        tuple(params)
+    )
+    return {row["publication_date"] if isinstance(row, dict) else row[0] for row in cursor.fetchall()}
+
+
+def delete_in_batches(connection, cursor, condition, params=(), watermark=None, source="articles a",
+                      archive=False, batch_size=CLEANUP_BATCH_SIZE):
+    """
+    Supprime les articles (alias `a` dans `source`) vérifiant `condition`,
+    parmi ceux modifiés depuis `watermark`, plage d'identifiants par plage
+    d'identifiants : chaque lot est validé aussitôt, avec le recalcul des
+    cumuls quotidiens et l'invalidation du cache qu'il entraîne.
+
+    :param archive: copie d'abord les articles dans 'irrelevant_articles'
+    :return: nombre d'articles supprimés
+    """
+    scope, scope_params = changed_rows_condition(watermark, "a")
+    deleted = 0
+    for start, end in id_ranges(cursor, watermark, batch_size):
+        batch_condition = f"a.id BETWEEN %s AND %s AND ({condition}) AND {scope}"
+        batch_params = (start, end, *params, *scope_params)
+
+        touched_days = collect_publication_days(cursor, source, batch_condition, batch_params)
+        if archive:
+            columns = ", ".join(ARCHIVED_COLUMNS)
+            selected = ", ".join(f"a.{column}" for column in ARCHIVED_COLUMNS)
+            cursor.execute(
+                f"INSERT IGNORE INTO irrelevant_articles ({columns}) SELECT {selected} FROM {source} WHERE {batch_condition}",
+                batch_params
+            )
+        cursor.execute(f"DELETE a FROM {source} WHERE {batch_condition}", batch_params)
+        rows_deleted = cursor.rowcount
+        if rows_deleted:
+            deleted += rows_deleted
+            refresh_daily_counts(cursor, "articles", touched_days)
+            bump_cache_generation(cursor)
+        connection.commit()
+    return deleted
 
-    # Modification ici pour accéder aux données par clé
-    invalid_links = [row['id'] for row in links if not urlparse(row['link']).scheme or not urlparse(row['link']).netloc]
 
-    if invalid_links:
-        cursor.execute(f"DELETE FROM articles WHERE id IN ({', '.join(map(str, invalid_links))})")
-        logging.info(f"{len(invalid_links)} article(s) supprimé(s) pour liens invalides.")
+def delete_invalid_links(connection, cursor, watermark=None):
+    """Supprime les articles avec des liens invalides (parmi les lignes modifiées depuis `watermark`)."""
+    rows_deleted = delete_in_batches(
+        connection, cursor, "a.link IS NOT NULL AND a.link NOT REGEXP %s", (VALID_LINK_PATTERN,), watermark
+    )
+    logging.info(f"{rows_deleted} article(s) supprimé(s) pour liens invalides.")
+    return rows_deleted
 
 
-def delete_empty_articles(cursor):
-    """Supprime les articles avec des champs critiques manquants."""
-    cursor.execute("""
-        DELETE FROM articles
-        WHERE title IS NULL OR publication_date IS NULL OR summary IS NULL OR full_content IS NULL OR author IS NULL
-    """)
-    rows_deleted = cursor.rowcount
+def delete_empty_articles(connection, cursor, watermark=None):
+    """Supprime les articles avec des champs critiques manquants (parmi les lignes modifiées depuis `watermark`)."""
+    condition = " OR ".join(f"a.{field} IS NULL" for field in CRITICAL_FIELDS)
+    rows_deleted = delete_in_batches(connection, cursor, condition, (), watermark)
     logging.info(f"{rows_deleted} article(s) supprimé(s) pour champs critiques vides.")
+    return rows_deleted
 
 
-def delete_duplicates(cursor):
-    """Supprime les doublons en gardant l'article au plus petit ID."""
-    cursor.execute("""
-        DELETE a1
-        FROM articles a1
-        INNER JOIN articles a2
-        ON a1.id > a2.id AND a1.link = a2.link
-    """)
-    rows_deleted = cursor.rowcount
+def delete_duplicates(connection, cursor, watermark=None):
+    """Supprime les doublons en gardant l'article au plus petit ID (seules les lignes modifiées depuis `watermark` sont supprimées)."""
+    rows_deleted = delete_in_batches(
+        connection, cursor, "1 = 1", (), watermark,
+        source="articles a INNER JOIN articles a2 ON a.id > a2.id AND a.link = a2.link"
+    )
     logging.info(f"{rows_deleted} doublon(s) supprimé(s).")
+    return rows_deleted
 
 
-def archive_irrelevant_articles(cursor):
-    """Déplace les articles sans mots-clés vers la table 'irrelevant_articles'."""
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS irrelevant_articles AS 
-        SELECT * FROM articles WHERE keywords IS NULL;
-    """)
-    cursor.execute("DELETE FROM articles WHERE keywords IS NULL;")
-    rows_deleted = cursor.rowcount
+def archive_irrelevant_articles(connection, cursor, watermark=None):
+    """Déplace les articles sans mots-clés (parmi les lignes modifiées depuis `watermark`) vers la table 'irrelevant_articles'."""
+    cursor.execute("CREATE TABLE IF NOT EXISTS irrelevant_articles AS SELECT * FROM articles WHERE 1 = 0")
+    rows_deleted = delete_in_batches(connection, cursor, "a.keywords IS NULL", (), watermark, archive=True)
     logging.info(f"{rows_deleted} article(s) déplacé(s) vers 'irrelevant_articles' et supprimé(s) de 'articles'.")
+    return rows_deleted
+
+
+def save_step_timings(cursor, started_at, timings):
+    """
+    Enregistre la durée de chaque étape dans 'monitoring_logs' : une ligne par
+    étape (script « database_cleanup:<étape> »), avec le nombre d'articles
+    concernés dans `articles_count`.
+
+    :param timings: [(étape, durée en secondes, nombre d'articles)]
+    """
+    cursor.executemany(
+        """
+        INSERT IGNORE INTO monitoring_logs (timestamp, script, duration_seconds, articles_count)
+        VALUES (%s, %s, %s, %s)
+        """,
+        [(started_at, f"database_cleanup:{step}", round(duration, 3), count) for step, duration, count in timings]
+    )
+
 
+def clean_database(full=False):
+    """
+    Point d'entrée principal pour la vérification et le nettoyage de la base de données.
 
-def clean_database():
-    """Point d'entrée principal pour la vérification et le nettoyage de la base de données."""
+    Seuls les articles créés ou modifiés depuis le dernier nettoyage réussi sont
+    examinés (repère de l'étape "cleanup"), sauf si `full`. Les suppressions sont
+    validées par plages de `CLEANUP_BATCH_SIZE` identifiants.
+    """
+    connection = None
     try:
         connection = connect_to_database()
         cursor = connection.cursor(dictionary=True)
 
-        logging.info("Début du nettoyage de la base de données.")
+        watermark = None if full else load_watermarks(cursor, "cleanup").get("articles")
+        started_at = database_now(cursor)
+        cursor.execute("SELECT COALESCE(MAX(id), 0) AS max_id FROM articles")
+        max_id = cursor.fetchone()["max_id"]
+        if watermark is None or watermark.last_run_at is None:
+            logging.info("Début du nettoyage complet de la base de données.")
+        else:
+            logging.info(f"Début du nettoyage des articles créés ou modifiés depuis le {watermark.last_run_at}.")
+
+        timings = []
 
         # Vérification des champs critiques pour les articles
-        fields_articles = ["title", "publication_date", "summary", "full_content", "author"]
-        anomalies = check_empty_fields(cursor, "articles", fields_articles)
-        for field, rows in anomalies.items():
-            logging.info(f"{len(rows)} article(s) avec le champ '{field}' vide.")
-
-        # Suppressions et archivage
-        delete_invalid_links(cursor)
-        delete_empty_articles(cursor)
-        delete_duplicates(cursor)
-        archive_irrelevant_articles(cursor)
-
-        # Appliquer les changements
+        step_start = time.perf_counter()
+        anomalies = anomaly_report(cursor, watermark)
+        for field, count in anomalies.items():
+            logging.info(f"{count} article(s) avec le champ '{field}' vide.")
+        timings.append(("anomaly_report", time.perf_counter() - step_start, sum(anomalies.values())))
+
+        # Suppressions et archivage, validés lot par lot
+        for step in (delete_invalid_links, delete_empty_articles, delete_duplicates, archive_irrelevant_articles):
+            step_start = time.perf_counter()
+            rows_deleted = step(connection, cursor, watermark)
+            timings.append((step.__name__, time.perf_counter() - step_start, rows_deleted))
+
+        # Le repère n'avance qu'une fois toutes les étapes terminées : un échec laisse le périmètre à réexaminer
+        save_watermarks(cursor, "cleanup", {"articles": advance(watermark, row_id=max_id, run_at=started_at)})
+        save_step_timings(cursor, started_at, timings)
         connection.commit()
-        logging.info("Nettoyage terminé et changements appliqués.")
+        logging.info(
+            "Nettoyage terminé et changements appliqués ("
+            + ", ".join(f"{step} {duration:.2f} s" for step, duration, _ in timings) + ")."
+        )
 
     except Error as e:
         logging.error(f"Erreur lors de l'opération : {e}")
 
     finally:
-        if connection.is_connected():
+        if connection is not None and connection.is_connected():
             cursor.close()
             connection.close()
             logging.info("Connexion à la base de données fermée.")
 
 
 if __name__ == "__main__":
-    clean_database()
+    parser = argparse.ArgumentParser(description="Vérification et nettoyage de la base de données.")
+    parser.add_argument("--full", action="store_true", help="Examiner tous les articles, sans tenir compte du repère")
+    clean_database(full=parser.parse_args().full)
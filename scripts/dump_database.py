@@ -1,7 +1,17 @@
 import os
+import sys
+import argparse
+import mysql.connector
 from dotenv import load_dotenv
 import subprocess
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from watermarks import load_watermarks, save_watermarks, database_now, advance
+
 # Charger les variables d'environnement
 load_dotenv()
 
@@ -14,29 +24,108 @@ db_name = os.getenv("DB_NAME")
 # Nom du fichier de dump (fixe pour écraser à chaque exécution)
 dump_file = "sauvegarde_veille_ia.sql"
 
+# Dump incrémental : contenus créés ou modifiés depuis le dernier dump complet réussi
+delta_dump_file = "sauvegarde_veille_ia_delta.sql"
+
 # Chemin absolu vers mysqldump (remplace si nécessaire)
-mysqldump_path = r"C:\Program Files\MySQL\MySQL Workbench 8.0\mysqldump.exe"
+mysqldump_path = os.getenv("MYSQLDUMP_PATH", r"C:\Program Files\MySQL\MySQL Workbench 8.0\mysqldump.exe")
+
+# Tables de contenu concernées par le dump incrémental (colonne updated_at)
+CONTENT_TABLES = ["articles", "videos", "scientific_articles"]
+# Dictionnaire des mots-clés, liaisons et cumul quotidien : exportés en entier (structure comprise) dans le delta
+KEYWORD_TABLES = [
+    "keywords", "article_keywords", "video_keywords", "scientific_article_keywords", "keyword_daily_counts"
+]
+
+
+def delta_dump_command(since):
+    """
+    Commande mysqldump des lignes de contenu créées ou modifiées depuis `since`
+    (une insertion initialise aussi updated_at), écrites en REPLACE pour
+    s'appliquer par-dessus le dump complet.
+    """
+    return [
+        mysqldump_path,
+        f"-h{db_host}",
+        f"-u{db_user}",
+        f"--password={db_password}",
+        "--single-transaction",
+        "--no-create-info",
+        "--replace",
+        f"--where=updated_at >= '{since:%Y-%m-%d %H:%M:%S}'",
+        db_name,
+        *CONTENT_TABLES
+    ]
 
 
-def dump_database():
+def keyword_tables_dump_command():
+    """
+    Commande mysqldump des tables de mots-clés entières, recréées (DROP TABLE
+    puis CREATE TABLE) à la restauration : leurs lignes dépendent des contenus
+    du delta, et les liaisons d'un contenu dont les mots-clés ont changé
+    disparaissent.
+    """
+    return [
+        mysqldump_path,
+        f"-h{db_host}",
+        f"-u{db_user}",
+        f"--password={db_password}",
+        "--single-transaction",
+        db_name,
+        *KEYWORD_TABLES
+    ]
+
+
+def dump_database(full=False):
     """
     Effectue un dump de la base de données et écrase le fichier existant.
+
+    Après un premier dump complet réussi, seules les lignes de contenu créées ou
+    modifiées depuis ce dump complet sont exportées (dans `delta_dump_file`),
+    sauf si `full`, suivies des tables de mots-clés entières. Le delta est
+    cumulatif : le dump complet puis le dernier delta suffisent à restaurer
+    contenus, mots-clés et tendances, sans les deltas intermédiaires. Les
+    suppressions du nettoyage, les utilisateurs et les autres tables ne
+    figurent que dans un dump complet.
     """
     try:
-        # Construire la commande mysqldump avec le mot de passe caché
-        command = [
-            mysqldump_path,
-            f"-h{db_host}",
-            f"-u{db_user}",
-            f"--password={db_password}",  # Passe le mot de passe ici
-            db_name
-        ]
+        connection = mysql.connector.connect(host=db_host, user=db_user, password=db_password, database=db_name)
+        cursor = connection.cursor()
+        # Repère du dernier dump complet : il n'avance pas lors d'un dump incrémental
+        watermark = load_watermarks(cursor, "dump").get("content")
+        started_at = database_now(cursor)
+        full = full or watermark is None or watermark.last_run_at is None
+
+        if full:
+            # Construire la commande mysqldump avec le mot de passe caché
+            commands = [[
+                mysqldump_path,
+                f"-h{db_host}",
+                f"-u{db_user}",
+                f"--password={db_password}",  # Passe le mot de passe ici
+                # Instantané cohérent : le nettoyage peut s'exécuter pendant le dump
+                "--single-transaction",
+                db_name
+            ]]
+            output_path = dump_file
+        else:
+            commands = [delta_dump_command(watermark.last_run_at), keyword_tables_dump_command()]
+            output_path = delta_dump_file
 
         # Ouvrir le fichier de dump pour écraser son contenu
-        with open(dump_file, "w") as output_file:
-            subprocess.run(command, stdout=output_file, check=True)
+        with open(output_path, "w") as output_file:
+            for command in commands:
+                output_file.flush()
+                subprocess.run(command, stdout=output_file, check=True)
+
+        # Le repère n'avance qu'après un dump complet réussi
+        if full:
+            save_watermarks(cursor, "dump", {"content": advance(watermark, run_at=started_at)})
+            connection.commit()
+        cursor.close()
+        connection.close()
 
-        print(f"Dump de la base de données terminé : {dump_file}")
+        print(f"Dump de la base de données terminé : {output_path}")
         print("Ajoutez et committez le fichier dans votre dépôt Git pour versionner les changements.")
 
     except subprocess.CalledProcessError as e:
@@ -49,4 +138,6 @@ def dump_database():
 
 
 if __name__ == "__main__":
-    dump_database()
+    parser = argparse.ArgumentParser(description="Dump de la base de données (incrémental après un premier dump complet).")
+    parser.add_argument("--full", action="store_true", help="Forcer un dump complet")
+    dump_database(full=parser.parse_args().full)
@@ -0,0 +1,149 @@
+import os
+import hashlib
+import logging
+from collections import OrderedDict
+import numpy as np
+
+# Dossier persistant entre deux exécutions du pipeline (mis en cache par GitHub Actions)
+PIPELINE_CACHE_DIR = os.getenv("PIPELINE_CACHE_DIR", ".pipeline_cache")
+
+# Nombre de textes encodés par appel au modèle
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 32))
+# Nombre maximal d'embeddings de contenus conservés (les moins récemment utilisés sont oubliés)
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 50000))
+
+
+def content_hash(text):
+    """Empreinte SHA-256 d'un texte (espaces de début et de fin ignorés)."""
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+def model_slug(model_name):
+    """Nom de modèle utilisable dans un nom de fichier."""
+    return model_name.replace("/", "_")
+
+
+def normalize_rows(vectors):
+    """Normalise chaque ligne (norme L2) : le produit scalaire devient la similarité cosinus."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def encode_batched(model, texts, batch_size=EMBEDDING_BATCH_SIZE):
+    """
+    Encode des textes par lots de longueurs voisines pour limiter le remplissage (padding).
+
+    :return: Matrice (len(texts), dimension) normalisée, dans l'ordre des textes reçus
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    batches = []
+    for start in range(0, len(order), batch_size):
+        batch = [texts[i] for i in order[start:start + batch_size]]
+        batches.append(model.encode(batch, batch_size=len(batch), convert_to_numpy=True, show_progress_bar=False))
+
+    sorted_vectors = normalize_rows(np.vstack(batches))
+    vectors = np.empty_like(sorted_vectors)
+    vectors[order] = sorted_vectors
+    return vectors
+
+
+def load_candidate_embeddings(model, model_name, candidates, cache_dir=PIPELINE_CACHE_DIR):
+    """
+    Embeddings normalisés d'une liste fixe de mots-clés candidats.
+
+    Ils sont mémorisés sur disque sous une clé (nom du modèle, empreinte de la
+    liste) : ils ne sont recalculés que si le modèle ou la liste change.
+    """
+    list_hash = hashlib.sha256("\n".join(candidates).encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"candidates_{model_slug(model_name)}_{list_hash}.npy")
+
+    if os.path.exists(path):
+        vectors = np.load(path)
+        if vectors.shape[0] == len(candidates):
+            logging.info(f"Embeddings des mots-clés chargés depuis {path}.")
+            return vectors
+
+    logging.info("Encodage des mots-clés pour la comparaison.")
+    vectors = encode_batched(model, list(candidates))
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(path, vectors)
+    return vectors
+
+
+class EmbeddingCache:
+    """
+    Embeddings de contenus indexés par empreinte du texte, pour un modèle donné.
+
+    Un article inchangé n'est jamais réencodé d'une exécution à l'autre ; le
+    fichier (.npz) est réécrit de façon atomique par `save`.
+    """
+
+    def __init__(self, path, max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_model(cls, model_name, cache_dir=PIPELINE_CACHE_DIR, max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        """Charge (ou crée) le cache du modèle `model_name`."""
+        cache = cls(os.path.join(cache_dir, f"embeddings_{model_slug(model_name)}.npz"), max_entries)
+        cache.load()
+        return cache
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                for key, vector in zip(data["hashes"], data["vectors"]):
+                    self.entries[str(key)] = vector
+            logging.info(f"{len(self.entries)} embedding(s) chargé(s) depuis {self.path}.")
+        except (OSError, KeyError, ValueError) as e:
+            logging.warning(f"Cache d'embeddings illisible, il sera recréé : {e}")
+            self.entries.clear()
+
+    def save(self):
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        if not self.entries:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary_path = f"{self.path}.tmp.npz"
+        np.savez(
+            temporary_path,
+            hashes=np.array(list(self.entries.keys())),
+            vectors=np.vstack(list(self.entries.values()))
+        )
+        os.replace(temporary_path, self.path)
+        logging.info(f"{len(self.entries)} embedding(s) enregistré(s) dans {self.path}.")
+
+    def embed(self, model, texts, batch_size=EMBEDDING_BATCH_SIZE):
+        """
+        Embeddings normalisés de `texts` : seuls les textes absents du cache sont encodés.
+
+        :return: Matrice (len(texts), dimension) dans l'ordre des textes reçus
+        """
+        keys = [content_hash(text) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            elif key not in missing:
+                missing[key] = text
+
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        if missing:
+            vectors = encode_batched(model, list(missing.values()), batch_size)
+            for key, vector in zip(missing, vectors):
+                self.entries[key] = vector
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([self.entries[key] for key in keys])
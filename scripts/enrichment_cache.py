@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import unicodedata
+
+# Dossier persistant entre deux exécutions du pipeline (mis en cache par GitHub Actions)
+PIPELINE_CACHE_DIR = os.getenv("PIPELINE_CACHE_DIR", ".pipeline_cache")
+ENRICHMENT_CACHE_FILE = os.path.join(PIPELINE_CACHE_DIR, "enrichment.sqlite")
+
+# Taille maximale des résultats conservés (Mo) ; les moins récemment utilisés sont évincés
+ENRICHMENT_CACHE_MAX_MB = float(os.getenv("ENRICHMENT_CACHE_MAX_MB", 200))
+
+# Nombre maximal de paramètres par requête SQLite
+LOOKUP_CHUNK_SIZE = 500
+
+
+def normalize_content(text):
+    """Forme normalisée d'un contenu : Unicode NFC et espaces regroupés."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(model_id, content):
+    """SHA-256 du contenu normalisé et de l'identifiant du modèle."""
+    return hashlib.sha256(f"{model_id}\n{normalize_content(content)}".encode("utf-8")).hexdigest()
+
+
+class EnrichmentCache:
+    """
+    Résultats d'enrichissement (résumés, listes de mots-clés) indexés par
+    empreinte du contenu et du modèle, dans une base SQLite partagée par les
+    scripts du pipeline.
+
+    Un article déjà enrichi par le même modèle n'est plus soumis au modèle,
+    même si articles.jsonl est reconstruit. Les entrées les moins récemment lues
+    sont évincées au-delà de `max_mb` Mo.
+    """
+
+    def __init__(self, path=ENRICHMENT_CACHE_FILE, max_mb=ENRICHMENT_CACHE_MAX_MB):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS enrichments (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS idx_enrichments_accessed ON enrichments (accessed_at)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_many(self, kind, model_id, contents):
+        """
+        Résultats mémorisés pour `contents` (None pour un contenu absent du cache).
+
+        :return: Une liste alignée sur `contents`
+        """
+        keys = [f"{kind}:{cache_key(model_id, content)}" for content in contents]
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), LOOKUP_CHUNK_SIZE):
+            chunk = unique_keys[start:start + LOOKUP_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self.connection.execute(
+                f"SELECT key, value FROM enrichments WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            found.update(rows)
+
+        if found:
+            now = time.time()
+            self.connection.executemany(
+                "UPDATE enrichments SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+            )
+            self.connection.commit()
+
+        results = [json.loads(found[key]) if key in found else None for key in keys]
+        self.hits += sum(1 for result in results if result is not None)
+        self.misses += sum(1 for result in results if result is None)
+        return results
+
+    def put_many(self, kind, model_id, contents, values):
+        """Mémorise `values[i]` comme résultat de `contents[i]` (les valeurs None sont ignorées)."""
+        now = time.time()
+        rows = []
+        for content, value in zip(contents, values):
+            if value is None:
+                continue
+            encoded = json.dumps(value, ensure_ascii=False)
+            rows.append((f"{kind}:{cache_key(model_id, content)}", kind, encoded, len(encoded.encode("utf-8")), now))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO enrichments (key, kind, value, size, accessed_at) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        self.connection.commit()
+
+    def evict(self):
+        """Supprime les entrées les moins récemment lues jusqu'à repasser sous la taille maximale."""
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM enrichments").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        for key, size in self.connection.execute(
+            "SELECT key, size FROM enrichments ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self.connection.execute("DELETE FROM enrichments WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self.connection.commit()
+        logging.info(f"{evicted} entrée(s) évincée(s) du cache d'enrichissement.")
+        return evicted
+
+    def close(self):
+        self.evict()
+        self.connection.close()
@@ -3,55 +3,56 @@ import json
 import logging
 import sys  # Import nécessaire pour utiliser sys.exit()
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from jsonl_io import JsonlWriter, iter_records
+
 # Définir les chemins vers les dossiers des fichiers JSON
 ARTICLES_FOLDER = "articles_outputs"
 VIDEOS_FOLDER = "videos_outputs"
 
-# Définir les chemins des fichiers JSON finaux
-FINAL_ARTICLES_FILE = "articles.json"
-FINAL_VIDEOS_FILE = "videos.json"
+# Définir les chemins des fichiers JSONL finaux
+FINAL_ARTICLES_FILE = "articles.jsonl"
+FINAL_VIDEOS_FILE = "videos.jsonl"
 
 # Configurer le logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
 def merge_and_deduplicate_json_files(input_folder, output_file, unique_key):
-    all_data = []
     seen_keys = set()  # Ensemble pour stocker les clés uniques déjà rencontrées
     logging.info(f"Début du processus de fusion et dédoublonnage pour {input_folder}.")
 
-    # Parcourir tous les fichiers JSON dans le dossier
-    for file_name in os.listdir(input_folder):
-        file_path = os.path.join(input_folder, file_name)
-        if file_name.endswith(".json"):
-            try:
-                # Charger les données JSON
-                with open(file_path, "r", encoding="utf-8") as file:
-                    data = json.load(file)
-
-                    # Vérifier que les données sont une liste
-                    if isinstance(data, list):
-                        logging.info(f"Traitement du fichier : {file_name}")
-                        for item in data:
-                            # Vérifier si la clé unique existe et est nouvelle
-                            key_value = item.get(unique_key)
-                            if key_value and key_value not in seen_keys:
-                                all_data.append(item)
-                                seen_keys.add(key_value)
-                        logging.info(f"{len(data)} éléments traités dans {file_name}.")
-                    else:
-                        logging.warning(f"Le fichier {file_name} ne contient pas une liste. Ignoré.")
-            except json.JSONDecodeError:
-                logging.error(f"Erreur lors du chargement du fichier {file_name}. Ignoré.")
-
-    # Sauvegarder les données fusionnées et dédoublonnées dans un nouveau fichier JSON
     try:
-        with open(output_file, "w", encoding="utf-8") as output:
-            json.dump(all_data, output, ensure_ascii=False, indent=4)
-        logging.info(f"Fusion et dédoublonnage terminés. Les données ont été sauvegardées dans {output_file}.")
+        # Les éléments sont écrits au fil de la lecture : seules les clés restent en mémoire
+        with JsonlWriter(output_file) as writer:
+            # Parcourir tous les fichiers JSON (tableau) ou JSONL du dossier
+            for file_name in sorted(os.listdir(input_folder)):
+                file_path = os.path.join(input_folder, file_name)
+                if not file_name.endswith((".json", ".jsonl")):
+                    continue
+                logging.info(f"Traitement du fichier : {file_name}")
+                count = 0
+                try:
+                    for item in iter_records(file_path):
+                        count += 1
+                        # Vérifier si la clé unique existe et est nouvelle
+                        key_value = item.get(unique_key) if isinstance(item, dict) else None
+                        if key_value and key_value not in seen_keys:
+                            writer.write(item)
+                            seen_keys.add(key_value)
+                    logging.info(f"{count} éléments traités dans {file_name}.")
+                except (json.JSONDecodeError, ValueError) as e:
+                    logging.error(f"Erreur lors du chargement du fichier {file_name} ({e}). Ignoré après {count} éléments.")
+        logging.info(
+            f"Fusion et dédoublonnage terminés. {writer.count} éléments ont été sauvegardés dans {output_file}."
+        )
     except Exception as e:
         logging.error(f"Erreur lors de la sauvegarde du fichier {output_file}: {e}")
-        if output_file == FINAL_ARTICLES_FILE:  # Vérifier si l'erreur concerne `articles.json`
+        if output_file == FINAL_ARTICLES_FILE:  # Vérifier si l'erreur concerne `articles.jsonl`
             sys.exit(1)  # Arrêter l'exécution du workflow uniquement dans ce cas
 
 # Fusionner et dédoublonner les fichiers JSON pour les articles
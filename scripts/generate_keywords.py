@@ -1,43 +1,57 @@
 import os
-import json
+import sys
+import time
+import hashlib
 import logging
 from datetime import datetime
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from embedding_cache import EmbeddingCache, load_candidate_embeddings, encode_batched, EMBEDDING_BATCH_SIZE
+from enrichment_cache import EnrichmentCache
+from model_client import MODEL_SERVER_URL, RemoteEmbeddingModel
+from monitoring_file import append_monitoring_entry
+from jsonl_io import JsonlWriter, iter_records, iter_chunks, STREAM_CHUNK_SIZE
+from near_duplicates import remember_canonical, copy_from_canonical
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Chemins des fichiers
-JSON_FILE = "articles.json"
+JSON_FILE = "articles.jsonl"
 MONITORING_FILE = "monitoring_articles_metrics.json"
 
-# Début du timer
-start_time = datetime.now()
+# Modèle d'embeddings
+MODEL_NAME = 'all-MiniLM-L6-v2'
 
 
 # Fonction pour enregistrer les métriques dans un fichier centralisé
 def save_monitoring_entry(script_name, data):
-    if os.path.exists("monitoring.json"):
-        with open("monitoring.json", "r", encoding="utf-8") as f:
-            monitoring = json.load(f)
-    else:
-        monitoring = {"entries": []}
-
-    timestamp = datetime.now().isoformat()
-    entry = {
-        "timestamp": timestamp,
-        "script": script_name,
-        **data
-    }
-    monitoring["entries"].append(entry)
+    append_monitoring_entry(script_name, data, "monitoring.json")
+
 
-    with open("monitoring.json", "w", encoding="utf-8") as f:
-        json.dump(monitoring, f, indent=4)
+# Chargement paresseux du modèle (une seule fois par processus)
+_model = None
 
 
-# Chargement du modèle
-logging.info("Chargement du modèle pré-entraîné.")
-model = SentenceTransformer('all-MiniLM-L6-v2')
+def get_model():
+    global _model
+    if _model is None:
+        if MODEL_SERVER_URL:
+            # Le serveur de modèles partage une seule copie des poids entre les scripts
+            _model = RemoteEmbeddingModel(MODEL_NAME)
+        else:
+            # sentence-transformers (et torch) ne sont importés que sans serveur de modèles
+            from sentence_transformers import SentenceTransformer
+
+            logging.info("Chargement du modèle pré-entraîné.")
+            _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
 
 # Liste fusionnée des mots-clés (techniques et généralistes)
 keyword_list = [
@@ -89,70 +103,162 @@ keyword_list = [
 ]
 
 
-# Encodage des mots-clés
-logging.info("Encodage des mots-clés pour la comparaison.")
-keyword_embeddings = model.encode(keyword_list, convert_to_tensor=True)
-
 # Paramètres de filtrage
 MAX_KEYWORDS = 15
 SIMILARITY_THRESHOLD = 0.2
 
 
+def keywords_model_id():
+    """Identifiant des listes produites : modèle, liste de candidats, seuil et nombre maximal."""
+    list_hash = hashlib.sha256("\n".join(keyword_list).encode("utf-8")).hexdigest()[:16]
+    return f"{MODEL_NAME}:{list_hash}:{SIMILARITY_THRESHOLD}:{MAX_KEYWORDS}"
+
+
+def rank_keywords(scores, candidates, threshold):
+    """Candidats dont la similarité dépasse le seuil, du plus proche au moins proche (MAX_KEYWORDS au plus)."""
+    scores = np.asarray(scores, dtype=np.float32)
+    ranked = [i for i in np.argsort(-scores, kind="stable") if scores[i] > threshold]
+    return [candidates[i] for i in ranked[:MAX_KEYWORDS]]
+
+
 # Fonction d'extraction
 def extract_keywords(text, embeddings, candidates, threshold):
     if not text or not text.strip():
         return []
 
-    logging.info("Encodage du texte et calcul des similarités.")
-    text_embedding = model.encode(text, convert_to_tensor=True)
+    from sentence_transformers import util
+
+    text_embedding = encode_batched(get_model(), [text])
     cosine_scores = util.cos_sim(text_embedding, embeddings)[0]
+    return rank_keywords(cosine_scores.cpu().numpy(), candidates, threshold)
+
+
+def extract_keywords_batch(texts, cache, candidate_embeddings, candidates, threshold, batch_size=EMBEDDING_BATCH_SIZE):
+    """
+    Extrait les mots-clés d'une liste de textes non vides en une seule passe.
+
+    Les textes sont encodés par lots (voir `embedding_cache.encode_batched`) et
+    les contenus déjà vus sont lus dans le cache ; les similarités sont un
+    produit matriciel entre embeddings normalisés.
+    """
+    if not texts:
+        return []
+    text_embeddings = cache.embed(get_model(), texts, batch_size)
+    scores = text_embeddings @ candidate_embeddings.T
+    return [rank_keywords(row, candidates, threshold) for row in scores]
+
+
+def main():
+    start_time = datetime.now()
+    if not os.path.exists(JSON_FILE):
+        logging.error(f"Le fichier {JSON_FILE} est introuvable.")
+        return
+
+    logging.info(f"Enrichissement des mots-clés de {JSON_FILE} par lots de {STREAM_CHUNK_SIZE} articles.")
+    total_articles = 0
+    empty_contents = 0
+    keywords_total = 0
+    processed = 0
+    computed = 0
+    extraction_duration = 0.0
+    cache = None
+    candidate_embeddings = None
+    # Mots-clés des articles canoniques, recopiés dans leurs quasi-doublons (voir near_duplicates.py)
+    canonical_keywords = {}
+    keywords_copied = 0
+
+    # Le fichier est lu et réécrit par lots : seul le lot courant est en mémoire
+    with EnrichmentCache() as results_cache, JsonlWriter(JSON_FILE) as writer:
+        for articles in iter_chunks(iter_records(JSON_FILE)):
+            # Seuls les articles sans mots-clés et avec un contenu sont encodés
+            pending = []
+            for article in articles:
+                if article.get("keywords"):
+                    remember_canonical(canonical_keywords, article, "keywords")
+                    continue
+                if (article.get("full_content") or "").strip():
+                    pending.append(article)
+                else:
+                    article["keywords"] = ""
+
+            # Un quasi-doublon attend les mots-clés de son canonique (déjà connus ou calculés dans ce lot)
+            pending_links = {article.get("link") for article in pending}
+            duplicates = []
+            extracted_articles = []
+            for article in pending:
+                canonical = article.get("duplicate_of")
+                if canonical and (canonical in canonical_keywords or canonical in pending_links):
+                    duplicates.append(article)
+                else:
+                    extracted_articles.append(article)
+            pending = extracted_articles
+
+            contents = [article["full_content"] for article in pending]
+            extraction_start = time.perf_counter()
+            # Les listes déjà calculées pour un contenu identique sont reprises sans appel au modèle
+            keywords = results_cache.get_many("keywords", keywords_model_id(), contents)
+            missing = [i for i, result in enumerate(keywords) if result is None]
+            if missing:
+                if cache is None:
+                    candidate_embeddings = load_candidate_embeddings(get_model(), MODEL_NAME, keyword_list)
+                    cache = EmbeddingCache.for_model(MODEL_NAME)
+                extracted = extract_keywords_batch(
+                    [contents[i] for i in missing], cache, candidate_embeddings, keyword_list, SIMILARITY_THRESHOLD
+                )
+                results_cache.put_many("keywords", keywords_model_id(), [contents[i] for i in missing], extracted)
+                for i, new_keywords in zip(missing, extracted):
+                    keywords[i] = new_keywords
+            extraction_duration += time.perf_counter() - extraction_start
+
+            for article, new_keywords in zip(pending, keywords):
+                article["keywords"] = ";".join(sorted(set(new_keywords)))
+                remember_canonical(canonical_keywords, article, "keywords")
+            for article in duplicates:
+                # Un canonique sans mot-clé laisse aussi son doublon sans mot-clé
+                if not copy_from_canonical(canonical_keywords, article, "keywords"):
+                    article["keywords"] = ""
+            keywords_copied += len(duplicates)
+            writer.write_many(articles)
+
+            total_articles += len(articles)
+            empty_contents += sum(1 for a in articles if not (a.get("full_content") or "").strip())
+            keywords_total += sum(len(a.get("keywords", "").split(";")) for a in articles)
+            processed += len(pending)
+            computed += len(missing)
+
+    embedding_hits = 0
+    if cache is not None:
+        cache.save()
+        embedding_hits = cache.hits
+
+    articles_per_second = processed / extraction_duration if extraction_duration > 0 else 0
+    logging.info(
+        f"{processed} article(s) traité(s) en {extraction_duration:.2f} s ({articles_per_second:.1f} articles/s, "
+        f"{processed - computed} liste(s) lue(s) dans le cache d'enrichissement, {computed} calculée(s), "
+        f"{keywords_copied} recopiée(s) depuis un article canonique)."
+    )
+    logging.info(f"{total_articles} articles enrichis sauvegardés dans {JSON_FILE}.")
+
+    # Calcul des métriques de monitoring
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+    average_keywords = keywords_total / total_articles if total_articles else 0
+
+    monitoring_data = {
+        "timestamp": datetime.now().isoformat(),
+        "duration_seconds": round(duration, 2),
+        "articles_count": total_articles,
+        "empty_full_content_count": empty_contents,
+        "average_keywords_per_article": round(average_keywords, 2),
+        "articles_per_second": round(articles_per_second, 2),
+        "keywords_cache_hits": processed - computed,
+        "embedding_cache_hits": embedding_hits,
+        "near_duplicate_keywords_copied": keywords_copied
+    }
+
+    save_monitoring_entry("extract_keywords", monitoring_data)
+    logging.info("Monitoring mis à jour dans monitoring.json.")
+
 
-    filtered_terms = [
-        candidates[i] for i in range(len(cosine_scores)) if cosine_scores[i] > threshold
-    ]
-
-    sorted_terms = [candidates[i] for i in cosine_scores.argsort(descending=True)]
-    return sorted_terms[:MAX_KEYWORDS]
-
-# Chargement du fichier JSON
-logging.info(f"Chargement des données depuis le fichier {JSON_FILE}.")
-if os.path.exists(JSON_FILE):
-    with open(JSON_FILE, "r", encoding="utf-8") as file:
-        articles = json.load(file)
-else:
-    logging.error(f"Le fichier {JSON_FILE} est introuvable.")
-    articles = []
-
-# Enrichissement des articles
-logging.info("Début de l’enrichissement des mots-clés.")
-for article in articles:
-    full_content = article.get("full_content", "")
-    current_keywords = article.get("keywords", "")
-
-    if not current_keywords:
-        logging.info(f"Traitement de l'article : {article.get('title', 'Sans titre')}")
-        new_keywords = extract_keywords(full_content, keyword_embeddings, keyword_list, SIMILARITY_THRESHOLD)
-        article["keywords"] = ";".join(sorted(set(new_keywords)))
-
-# Sauvegarde des articles enrichis
-logging.info(f"Sauvegarde des articles enrichis dans {JSON_FILE}.")
-with open(JSON_FILE, "w", encoding="utf-8") as file:
-    json.dump(articles, file, indent=4, ensure_ascii=False)
-
-# Calcul des métriques de monitoring
-end_time = datetime.now()
-duration = (end_time - start_time).total_seconds()
-total_articles = len(articles)
-empty_contents = sum(1 for a in articles if not (a.get("full_content") or "").strip())
-average_keywords = sum(len(a.get("keywords", "").split(";")) for a in articles) / total_articles if total_articles else 0
-
-monitoring_data = {
-    "timestamp": datetime.now().isoformat(),
-    "duration_seconds": round(duration, 2),
-    "articles_count": total_articles,
-    "empty_full_content_count": empty_contents,
-    "average_keywords_per_article": round(average_keywords, 2)
-}
-
-save_monitoring_entry("extract_keywords", monitoring_data)
-logging.info("Monitoring mis à jour dans monitoring.json.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,55 @@
 import os
-import json
+import sys
+import time
+import hashlib
 import logging
 from datetime import datetime
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from embedding_cache import EmbeddingCache, load_candidate_embeddings, encode_batched
+from enrichment_cache import EnrichmentCache
+from model_client import MODEL_SERVER_URL, RemoteEmbeddingModel
+from monitoring_file import append_monitoring_entry
+from jsonl_io import JsonlWriter, iter_records, iter_chunks, STREAM_CHUNK_SIZE
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Chemins des fichiers
-JSON_FILE = "arxiv_articles.json"
+JSON_FILE = "arxiv_articles.jsonl"
 MONITORING_FILE = "monitoring.json"
 
-# Timer début
-start_time = datetime.now()
+# Modèle d'embeddings
+MODEL_NAME = 'all-MiniLM-L6-v2'
 
 
 # Fonction pour enregistrer les métriques dans un fichier centralisé
 def save_monitoring_entry(script_name, data):
-    if os.path.exists(MONITORING_FILE):
-        with open(MONITORING_FILE, "r", encoding="utf-8") as f:
-            monitoring = json.load(f)
-    else:
-        monitoring = {"entries": []}
-
-    timestamp = datetime.now().isoformat()
-    entry = {
-        "timestamp": timestamp,
-        "script": script_name,
-        **data
-    }
-    monitoring["entries"].append(entry)
+    append_monitoring_entry(script_name, data, MONITORING_FILE)
+
+# Modèle SentenceTransformer, chargé au premier besoin
+_model = None
 
-    with open(MONITORING_FILE, "w", encoding="utf-8") as f:
-        json.dump(monitoring, f, indent=4)
 
-# Charger le modèle SentenceTransformer
-logging.info("Chargement du modèle SentenceTransformer.")
-model = SentenceTransformer('all-MiniLM-L6-v2')
+def get_model():
+    global _model
+    if _model is None:
+        if MODEL_SERVER_URL:
+            # Le serveur de modèles partage une seule copie des poids entre les scripts
+            _model = RemoteEmbeddingModel(MODEL_NAME)
+        else:
+            # sentence-transformers (et torch) ne sont importés que sans serveur de modèles
+            from sentence_transformers import SentenceTransformer
+
+            logging.info("Chargement du modèle SentenceTransformer.")
+            _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
 
 # Liste de mots-clés
 keyword_list = [
@@ -68,69 +81,109 @@ keyword_list = [
     "AI for Cybersecurity", "AI Deployment"
 ]
 
-# Embeddings des mots-clés
-logging.info("Encodage des mots-clés.")
-keyword_embeddings = model.encode(keyword_list, convert_to_tensor=True)
-
 # Paramètres
 MAX_KEYWORDS = 10
 SIMILARITY_THRESHOLD = 0.8
 
 
+def keywords_model_id():
+    """Clé des résultats dans le cache d'enrichissement (modèle, liste de mots-clés, paramètres)."""
+    list_hash = hashlib.sha256("\n".join(keyword_list).encode("utf-8")).hexdigest()[:16]
+    return f"{MODEL_NAME}:{list_hash}:{SIMILARITY_THRESHOLD}:{MAX_KEYWORDS}"
+
+
+def rank_keywords(scores, candidates, threshold):
+    """Retourne les MAX_KEYWORDS candidats les plus similaires parmi ceux qui dépassent le seuil."""
+    scores = np.asarray(scores, dtype=np.float32)
+    ranked = [i for i in np.argsort(-scores, kind="stable") if scores[i] > threshold]
+    return [candidates[i] for i in ranked[:MAX_KEYWORDS]]
+
+
 # Fonction d'extraction
 def extract_keywords(text, embeddings, candidates, threshold):
     if not text or not text.strip():
         return []
-    text_embedding = model.encode(text, convert_to_tensor=True)
+    from sentence_transformers import util
+
+    text_embedding = encode_batched(get_model(), [text])
     cosine_scores = util.cos_sim(text_embedding, embeddings)[0]
+    return rank_keywords(cosine_scores.cpu().numpy(), candidates, threshold)
+
+
+def main():
+    start_time = datetime.now()
+    if not os.path.exists(JSON_FILE):
+        logging.error(f"Fichier {JSON_FILE} introuvable.")
+        return
+
+    # Traitement par lots : les résumés sont encodés ensemble, ceux déjà vus sont lus dans le cache
+    logging.info(f"Extraction des mots-clés des articles de {JSON_FILE} par lots de {STREAM_CHUNK_SIZE}.")
+    total_articles = 0
+    keywords_total = 0
+    processed = 0
+    computed = 0
+    extraction_duration = 0.0
+    cache = None
+    candidate_embeddings = None
+
+    with EnrichmentCache() as results_cache, JsonlWriter(JSON_FILE) as writer:
+        for articles in iter_chunks(iter_records(JSON_FILE)):
+            with_abstract = [article for article in articles if (article.get("abstract") or "").strip()]
+            for article in articles:
+                article["keywords"] = ""
+
+            abstracts = [article["abstract"] for article in with_abstract]
+            extraction_start = time.perf_counter()
+            # Un résumé déjà traité avec les mêmes paramètres n'est pas réencodé
+            keywords = results_cache.get_many("keywords", keywords_model_id(), abstracts)
+            missing = [i for i, result in enumerate(keywords) if result is None]
+            if missing:
+                if cache is None:
+                    candidate_embeddings = load_candidate_embeddings(get_model(), MODEL_NAME, keyword_list)
+                    cache = EmbeddingCache.for_model(MODEL_NAME)
+                scores = cache.embed(get_model(), [abstracts[i] for i in missing]) @ candidate_embeddings.T
+                extracted = [rank_keywords(row, keyword_list, SIMILARITY_THRESHOLD) for row in scores]
+                results_cache.put_many("keywords", keywords_model_id(), [abstracts[i] for i in missing], extracted)
+                for i, new_keywords in zip(missing, extracted):
+                    keywords[i] = new_keywords
+            for article, new_keywords in zip(with_abstract, keywords):
+                article["keywords"] = ";".join(new_keywords)
+            extraction_duration += time.perf_counter() - extraction_start
+            writer.write_many(articles)
+
+            total_articles += len(articles)
+            keywords_total += sum(len(a.get("keywords", "").split(";")) for a in articles)
+            processed += len(with_abstract)
+            computed += len(missing)
+
+    if cache is not None:
+        cache.save()
+
+    articles_per_second = processed / extraction_duration if extraction_duration > 0 else 0
+    logging.info(
+        f"{processed} résumé(s) traité(s) ({articles_per_second:.1f} articles/s, "
+        f"{processed - computed} liste(s) reprise(s) du cache)."
+    )
+    logging.info(f"{total_articles} articles sauvegardés dans {JSON_FILE}.")
+
+    # Monitoring
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+    empty_abstracts = total_articles - processed
+    average_keywords = keywords_total / total_articles if total_articles else 0
+
+    monitoring_data = {
+        "duration_seconds": round(duration, 2),
+        "scientific_articles_count": total_articles,
+        "empty_abstracts_count": empty_abstracts,
+        "average_keywords_per_scientific_article": round(average_keywords, 2),
+        "articles_per_second": round(articles_per_second, 2),
+        "keywords_cache_hits": processed - computed
+    }
+
+    save_monitoring_entry("extract_scientific_keywords", monitoring_data)
+    logging.info("Monitoring mis à jour dans monitoring.json.")
+
 
-    # Crée une liste de tuples (score, index) pour faciliter le tri
-    scored_candidates = [(cosine_scores[i], candidates[i]) for i in range(len(candidates))]
-
-    # Filtre les termes dont le score est supérieur au seuil
-    filtered_scored_candidates = [item for item in scored_candidates if item[0] > threshold]
-
-    # Trie les termes filtrés par score de similarité décroissant
-    sorted_filtered_candidates = sorted(filtered_scored_candidates, key=lambda item: item[0], reverse=True)
-
-    # Retourne les MAX_KEYWORDS premiers termes (si la liste n'est pas vide)
-    return [term for score, term in sorted_filtered_candidates[:MAX_KEYWORDS]]
-
-
-# Chargement des articles
-logging.info(f"Chargement des articles depuis {JSON_FILE}.")
-if os.path.exists(JSON_FILE):
-    with open(JSON_FILE, "r", encoding="utf-8") as json_file:
-        articles = json.load(json_file)
-else:
-    logging.error(f"Fichier {JSON_FILE} introuvable.")
-    articles = []
-
-# Traitement
-logging.info("Extraction des mots-clés pour chaque article.")
-for article in articles:
-    abstract = article.get("abstract", "")
-    new_keywords = extract_keywords(abstract, keyword_embeddings, keyword_list, SIMILARITY_THRESHOLD)
-    article["keywords"] = ";".join(new_keywords)
-
-# Sauvegarde
-logging.info(f"Sauvegarde dans {JSON_FILE}.")
-with open(JSON_FILE, "w", encoding="utf-8") as json_file:
-    json.dump(articles, json_file, ensure_ascii=False, indent=4)
-
-# Monitoring
-end_time = datetime.now()
-duration = (end_time - start_time).total_seconds()
-total_articles = len(articles)
-empty_abstracts = sum(1 for a in articles if not (a.get("abstract", "") or"").strip())
-average_keywords = sum(len(a.get("keywords", "").split(";")) for a in articles) / total_articles if total_articles else 0
-
-monitoring_data = {
-    "duration_seconds": round(duration, 2),
-    "scientific_articles_count": total_articles,
-    "empty_abstracts_count": empty_abstracts,
-    "average_keywords_per_scientific_article": round(average_keywords, 2)
-}
-
-save_monitoring_entry("extract_scientific_keywords", monitoring_data)
-logging.info("Monitoring mis à jour dans monitoring.json.")
+if __name__ == "__main__":
+    main()
@@ -1,129 +1,196 @@
-import json
 import logging
 import os
+import sys
 from datetime import datetime
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from summarization_engine import summary_max_length
+from summarizers import BART_MODEL, choose_backend
+from enrichment_cache import EnrichmentCache
+from model_client import MODEL_SERVER_URL, RemoteSummarizer
+from monitoring_file import append_monitoring_entry
+from jsonl_io import JsonlWriter, iter_records, iter_chunks
+from near_duplicates import remember_canonical, copy_from_canonical
 
 # Configurer le modèle Hugging Face
-MODEL_NAME = "facebook/bart-large-cnn"
+MODEL_NAME = BART_MODEL
 
 # Configurer le logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Fichiers
-JSON_FILE = "articles.json"
+JSON_FILE = "articles.jsonl"
 MONITORING_FILE = "monitoring.json"
 
-# Timer début
-start_time = datetime.now()
 
-logging.info("Chargement du modèle Hugging Face...")
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+def load_summarizer(backend_name):
+    """Backend local, ou exécuté par le serveur de modèles si MODEL_SERVER_URL est défini."""
+    if MODEL_SERVER_URL:
+        return RemoteSummarizer(backend_name)
+    # Les modèles locaux ne sont chargés que sans serveur de modèles
+    from summarizers import get_summarizer
+    return get_summarizer(backend_name)
 
 
 # Fonction de résumé
 def generate_summary(content, max_length=200, min_length=50):
     logging.info("Début de la génération du résumé.")
-    inputs = tokenizer(
-        content,
-        return_tensors="pt",
-        truncation=True,
-        max_length=1024
-    )
-    summary_ids = model.generate(
-        inputs.input_ids,
-        max_length=max_length,
-        min_length=min_length,
-        length_penalty=2.0,
-        num_beams=4,
-        early_stopping=True
-    )
-    summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+    summary, = load_summarizer("bart").summarize([content], [max_length], min_length=min_length)
+    if summary is None:
+        raise RuntimeError("La génération du résumé a échoué.")
     logging.info("Résumé généré avec succès.")
     return summary
 
 
 # Fonction pour enregistrer les métriques dans un fichier unique
 def save_monitoring_entry(script_name, data):
-    if os.path.exists(MONITORING_FILE):
-        with open(MONITORING_FILE, "r", encoding="utf-8") as f:
-            monitoring = json.load(f)
-    else:
-        monitoring = {"entries": []}
-
-    timestamp = datetime.now().isoformat()
-    entry = {
-        "timestamp": timestamp,
-        "script": script_name,
-        **data
-    }
-    monitoring["entries"].append(entry)
+    append_monitoring_entry(script_name, data, MONITORING_FILE)
 
-    with open(MONITORING_FILE, "w", encoding="utf-8") as f:
-        json.dump(monitoring, f, indent=4)
 
+def needs_summary(article):
+    """Vrai si l'article n'a pas encore de résumé exploitable."""
+    return article.get("summary") in [None, "", "No summary available."]
 
-# Fonction principale
-def main():
-    try:
-        with open(JSON_FILE, "r", encoding="utf-8") as file:
-            articles = json.load(file)
-        logging.info(f"{len(articles)} articles chargés depuis {JSON_FILE}.")
-    except FileNotFoundError:
-        logging.error(f"Le fichier {JSON_FILE} est introuvable.")
-        return
-    except json.JSONDecodeError:
-        logging.error(f"Erreur lors du chargement du fichier {JSON_FILE}.")
-        return
 
-    total_articles = len(articles)
+def summarize_articles(articles, cache, backend_counts, canonical_summaries=None):
+    """
+    Résume les articles d'un lot qui n'ont pas de résumé.
+
+    Un quasi-doublon (`duplicate_of`, voir near_duplicates.py) reçoit le résumé
+    de son article canonique, conservé dans `canonical_summaries` d'un lot à
+    l'autre ; il n'est soumis au modèle que si le canonique n'a pas de résumé.
+
+    :return: Tuple (résumés générés, contenus vides, résumés recopiés)
+    """
+    canonical_summaries = {} if canonical_summaries is None else canonical_summaries
     empty_contents = 0
-    summaries_generated = 0
+    pending = []
+    duplicates = []
 
     for article in articles:
-        if article.get("summary") not in [None, "", "No summary available."]:
+        if not needs_summary(article):
             continue
 
-        full_content = article.get("full_content", "")
+        full_content = article.get("full_content") or ""
         if not full_content.strip():
             empty_contents += 1
             continue
+        if article.get("duplicate_of"):
+            duplicates.append(article)
+            continue
+        pending.append(article)
+
+    summaries_generated = summarize_pending(pending, cache, backend_counts)
+
+    # Le canonique précède ses doublons dans le fichier : son résumé est connu à ce stade
+    for article in articles:
+        if not needs_summary(article):
+            remember_canonical(canonical_summaries, article, "summary")
+    orphans = [article for article in duplicates if not copy_from_canonical(canonical_summaries, article, "summary")]
+    summaries_generated += summarize_pending(orphans, cache, backend_counts)
+
+    return summaries_generated, empty_contents, len(duplicates) - len(orphans)
 
-        try:
-            word_count = len(full_content.split())
-            if word_count < 300:
-                max_length = 100
-            elif word_count < 1000:
-                max_length = 200
-            else:
-                max_length = 300
 
-            summary = generate_summary(full_content, max_length=max_length)
+def summarize_pending(pending, cache, backend_counts):
+    """Résume `pending` par backend ; retourne le nombre de résumés générés."""
+    # Les articles sont répartis entre backends (source, longueur), puis résumés par lots
+    by_backend = {}
+    for article in pending:
+        by_backend.setdefault(choose_backend(article), []).append(article)
+
+    summaries_generated = 0
+    for backend_name, backend_articles in by_backend.items():
+        summarizer = load_summarizer(backend_name)
+        contents = [article["full_content"] for article in backend_articles]
+
+        # Seuls les contenus nouveaux ou modifiés sont soumis au modèle
+        summaries = cache.get_many("summary", summarizer.model_id, contents)
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        logging.info(
+            f"Backend {backend_name} : {len(backend_articles)} article(s), "
+            f"{len(backend_articles) - len(missing)} résumé(s) lu(s) dans le cache."
+        )
+        if missing:
+            generated = summarizer.summarize(
+                [contents[i] for i in missing],
+                [summary_max_length(len(contents[i].split())) for i in missing]
+            )
+            cache.put_many("summary", summarizer.model_id, [contents[i] for i in missing], generated)
+            for i, summary in zip(missing, generated):
+                summaries[i] = summary
+
+        for article, summary in zip(backend_articles, summaries):
+            if summary is None:
+                logging.error(f"Aucun résumé généré pour l'article '{article.get('title', 'Sans titre')}'.")
+                continue
             article["summary"] = summary
             summaries_generated += 1
-        except Exception as e:
-            logging.error(f"Erreur lors de la génération du résumé pour l'article '{article.get('title', 'Sans titre')}': {e}")
+            backend_counts[backend_name] = backend_counts.get(backend_name, 0) + 1
 
+    return summaries_generated
+
+
+# Fonction principale
+def main():
+    start_time = datetime.now()
+    if not os.path.exists(JSON_FILE):
+        logging.error(f"Le fichier {JSON_FILE} est introuvable.")
+        return
+
+    total_articles = 0
+    empty_contents = 0
+    summaries_generated = 0
+    summary_words = 0
+    backend_counts = {}
+    canonical_summaries = {}
+    summaries_copied = 0
+
+    # Le fichier est lu et réécrit par lots de STREAM_CHUNK_SIZE articles
     try:
-        with open(JSON_FILE, "w", encoding="utf-8") as file:
-            json.dump(articles, file, ensure_ascii=False, indent=4)
-        logging.info(f"Fichier {JSON_FILE} mis à jour avec les résumés.")
-    except Exception as e:
-        logging.error(f"Erreur lors de la sauvegarde du fichier : {e}")
+        with EnrichmentCache() as cache, JsonlWriter(JSON_FILE) as writer:
+            for articles in iter_chunks(iter_records(JSON_FILE)):
+                generated, empty, copied = summarize_articles(articles, cache, backend_counts, canonical_summaries)
+                writer.write_many(articles)
+
+                total_articles += len(articles)
+                summaries_generated += generated
+                empty_contents += empty
+                summaries_copied += copied
+                summary_words += sum(len(a.get("summary", "").split()) for a in articles if a.get("summary"))
+            cache_hits = cache.hits
+        logging.info(f"Fichier {JSON_FILE} mis à jour avec les résumés ({total_articles} articles).")
+    except ValueError as e:
+        logging.error(f"Erreur lors du chargement du fichier {JSON_FILE} : {e}")
+        return
 
     # Monitoring
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
-    average_summary_length = sum(len(a.get("summary", "").split()) for a in articles if a.get("summary")) / summaries_generated if summaries_generated else 0
+    average_summary_length = summary_words / summaries_generated if summaries_generated else 0
 
     monitoring_data = {
         "duration_seconds": round(duration, 2),
         "articles_count": total_articles,
         "empty_full_content_count": empty_contents,
         "summaries_generated": summaries_generated,
-        "average_summary_word_count": round(average_summary_length, 2)
+        "average_summary_word_count": round(average_summary_length, 2),
+        "summaries_by_backend": backend_counts,
+        "summary_cache_hits": cache_hits,
+        "near_duplicate_summaries_copied": summaries_copied
     }
+    # Statistiques du moteur BART local ; en mode distant, le serveur de modèles les tient pour tous ses clients
+    if not MODEL_SERVER_URL:
+        engine = load_summarizer("bart").engine
+        monitoring_data.update({
+            "summary_batches": engine.stats["batches"],
+            "chunked_articles": engine.stats["chunked_texts"],
+            "tokens_per_second": round(engine.tokens_per_second(), 1)
+        })
 
     save_monitoring_entry("generate_summaries", monitoring_data)
     logging.info("Monitoring mis à jour dans monitoring.json.")
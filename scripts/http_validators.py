@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import date, timedelta
+
+# Dossier persistant entre deux exécutions du pipeline (mis en cache par GitHub Actions)
+PIPELINE_CACHE_DIR = os.getenv("PIPELINE_CACHE_DIR", ".pipeline_cache")
+VALIDATORS_FILE = os.path.join(PIPELINE_CACHE_DIR, "http_validators.json")
+
+# Dernier corps complet de chaque flux, rejoué sur un 304 (dossier voisin du fichier des validateurs)
+FEED_BODIES_DIRNAME = "feeds"
+
+# Les URL absentes des flux depuis ce nombre de jours sont oubliées
+HTTP_VALIDATOR_MAX_AGE_DAYS = int(os.getenv("HTTP_VALIDATOR_MAX_AGE_DAYS", 90))
+
+
+class ValidatorStore:
+    """
+    Mémorise, par URL, les validateurs HTTP (ETag, Last-Modified), la taille
+    et le corps de la dernière réponse complète.
+
+    Les flux sont redemandés en requête conditionnelle (If-None-Match /
+    If-Modified-Since) ; sur un 304, leur dernier corps est relu, si bien
+    qu'un flux inchangé produit les mêmes éléments qu'à la collecte
+    précédente (les fichiers de sortie ne sont pas conservés entre deux
+    exécutions de la CI, le dossier du cache l'est). Les pages d'articles ne sont reconnues, sans nouvelle
+    requête, qu'une fois leur article chargé en base par insert_json.py
+    (`mark_ingested`) : un article collecté mais jamais chargé est recollecté.
+    """
+
+    def __init__(self, path=VALIDATORS_FILE, entries=None):
+        self.path = path
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path=VALIDATORS_FILE):
+        """Charge le magasin depuis le disque (vide si le fichier est absent ou illisible)."""
+        entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    entries = json.load(file)
+            except (IOError, json.JSONDecodeError) as e:
+                logging.warning(f"Validateurs HTTP illisibles, ils seront recréés : {e}")
+        return cls(path, entries)
+
+    def save(self):
+        """Écrit le magasin de façon atomique, après avoir oublié les URL trop anciennes."""
+        if not self.path:
+            return
+        # Les entrées écrites entre-temps par une autre collecte (processus parallèle) sont conservées
+        on_disk = ValidatorStore.load(self.path).entries
+        self.entries = {**on_disk, **self.entries}
+        threshold = (date.today() - timedelta(days=HTTP_VALIDATOR_MAX_AGE_DAYS)).isoformat()
+        expired = [url for url, entry in self.entries.items() if entry.get("seen_at", "") < threshold]
+        for url in expired:
+            del self.entries[url]
+            try:
+                os.remove(self.body_path(url))
+            except FileNotFoundError:
+                pass
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(self.entries, file, ensure_ascii=False)
+        os.replace(temporary_path, self.path)
+        logging.info(f"{len(self.entries)} validateur(s) HTTP enregistré(s) dans {self.path}.")
+
+    def __contains__(self, url):
+        return url in self.entries
+
+    def request_headers(self, url):
+        """En-têtes conditionnels à joindre à une requête vers `url` (vide si inconnue)."""
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body_path(self, url):
+        """Fichier du dernier corps complet de `url` (None sans fichier de validateurs)."""
+        if not self.path:
+            return None
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(os.path.dirname(self.path) or ".", FEED_BODIES_DIRNAME, name)
+
+    def cached_body(self, url):
+        """Corps (octets) de la dernière réponse complète de `url`, ou None s'il n'a pas été mémorisé."""
+        path = self.body_path(url)
+        if url not in self.entries or not path or not os.path.exists(path):
+            return None
+        with open(path, "rb") as file:
+            return file.read()
+
+    def is_ingested(self, url):
+        """Vrai si l'article de la page `url` a été chargé en base lors d'une exécution précédente."""
+        return self.entries.get(url, {}).get("ingested", False)
+
+    def mark_ingested(self, urls):
+        """Marque les pages dont l'article vient d'être chargé en base (avec un contenu complet)."""
+        today = date.today().isoformat()
+        for url in urls:
+            self.entries[url] = {**self.entries.get(url, {}), "ingested": True, "seen_at": today}
+
+    def update(self, url, response):
+        """Enregistre les validateurs, la taille et le corps d'une réponse complète (200)."""
+        path = self.body_path(url)
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(response.content)
+            os.replace(temporary_path, path)
+        self.entries[url] = {
+            **self.entries.get(url, {}),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "length": len(response.content),
+            "seen_at": date.today().isoformat(),
+        }
+
+    def touch(self, url):
+        """Marque une URL comme toujours présente (304 ou lien déjà connu)."""
+        if url in self.entries:
+            self.entries[url]["seen_at"] = date.today().isoformat()
@@ -133,3 +133,116 @@ ADD COLUMN alert_criteria TEXT;
 
 
 
+-- Index de pagination par curseur (publication_date, id)
+CREATE INDEX idx_articles_publication ON articles (publication_date, id);
+CREATE INDEX idx_videos_publication ON videos (publication_date, id);
+CREATE INDEX idx_scientific_articles_publication ON scientific_articles (publication_date, id);
+
+-- Mots-clés normalisés : dictionnaire et tables de liaison
+-- (les lignes existantes sont migrées avec `python scripts/migrate_keywords.py`)
+CREATE TABLE keywords (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  name VARCHAR(255) NOT NULL,
+  CONSTRAINT unique_keyword_name UNIQUE (name)
+);
+
+CREATE TABLE article_keywords (
+  article_id INT NOT NULL,
+  keyword_id INT NOT NULL,
+  PRIMARY KEY (article_id, keyword_id),
+  INDEX idx_article_keywords_keyword (keyword_id, article_id),
+  FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
+  FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE
+);
+
+CREATE TABLE video_keywords (
+  video_id INT NOT NULL,
+  keyword_id INT NOT NULL,
+  PRIMARY KEY (video_id, keyword_id),
+  INDEX idx_video_keywords_keyword (keyword_id, video_id),
+  FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
+  FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE
+);
+
+CREATE TABLE scientific_article_keywords (
+  scientific_article_id INT NOT NULL,
+  keyword_id INT NOT NULL,
+  PRIMARY KEY (scientific_article_id, keyword_id),
+  INDEX idx_scientific_article_keywords_keyword (keyword_id, scientific_article_id),
+  FOREIGN KEY (scientific_article_id) REFERENCES scientific_articles(id) ON DELETE CASCADE,
+  FOREIGN KEY (keyword_id) REFERENCES keywords(id) ON DELETE CASCADE
+);
+
+-- Cumul quotidien des mots-clés par type de contenu (tendances et métriques)
+-- (rempli par `python scripts/migrate_keywords.py`, puis tenu à jour par l'ingestion et le nettoyage)
+CREATE TABLE keyword_daily_counts (
+  day DATE NOT NULL,
+  keyword VARCHAR(255) NOT NULL,
+  content_type VARCHAR(30) NOT NULL,
+  count INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (content_type, day, keyword),
+  INDEX idx_keyword_daily_counts_keyword (content_type, keyword, day)
+);
+
+-- Génération des données, incrémentée à chaque ingestion pour invalider le cache de l'API
+CREATE TABLE cache_generation (
+  id TINYINT PRIMARY KEY,
+  generation BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO cache_generation (id, generation) VALUES (1, 0);
+
+-- Tableaux de bord précalculés, partagés par les utilisateurs aux préférences identiques
+CREATE TABLE dashboard_snapshots (
+  preferences_hash CHAR(64) NOT NULL,
+  limit_count INT NOT NULL,
+  days_range INT NOT NULL,
+  generation BIGINT NOT NULL,
+  payload LONGTEXT NOT NULL,
+  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (preferences_hash, limit_count, days_range)
+);
+
+-- Date de dernière modification des contenus (étapes incrémentales du pipeline)
+ALTER TABLE articles
+  ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD INDEX idx_articles_updated (updated_at);
+ALTER TABLE videos
+  ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD INDEX idx_videos_updated (updated_at);
+ALTER TABLE scientific_articles
+  ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD INDEX idx_scientific_articles_updated (updated_at);
+
+-- Repères des étapes du pipeline (dernière date de publication, dernier id, début de la dernière exécution réussie)
+CREATE TABLE pipeline_watermarks (
+  stage VARCHAR(50) NOT NULL,
+  scope VARCHAR(255) NOT NULL,
+  last_publication_date DATE,
+  last_id INT NOT NULL DEFAULT 0,
+  last_run_at DATETIME,
+  PRIMARY KEY (stage, scope)
+);
+
+-- Index plein texte de la recherche (route /search) ; les mots de 2 lettres (« AI ») demandent innodb_ft_min_token_size = 2
+ALTER TABLE articles ADD FULLTEXT INDEX ft_articles (title, summary, full_content, keywords);
+ALTER TABLE videos ADD FULLTEXT INDEX ft_videos (title, description, keywords);
+ALTER TABLE scientific_articles ADD FULLTEXT INDEX ft_scientific_articles (title, abstract, keywords);
+
+-- Contenus similaires précalculés après chaque ingestion (scripts/build_related_content.py)
+CREATE TABLE related_content (
+  content_type VARCHAR(32) NOT NULL,
+  content_id INT NOT NULL,
+  rank_position TINYINT NOT NULL,
+  related_type VARCHAR(32) NOT NULL,
+  related_id INT NOT NULL,
+  score FLOAT NOT NULL,
+  PRIMARY KEY (content_type, content_id, rank_position)
+);
+
+-- Unicité des entrées de monitoring_logs (INSERT IGNORE de scripts/insert_json.py et scripts/database_cleanup.py) :
+-- les doublons d'une base existante sont supprimés (la plus ancienne ligne est gardée) avant d'ajouter la contrainte
+DELETE duplicate FROM monitoring_logs duplicate
+JOIN monitoring_logs kept
+  ON kept.timestamp = duplicate.timestamp AND kept.script = duplicate.script AND kept.id < duplicate.id;
+ALTER TABLE monitoring_logs ADD CONSTRAINT unique_monitoring_entry UNIQUE (timestamp, script);
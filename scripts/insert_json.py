@@ -1,9 +1,23 @@
 import mysql.connector
 import json
+import argparse
 import os
+import sys
+import time
 from dotenv import load_dotenv
 from datetime import datetime
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from keyword_store import sync_keywords, refresh_daily_counts
+from cache_generation import bump_cache_generation
+from jsonl_io import iter_records, iter_chunks
+from watermarks import load_watermarks, save_watermarks, advance, is_recent
+from http_validators import ValidatorStore
+
 # Charger les variables d'environnement
 load_dotenv()
 
@@ -12,6 +26,9 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
+# Nombre d'enregistrements écrits (et validés) par lot
+INSERT_CHUNK_SIZE = int(os.getenv("INSERT_CHUNK_SIZE", 1000))
+
 
 # Connexion à la base de données
 def connect_to_database():
@@ -67,115 +84,243 @@ def load_json_file(file_path):
         return []
 
 
-# Insérer ou mettre à jour les données
-def insert_or_update_data(table_name, data, connection):
-    cursor = connection.cursor()
-    inserted = 0
-    updated = 0
+# Lire un fichier JSONL (ou tableau JSON) enregistrement par enregistrement
+def stream_json_file(file_path):
+    if not os.path.exists(file_path):
+        print(f"Le fichier {file_path} n'existe pas.")
+        return
+    count = 0
+    try:
+        for item in iter_records(file_path):
+            count += 1
+            # Normalisation des dates pour les formats articles / scientifiques / vidéos
+            if "publication_date" in item:
+                item["publication_date"] = normalize_date_format(item["publication_date"])
+            yield item
+    except ValueError as e:
+        print(f"Erreur de décodage JSON dans {file_path} : {e}")
+    print(f"{count} enregistrements lus depuis {file_path}.")
+
+
+# Colonnes écrites par table et colonne identifiant un enregistrement du JSON
+UPSERT_TABLES = {
+    "articles": ("link", [
+        "title", "source", "publication_date", "summary", "full_content", "language", "link", "author", "keywords"
+    ]),
+    "scientific_articles": ("external_id", [
+        "title", "authors", "publication_date", "abstract", "article_url", "external_id", "keywords", "source"
+    ]),
+    "videos": ("video_url", [
+        "title", "description", "publication_date", "source", "video_url", "channel_name", "channel_id"
+    ]),
+}
+
+MONITORING_COLUMNS = [
+    "timestamp", "script", "duration_seconds",
+    "articles_count", "empty_full_content_count", "average_keywords_per_article",
+    "summaries_generated", "average_summary_word_count",
+    "scientific_articles_count", "empty_abstracts_count", "average_keywords_per_scientific_article"
+]
+
+
+def build_upsert_query(table_name):
+    """INSERT ... ON DUPLICATE KEY UPDATE de toutes les colonnes sauf la clé de l'enregistrement."""
+    key_column, columns = UPSERT_TABLES[table_name]
+    updates = ", ".join(f"{column} = VALUES({column})" for column in columns if column != key_column)
+    return f"""
+        INSERT INTO {table_name} ({", ".join(columns)})
+        VALUES ({", ".join(["%s"] * len(columns))})
+        ON DUPLICATE KEY UPDATE {updates}
+    """
+
+
+def fetch_existing(cursor, table_name, key_column, keys):
+    """Retourne {clé: (id, publication_date, keywords)} des enregistrements déjà présents, en une requête."""
+    if not keys:
+        return {}
+    placeholders = ", ".join(["%s"] * len(keys))
+    cursor.execute(
+        f"SELECT {key_column}, id, publication_date, keywords FROM {table_name} WHERE {key_column} IN ({placeholders})",
+        keys
+    )
+    return {key: (row_id, publication_date, keywords) for key, row_id, publication_date, keywords in cursor.fetchall()}
+
+
+def keywords_changed(item, existing_row):
+    """Vrai si l'enregistrement est nouveau ou si sa date ou ses mots-clés diffèrent de la ligne existante."""
+    if existing_row is None:
+        return True
+    _, publication_date, keywords = existing_row
+    return (
+        (str(publication_date) if publication_date else None) != item.get("publication_date")
+        or (keywords or "") != (item.get("keywords") or "")
+    )
+
+
+def fetch_stored_values(cursor, table_name, key_column, keys):
+    """Retourne {clé: {colonne: valeur}} des colonnes écrites par l'upsert, pour les enregistrements présents."""
+    if not keys:
+        return {}
+    columns = UPSERT_TABLES[table_name][1]
+    placeholders = ", ".join(["%s"] * len(keys))
+    cursor.execute(
+        f"SELECT {key_column}, {', '.join(columns)} FROM {table_name} WHERE {key_column} IN ({placeholders})",
+        keys
+    )
+    return {row[0]: dict(zip(columns, row[1:])) for row in cursor.fetchall()}
+
+
+def comparable(value):
+    """Valeur comparable entre le JSON et la base (date -> 'AAAA-MM-JJ', chaîne vide -> None)."""
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def record_changed(item, stored, columns):
+    """Vrai si l'une des colonnes écrites par l'upsert diffère de la ligne enregistrée (ou si elle est absente)."""
+    if stored is None:
+        return True
+    return any(comparable(item.get(column)) != comparable(stored.get(column)) for column in columns)
+
 
-    if table_name == "articles":
-        query_check = "SELECT COUNT(*) FROM articles WHERE link = %s"
-        query_insert = """
-            INSERT INTO articles (title, source, publication_date, summary,
-            full_content, language, link, author, keywords)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        query_update = """
-            UPDATE articles SET title = %s, source = %s, publication_date = %s,
-            summary = %s, full_content = %s, language = %s, author = %s, keywords = %s
-            WHERE link = %s
-        """
-    elif table_name == "scientific_articles":
-        query_check = "SELECT COUNT(*) FROM scientific_articles WHERE external_id = %s"
-        query_insert = """
-            INSERT INTO scientific_articles (title, authors, publication_date,
-            abstract, article_url, external_id, keywords, source)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        query_update = """
-            UPDATE scientific_articles SET title = %s, authors = %s, publication_date = %s,
-            abstract = %s, keywords = %s, source = %s, article_url = %s
-            WHERE external_id = %s
-        """
-    elif table_name == "videos":
-        query_check = "SELECT COUNT(*) FROM videos WHERE video_url = %s"
-        query_insert = """
-            INSERT INTO videos (title, description, publication_date, source,
-            video_url, channel_name, channel_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        query_update = """
-            UPDATE videos SET title = %s, description = %s, publication_date = %s,
-            source = %s, channel_name = %s, channel_id = %s
-            WHERE video_url = %s
-        """
-    else:
+def watermark_scope(table_name, item):
+    """Périmètre du repère d'ingestion : une source d'une table."""
+    return f"{table_name}:{item.get('source') or ''}"
+
+
+# Insérer ou mettre à jour les données
+def insert_or_update_data(
+    table_name, data, connection, chunk_size=INSERT_CHUNK_SIZE, watermarks=None, full=False, validators=None
+):
+    """
+    Charge les enregistrements (liste ou flux) par lots de `chunk_size` : une
+    lecture des lignes existantes, un INSERT ... ON DUPLICATE KEY UPDATE groupé
+    (executemany), la synchronisation des mots-clés et du cumul quotidien, puis
+    un commit par lot.
+
+    Avec `watermarks` (repères de l'étape "insert", voir watermarks.py), les
+    enregistrements publiés avant le repère de leur source (moins la marge)
+    sont ignorés s'ils sont déjà en base avec les mêmes valeurs pour toutes les
+    colonnes écrites, sauf si `full` ; un
+    enregistrement absent de la base est toujours chargé, même ancien. Les
+    repères sont avancés après le dernier lot.
+
+    Avec `validators` (voir http_validators.py), les pages des articles chargés
+    avec un contenu complet sont marquées comme connues après le commit de leur
+    lot : les scripts de collecte ne les redemanderont plus.
+    """
+    if table_name not in UPSERT_TABLES:
         print(f"Table inconnue : {table_name}")
         return
 
-    for item in data:
-        unique_key = None
-        if table_name == "articles":
-            unique_key = item.get("link")
-        elif table_name == "scientific_articles":
-            unique_key = item.get("external_id")
-        elif table_name == "videos":
-            unique_key = item.get("video_url")
-
-        if not unique_key:
-            print(f"Enregistrement ignoré (clé unique manquante) : {item}")
+    key_column, columns = UPSERT_TABLES[table_name]
+    skipped = 0
+
+    def records():
+        nonlocal skipped
+        for item in data:
+            if not item.get(key_column):
+                print(f"Enregistrement ignoré (clé unique manquante) : {item}")
+                continue
+            yield item
+
+    def is_old(item, existing_row):
+        """Enregistrement déjà en base et antérieur au repère de sa source (moins la marge)."""
+        if watermarks is None or full or existing_row is None:
+            return False
+        return not is_recent(item.get("publication_date"), watermarks.get(watermark_scope(table_name, item)))
+
+    cursor = connection.cursor()
+    query_upsert = build_upsert_query(table_name)
+    inserted = 0
+    updated = 0
+    links = 0
+    total = 0
+    new_watermarks = {}
+    start = time.perf_counter()
+
+    # `data` peut être un flux (fichier JSONL) : seul le lot courant est en mémoire
+    for chunk in iter_chunks(records(), chunk_size):
+        existing = fetch_existing(
+            cursor, table_name, key_column, list(dict.fromkeys(item[key_column] for item in chunk))
+        )
+        # Seuls les enregistrements déjà en base peuvent être écartés : un contenu découvert tardivement est chargé,
+        # et un ancien enregistrement dont une colonne a changé (titre, résumé...) est réécrit
+        old_keys = list(dict.fromkeys(
+            item[key_column] for item in chunk if is_old(item, existing.get(item[key_column]))
+        ))
+        stored = fetch_stored_values(cursor, table_name, key_column, old_keys)
+        kept = [
+            item for item in chunk
+            if item[key_column] not in stored or record_changed(item, stored[item[key_column]], columns)
+        ]
+        skipped += len(chunk) - len(kept)
+        chunk = kept
+        if not chunk:
             continue
+        total += len(chunk)
+        keys = list(dict.fromkeys(item[key_column] for item in chunk))
+        existing = {key: existing[key] for key in keys if key in existing}
+
+        cursor.executemany(query_upsert, [tuple(item.get(column) for column in columns) for item in chunk])
+        # Une ligne identique n'est pas réécrite : 0 ligne affectée si le lot n'apporte aucun changement
+        affected = cursor.rowcount
+
+        # Identifiants des nouvelles lignes, relus en une requête pour les liaisons mot-clé
+        new_keys = [key for key in keys if key not in existing]
+        ids = {key: row[0] for key, row in existing.items()}
+        ids.update({key: row[0] for key, row in fetch_existing(cursor, table_name, key_column, new_keys).items()})
+
+        # Seuls les contenus nouveaux, ou dont la date ou les mots-clés ont changé, touchent les liaisons
+        changed = [item for item in chunk if keywords_changed(item, existing.get(item[key_column]))]
+
+        # Les vidéos n'ont pas de mots-clés générés : leurs liaisons ne sont écrites que si le JSON en fournit
+        keyword_rows = [
+            (ids.get(item[key_column]), item.get("keywords"))
+            for item in changed
+            if table_name != "videos" or item.get("keywords")
+        ]
+        # Jours dont le cumul quotidien des mots-clés doit être recalculé (ancienne et nouvelle date)
+        touched_days = {item.get("publication_date") for item in changed}
+        touched_days.update(
+            existing[item[key_column]][1] for item in changed if item[key_column] in existing
+        )
 
-        cursor.execute(query_check, (unique_key,))
-        exists = cursor.fetchone()[0] > 0
-
-        if exists:
-            if table_name == "articles":
-                cursor.execute(query_update, (
-                    item.get("title"), item.get("source"), item.get("publication_date"),
-                    item.get("summary"), item.get("full_content"), item.get("language"),
-                    item.get("author"), item.get("keywords"), unique_key
-                ))
-            elif table_name == "scientific_articles":
-                cursor.execute(query_update, (
-                    item.get("title"), item.get("authors"), item.get("publication_date"),
-                    item.get("abstract"), item.get("keywords"), item.get("source"),
-                    item.get("article_url"), unique_key
-                ))
-            elif table_name == "videos":
-                cursor.execute(query_update, (
-                    item.get("title"), item.get("description"), item.get("publication_date"),
-                    item.get("source"), item.get("channel_name"), item.get("channel_id"),
-                    unique_key
-                ))
-            updated += 1
-        else:
-            if table_name == "articles":
-                cursor.execute(query_insert, (
-                    item.get("title"), item.get("source"), item.get("publication_date"),
-                    item.get("summary"), item.get("full_content"), item.get("language"),
-                    unique_key, item.get("author"), item.get("keywords")
-                ))
-            elif table_name == "scientific_articles":
-                cursor.execute(query_insert, (
-                    item.get("title"), item.get("authors"), item.get("publication_date"),
-                    item.get("abstract"), item.get("article_url"), unique_key,
-                    item.get("keywords"), item.get("source")
-                ))
-            elif table_name == "videos":
-                cursor.execute(query_insert, (
-                    item.get("title"), item.get("description"), item.get("publication_date"),
-                    item.get("source"), unique_key, item.get("channel_name"), item.get("channel_id")
-                ))
-            inserted += 1
-
-    connection.commit()
-    print(f"Table {table_name} : {inserted} enregistrements insérés, {updated} enregistrements mis à jour.")
+        # Mise à jour des tables de liaison mot-clé et du cumul quotidien dans la transaction du lot
+        links += sync_keywords(cursor, table_name, keyword_rows)
+        refresh_daily_counts(cursor, table_name, touched_days)
+        if affected or changed:
+            bump_cache_generation(cursor)
+        connection.commit()
+        if validators is not None and table_name == "articles":
+            validators.mark_ingested(item["link"] for item in chunk if item.get("full_content"))
+
+        inserted += len(new_keys)
+        updated += len(existing)
+        for item in chunk:
+            scope = watermark_scope(table_name, item)
+            current = new_watermarks.get(scope) or (watermarks or {}).get(scope)
+            new_watermarks[scope] = advance(current, item.get("publication_date"), ids.get(item[key_column]))
+
+    # Les repères ne sont avancés qu'une fois tous les lots validés
+    if watermarks is not None:
+        save_watermarks(cursor, "insert", new_watermarks)
+        connection.commit()
+        watermarks.update(new_watermarks)
+
+    duration = time.perf_counter() - start
+    rate = total / duration if duration > 0 else 0
+    print(
+        f"Table {table_name} : {inserted} enregistrements insérés, {updated} enregistrements mis à jour, "
+        f"{links} liaisons mot-clé écrites en {duration:.1f} s ({rate:.0f} lignes/s)"
+        + (f", {skipped} enregistrements antérieurs au repère, déjà en base et inchangés, ignorés." if skipped else ".")
+    )
     cursor.close()
 
 
 # Insertion dans monitoring_logs
-def insert_monitoring_logs(data, connection):
+def insert_monitoring_logs(data, connection, chunk_size=INSERT_CHUNK_SIZE):
     cursor = connection.cursor()
     inserted = 0
 
@@ -183,70 +328,63 @@ def insert_monitoring_logs(data, connection):
     if isinstance(data, dict) and 'entries' in data:
         data = data['entries']
 
+    rows = []
     for entry in data:
-        timestamp = entry.get("timestamp")
-        script = entry.get("script")
-
-        if not timestamp or not script:
+        if not entry.get("timestamp") or not entry.get("script"):
             print(f"Entrée ignorée (timestamp ou script manquant) : {entry}")
             continue
+        rows.append(tuple(entry.get(column) for column in MONITORING_COLUMNS))
+
+    # Les entrées déjà chargées sont écartées par la contrainte unique (timestamp, script)
+    query = f"""
+        INSERT IGNORE INTO monitoring_logs ({", ".join(MONITORING_COLUMNS)})
+        VALUES ({", ".join(["%s"] * len(MONITORING_COLUMNS))})
+    """
+    for chunk_start in range(0, len(rows), chunk_size):
+        cursor.executemany(query, rows[chunk_start:chunk_start + chunk_size])
+        inserted += max(cursor.rowcount, 0)
+        connection.commit()
 
-        cursor.execute("""
-            SELECT COUNT(*) FROM monitoring_logs WHERE timestamp = %s AND script = %s
-        """, (timestamp, script))
-        if cursor.fetchone()[0] > 0:
-            continue
-
-        cursor.execute("""
-            INSERT INTO monitoring_logs (
-                timestamp, script, duration_seconds,
-                articles_count, empty_full_content_count, average_keywords_per_article,
-                summaries_generated, average_summary_word_count,
-                scientific_articles_count, empty_abstracts_count, average_keywords_per_scientific_article
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            timestamp,
-            script,
-            entry.get("duration_seconds"),
-            entry.get("articles_count"),
-            entry.get("empty_full_content_count"),
-            entry.get("average_keywords_per_article"),
-            entry.get("summaries_generated"),
-            entry.get("average_summary_word_count"),
-            entry.get("scientific_articles_count"),
-            entry.get("empty_abstracts_count"),
-            entry.get("average_keywords_per_scientific_article")
-        ))
-
-        inserted += 1
-
-    connection.commit()
     print(f"Table monitoring_logs : {inserted} entrées insérées.")
     cursor.close()
 
 
 # Fonction principale
 def main():
+    parser = argparse.ArgumentParser(description="Charge les fichiers JSONL du pipeline dans la base de données.")
+    parser.add_argument("--full", action="store_true", help="Recharger tous les enregistrements, sans tenir compte des repères")
+    args = parser.parse_args()
+
     connection = connect_to_database()
     if not connection:
         print("Impossible de se connecter à la base de données. Fin du programme.")
         return
 
     json_files_and_tables = {
-        "articles.json": "articles",
-        "arxiv_articles.json": "scientific_articles",
-        "videos.json": "videos",
+        "articles.jsonl": "articles",
+        "arxiv_articles.jsonl": "scientific_articles",
+        "videos.jsonl": "videos",
         "monitoring.json": "monitoring_logs"
     }
 
+    # Repères de la dernière ingestion réussie, par table et par source
+    cursor = connection.cursor()
+    watermarks = load_watermarks(cursor, "insert")
+    cursor.close()
+    # Pages d'articles chargés en base, que la collecte suivante ne redemandera pas
+    validators = ValidatorStore.load()
+
     for json_file, table_name in json_files_and_tables.items():
         print(f"Traitement de {json_file}...")
-        data = load_json_file(json_file)
         if table_name == "monitoring_logs":
-            insert_monitoring_logs(data, connection)
+            insert_monitoring_logs(load_json_file(json_file), connection)
         else:
-            insert_or_update_data(table_name, data, connection)
+            insert_or_update_data(
+                table_name, stream_json_file(json_file), connection,
+                watermarks=watermarks, full=args.full, validators=validators
+            )
 
+    validators.save()
     print("Fin du traitement des fichiers JSON.")
 
 
@@ -0,0 +1,165 @@
+"""
+Format d'échange entre les étapes du pipeline : JSON Lines (un enregistrement par ligne).
+
+Les fichiers sont lus et écrits enregistrement par enregistrement, sans charger
+le fichier entier : la mémoire utilisée ne dépend pas de sa taille. Les
+anciens fichiers (tableau JSON) restent lisibles et se convertissent avec :
+
+    python scripts/jsonl_io.py articles.json articles.jsonl
+"""
+import os
+import json
+import logging
+import argparse
+
+# Taille des lectures lors du décodage d'un tableau JSON (caractères)
+READ_BUFFER_SIZE = 1 << 16
+
+# Nombre d'enregistrements traités ensemble par les étapes d'enrichissement
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", 500))
+
+
+def iter_json_array(file, buffer_size=READ_BUFFER_SIZE):
+    """Décode un tableau JSON élément par élément depuis un fichier texte ouvert."""
+    decoder = json.JSONDecoder()
+    # Les lectures se poursuivent jusqu'au premier caractère significatif (le tampon peut ne contenir que des blancs)
+    buffer = ""
+    while not buffer:
+        chunk = file.read(buffer_size)
+        if not chunk:
+            break
+        buffer = chunk.lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Le fichier ne contient pas un tableau JSON.")
+    buffer = buffer[1:]
+    eof = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if buffer.startswith(","):
+            buffer = buffer[1:].lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Élément incomplet : la lecture suivante double au moins le tampon
+            chunk = file.read(max(buffer_size, len(buffer)))
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield item
+        buffer = buffer[end:]
+
+
+def iter_records(path):
+    """
+    Enregistrements d'un fichier JSONL ou d'un tableau JSON, lus un à un.
+
+    Le format est détecté au premier caractère significatif du fichier.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        first = file.read(1)
+        while first and first.isspace():
+            first = file.read(1)
+        file.seek(0)
+
+        if first == "[":
+            yield from iter_json_array(file)
+            return
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}, ligne {line_number} : JSON invalide ({e})") from e
+
+
+def iter_chunks(records, size=STREAM_CHUNK_SIZE):
+    """Regroupe un itérable d'enregistrements en listes d'au plus `size` éléments."""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class JsonlWriter:
+    """
+    Écrit des enregistrements JSONL dans un fichier temporaire, renommé sur
+    `path` à la sortie du bloc `with` si aucune erreur n'est survenue.
+
+    Un fichier peut ainsi être réécrit pendant qu'il est lu : l'original reste
+    intact jusqu'au renommage, et en cas d'échec.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.temporary_path = f"{path}.tmp"
+        self.count = 0
+        self.file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.file = open(self.temporary_path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.temporary_path, self.path)
+        else:
+            os.remove(self.temporary_path)
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str))
+        self.file.write("\n")
+        self.count += 1
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+
+def write_records(path, records):
+    """Écrit un itérable d'enregistrements dans `path` (JSONL) et retourne leur nombre."""
+    with JsonlWriter(path) as writer:
+        writer.write_many(records)
+    return writer.count
+
+
+def append_records(path, records):
+    """Ajoute des enregistrements à la fin d'un fichier JSONL (créé au besoin) et retourne leur nombre."""
+    count = 0
+    with open(path, "a", encoding="utf-8") as file:
+        for record in records:
+            file.write(json.dumps(record, ensure_ascii=False, default=str))
+            file.write("\n")
+            count += 1
+    return count
+
+
+def convert(source, destination):
+    """Convertit un fichier JSON (tableau) ou JSONL en JSONL."""
+    count = write_records(destination, iter_records(source))
+    logging.info(f"{count} enregistrement(s) écrit(s) de {source} vers {destination}.")
+    return count
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Fichier JSON (tableau) ou JSONL")
+    parser.add_argument("destination", help="Fichier JSONL produit")
+    args = parser.parse_args()
+    convert(args.source, args.destination)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import os
+import sys
+import logging
+
+# Rend le paquet app importable quel que soit le répertoire courant
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Table de liaison et clé étrangère de chaque table de contenu, partagées avec les filtres de l'API
+from app.keywords import KEYWORD_LINK_TABLES
+
+# Longueur maximale d'un mot-clé (colonne keywords.name)
+MAX_KEYWORD_LENGTH = 255
+
+# Nombre de contenus traités par requête de synchronisation
+SYNC_CHUNK_SIZE = 1000
+
+
+def split_keywords(value):
+    """Découpe une valeur de mots-clés (chaîne séparée par des ';' ou liste) en liste dédoublonnée."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")
+
+    keywords = []
+    seen = set()
+    for keyword in value:
+        keyword = (keyword or "").strip()[:MAX_KEYWORD_LENGTH]
+        # Le dictionnaire est insensible à la casse (collation MySQL par défaut)
+        if keyword and keyword.casefold() not in seen:
+            seen.add(keyword.casefold())
+            keywords.append(keyword)
+    return keywords
+
+
+def get_keyword_ids(cursor, names):
+    """Insère les mots-clés manquants dans le dictionnaire et retourne {nom normalisé: id}."""
+    names = list({name.casefold(): name for name in names}.values())
+    if not names:
+        return {}
+
+    cursor.executemany("INSERT IGNORE INTO keywords (name) VALUES (%s)", [(name,) for name in names])
+
+    placeholders = ", ".join(["%s"] * len(names))
+    cursor.execute(f"SELECT id, name FROM keywords WHERE name IN ({placeholders})", names)
+    keyword_ids = {row_name.casefold(): keyword_id for keyword_id, row_name in _rows_as_tuples(cursor, ("id", "name"))}
+
+    # Les variantes accentuées sont confondues par la collation : on les rattache individuellement
+    for name in names:
+        if name.casefold() not in keyword_ids:
+            cursor.execute("SELECT id FROM keywords WHERE name = %s", (name,))
+            row = _rows_as_tuples(cursor, ("id",))
+            if row:
+                keyword_ids[name.casefold()] = row[0][0]
+    return keyword_ids
+
+
+def sync_keywords(cursor, table_name, rows):
+    """
+    Remplace les liaisons mot-clé des contenus donnés.
+
+    :param table_name: Table de contenu (articles, videos ou scientific_articles)
+    :param rows: Liste de tuples (id du contenu, mots-clés ';'-séparés ou liste)
+    :return: Nombre de liaisons insérées
+    """
+    rows = [(content_id, split_keywords(keywords)) for content_id, keywords in rows if content_id]
+    return sum(
+        _sync_keyword_chunk(cursor, table_name, rows[start:start + SYNC_CHUNK_SIZE])
+        for start in range(0, len(rows), SYNC_CHUNK_SIZE)
+    )
+
+
+def _sync_keyword_chunk(cursor, table_name, rows):
+    """Remplace les liaisons mot-clé d'un lot de contenus déjà découpés."""
+    link_table, foreign_key = KEYWORD_LINK_TABLES[table_name]
+    keyword_ids = get_keyword_ids(cursor, [keyword for _, keywords in rows for keyword in keywords])
+
+    content_ids = [content_id for content_id, _ in rows]
+    placeholders = ", ".join(["%s"] * len(content_ids))
+    cursor.execute(f"DELETE FROM {link_table} WHERE {foreign_key} IN ({placeholders})", content_ids)
+
+    links = {
+        (content_id, keyword_ids[keyword.casefold()])
+        for content_id, keywords in rows
+        for keyword in keywords
+        if keyword.casefold() in keyword_ids
+    }
+    if links:
+        cursor.executemany(
+            f"INSERT INTO {link_table} ({foreign_key}, keyword_id) VALUES (%s, %s)",
+            sorted(links)
+        )
+    logging.debug(f"{len(links)} liaison(s) mot-clé écrite(s) dans {link_table}.")
+    return len(links)
+
+
+def refresh_daily_counts(cursor, table_name, days):
+    """
+    Recalcule la table de cumul `keyword_daily_counts` pour les jours donnés d'un type de contenu.
+
+    Seuls les jours touchés par une ingestion ou une suppression sont recalculés,
+    à partir des tables de liaison : le cumul reste exact même si un contenu
+    change de mots-clés ou de date.
+
+    :return: Nombre de lignes de cumul écrites
+    """
+    link_table, foreign_key = KEYWORD_LINK_TABLES[table_name]
+    # Les dates peuvent venir du JSON (chaînes) ou de la base (date) : normalisation en YYYY-MM-DD
+    days = sorted({str(day) for day in days if day})
+    written = 0
+
+    for start in range(0, len(days), SYNC_CHUNK_SIZE):
+        chunk = days[start:start + SYNC_CHUNK_SIZE]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(
+            f"DELETE FROM keyword_daily_counts WHERE content_type = %s AND day IN ({placeholders})",
+            [table_name] + chunk
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO keyword_daily_counts (day, keyword, content_type, count)
+            SELECT c.publication_date, k.name, %s, COUNT(*)
+            FROM {table_name} c
+            JOIN {link_table} kl ON kl.{foreign_key} = c.id
+            JOIN keywords k ON k.id = kl.keyword_id
+            WHERE c.publication_date IN ({placeholders})
+            GROUP BY c.publication_date, k.name
+            """,
+            [table_name] + chunk
+        )
+        written += cursor.rowcount
+    return written
+
+
+def rebuild_daily_counts(cursor, table_name):
+    """Reconstruit entièrement le cumul quotidien d'un type de contenu (migration ou réparation)."""
+    cursor.execute(f"SELECT DISTINCT publication_date FROM {table_name} WHERE publication_date IS NOT NULL")
+    days = [row[0] for row in _rows_as_tuples(cursor, ("publication_date",))]
+    cursor.execute("DELETE FROM keyword_daily_counts WHERE content_type = %s", (table_name,))
+    return refresh_daily_counts(cursor, table_name, days)
+
+
+def _rows_as_tuples(cursor, columns):
+    """Lit le résultat courant en tuples, que le curseur soit en mode dictionnaire ou non."""
+    return [
+        tuple(row[column] for column in columns) if isinstance(row, dict) else tuple(row)
+        for row in cursor.fetchall()
+    ]
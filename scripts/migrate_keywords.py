@@ -0,0 +1,86 @@
+import os
+import sys
+import logging
+import mysql.connector
+from dotenv import load_dotenv
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from keyword_store import KEYWORD_LINK_TABLES, sync_keywords, rebuild_daily_counts
+from cache_generation import bump_cache_generation
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_NAME = os.getenv("DB_NAME")
+
+# Nombre de lignes lues et migrées par transaction
+BATCH_SIZE = 1000
+
+# Configuration des logs
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def connect_to_database():
+    """Établit une connexion à la base de données MySQL."""
+    return mysql.connector.connect(
+        host=DB_HOST,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME
+    )
+
+
+def migrate_table(connection, table_name):
+    """Remplit la table de liaison mot-clé d'une table de contenu à partir de sa colonne `keywords`."""
+    cursor = connection.cursor()
+    last_id = 0
+    migrated = 0
+    links = 0
+
+    # Parcours par plages d'identifiants pour garder des transactions courtes
+    while True:
+        cursor.execute(
+            f"SELECT id, keywords FROM {table_name} WHERE id > %s ORDER BY id LIMIT %s",
+            (last_id, BATCH_SIZE)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            break
+
+        links += sync_keywords(cursor, table_name, rows)
+        connection.commit()
+
+        migrated += len(rows)
+        last_id = rows[-1][0]
+
+    # Reconstruction du cumul quotidien utilisé par les tendances et les métriques
+    daily_counts = rebuild_daily_counts(cursor, table_name)
+    bump_cache_generation(cursor)
+    connection.commit()
+
+    cursor.close()
+    logging.info(
+        f"Table {table_name} : {migrated} ligne(s) migrée(s), {links} liaison(s) mot-clé, "
+        f"{daily_counts} ligne(s) de cumul quotidien."
+    )
+
+
+def main():
+    """Migre les mots-clés ';'-séparés existants vers les tables normalisées et le cumul quotidien."""
+    connection = connect_to_database()
+    try:
+        for table_name in KEYWORD_LINK_TABLES:
+            migrate_table(connection, table_name)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
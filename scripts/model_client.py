@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import httpx
+import numpy as np
+
+# Adresse du serveur de modèles (http://hôte:port ou unix:///chemin/du/socket) ; vide = modèles chargés localement
+MODEL_SERVER_URL = os.getenv("MODEL_SERVER_URL", "")
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", 1800))
+
+
+class ModelServerClient:
+    """Client HTTP du serveur de modèles (scripts/model_server.py)."""
+
+    def __init__(self, url=MODEL_SERVER_URL, http_client=None):
+        if http_client is not None:
+            self.http = http_client
+        elif url.startswith("unix://"):
+            self.http = httpx.Client(
+                base_url="http://model-server",
+                transport=httpx.HTTPTransport(uds=url[len("unix://"):]),
+                timeout=MODEL_SERVER_TIMEOUT
+            )
+        else:
+            self.http = httpx.Client(base_url=url, timeout=MODEL_SERVER_TIMEOUT)
+
+    def post(self, path, payload):
+        response = self.http.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def health(self):
+        response = self.http.get("/health")
+        response.raise_for_status()
+        return response.json()
+
+    def wait_until_ready(self, timeout=60.0):
+        """Attend que le serveur réponde (démarrage en arrière-plan)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.health()
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        logging.info(f"Utilisation du serveur de modèles {MODEL_SERVER_URL}.")
+        _client = ModelServerClient()
+    return _client
+
+
+class RemoteEmbeddingModel:
+    """Équivalent distant de `SentenceTransformer.encode` (sortie numpy uniquement)."""
+
+    def __init__(self, model_name, client=None):
+        self.model_name = model_name
+        self.client = client or get_client()
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True, show_progress_bar=False):
+        single = isinstance(texts, str)
+        payload = {"model": self.model_name, "texts": [texts] if single else list(texts)}
+        vectors = np.asarray(self.client.post("/embed", payload)["embeddings"], dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+class RemoteSummarizer:
+    """Backend de résumé exécuté par le serveur de modèles (même interface que summarizers.py)."""
+
+    def __init__(self, name, client=None):
+        self.name = name
+        self.client = client or get_client()
+        self._model_id = None
+
+    @property
+    def model_id(self):
+        if self._model_id is None:
+            response = self.client.http.get(f"/summarizers/{self.name}")
+            response.raise_for_status()
+            self._model_id = response.json()["model_id"]
+        return self._model_id
+
+    def summarize(self, texts, max_lengths, min_length=50):
+        payload = {"backend": self.name, "texts": list(texts), "max_lengths": list(max_lengths), "min_length": min_length}
+        return self.client.post("/summarize", payload)["summaries"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifie que le serveur de modèles répond.")
+    parser.add_argument("--wait", type=float, default=0, help="Délai d'attente maximal (secondes)")
+    args = parser.parse_args()
+    if not MODEL_SERVER_URL:
+        logging.error("MODEL_SERVER_URL n'est pas défini.")
+        sys.exit(1)
+    print(ModelServerClient().wait_until_ready(args.wait))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Serveur d'inférence local partagé par les scripts d'enrichissement.
+
+Les modèles (SentenceTransformer, backends de résumé) sont chargés une seule
+fois, au premier appel, puis servis en HTTP (TCP local ou socket Unix). Les
+requêtes arrivant dans une courte fenêtre sont regroupées en un seul lot par
+modèle (micro-batching), quel que soit le script qui les envoie :
+
+    python scripts/model_server.py --uds /tmp/veille_models.sock
+    MODEL_SERVER_URL=unix:///tmp/veille_models.sock python scripts/generate_keywords.py
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Fenêtre de regroupement des requêtes (millisecondes) et taille maximale d'un lot (textes)
+MODEL_SERVER_BATCH_WINDOW_MS = float(os.getenv("MODEL_SERVER_BATCH_WINDOW_MS", 20))
+MODEL_SERVER_MAX_BATCH_ITEMS = int(os.getenv("MODEL_SERVER_MAX_BATCH_ITEMS", 256))
+MODEL_SERVER_HOST = os.getenv("MODEL_SERVER_HOST", "127.0.0.1")
+MODEL_SERVER_PORT = int(os.getenv("MODEL_SERVER_PORT", 8765))
+
+Job = namedtuple("Job", ["key", "items", "future"])
+
+
+class MicroBatcher:
+    """
+    Regroupe les requêtes concurrentes en lots par clé (modèle et paramètres).
+
+    `run_batch(key, items)` s'exécute dans un thread dédié (un seul lot à la
+    fois : les modèles utilisent déjà tous les cœurs) et retourne un résultat
+    par élément ; chaque appelant reçoit la tranche correspondant à ses éléments.
+    """
+
+    def __init__(self, run_batch, window_ms=MODEL_SERVER_BATCH_WINDOW_MS, max_items=MODEL_SERVER_MAX_BATCH_ITEMS):
+        self.run_batch = run_batch
+        self.window = window_ms / 1000
+        self.max_items = max_items
+        self.queue = None
+        self.worker = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-server")
+        self.stats = {"requests": 0, "batches": 0, "items": 0, "seconds": 0.0}
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.worker = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.worker.cancel()
+        try:
+            await self.worker
+        except asyncio.CancelledError:
+            pass
+        self.executor.shutdown(wait=False)
+
+    async def submit(self, key, items):
+        """Ajoute des éléments à traiter et attend leurs résultats."""
+        self.stats["requests"] += 1
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(Job(key, list(items), future))
+        return await future
+
+    async def collect(self):
+        """Attend une requête, puis celles qui arrivent pendant la fenêtre de regroupement."""
+        loop = asyncio.get_running_loop()
+        jobs = [await self.queue.get()]
+        count = len(jobs[0].items)
+        deadline = loop.time() + self.window
+        while count < self.max_items:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                job = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            jobs.append(job)
+            count += len(job.items)
+        return jobs
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            groups = {}
+            for job in await self.collect():
+                groups.setdefault(job.key, []).append(job)
+
+            for key, group in groups.items():
+                items = [item for job in group for item in job.items]
+                start = time.perf_counter()
+                try:
+                    results = await loop.run_in_executor(self.executor, self.run_batch, key, items)
+                except Exception as e:
+                    logging.error(f"Erreur lors du traitement d'un lot {key} : {e}")
+                    for job in group:
+                        if not job.future.done():
+                            job.future.set_exception(e)
+                    continue
+
+                duration = time.perf_counter() - start
+                self.stats["batches"] += 1
+                self.stats["items"] += len(items)
+                self.stats["seconds"] += duration
+                logging.info(f"Lot {key[0]} : {len(group)} requête(s), {len(items)} texte(s) en {duration:.2f} s.")
+
+                offset = 0
+                for job in group:
+                    if not job.future.done():
+                        job.future.set_result(results[offset:offset + len(job.items)])
+                    offset += len(job.items)
+
+
+# Modèles chargés par le serveur (une seule copie des poids par hôte)
+_embedding_models = {}
+
+
+def get_embedding_model(model_name):
+    if model_name not in _embedding_models:
+        from sentence_transformers import SentenceTransformer
+        logging.info(f"Chargement du modèle SentenceTransformer {model_name}...")
+        _embedding_models[model_name] = SentenceTransformer(model_name)
+    return _embedding_models[model_name]
+
+
+def run_model_batch(key, items):
+    """Exécute un lot sur le modèle désigné par la clé ("embed", modèle) ou ("summarize", backend, min_length)."""
+    if key[0] == "embed":
+        vectors = get_embedding_model(key[1]).encode(items, convert_to_numpy=True, show_progress_bar=False)
+        return vectors.tolist()
+
+    from summarizers import get_summarizer
+    _, backend, min_length = key
+    texts, max_lengths = zip(*items)
+    return get_summarizer(backend).summarize(list(texts), list(max_lengths), min_length=min_length)
+
+
+def summarizer_model_id(backend):
+    from summarizers import get_summarizer
+    return get_summarizer(backend).model_id
+
+
+class EmbedRequest(BaseModel):
+    model: str
+    texts: List[str]
+
+
+class SummarizeRequest(BaseModel):
+    backend: str
+    texts: List[str]
+    max_lengths: List[int]
+    min_length: int = Field(50, ge=0)
+
+
+def create_app(run_batch=run_model_batch, model_id=summarizer_model_id):
+    """Application FastAPI du serveur ; `run_batch` et `model_id` sont remplaçables (tests)."""
+    batcher = MicroBatcher(run_batch)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        batcher.start()
+        yield
+        await batcher.stop()
+
+    app = FastAPI(title="Serveur de modèles Veille IA", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "embedding_models": list(_embedding_models), **batcher.stats}
+
+    @app.post("/embed")
+    async def embed(request: EmbedRequest):
+        if not request.texts:
+            return {"embeddings": []}
+        embeddings = await batcher.submit(("embed", request.model), request.texts)
+        return {"embeddings": embeddings}
+
+    @app.get("/summarizers/{backend}")
+    async def summarizer_info(backend: str):
+        try:
+            return {"backend": backend, "model_id": model_id(backend)}
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    @app.post("/summarize")
+    async def summarize(request: SummarizeRequest):
+        if len(request.texts) != len(request.max_lengths):
+            raise HTTPException(status_code=422, detail="texts et max_lengths doivent avoir la même longueur.")
+        if not request.texts:
+            return {"summaries": []}
+        try:
+            summaries = await batcher.submit(
+                ("summarize", request.backend, request.min_length), zip(request.texts, request.max_lengths)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return {"summaries": summaries}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=MODEL_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=MODEL_SERVER_PORT)
+    parser.add_argument("--uds", help="Chemin d'un socket Unix (remplace --host/--port)")
+    args = parser.parse_args()
+
+    if args.uds:
+        uvicorn.run(create_app(), uds=args.uds, log_level="warning")
+    else:
+        uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import json
+import time
+from datetime import datetime
+
+# Fichier de monitoring partagé par les scripts du pipeline (chargé par insert_json.py)
+MONITORING_FILE = "monitoring.json"
+
+# Âge (secondes) à partir duquel un verrou est considéré comme abandonné (processus interrompu) et repris
+LOCK_STALE_AFTER = 30.0
+# Attente maximale d'un verrou actif (secondes) : au-delà, l'écriture échoue
+LOCK_TIMEOUT = 60.0
+
+
+def acquire_lock(lock_path, timeout=LOCK_TIMEOUT, stale_after=LOCK_STALE_AFTER):
+    """
+    Crée le fichier verrou `lock_path`, en attendant qu'il soit libéré.
+
+    Un verrou plus ancien que `stale_after` secondes (date de modification)
+    est supprimé puis recréé par l'appelant ; sinon, l'attente dépassant
+    `timeout` secondes lève TimeoutError.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return
+        except FileExistsError:
+            pass
+
+        try:
+            if time.time() - os.path.getmtime(lock_path) > stale_after:
+                os.remove(lock_path)
+                continue
+        except FileNotFoundError:
+            # Verrou libéré entre-temps
+            continue
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Le verrou {lock_path} est occupé depuis plus de {timeout:.0f} s.")
+        time.sleep(0.05)
+
+
+def append_monitoring_entry(script_name, data, path=MONITORING_FILE):
+    """
+    Ajoute une entrée horodatée au fichier de monitoring.
+
+    Plusieurs étapes du pipeline s'exécutent en parallèle : la lecture et
+    l'écriture du fichier sont protégées par un fichier verrou, et l'écriture
+    est atomique.
+    """
+    lock_path = f"{path}.lock"
+    acquire_lock(lock_path)
+    # Le verrou n'est supprimé (finally) que par l'appel qui l'a créé
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                monitoring = json.load(f)
+        else:
+            monitoring = {"entries": []}
+
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "script": script_name,
+            **data
+        }
+        monitoring["entries"].append(entry)
+
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(monitoring, f, indent=4)
+        os.replace(temporary_path, path)
+    finally:
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,210 @@
+"""
+Détection des quasi-doublons d'articles (même dépêche reprise par plusieurs
+sources), avant les étapes d'enrichissement :
+
+    python scripts/near_duplicates.py
+
+Chaque `full_content` est découpé en shingles (suites de SHINGLE_SIZE mots),
+résumés par une signature MinHash de NUM_PERMUTATIONS valeurs. La signature est
+coupée en NUM_BANDS bandes : deux articles partageant une bande sont candidats,
+retenus si leur similarité de Jaccard estimée atteint NEAR_DUPLICATE_THRESHOLD.
+Les paires retenues sont regroupées (union-find) ; le premier article de chaque
+groupe dans articles.jsonl est canonique. Les autres reçoivent `duplicate_of`
+(lien du canonique) : generate_summaries.py et generate_keywords.py leur
+recopient les résultats du canonique au lieu d'appeler le modèle.
+"""
+import os
+import re
+import sys
+import zlib
+import logging
+from datetime import datetime
+import numpy as np
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from jsonl_io import JsonlWriter, iter_records
+from monitoring_file import append_monitoring_entry
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+JSON_FILE = "articles.jsonl"
+
+# Nombre de mots par shingle
+SHINGLE_SIZE = 5
+# Taille de la signature MinHash, découpée en NUM_BANDS bandes de NUM_PERMUTATIONS / NUM_BANDS valeurs
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 16
+# Similarité de Jaccard estimée à partir de laquelle deux articles sont des quasi-doublons
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", 0.8))
+
+# Nombre premier supérieur à 2^32 : les permutations sont (a·x + b) mod MERSENNE_PRIME sur des empreintes 32 bits
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def permutations(num_permutations=NUM_PERMUTATIONS, seed=1):
+    """Coefficients (a, b) des fonctions de hachage de la signature, fixés par `seed`."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MAX_HASH, size=num_permutations, dtype=np.uint64)
+    b = rng.integers(0, MAX_HASH, size=num_permutations, dtype=np.uint64)
+    return a, b
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Empreintes 32 bits des suites de `size` mots du texte (en minuscules), sans doublons."""
+    words = WORD_PATTERN.findall((text or "").lower())
+    if len(words) < size:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique(np.fromiter(
+        (zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)),
+        dtype=np.uint64
+    ))
+
+
+def minhash(hashes, coefficients):
+    """
+    Signature MinHash d'un ensemble d'empreintes : pour chaque permutation,
+    le minimum de (a·x + b) mod p, réduit à 32 bits. None si l'ensemble est vide.
+    """
+    if not len(hashes):
+        return None
+    a, b = coefficients
+    # a < 2^32 et x < 2^32 : le produit tient sur 64 bits
+    values = (hashes[:, None] * a[None, :] + b[None, :]) % MERSENNE_PRIME
+    return (values.min(axis=0) & MAX_HASH).astype(np.uint32)
+
+
+def candidate_pairs(signatures, num_bands=NUM_BANDS):
+    """Paires (i, j), i < j, de signatures identiques sur au moins une bande (LSH)."""
+    pairs = set()
+    rows_per_band = signatures.shape[1] // num_bands
+    for band in range(num_bands):
+        buckets = {}
+        columns = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        for row, key in enumerate(columns):
+            buckets.setdefault(key.tobytes(), []).append(row)
+        for rows in buckets.values():
+            for position, first in enumerate(rows):
+                pairs.update((first, second) for second in rows[position + 1:])
+    return pairs
+
+
+def estimated_similarity(signatures, first, second):
+    """Similarité de Jaccard estimée : part des valeurs égales des deux signatures."""
+    return float(np.mean(signatures[first] == signatures[second]))
+
+
+def find_root(parents, row):
+    """Racine du groupe de `row` (union-find avec compression des chemins)."""
+    while parents[row] != row:
+        parents[row] = parents[parents[row]]
+        row = parents[row]
+    return row
+
+
+def cluster(signatures, threshold=NEAR_DUPLICATE_THRESHOLD, num_bands=NUM_BANDS):
+    """
+    Groupes de quasi-doublons : canonique de chaque ligne de `signatures`
+    (la plus petite ligne de son groupe, elle-même si elle n'a pas de doublon).
+    """
+    parents = list(range(len(signatures)))
+    for first, second in sorted(candidate_pairs(signatures, num_bands)):
+        if estimated_similarity(signatures, first, second) < threshold:
+            continue
+        first_root, second_root = find_root(parents, first), find_root(parents, second)
+        # La racine d'un groupe reste sa plus petite ligne : le premier article du fichier
+        if first_root != second_root:
+            parents[max(first_root, second_root)] = min(first_root, second_root)
+    return [find_root(parents, row) for row in range(len(signatures))]
+
+
+def canonical_links(records, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Lien canonique des quasi-doublons d'un itérable d'articles : {lien: lien du
+    canonique}, pour les doublons seulement ; et nombre de doublons par canonique.
+    """
+    coefficients = permutations()
+    links = []
+    signatures = []
+    for article in records:
+        signature = minhash(shingles(article.get("full_content")), coefficients)
+        if signature is not None and article.get("link"):
+            links.append(article["link"])
+            signatures.append(signature)
+
+    if not signatures:
+        return {}, {}
+    roots = cluster(np.vstack(signatures), threshold)
+    duplicates = {links[row]: links[root] for row, root in enumerate(roots) if root != row}
+    counts = {}
+    for canonical in duplicates.values():
+        counts[canonical] = counts.get(canonical, 0) + 1
+    return duplicates, counts
+
+
+def remember_canonical(results, article, field):
+    """Conserve le résultat `field` d'un article canonique pour ses doublons plus loin dans le fichier."""
+    if article.get("near_duplicates") and article.get(field):
+        results[article["link"]] = article[field]
+
+
+def copy_from_canonical(results, article, field):
+    """Recopie dans un doublon le résultat `field` de son canonique ; False si le canonique n'en a pas."""
+    value = results.get(article.get("duplicate_of"))
+    if not value:
+        return False
+    article[field] = value
+    return True
+
+
+def mark_near_duplicates(path=JSON_FILE, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Marque les quasi-doublons de `path` (deux lectures, réécriture en flux).
+
+    :return: Tuple (doublons, articles canoniques ayant des doublons, articles)
+    """
+    duplicates, counts = canonical_links(iter_records(path), threshold)
+    with JsonlWriter(path) as writer:
+        for article in iter_records(path):
+            # Les marques d'une exécution précédente sont recalculées
+            article.pop("duplicate_of", None)
+            article.pop("near_duplicates", None)
+            link = article.get("link")
+            if link in duplicates:
+                article["duplicate_of"] = duplicates[link]
+            elif link in counts:
+                article["near_duplicates"] = counts[link]
+            writer.write(article)
+    return len(duplicates), len(counts), writer.count
+
+
+def main():
+    start_time = datetime.now()
+    if not os.path.exists(JSON_FILE):
+        logging.error(f"Le fichier {JSON_FILE} est introuvable.")
+        return
+
+    duplicates, groups, total_articles = mark_near_duplicates()
+    duration = (datetime.now() - start_time).total_seconds()
+    logging.info(
+        f"{duplicates} quasi-doublon(s) de {groups} article(s) canonique(s) marqué(s) sur {total_articles} "
+        f"article(s) en {duration:.1f} s : ils ne seront pas enrichis par les modèles."
+    )
+    append_monitoring_entry("near_duplicates", {
+        "duration_seconds": round(duration, 2),
+        "articles_count": total_articles,
+        "near_duplicates_count": duplicates,
+        "canonical_articles_count": groups,
+        "duplicate_rate": round(duplicates / total_articles, 4) if total_articles else 0
+    })
+
+
+if __name__ == "__main__":
+    main()
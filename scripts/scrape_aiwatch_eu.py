@@ -1,17 +1,25 @@
 import os
-import requests
+import sys
+import asyncio
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import json
 import logging
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import run
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger()
 
 # URL du flux RSS
 RSS_URL = "https://ai-watch.ec.europa.eu/node/2/rss_en"
+RSS_HOST = "ai-watch.ec.europa.eu"
 
 # Dossier pour les fichiers JSON
 JSON_OUTPUT_DIR = "articles_outputs"
@@ -45,46 +53,43 @@ def save_to_json(articles):
         logger.error(f"Erreur lors de l'écriture du fichier JSON : {e}")
 
 
-def fetch_full_content(url):
+def parse_full_content(html, url):
     """
-    Récupère le contenu complet d'un article à partir de son URL.
+    Extrait le texte d'un article AI Watch.
     """
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
-        }
-        logger.info(f"Récupération du contenu complet de l'article : {url}")
-        response = requests.get(url, headers=headers)
-
-        if response.status_code == 429:
-            logger.warning("Trop de requêtes ! Pause de 60 secondes.")
-            time.sleep(60)
-            return fetch_full_content(url)
-
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        article_body = soup.find("article")
-
-        if not article_body:
-            logger.warning(f"Aucun contenu trouvé pour l'URL {url}.")
-            return None
-
-        paragraphs = [p.get_text(strip=True) for p in article_body.find_all("p")]
-        return "\n".join(paragraphs) if paragraphs else None
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Erreur lors de la récupération de l'article {url} : {e}")
+    soup = BeautifulSoup(html, 'html.parser')
+    article_body = soup.find("article")
+
+    if not article_body:
+        logger.warning(f"Aucun contenu trouvé pour l'URL {url}.")
         return None
 
+    paragraphs = [p.get_text(strip=True) for p in article_body.find_all("p")]
+    return "\n".join(paragraphs) if paragraphs else None
 
-def parse_rss_feed():
+
+async def fetch_full_content(engine, url):
+    """
+    Récupère le contenu complet d'un article à partir de son URL.
+    """
+    logger.info(f"Récupération du contenu complet de l'article : {url}")
+    html = await engine.get_text(url)
+    return parse_full_content(html, url) if html is not None else None
+
+
+async def parse_rss_feed(engine):
     """
     Scrape les articles à partir du flux RSS.
     """
+    # Le site limite le débit (429) : une requête à la fois, espacées de 2 secondes
+    engine.configure_host(RSS_HOST, concurrency=1, delay=2)
+
     articles = []
     try:
         logger.info(f"Scraping du flux RSS à l'URL {RSS_URL}...")
-        response = requests.get(RSS_URL)
-        response.raise_for_status()
+        response = await engine.get(RSS_URL, conditional=True)
+        if response is None:
+            return
         soup = BeautifulSoup(response.content, "xml")
         items = soup.find_all("item")
 
@@ -118,10 +123,7 @@ def parse_rss_feed():
             author = "AI Watch"
             language = "english"
 
-            # Récupérer le contenu complet de l'article
-            full_content = fetch_full_content(link)
-
-            # Préparer les données de l'article
+            # Préparer les données de l'article (contenu complet récupéré ci-dessous)
             article_data = {
                 "title": title,
                 "source": source,
@@ -129,7 +131,7 @@ def parse_rss_feed():
                 "link": link,
                 "author": author,
                 "summary": summary,
-                "full_content": full_content,
+                "full_content": None,
                 "language": language,
             }
 
@@ -137,7 +139,14 @@ def parse_rss_feed():
             articles.append(article_data)
             existing_links.add(link)  # Ajouter le lien à l'ensemble pour éviter les doublons
             logger.info(f"Article ajouté : {title}")
-            time.sleep(2)  # Pause pour éviter trop de requêtes rapides
+
+        # Les pages déjà récupérées lors d'une exécution précédente ne sont pas redemandées
+        articles = [article for article in articles if not engine.skip_known(article["link"])]
+
+        # Récupérer les contenus complets (le moteur espace les requêtes vers l'hôte)
+        contents = await asyncio.gather(*(fetch_full_content(engine, article["link"]) for article in articles))
+        for article, full_content in zip(articles, contents):
+            article["full_content"] = full_content
 
         # Fusionner les articles existants et les nouveaux
         existing_articles.extend(articles)
@@ -149,5 +158,13 @@ def parse_rss_feed():
         logger.error(f"Erreur lors du scraping du flux RSS : {e}")
 
 
+async def scrape(engine):
+    await parse_rss_feed(engine)
+
+
+def main():
+    run(scrape)
+
+
 if __name__ == "__main__":
-    parse_rss_feed()
+    main()
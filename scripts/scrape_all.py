@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+import logging
+import importlib
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import ScrapingEngine
+from http_validators import ValidatorStore
+
+# Configuration des logs
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Scripts de collecte exposant une fonction `async def scrape(engine)`
+SCRAPERS = [
+    "scrape_aiwatch_eu",
+    "scrape_azure_ai",
+    "scrape_digital_strategy_eu_ai",
+    "scrape_mit_technology_review_ai",
+    "scrape_techcommunity_ai",
+    "scrape_techcrunch_ai",
+    "scrape_theverge_ai",
+    "scrape_venturebeat_ai",
+    "scrape_anthropic_videos",
+    "scrape_google_deepmind_videos",
+    "scrape_microsoft_azure_videos",
+    "scrape_mistral_videos",
+    "scrape_openai_videos",
+    "scrape_arxiv_ai",
+]
+
+
+async def run_scraper(engine, name):
+    """Exécute une source et retourne (nom, durée en secondes, erreur éventuelle)."""
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(name)
+        await module.scrape(engine)
+        error = None
+    except Exception as e:
+        logging.error(f"Échec de la collecte {name} : {e}")
+        error = e
+    return name, time.perf_counter() - start, error
+
+
+async def scrape_all(names):
+    """Collecte toutes les sources en parallèle sur un moteur HTTP partagé."""
+    start = time.perf_counter()
+    async with ScrapingEngine(validators=ValidatorStore.load()) as engine:
+        results = await asyncio.gather(*(run_scraper(engine, name) for name in names))
+        engine.log_stats()
+        # Après un échec, les validateurs ne sont pas conservés : la collecte suivante repart du contenu complet
+        if not any(error for _, _, error in results):
+            engine.save_validators()
+
+    for name, duration, error in sorted(results, key=lambda result: result[1], reverse=True):
+        status = "échec" if error else "ok"
+        logging.info(f"{name} : {duration:.1f} s ({status})")
+    logging.info(f"Collecte terminée en {time.perf_counter() - start:.1f} s.")
+    return [name for name, _, error in results if error]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exécute les scripts de collecte en parallèle.")
+    parser.add_argument("--only", nargs="+", choices=SCRAPERS, help="Sources à collecter")
+    parser.add_argument("--exclude", nargs="+", choices=SCRAPERS, default=[], help="Sources à ignorer")
+    args = parser.parse_args()
+
+    names = [name for name in (args.only or SCRAPERS) if name not in args.exclude]
+    failed = asyncio.run(scrape_all(names))
+    if failed:
+        logging.error(f"Sources en échec : {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,27 @@
-import requests
 import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
 import os
+import sys
 import logging
-import json
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import run
+from jsonl_io import append_records
 
 # Configuration des logs
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 
 # Fonction pour parser et récupérer les articles
-def fetch_arxiv_articles():
+async def fetch_arxiv_articles(engine):
     logging.info("Récupération des articles depuis ArXiv...")
     base_url = "http://export.arxiv.org/api/query"
+    # L'API arXiv demande d'espacer les requêtes de 3 secondes
+    engine.configure_host("export.arxiv.org", concurrency=1, delay=3)
     params = {
         "search_query": "all:artificial intelligence",
         "start": 0,
@@ -20,8 +29,10 @@ def fetch_arxiv_articles():
     }
     articles = []
     while True:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()
+        response = await engine.get(base_url, params=dict(params))
+        if response is None:
+            # Échec bloquant, comme auparavant : l'étape de génération des mots-clés en dépend
+            raise RuntimeError(f"Impossible de récupérer les articles ArXiv (start={params['start']}).")
         xml_data = response.text
 
         root = ET.fromstring(xml_data)
@@ -62,29 +73,25 @@ def fetch_arxiv_articles():
     return articles
 
 
-# Fonction pour sauvegarder les articles dans un fichier JSON
+# Fonction pour sauvegarder les articles dans le fichier JSONL (ajout en fin de fichier)
 def save_articles_to_json(articles):
-    json_file_path = "arxiv_articles.json"
-    if os.path.exists(json_file_path):
-        with open(json_file_path, "r", encoding="utf-8") as json_file:
-            existing_data = json.load(json_file)
-    else:
-        existing_data = []
-
-    # Ajouter les nouveaux articles
-    existing_data.extend(articles)
-
-    # Sauvegarder les articles dans le fichier JSON
-    with open(json_file_path, "w", encoding="utf-8") as json_file:
-        json.dump(existing_data, json_file, ensure_ascii=False, indent=4)
-
-    logging.info(f"{len(articles)} articles ont été sauvegardés dans '{json_file_path}'.")
+    json_file_path = "arxiv_articles.jsonl"
+    count = append_records(json_file_path, articles)
+    logging.info(f"{count} articles ont été sauvegardés dans '{json_file_path}'.")
 
 
 # Script principal
-if __name__ == "__main__":
-    articles = fetch_arxiv_articles()
+async def scrape(engine):
+    articles = await fetch_arxiv_articles(engine)
     if articles:
         save_articles_to_json(articles)
     else:
         logging.info("Aucun article collecté.")
+
+
+def main():
+    run(scrape)
+
+
+if __name__ == "__main__":
+    main()
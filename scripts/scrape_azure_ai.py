@@ -1,12 +1,19 @@
 import feedparser
-import requests
-import time
 import os
+import sys
 import json
+import asyncio
 import logging
 from datetime import datetime
 from bs4 import BeautifulSoup
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import run
+
 # Configuration des logs
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -34,35 +41,27 @@ def validate_and_format_date(date_str):
         return None
 
 
-# Récupérer le contenu complet de l'article avec BeautifulSoup
-def fetch_full_content(url, retries=3, delay=5):
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36"
-        }
-        for _ in range(retries):
-            try:
-                response = requests.get(url, headers=headers, timeout=30)
-                if response.status_code != 200:
-                    logger.warning(f"Erreur HTTP {response.status_code} pour l'URL : {url}")
-                    return None
-                soup = BeautifulSoup(response.text, 'html.parser')
-                main_content = soup.find("article") or soup.find("main")
-                if not main_content:
-                    logger.warning(f"Impossible de trouver le contenu principal pour {url}")
-                    return None
-                content = []
-                for tag in ["p", "h2", "h3"]:
-                    for element in main_content.find_all(tag):
-                        text = element.get_text(strip=True)
-                        if text:
-                            content.append(text)
-                return "\n".join(content) if content else None
-            except requests.exceptions.Timeout:
-                logger.warning(f"Timeout lors de la récupération du contenu de {url}. Nouvelle tentative...")
-                time.sleep(delay)
-        logger.error(f"Erreur lors de l'extraction du contenu après plusieurs tentatives : {url}")
+# Extraire le contenu complet de l'article avec BeautifulSoup
+def parse_full_content(html, url):
+    soup = BeautifulSoup(html, 'html.parser')
+    main_content = soup.find("article") or soup.find("main")
+    if not main_content:
+        logger.warning(f"Impossible de trouver le contenu principal pour {url}")
         return None
+    content = []
+    for tag in ["p", "h2", "h3"]:
+        for element in main_content.find_all(tag):
+            text = element.get_text(strip=True)
+            if text:
+                content.append(text)
+    return "\n".join(content) if content else None
+
+
+# Récupérer le contenu complet de l'article (nouvelles tentatives gérées par le moteur)
+async def fetch_full_content(engine, url):
+    try:
+        html = await engine.get_text(url)
+        return parse_full_content(html, url) if html is not None else None
     except Exception as e:
         logger.error(f"Erreur lors de l'extraction du contenu complet : {e}")
         return None
@@ -94,14 +93,11 @@ def save_to_json(data):
 
 
 # Traiter chaque flux RSS
-def process_feed(feed_url):
+async def process_feed(engine, feed_url):
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36"
-        }
-        response = requests.get(feed_url, headers=headers, timeout=30)
-        if response.status_code != 200:
-            logger.error(f"Erreur HTTP {response.status_code} pour le flux RSS : {feed_url}")
+        response = await engine.get(feed_url, conditional=True)
+        if response is None:
+            logger.error(f"Impossible de récupérer le flux RSS : {feed_url}")
             return
 
         feed = feedparser.parse(response.content)
@@ -113,7 +109,6 @@ def process_feed(feed_url):
             author = entry.get("author", "Unknown")
             summary = clean_html_content(entry.get("summary", "No summary available."))
             publication_date = validate_and_format_date(entry.get("published"))
-            full_content = fetch_full_content(link)
 
             article_data = {
                 "title": title,
@@ -121,13 +116,21 @@ def process_feed(feed_url):
                 "author": author,
                 "summary": summary,
                 "publication_date": str(publication_date) if publication_date else None,
-                "full_content": full_content,
+                "full_content": None,
                 "source": "Azure Blog",
                 "language": "english"
             }
 
             articles.append(article_data)
 
+        # Les pages déjà récupérées lors d'une exécution précédente ne sont pas redemandées
+        articles = [article for article in articles if not engine.skip_known(article["link"])]
+
+        # Récupérer simultanément le contenu complet des articles
+        contents = await asyncio.gather(*(fetch_full_content(engine, article["link"]) for article in articles))
+        for article, full_content in zip(articles, contents):
+            article["full_content"] = full_content
+
         # Enregistrer les articles dans le fichier JSON
         save_to_json(articles)
         logger.info(f"Traitement du flux RSS '{feed_url}' terminé.")
@@ -137,10 +140,14 @@ def process_feed(feed_url):
 
 
 # Fonction principale
-def main():
+async def scrape(engine):
     # Flux RSS pour le blog Azure
     azure_feed_url = "https://azure.microsoft.com/en-us/blog/feed/"
-    process_feed(azure_feed_url)
+    await process_feed(engine, azure_feed_url)
+
+
+def main():
+    run(scrape)
 
 
 if __name__ == "__main__":
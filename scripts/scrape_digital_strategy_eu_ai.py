@@ -1,12 +1,19 @@
 import os
-import time
+import sys
 import json
-import requests
+import asyncio
 from bs4 import BeautifulSoup
 from datetime import datetime
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 import logging
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import run
+
 # Configuration des logs
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -56,39 +63,38 @@ def extract_date(article):
     return None
 
 
-def fetch_digital_strategy_content(url):
-    """Récupère et parse le contenu complet d'un article Digital Strategy."""
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
-        }
-        logger.info(f"Récupération de l'article {url}...")
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        main_content = soup.find("div", class_="cnt-main-body")
-
-        if main_content:
-            paragraphs = [p.get_text(strip=True) for p in main_content.find_all("p")]
-            return "\n".join(paragraphs)
-        else:
-            logger.warning(f"Aucun contenu trouvé pour l'URL {url}.")
-            return None
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Erreur lors de la récupération de l'article {url} : {e}")
+def parse_digital_strategy_content(html, url):
+    """Extrait le texte d'un article Digital Strategy."""
+    soup = BeautifulSoup(html, 'html.parser')
+    main_content = soup.find("div", class_="cnt-main-body")
+
+    if main_content:
+        paragraphs = [p.get_text(strip=True) for p in main_content.find_all("p")]
+        return "\n".join(paragraphs)
+    else:
+        logger.warning(f"Aucun contenu trouvé pour l'URL {url}.")
         return None
 
 
-def scrape_page(url):
+async def fetch_digital_strategy_content(engine, url):
+    """Récupère et parse le contenu complet d'un article Digital Strategy."""
+    logger.info(f"Récupération de l'article {url}...")
+    html = await engine.get_text(url)
+    return parse_digital_strategy_content(html, url) if html is not None else None
+
+
+async def scrape_page(engine, url):
     """Scrape les articles à partir de la page spécifiée."""
+    # Pause de 2 secondes entre deux requêtes pour éviter de surcharger le serveur
+    engine.configure_host(urlsplit(BASE_URL).hostname, concurrency=1, delay=2)
+
     logger.info(f"Scraping de la page {url}...")
-    response = requests.get(urljoin(BASE_URL, url))
-    if response.status_code != 200:
-        logger.error(f"Erreur HTTP : {response.status_code} pour {url}")
+    html = await engine.get_text(urljoin(BASE_URL, url))
+    if html is None:
+        logger.error(f"Impossible de récupérer la page {url}")
         return []
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
     articles = soup.find_all("article", class_="ecl-u-d-flex")
 
     scraped_articles = []
@@ -102,41 +108,51 @@ def scrape_page(url):
         summary_tag = article.find("div", class_="cnt-teaser")
         summary = summary_tag.text.strip() if summary_tag else "No summary available."
 
-        # Récupérer le contenu complet
-        full_content = fetch_digital_strategy_content(link) if link else None
-
         # Champs fixes
         source = "Digital Strategy"
         author = "European Commission"
         language = "english"
 
-        # Structure des données
+        # Structure des données (contenu complet récupéré ci-dessous)
         article_data = {
             "title": title,
             "source": source,
             "publication_date": publication_date,
             "link": link,
             "author": author,
-            "full_content": full_content,
+            "full_content": None,
             "summary": summary,
             "language": language,
         }
 
         scraped_articles.append(article_data)
-        time.sleep(2)  # Pause pour éviter de surcharger le serveur
+
+    # Les pages déjà récupérées lors d'une exécution précédente ne sont pas redemandées
+    scraped_articles = [
+        article for article in scraped_articles
+        if not (article["link"] and engine.skip_known(article["link"]))
+    ]
+
+    # Récupérer le contenu complet des articles
+    contents = await asyncio.gather(*(
+        fetch_digital_strategy_content(engine, article["link"]) if article["link"] else asyncio.sleep(0)
+        for article in scraped_articles
+    ))
+    for article, full_content in zip(scraped_articles, contents):
+        article["full_content"] = full_content
 
     logger.info(f"Nombre d'articles récupérés : {len(scraped_articles)}")
     return scraped_articles
 
 
-if __name__ == "__main__":
+async def scrape(engine):
     # Charger les articles existants
     existing_articles = load_existing_articles()
     existing_links = {article["link"] for article in existing_articles}
     logger.info(f"Articles existants chargés. Nombre d'articles : {len(existing_articles)}")
 
     # Scraper les nouveaux articles
-    new_articles = scrape_page(PAGE_URL)
+    new_articles = await scrape_page(engine, PAGE_URL)
 
     # Filtrer les articles déjà présents
     unique_articles = [article for article in new_articles if article["link"] not in existing_links]
@@ -150,3 +166,11 @@ if __name__ == "__main__":
     save_to_json(existing_articles)
 
     logger.info(f"Processus terminé. Nombre total d'articles : {len(existing_articles)}")
+
+
+def main():
+    run(scrape)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 import os
+import sys
 import json
 import feedparser
 from datetime import datetime
 from bs4 import BeautifulSoup
 import logging
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import run
+
 # Configurer les logs
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -18,9 +26,10 @@ JSON_OUTPUT_FILE = os.path.join(JSON_OUTPUT_DIR, "techcommunity_articles.json")
 
 
 # Fonction pour récupérer les articles depuis un flux RSS
-def fetch_rss_articles(rss_url):
+async def fetch_rss_articles(engine, rss_url):
     logging.info(f"Récupération des articles depuis le flux RSS: {rss_url}")
-    feed = feedparser.parse(rss_url)
+    response = await engine.get(rss_url, conditional=True)
+    feed = feedparser.parse(response.content if response is not None else b"")
     articles = []
 
     for entry in feed.entries:
@@ -79,11 +88,10 @@ def save_articles_to_json(articles, json_file):
         logging.error(f"Erreur lors de la sauvegarde des articles en JSON : {e}")
 
 
-# Exemple d'utilisation
-if __name__ == "__main__":
+async def scrape(engine):
     try:
         logging.info("Début du traitement des articles.")
-        articles = fetch_rss_articles(RSS_URL)
+        articles = await fetch_rss_articles(engine, RSS_URL)
         if articles:
             save_articles_to_json(articles, JSON_OUTPUT_FILE)
             logging.info("Les articles ont été traités avec succès.")
@@ -91,3 +99,11 @@ if __name__ == "__main__":
             logging.warning("Aucun article trouvé dans le flux RSS.")
     except Exception as e:
         logging.error(f"Erreur lors de l'exécution : {e}")
+
+
+def main():
+    run(scrape)
+
+
+if __name__ == "__main__":
+    main()
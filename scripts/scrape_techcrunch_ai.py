@@ -1,12 +1,20 @@
 import os
+import sys
 import json
+import asyncio
 import feedparser
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
-import requests
 import logging
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import run
+
 # Configuration des logs
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -70,33 +78,36 @@ def clean_content(content):
     return text
 
 
-def fetch_full_content(url):
-    """Récupère le contenu complet de l'article à partir de l'URL."""
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        article_section = soup.find("div", class_="entry-content")
+def parse_full_content(html):
+    """Extrait le texte de l'article d'une page TechCrunch."""
+    soup = BeautifulSoup(html, 'html.parser')
+    article_section = soup.find("div", class_="entry-content")
 
-        if not article_section:
-            return "Aucun contenu trouvé ou structure HTML différente."
+    if not article_section:
+        return None
 
-        content = []
-        paragraphs = article_section.find_all("p")
-        for paragraph in paragraphs:
-            content.append(paragraph.get_text(strip=True))
+    content = []
+    paragraphs = article_section.find_all("p")
+    for paragraph in paragraphs:
+        content.append(paragraph.get_text(strip=True))
 
-        full_content = "\n".join(content)
-        return full_content if full_content else "Aucun contenu pertinent trouvé."
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Erreur lors de la récupération de l'article {url}: {e}")
-        return f"Erreur lors de la récupération de l'article : {e}"
+    full_content = "\n".join(content)
+    return full_content if full_content else None
+
+
+async def fetch_full_content(engine, url):
+    """Récupère le contenu complet de l'article à partir de l'URL."""
+    html = await engine.get_text(url)
+    if html is None:
+        return None
+    return parse_full_content(html)
 
 
-def fetch_articles():
+async def fetch_articles(engine):
     """Récupère et traite les articles depuis le flux RSS."""
     logging.info("Récupération des articles depuis TechCrunch...")
-    feed = feedparser.parse(RSS_URL)
+    response = await engine.get(RSS_URL, conditional=True)
+    feed = feedparser.parse(response.content if response is not None else b"")
 
     if not feed.entries:
         logging.warning("Aucun article récupéré. Vérifiez l'URL du flux RSS.")
@@ -125,29 +136,36 @@ def fetch_articles():
 
         # Vérification de la pertinence
         if is_relevant(entry):
-            full_content = fetch_full_content(link)  # Récupère le contenu
             articles.append({
                 "title": title,
                 "link": link,
                 "published_date": published_date,
                 "summary": clean_content(content),  # Résumé extrait
-                "full_content": full_content,  # Contenu complet de l'article
+                "full_content": None,  # Contenu complet, récupéré ci-dessous
                 "language": "english",
                 "source": "TechCrunch",
                 "author": author
             })
 
+    # Les pages déjà récupérées lors d'une exécution précédente ne sont pas redemandées
+    articles = [article for article in articles if not engine.skip_known(article["link"])]
+
+    # Récupération simultanée des contenus complets
+    contents = await asyncio.gather(*(fetch_full_content(engine, article["link"]) for article in articles))
+    for article, full_content in zip(articles, contents):
+        article["full_content"] = full_content
+
     logging.info(f"{len(articles)} articles pertinents récupérés.")
     return articles
 
 
-def main():
+async def scrape(engine):
     # Charger les articles existants
     existing_articles = load_existing_articles()
     existing_links = {article["link"] for article in existing_articles}
 
     # Récupérer les nouveaux articles
-    new_articles = fetch_articles()
+    new_articles = await fetch_articles(engine)
 
     # Filtrer les articles déjà présents
     unique_articles = [article for article in new_articles if article["link"] not in existing_links]
@@ -161,5 +179,9 @@ def main():
     logging.info(f"Nombre d'articles ajoutés : {len(unique_articles)}")
 
 
+def main():
+    run(scrape)
+
+
 if __name__ == "__main__":
     main()
@@ -1,5 +1,6 @@
 import os
-import requests
+import sys
+import asyncio
 from bs4 import BeautifulSoup
 import feedparser
 from datetime import datetime
@@ -7,6 +8,13 @@ import re
 import json
 import logging
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import run
+
 # URL du flux RSS
 RSS_URL = "https://www.theverge.com/rss/index.xml"
 
@@ -48,33 +56,35 @@ def clean_content(content):
     return text
 
 
-def fetch_theverge_content(url):
-    """Récupère le contenu complet de l'article à partir de son URL."""
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
+def parse_theverge_content(html):
+    """Extrait le texte de l'article d'une page The Verge."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Localiser les sections contenant le contenu de l'article
+    article_sections = soup.find_all("div", class_="duet--article--article-body-component")
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+    content = []
+    for section in article_sections:
+        paragraphs = section.find_all("p", class_="duet--article--dangerously-set-cms-markup")
+        for paragraph in paragraphs:
+            content.append(paragraph.get_text(strip=True))
 
-        # Localiser les sections contenant le contenu de l'article
-        article_sections = soup.find_all("div", class_="duet--article--article-body-component")
+    return clean_content("\n".join(content)) if content else None
 
-        content = []
-        for section in article_sections:
-            paragraphs = section.find_all("p", class_="duet--article--dangerously-set-cms-markup")
-            for paragraph in paragraphs:
-                content.append(paragraph.get_text(strip=True))
 
-        return clean_content("\n".join(content)) if content else "Aucun contenu trouvé."
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Erreur lors de la récupération du contenu pour {url}: {e}")
-        return f"Error fetching content: {e}"
+async def fetch_theverge_content(engine, url):
+    """Récupère le contenu complet de l'article à partir de son URL."""
+    html = await engine.get_text(url)
+    if html is None:
+        return None
+    return parse_theverge_content(html)
 
 
-def fetch_articles():
+async def fetch_articles(engine):
     """Récupère les articles pertinents depuis le flux RSS."""
     logging.info("Récupération d'articles à partir du flux RSS The Verge...")
-    feed = feedparser.parse(RSS_URL)
+    response = await engine.get(RSS_URL, conditional=True)
+    feed = feedparser.parse(response.content if response is not None else b"")
 
     if not feed.entries:
         logging.warning("Aucun article récupéré. Vérifiez l'URL du flux RSS.")
@@ -97,18 +107,24 @@ def fetch_articles():
 
         # Vérification de la pertinence
         if is_relevant(entry):
-            full_content = fetch_theverge_content(link)
             articles.append({
                 "title": title,
                 "link": link,
                 "published_date": published_date,
                 "summary": clean_content(summary),
-                "full_content": full_content,
+                "full_content": None,
                 "language": "english",
                 "source": "The Verge",
                 "author": author
             })
 
+    # Récupération simultanée des contenus complets
+    # Les pages déjà récupérées lors d'une exécution précédente ne sont pas redemandées
+    articles = [article for article in articles if not engine.skip_known(article["link"])]
+    contents = await asyncio.gather(*(fetch_theverge_content(engine, article["link"]) for article in articles))
+    for article, full_content in zip(articles, contents):
+        article["full_content"] = full_content
+
     logging.info(f"{len(articles)} articles pertinents récupérés.")
     return articles
 
@@ -141,13 +157,17 @@ def save_articles_to_json(articles):
         logging.error(f"Erreur lors de la sauvegarde dans le fichier JSON : {e}")
 
 
-def main():
-    articles = fetch_articles()
+async def scrape(engine):
+    articles = await fetch_articles(engine)
     if articles:
         save_articles_to_json(articles)  # Sauvegarde des articles dans un JSON
     else:
         logging.info("Aucun article pertinent à sauvegarder.")
 
 
+def main():
+    run(scrape)
+
+
 if __name__ == "__main__":
     main()
@@ -2,10 +2,18 @@ import feedparser
 from datetime import datetime
 import json
 import os
-import requests
+import sys
+import asyncio
 from bs4 import BeautifulSoup
 import logging
 
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from scraping_engine import run
+
 # Configuration des logs
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -59,39 +67,39 @@ def clean_html_content(content):
     return soup.get_text()  # Extraire uniquement le texte brut
 
 
-# Fonction pour récupérer le contenu complet d'un article
-def fetch_full_content(url):
+# Fonction pour extraire le contenu complet d'un article
+def parse_full_content(html, url):
     """
-    Récupère le contenu complet d'un article depuis l'URL donnée.
+    Extrait le contenu principal d'une page d'article VentureBeat.
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+    soup = BeautifulSoup(html, "html.parser")
 
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # VentureBeat : Contenu principal de l'article
-        article_body = soup.find("div", class_="article-content")
-
-        if not article_body:
-            logging.warning(f"Impossible de trouver le contenu principal pour : {url}")
-            return None
-
-        # Extraire le texte
-        full_content = article_body.get_text(separator=" ").strip()
-        return full_content
-    except Exception as e:
-        logging.error(f"Erreur lors de la récupération du contenu pour {url} : {e}")
+    # VentureBeat : Contenu principal de l'article
+    article_body = soup.find("div", class_="article-content")
+
+    if not article_body:
+        logging.warning(f"Impossible de trouver le contenu principal pour : {url}")
         return None
 
+    # Extraire le texte
+    full_content = article_body.get_text(separator=" ").strip()
+    return full_content
+
+
+# Fonction pour récupérer le contenu complet d'un article
+async def fetch_full_content(engine, url):
+    """
+    Récupère le contenu complet d'un article depuis l'URL donnée.
+    """
+    html = await engine.get_text(url)
+    return parse_full_content(html, url) if html is not None else None
+
 
 # Fonction pour traiter chaque article du flux RSS
-def process_feed(feed_url):
+async def process_feed(engine, feed_url):
     logging.info(f"Récupération du flux RSS depuis {feed_url}")
-    feed = feedparser.parse(feed_url)
+    response = await engine.get(feed_url, conditional=True)
+    feed = feedparser.parse(response.content if response is not None else b"")
     if not feed.entries:
         logging.warning("Aucun article trouvé dans le flux RSS.")
         return
@@ -111,15 +119,12 @@ def process_feed(feed_url):
         # Validation et formatage de la date de publication
         publication_date = validate_and_format_date(entry.get("published"))
 
-        # Récupérer le contenu complet de l'article
-        full_content = fetch_full_content(link)
-
         article = {
             "title": title,
             "source": "VentureBeat",
             "publication_date": publication_date.isoformat() if publication_date else None,
             "summary": summary,
-            "full_content": full_content,
+            "full_content": None,
             "language": "english",
             "link": link,
             "author": author
@@ -128,20 +133,32 @@ def process_feed(feed_url):
         # Ajouter l'article à la liste pour le JSON
         articles_to_save.append(article)
 
+    # Les pages déjà récupérées lors d'une exécution précédente ne sont pas redemandées
+    articles_to_save = [article for article in articles_to_save if not engine.skip_known(article["link"])]
+
+    # Récupérer simultanément le contenu complet des articles
+    contents = await asyncio.gather(*(fetch_full_content(engine, article["link"]) for article in articles_to_save))
+    for article, full_content in zip(articles_to_save, contents):
+        article["full_content"] = full_content
+
     # Enregistrer les articles dans le fichier JSON
     save_to_json(articles_to_save)
 
 
 # Fonction principale
-def main():
+async def scrape(engine):
     logging.info("Démarrage du traitement des articles.")
-    
+
     # Flux RSS pour VentureBeat
     venturebeat_feed_url = "https://venturebeat.com/category/ai/feed/"
-    process_feed(venturebeat_feed_url)
+    await process_feed(engine, venturebeat_feed_url)
 
     logging.info("Traitement terminé.")
 
 
+def main():
+    run(scrape)
+
+
 if __name__ == "__main__":
     main()
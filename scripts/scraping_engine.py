@@ -0,0 +1,277 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import httpx
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from http_validators import ValidatorStore
+
+# Configuration du moteur de collecte (variables d'environnement optionnelles)
+SCRAPER_USER_AGENT = os.getenv(
+    "SCRAPER_USER_AGENT",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+)
+SCRAPER_MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", 20))
+SCRAPER_PER_HOST_CONCURRENCY = int(os.getenv("SCRAPER_PER_HOST_CONCURRENCY", 4))
+SCRAPER_REQUESTS_PER_SECOND = float(os.getenv("SCRAPER_REQUESTS_PER_SECOND", 10))
+SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", 30))
+SCRAPER_MAX_RETRIES = int(os.getenv("SCRAPER_MAX_RETRIES", 3))
+
+# Statuts pour lesquels une nouvelle tentative a un sens
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Pause maximale acceptée pour un en-tête Retry-After (secondes)
+MAX_RETRY_AFTER = 120
+# Pause appliquée sur un 429 sans en-tête Retry-After
+DEFAULT_RETRY_AFTER = 60
+
+# Une ligne par requête serait trop verbeuse : seuls les avertissements de httpx sont conservés
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class RateLimiter:
+    """Espace les départs de requêtes d'au moins `interval` secondes (partagé entre tâches)."""
+
+    def __init__(self, interval: float):
+        self.interval = max(interval, 0.0)
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HostState:
+    """Limites propres à un hôte : requêtes simultanées, délai entre requêtes et pause après un 429."""
+
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.limiter = RateLimiter(delay)
+        self.paused_until = 0.0
+
+    async def wait(self):
+        pause = self.paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        await self.limiter.wait()
+
+
+def parse_retry_after(value, default=DEFAULT_RETRY_AFTER):
+    """Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes d'attente, plafonnées."""
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class ScrapingEngine:
+    """
+    Client HTTP asynchrone partagé par les scripts de collecte.
+
+    Une seule session (connexions persistantes) sert toutes les sources ; les
+    requêtes sont limitées globalement (requêtes par seconde) et par hôte
+    (requêtes simultanées, délai minimal), et un 429 / Retry-After met en pause
+    l'hôte concerné uniquement. Chaque source s'y branche via une fonction
+    `async def scrape(engine)`.
+    """
+
+    def __init__(
+        self,
+        per_host_concurrency: int = SCRAPER_PER_HOST_CONCURRENCY,
+        requests_per_second: float = SCRAPER_REQUESTS_PER_SECOND,
+        timeout: float = SCRAPER_TIMEOUT,
+        max_retries: int = SCRAPER_MAX_RETRIES,
+        transport=None,
+        validators: ValidatorStore = None
+    ):
+        self.per_host_concurrency = per_host_concurrency
+        self.rate_limiter = RateLimiter(1.0 / requests_per_second if requests_per_second > 0 else 0.0)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.transport = transport
+        self.validators = validators
+        self.hosts = {}
+        self.host_policies = {}
+        self.client = None
+        self.stats = {
+            "requests": 0, "bytes_received": 0, "retries": 0, "throttled": 0, "failures": 0,
+            "conditional_requests": 0, "not_modified": 0, "pages_skipped": 0, "bytes_saved": 0,
+        }
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": SCRAPER_USER_AGENT},
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=SCRAPER_MAX_CONNECTIONS, max_keepalive_connections=SCRAPER_MAX_CONNECTIONS),
+            transport=self.transport
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+
+    def configure_host(self, host: str, concurrency: int = None, delay: float = 0.0):
+        """Déclare une politique propre à un hôte (ex. une requête à la fois, 2 s entre deux requêtes)."""
+        self.host_policies[host] = (concurrency or self.per_host_concurrency, delay)
+        self.hosts.pop(host, None)
+
+    def host_state(self, host: str) -> HostState:
+        if host not in self.hosts:
+            concurrency, delay = self.host_policies.get(host, (self.per_host_concurrency, 0.0))
+            self.hosts[host] = HostState(concurrency, delay)
+        return self.hosts[host]
+
+    def skip_known(self, url: str) -> bool:
+        """
+        Indique si l'article d'une page a déjà été chargé en base (voir
+        `ValidatorStore.mark_ingested`).
+
+        Le contenu d'une page d'article ne change pas après publication : une
+        page dont l'article est en base n'est pas redemandée, et l'article peut
+        être écarté de la collecte. Une page seulement récupérée (chargement en
+        échec, contenu illisible) est toujours redemandée.
+        """
+        if self.validators is None or not self.validators.is_ingested(url):
+            return False
+        self.validators.touch(url)
+        self.stats["pages_skipped"] += 1
+        return True
+
+    async def get(self, url: str, params=None, headers=None, conditional: bool = False):
+        """
+        Effectue un GET en respectant les limites globales et de l'hôte.
+
+        Les erreurs réseau et les statuts 429/5xx sont retentés (pause Retry-After
+        pour l'hôte sur un 429, sinon attente exponentielle). Avec `conditional`,
+        la requête porte les validateurs mémorisés ; un 304 est remplacé par la
+        dernière réponse complète mémorisée (voir `ValidatorStore.cached_body`).
+
+        :return: La réponse httpx (statut < 400), ou None en cas d'échec définitif
+        """
+        host = urlsplit(url).hostname or ""
+        state = self.host_state(host)
+
+        # Une requête n'est conditionnelle que si le corps à rejouer sur un 304 est disponible
+        cached_body = self.validators.cached_body(url) if conditional and self.validators is not None else None
+        if cached_body is not None:
+            validator_headers = self.validators.request_headers(url)
+            if validator_headers:
+                self.stats["conditional_requests"] += 1
+                headers = {**(headers or {}), **validator_headers}
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+
+            async with state.semaphore:
+                await state.wait()
+                await self.rate_limiter.wait()
+                try:
+                    self.stats["requests"] += 1
+                    response = await self.client.get(url, params=params, headers=headers)
+                except httpx.HTTPError as e:
+                    logging.warning(f"Erreur réseau pour {url} (tentative {attempt + 1}) : {e}")
+                    response = None
+
+            if response is None:
+                await asyncio.sleep(2 ** attempt)
+                continue
+
+            self.stats["bytes_received"] += len(response.content)
+
+            if response.status_code == 429:
+                self.stats["throttled"] += 1
+                pause = parse_retry_after(response.headers.get("Retry-After"))
+                logging.warning(f"Trop de requêtes vers {host} ! Pause de {pause:.0f} secondes.")
+                state.paused_until = max(state.paused_until, time.monotonic() + pause)
+                continue
+
+            if response.status_code in RETRY_STATUSES:
+                logging.warning(f"Erreur HTTP {response.status_code} pour {url} (tentative {attempt + 1}).")
+                await asyncio.sleep(2 ** attempt)
+                continue
+
+            if response.status_code >= 400:
+                logging.error(f"Erreur HTTP {response.status_code} pour l'URL : {url}")
+                self.stats["failures"] += 1
+                return None
+
+            if response.status_code == 304 and cached_body is not None:
+                logging.info(f"Contenu inchangé depuis la dernière collecte : {url}")
+                self.stats["not_modified"] += 1
+                self.stats["bytes_saved"] += len(cached_body)
+                self.validators.touch(url)
+                # Le dernier corps complet est rejoué : un flux inchangé produit les mêmes éléments
+                response = httpx.Response(200, content=cached_body, request=response.request)
+            elif conditional and self.validators is not None:
+                # Seuls les flux sont mémorisés ici ; les pages le sont après chargement en base
+                self.validators.update(url, response)
+
+            return response
+
+        logging.error(f"Échec de la récupération de {url} après {self.max_retries + 1} tentative(s).")
+        self.stats["failures"] += 1
+        return None
+
+    async def get_text(self, url: str, params=None, headers=None):
+        """Retourne le corps texte d'une page, ou None en cas d'échec."""
+        response = await self.get(url, params=params, headers=headers)
+        return response.text if response is not None else None
+
+    def log_stats(self):
+        logging.info(
+            f"Collecte HTTP : {self.stats['requests']} requête(s), {self.stats['bytes_received']} octet(s) reçus, "
+            f"{self.stats['retries']} nouvelle(s) tentative(s), {self.stats['throttled']} réponse(s) 429, "
+            f"{self.stats['failures']} échec(s) ; {self.stats['conditional_requests']} requête(s) conditionnelle(s), "
+            f"{self.stats['not_modified']} réponse(s) 304, {self.stats['pages_skipped']} page(s) connue(s) ignorée(s), "
+            f"{self.stats['bytes_saved']} octet(s) économisés."
+        )
+
+    def save_validators(self):
+        """Persiste les validateurs HTTP pour l'exécution suivante."""
+        if self.validators is not None:
+            self.validators.save()
+
+
+async def run_with_engine(*scrapers):
+    """Exécute des fonctions `scrape(engine)` en parallèle sur un moteur partagé."""
+    async with ScrapingEngine(validators=ValidatorStore.load()) as engine:
+        results = await asyncio.gather(*(scrape(engine) for scrape in scrapers), return_exceptions=True)
+        engine.log_stats()
+        # Après un échec, les validateurs ne sont pas conservés : la collecte suivante repart du contenu complet
+        if not any(isinstance(result, BaseException) for result in results):
+            engine.save_validators()
+    return results
+
+
+def run(scrape):
+    """Point d'entrée d'un script de collecte exécuté seul."""
+    result, = asyncio.run(run_with_engine(scrape))
+    if isinstance(result, BaseException):
+        raise result
+    return result
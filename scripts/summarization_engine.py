@@ -0,0 +1,270 @@
+import os
+import re
+import time
+import logging
+from itertools import groupby
+
+# Configuration du moteur de résumé (variables d'environnement optionnelles)
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", 8))
+SUMMARY_NUM_THREADS = int(os.getenv("SUMMARY_NUM_THREADS", os.cpu_count() or 1))
+SUMMARY_NUM_BEAMS = int(os.getenv("SUMMARY_NUM_BEAMS", 4))
+# Nombre maximal de tokens d'un article pris en compte (au-delà de MAX_INPUT_TOKENS, résumé par segments)
+SUMMARY_TOKEN_BUDGET = int(os.getenv("SUMMARY_TOKEN_BUDGET", 4096))
+
+# Longueur maximale (en tokens) du texte source accepté par le modèle
+MAX_INPUT_TOKENS = 1024
+# Marge pour les tokens spéciaux et l'écart entre tokenisation par phrase et par segment
+CHUNK_TOKEN_MARGIN = 24
+# Longueur maximale du résumé intermédiaire d'un segment
+CHUNK_SUMMARY_MAX_LENGTH = 150
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[\"'“(\[A-Z0-9])")
+
+
+def split_sentences(text):
+    """Découpe un texte en phrases (ponctuation finale suivie d'une majuscule ou d'un chiffre)."""
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text or "") if sentence.strip()]
+
+
+def chunk_sentences(sentences, token_counts, max_tokens, token_budget):
+    """
+    Regroupe des phrases consécutives en segments d'au plus `max_tokens` tokens.
+
+    Seules les phrases tenant dans `token_budget` tokens au total sont gardées
+    (au moins la première) ; une phrase plus longue qu'un segment forme un
+    segment à elle seule et sera tronquée à la tokenisation.
+    """
+    chunks = []
+    current, current_tokens, total = [], 0, 0
+    for sentence, count in zip(sentences, token_counts):
+        if total and total + count > token_budget:
+            break
+        total += count
+        if current and current_tokens + count > max_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += count
+    if current:
+        chunks.append(current)
+    return [" ".join(chunk) for chunk in chunks]
+
+
+def summary_max_length(word_count):
+    """Longueur maximale du résumé (en tokens) selon la taille de l'article (en mots)."""
+    if word_count < 300:
+        return 100
+    if word_count < 1000:
+        return 200
+    return 300
+
+
+class SummarizationEngine:
+    """
+    Génération de résumés par lots avec un modèle seq2seq (BART par défaut).
+
+    Les textes sont regroupés par longueur de résumé visée, puis triés par
+    nombre de tokens : chaque lot complété (padding) contient des textes de
+    tailles voisines. La génération s'exécute sous `torch.inference_mode` et
+    le débit (tokens/s) de chaque lot est journalisé.
+
+    Un texte plus long que MAX_INPUT_TOKENS n'est pas tronqué : dans la limite
+    de `token_budget` tokens, il est découpé en segments aux frontières de
+    phrases, les segments de tous les textes sont résumés ensemble, puis les
+    résumés de segments de chaque texte sont résumés à leur tour (map-reduce).
+    Avec `token_budget` <= MAX_INPUT_TOKENS, les textes sont simplement tronqués.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = SUMMARY_BATCH_SIZE,
+        num_threads: int = SUMMARY_NUM_THREADS,
+        num_beams: int = SUMMARY_NUM_BEAMS,
+        token_budget: int = SUMMARY_TOKEN_BUDGET
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.num_beams = num_beams
+        self.token_budget = token_budget
+        self.tokenizer = None
+        self.model = None
+        self.stats = {
+            "batches": 0, "texts": 0, "input_tokens": 0, "output_tokens": 0, "seconds": 0.0,
+            "chunked_texts": 0, "chunks": 0,
+        }
+
+    def load(self):
+        """Charge le tokenizer et le modèle au premier appel."""
+        if self.model is None:
+            # Import différé : les découpages et longueurs de résumé restent utilisables sans torch
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+            logging.info(f"Chargement du modèle Hugging Face {self.model_name}...")
+            torch.set_num_threads(self.num_threads)
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+            self.model.eval()
+        return self
+
+    def generate_batch(self, input_ids, max_length, min_length):
+        """Génère les résumés d'un lot de textes déjà tokenisés (listes d'identifiants)."""
+        import torch
+
+        inputs = self.tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+        start = time.perf_counter()
+        with torch.inference_mode():
+            summary_ids = self.model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                max_length=max_length,
+                min_length=min_length,
+                length_penalty=2.0,
+                num_beams=self.num_beams,
+                early_stopping=True
+            )
+        duration = time.perf_counter() - start
+
+        input_tokens = sum(len(ids) for ids in input_ids)
+        output_tokens = int((summary_ids != self.tokenizer.pad_token_id).sum())
+        self.stats["batches"] += 1
+        self.stats["texts"] += len(input_ids)
+        self.stats["input_tokens"] += input_tokens
+        self.stats["output_tokens"] += output_tokens
+        self.stats["seconds"] += duration
+        logging.info(
+            f"Lot de {len(input_ids)} texte(s) ({input_tokens} tokens en entrée) résumé en {duration:.1f} s "
+            f"({(input_tokens + output_tokens) / duration:.0f} tokens/s)."
+        )
+        return self.tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+
+    def summarize(self, texts, max_lengths, min_length=50):
+        """
+        Résume `texts` ; `max_lengths[i]` est la longueur maximale du résumé du texte i.
+
+        :return: Les résumés dans l'ordre des textes reçus (None pour un lot en échec)
+        """
+        if not texts:
+            return []
+        self.load()
+        lengths = [len(ids) for ids in self.tokenizer(list(texts), verbose=False)["input_ids"]]
+        long_texts = [
+            i for i, length in enumerate(lengths)
+            if length > MAX_INPUT_TOKENS and self.token_budget > MAX_INPUT_TOKENS
+        ]
+        long_set = set(long_texts)
+        direct = [i for i in range(len(texts)) if i not in long_set]
+
+        summaries = [None] * len(texts)
+        results = self.summarize_batches([texts[i] for i in direct], [max_lengths[i] for i in direct], min_length)
+        for i, summary in zip(direct, results):
+            summaries[i] = summary
+
+        if long_texts:
+            results = self.summarize_chunked([texts[i] for i in long_texts], [max_lengths[i] for i in long_texts], min_length)
+            for i, summary in zip(long_texts, results):
+                summaries[i] = summary
+        return summaries
+
+    def chunk_text(self, text):
+        """Segments (texte) d'un article long, dans la limite du budget de tokens."""
+        sentences = split_sentences(text)
+        return chunk_sentences(
+            sentences, self.count_tokens(sentences), MAX_INPUT_TOKENS - CHUNK_TOKEN_MARGIN, self.token_budget
+        )
+
+    def summarize_chunked(self, texts, max_lengths, min_length):
+        """
+        Map-reduce : résumé de tous les segments en lots, puis résumé des résumés de chaque texte.
+
+        Tant que les résumés de segments d'un texte, mis bout à bout, dépassent
+        MAX_INPUT_TOKENS (grand `token_budget`), ils sont regroupés en segments
+        et résumés à nouveau : le résumé final n'est jamais tronqué.
+        """
+        segments = [self.chunk_text(text) for text in texts]
+        self.stats["chunked_texts"] += len(texts)
+        self.stats["chunks"] += sum(len(chunks) for chunks in segments)
+        logging.info(f"{len(texts)} texte(s) long(s) découpé(s) en {sum(len(chunks) for chunks in segments)} segment(s).")
+
+        partials = self.summarize_segments(segments, min_length)
+        while True:
+            joined = {i: " ".join(parts) for i, parts in enumerate(partials) if parts is not None and len(parts) > 1}
+            lengths = dict(zip(joined, self.count_tokens(list(joined.values()))))
+            too_long = [i for i, length in lengths.items() if length > MAX_INPUT_TOKENS - CHUNK_TOKEN_MARGIN]
+            if not too_long:
+                break
+            logging.info(f"{len(too_long)} résumé(s) de segments trop long(s) : nouvelle réduction.")
+            regrouped = []
+            for i in too_long:
+                token_counts = self.count_tokens(partials[i])
+                regrouped.append(
+                    chunk_sentences(partials[i], token_counts, MAX_INPUT_TOKENS - CHUNK_TOKEN_MARGIN, sum(token_counts))
+                )
+            regrouped = self.summarize_segments(regrouped, min_length)
+            for i, parts in zip(too_long, regrouped):
+                partials[i] = parts
+
+        reduced = [i for i in range(len(texts)) if partials[i] is not None]
+        results = self.summarize_batches(
+            [" ".join(partials[i]) for i in reduced], [max_lengths[i] for i in reduced], min_length
+        )
+        summaries = [None] * len(texts)
+        for i, summary in zip(reduced, results):
+            summaries[i] = summary
+        return summaries
+
+    def summarize_segments(self, segments, min_length):
+        """
+        Résume en lots les segments de plusieurs textes (une liste de segments par texte).
+
+        :return: Les résumés des segments de chaque texte, ou None si l'un d'eux a échoué
+        """
+        chunks, owners = [], []
+        for i, text_chunks in enumerate(segments):
+            chunks.extend(text_chunks)
+            owners.extend([i] * len(text_chunks))
+
+        results = self.summarize_batches(chunks, [CHUNK_SUMMARY_MAX_LENGTH] * len(chunks), min_length)
+        partials = [[] for _ in segments]
+        for i, summary in zip(owners, results):
+            if summary is None or partials[i] is None:
+                partials[i] = None
+            else:
+                partials[i].append(summary)
+        return partials
+
+    def count_tokens(self, texts):
+        """Nombre de tokens (sans tokens spéciaux) de chaque texte."""
+        if not texts:
+            return []
+        return [len(ids) for ids in self.tokenizer(list(texts), add_special_tokens=False, verbose=False)["input_ids"]]
+
+    def summarize_batches(self, texts, max_lengths, min_length):
+        """Résume des textes d'au plus MAX_INPUT_TOKENS tokens (tronqués au-delà), par lots de tailles voisines."""
+        if not texts:
+            return []
+        input_ids = self.tokenizer(list(texts), truncation=True, max_length=MAX_INPUT_TOKENS)["input_ids"]
+        order = sorted(range(len(texts)), key=lambda i: (max_lengths[i], len(input_ids[i])))
+
+        summaries = [None] * len(texts)
+        for max_length, bucket in groupby(order, key=lambda i: max_lengths[i]):
+            bucket = list(bucket)
+            for start in range(0, len(bucket), self.batch_size):
+                batch = bucket[start:start + self.batch_size]
+                try:
+                    results = self.generate_batch([input_ids[i] for i in batch], max_length, min(min_length, max_length))
+                except Exception as e:
+                    # Un lot en échec n'empêche pas les suivants : ses textes restent sans résumé (None)
+                    logging.error(f"Erreur lors de la génération d'un lot de {len(batch)} résumé(s) : {e}")
+                    continue
+                for i, summary in zip(batch, results):
+                    summaries[i] = summary
+        return summaries
+
+    def tokens_per_second(self):
+        """Débit moyen (tokens d'entrée et de sortie par seconde) depuis la création du moteur."""
+        if not self.stats["seconds"]:
+            return 0.0
+        return (self.stats["input_tokens"] + self.stats["output_tokens"]) / self.stats["seconds"]
@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+import logging
+import numpy as np
+
+# Rend les modules partagés du dossier scripts importables quel que soit le répertoire courant
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from summarization_engine import SummarizationEngine, split_sentences
+from embedding_cache import encode_batched
+
+# Backend par défaut, puis choix par source ("Source=backend,...") et pour les articles courts
+SUMMARY_BACKEND = os.getenv("SUMMARY_BACKEND", "bart")
+SUMMARY_BACKEND_BY_SOURCE = os.getenv("SUMMARY_BACKEND_BY_SOURCE", "")
+SUMMARY_SHORT_BACKEND = os.getenv("SUMMARY_SHORT_BACKEND", "")
+SUMMARY_SHORT_MAX_WORDS = int(os.getenv("SUMMARY_SHORT_MAX_WORDS", 300))
+
+# Modèles des backends
+BART_MODEL = "facebook/bart-large-cnn"
+DISTILBART_MODEL = os.getenv("DISTILBART_MODEL", "sshleifer/distilbart-cnn-12-6")
+TEXTRANK_MODEL = "all-MiniLM-L6-v2"
+
+# Nombre moyen de tokens par mot (anglais), pour convertir un budget de tokens en mots
+TOKENS_PER_WORD = 1.3
+
+def textrank_scores(similarity, damping=0.85, iterations=50, tolerance=1e-6):
+    """Score PageRank de chaque phrase dans le graphe pondéré par la similarité entre phrases."""
+    weights = np.clip(np.asarray(similarity, dtype=np.float64), 0.0, None)
+    np.fill_diagonal(weights, 0.0)
+    count = weights.shape[0]
+    out_weights = weights.sum(axis=1, keepdims=True)
+    transition = np.divide(weights, out_weights, out=np.full_like(weights, 1.0 / count), where=out_weights > 0)
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(iterations):
+        updated = (1 - damping) / count + damping * transition.T @ scores
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def select_sentences(sentences, scores, max_words):
+    """Meilleures phrases dans la limite de `max_words` mots, restituées dans l'ordre du texte."""
+    selected = []
+    words = 0
+    for i in np.argsort(-np.asarray(scores), kind="stable"):
+        length = len(sentences[i].split())
+        if selected and words + length > max_words:
+            continue
+        selected.append(i)
+        words += length
+        if words >= max_words:
+            break
+    return " ".join(sentences[i] for i in sorted(selected))
+
+
+class Seq2SeqSummarizer:
+    """Résumé abstractif par un modèle seq2seq Hugging Face (BART, DistilBART...)."""
+
+    def __init__(self, name, model_name):
+        self.name = name
+        self.engine = SummarizationEngine(model_name)
+
+    @property
+    def model_id(self):
+        """Identifiant des résultats produits (clé du cache d'enrichissement)."""
+        return f"{self.engine.model_name}:beams={self.engine.num_beams}:budget={self.engine.token_budget}"
+
+    def summarize(self, texts, max_lengths, min_length=50):
+        return self.engine.summarize(texts, max_lengths, min_length=min_length)
+
+    def tokens_per_second(self):
+        return self.engine.tokens_per_second()
+
+
+class TextRankSummarizer:
+    """
+    Résumé extractif sur CPU : TextRank sur les embeddings de phrases
+    (sentence-transformers), sans modèle génératif.
+    """
+
+    def __init__(self, name="textrank", model_name=TEXTRANK_MODEL):
+        self.name = name
+        self.model_name = model_name
+        self.model = None
+        self.stats = {"texts": 0, "sentences": 0, "seconds": 0.0}
+
+    @property
+    def model_id(self):
+        return f"textrank:{self.model_name}"
+
+    def summarize(self, texts, max_lengths, min_length=50):
+        if self.model is None:
+            from sentence_transformers import SentenceTransformer
+
+            logging.info(f"Chargement du modèle SentenceTransformer {self.model_name}...")
+            self.model = SentenceTransformer(self.model_name)
+
+        start = time.perf_counter()
+        summaries = []
+        for text, max_length in zip(texts, max_lengths):
+            sentences = split_sentences(text)
+            if len(sentences) <= 1:
+                summaries.append(" ".join(sentences))
+                continue
+            embeddings = encode_batched(self.model, sentences)
+            scores = textrank_scores(embeddings @ embeddings.T)
+            summaries.append(select_sentences(sentences, scores, int(max_length / TOKENS_PER_WORD)))
+            self.stats["sentences"] += len(sentences)
+
+        self.stats["texts"] += len(texts)
+        self.stats["seconds"] += time.perf_counter() - start
+        return summaries
+
+    def tokens_per_second(self):
+        return 0.0
+
+
+# Backends disponibles, instanciés au premier usage
+BACKENDS = {
+    "bart": lambda: Seq2SeqSummarizer("bart", BART_MODEL),
+    "distilbart": lambda: Seq2SeqSummarizer("distilbart", DISTILBART_MODEL),
+    "textrank": lambda: TextRankSummarizer("textrank"),
+}
+_summarizers = {}
+
+
+def get_summarizer(name):
+    """Retourne (et crée au besoin) le backend `name`."""
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de résumé inconnu : {name} (disponibles : {', '.join(BACKENDS)})")
+    if name not in _summarizers:
+        _summarizers[name] = BACKENDS[name]()
+    return _summarizers[name]
+
+
+def parse_backend_map(value):
+    """Convertit "Source A=textrank,Source B=distilbart" en dictionnaire."""
+    mapping = {}
+    for item in value.split(","):
+        if "=" in item:
+            source, backend = item.rsplit("=", 1)
+            mapping[source.strip()] = backend.strip()
+    return mapping
+
+
+def choose_backend(article, by_source=None, short_backend=SUMMARY_SHORT_BACKEND,
+                   short_max_words=SUMMARY_SHORT_MAX_WORDS, default=SUMMARY_BACKEND):
+    """
+    Backend à utiliser pour un article : celui de sa source s'il est configuré,
+    sinon celui des articles courts si l'article en est un, sinon le backend par défaut.
+    """
+    by_source = parse_backend_map(SUMMARY_BACKEND_BY_SOURCE) if by_source is None else by_source
+    if article.get("source") in by_source:
+        return by_source[article["source"]]
+    if short_backend and len((article.get("full_content") or "").split()) < short_max_words:
+        return short_backend
+    return default
@@ -0,0 +1,100 @@
+import os
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+# Marge (jours) sous la dernière date de publication vue : les contenus récents mais modifiés sont rechargés
+PIPELINE_LOOKBACK_DAYS = int(os.getenv("PIPELINE_LOOKBACK_DAYS", 3))
+
+# Dernière date de publication et dernier id vus, et début de la dernière exécution réussie d'une étape
+Watermark = namedtuple("Watermark", ["last_publication_date", "last_id", "last_run_at"])
+EMPTY_WATERMARK = Watermark(None, 0, None)
+
+
+def to_date(value):
+    """Date d'une valeur `date`, `datetime` ou chaîne ISO (None si absente ou illisible)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def database_now(cursor):
+    """Heure du serveur MySQL, utilisée comme début d'exécution (indépendante de l'horloge locale)."""
+    cursor.execute("SELECT NOW()")
+    row = cursor.fetchone()
+    return list(row.values())[0] if isinstance(row, dict) else row[0]
+
+
+def load_watermarks(cursor, stage):
+    """Retourne {périmètre: Watermark} des exécutions réussies de l'étape `stage`."""
+    cursor.execute(
+        "SELECT scope, last_publication_date, last_id, last_run_at FROM pipeline_watermarks WHERE stage = %s",
+        (stage,)
+    )
+    watermarks = {}
+    for row in cursor.fetchall():
+        if isinstance(row, dict):
+            row = (row["scope"], row["last_publication_date"], row["last_id"], row["last_run_at"])
+        scope, last_publication_date, last_id, last_run_at = row
+        watermarks[scope] = Watermark(last_publication_date, last_id or 0, last_run_at)
+    return watermarks
+
+
+def save_watermarks(cursor, stage, watermarks):
+    """Enregistre les repères de l'étape (à appeler dans la transaction qui valide son travail)."""
+    if not watermarks:
+        return
+    cursor.executemany(
+        """
+        INSERT INTO pipeline_watermarks (stage, scope, last_publication_date, last_id, last_run_at)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE last_publication_date = VALUES(last_publication_date),
+            last_id = VALUES(last_id), last_run_at = VALUES(last_run_at)
+        """,
+        [
+            (stage, scope, watermark.last_publication_date, watermark.last_id, watermark.last_run_at)
+            for scope, watermark in watermarks.items()
+        ]
+    )
+
+
+def advance(watermark, publication_date=None, row_id=None, run_at=None):
+    """Repère avancé au plus récent de l'existant et des valeurs données."""
+    watermark = watermark or EMPTY_WATERMARK
+    publication_date = to_date(publication_date)
+    last_publication_date = watermark.last_publication_date
+    if publication_date and (last_publication_date is None or publication_date > to_date(last_publication_date)):
+        last_publication_date = publication_date
+    return Watermark(
+        last_publication_date,
+        max(watermark.last_id or 0, row_id or 0),
+        run_at if run_at is not None else watermark.last_run_at
+    )
+
+
+def is_recent(publication_date, watermark, lookback_days=PIPELINE_LOOKBACK_DAYS):
+    """
+    Un enregistrement est à traiter s'il n'a pas de date, si son périmètre n'a
+    jamais été chargé, ou s'il est publié après le repère moins la marge.
+    """
+    if watermark is None or watermark.last_publication_date is None:
+        return True
+    publication_date = to_date(publication_date)
+    if publication_date is None:
+        return True
+    return publication_date >= to_date(watermark.last_publication_date) - timedelta(days=lookback_days)
+
+
+def changed_rows_condition(watermark, alias=None):
+    """
+    Condition SQL (et paramètres) des lignes créées ou modifiées depuis la
+    dernière exécution réussie ; toutes les lignes si l'étape n'a jamais réussi.
+    """
+    if watermark is None or watermark.last_run_at is None:
+        return "1 = 1", []
+    prefix = f"{alias}." if alias else ""
+    return f"({prefix}id > %s OR {prefix}updated_at >= %s)", [watermark.last_id, watermark.last_run_at]
@@ -0,0 +1,118 @@
+import os
+import json
+import logging
+import xml.etree.ElementTree as ET
+
+# Chemin du dossier pour les fichiers de sortie
+OUTPUT_DIR = "videos_outputs"
+
+# Espaces de noms XML des flux YouTube
+NAMESPACES = {
+    'media': 'http://search.yahoo.com/mrss/',
+    'yt': 'http://www.youtube.com/xml/schemas/2015',
+    'atom': 'http://www.w3.org/2005/Atom',
+}
+
+
+def channel_feed_url(channel_id):
+    """URL du flux Atom d'une chaîne YouTube."""
+    return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+
+
+def load_existing_data(json_output_file):
+    """
+    Charge les vidéos existantes à partir du fichier JSON.
+    """
+    if os.path.exists(json_output_file):
+        try:
+            with open(json_output_file, "r", encoding="utf-8") as json_file:
+                logging.info("Chargement des vidéos existantes...")
+                return json.load(json_file)
+        except (IOError, json.JSONDecodeError):
+            logging.warning("Erreur lors du chargement des vidéos existantes. Le fichier sera recréé.")
+    return []
+
+
+def save_data_to_json(data, json_output_file):
+    """
+    Sauvegarde les données dans un fichier JSON.
+    """
+    try:
+        with open(json_output_file, "w", encoding="utf-8") as json_file:
+            json.dump(data, json_file, ensure_ascii=False, indent=4)
+        logging.info(f"Données sauvegardées avec succès dans '{json_output_file}'.")
+    except IOError as e:
+        logging.error(f"Erreur lors de l'écriture du fichier JSON : {e}")
+
+
+async def fetch_rss_feed(engine, rss_url):
+    """
+    Télécharge et parse le flux RSS ; retourne None en cas d'échec.
+    """
+    logging.info(f"Téléchargement du flux RSS depuis {rss_url}...")
+    response = await engine.get(rss_url, conditional=True)
+    if response is None:
+        logging.error(f"Erreur lors du téléchargement du flux RSS : {rss_url}")
+        return None
+    logging.info("Flux RSS téléchargé avec succès.")
+    return ET.fromstring(response.content)
+
+
+def process_videos(root, existing_urls, source):
+    """
+    Traite les vidéos du flux RSS et retourne une liste de nouvelles vidéos.
+    """
+    videos_data = []
+    channel_name = root.find('atom:title', NAMESPACES).text
+    channel_id = root.find('yt:channelId', NAMESPACES).text
+
+    # Parcourir les entrées du flux
+    for entry in root.findall('atom:entry', NAMESPACES):
+        title = entry.find('atom:title', NAMESPACES).text
+        video_url = entry.find('atom:link', NAMESPACES).attrib['href']
+        published_date = entry.find('atom:published', NAMESPACES).text
+
+        # Extraire la description depuis media:description
+        media_group = entry.find('media:group', NAMESPACES)
+        media_description = media_group.find(
+            'media:description',
+            NAMESPACES).text if media_group is not None else None
+
+        # Vérifier si l'URL de la vidéo existe déjà
+        if video_url not in existing_urls:
+            videos_data.append({
+                "title": title,
+                "source": source,
+                "publication_date": published_date,
+                "video_url": video_url,
+                "description": media_description,
+                "channel_id": channel_id,
+                "channel_name": channel_name
+            })
+            existing_urls.add(video_url)  # Ajouter l'URL à l'ensemble des existants
+            logging.info(f"Nouvelle vidéo ajoutée : {title}")
+
+    logging.info(f"Nombre de nouvelles vidéos ajoutées ({source}) : {len(videos_data)}")
+    return videos_data
+
+
+async def scrape_channel(engine, channel_id, source, json_file_name):
+    """Collecte les nouvelles vidéos d'une chaîne YouTube et les ajoute à son fichier JSON."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    json_output_file = os.path.join(OUTPUT_DIR, json_file_name)
+
+    # Charger les vidéos existantes
+    existing_data = load_existing_data(json_output_file)
+    existing_urls = {video["video_url"] for video in existing_data}
+
+    # Récupérer et traiter le flux RSS
+    root = await fetch_rss_feed(engine, channel_feed_url(channel_id))
+    if root is None:
+        return
+    new_videos = process_videos(root, existing_urls, source)
+
+    # Fusionner les nouvelles vidéos avec les données existantes
+    existing_data.extend(new_videos)
+
+    # Sauvegarder les données mises à jour
+    save_data_to_json(existing_data, json_output_file)
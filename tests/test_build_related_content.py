@@ -0,0 +1,39 @@
+import pytest
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+import numpy as np
+from scripts.build_related_content import index_positions, index_rows, related_rows
+
+
+class Index:
+    def __init__(self, content_types, content_ids):
+        self.content_types = np.asarray(content_types, dtype=np.int8)
+        self.content_ids = np.asarray(content_ids, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.content_ids)
+
+
+def test_index_rows_ignores_contents_missing_from_index():
+    positions = index_positions(Index([2, 0, 1], [7, 3, 3]))
+
+    rows = index_rows(positions, {("articles", 3), ("videos", 7), ("articles", 99)})
+
+    assert rows.tolist() == [0, 1]
+    assert index_rows(positions, set()).tolist() == []
+
+
+def test_related_rows_stop_at_padding():
+    index = Index([0, 1, 2], [10, 20, 30])
+
+    values = related_rows(index, [0], np.array([[2, 1, -1]]), np.array([[0.9, 0.5, -np.inf]]))
+
+    assert values == [
+        ("articles", 10, 0, "videos", 30, pytest.approx(0.9)),
+        ("articles", 10, 1, "scientific_articles", 20, pytest.approx(0.5)),
+    ]
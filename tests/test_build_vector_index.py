@@ -0,0 +1,36 @@
+import pytest
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+import numpy as np
+from scripts.build_vector_index import content_text, previous_rows
+
+
+class PreviousIndex:
+    def __init__(self, content_types, content_ids):
+        self.content_types = np.asarray(content_types, dtype=np.int8)
+        self.content_ids = np.asarray(content_ids, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.content_ids)
+
+
+def test_content_text_reuses_keyword_extraction_texts():
+    assert content_text("articles", {"title": "T", "summary": "S", "full_content": "Contenu"}) == "Contenu"
+    assert content_text("articles", {"title": "T", "summary": "S", "full_content": " "}) == "T. S"
+    assert content_text("scientific_articles", {"title": "T", "abstract": "Résumé"}) == "Résumé"
+    assert content_text("videos", {"title": "T", "description": None}) == "T"
+
+
+def test_previous_rows_locates_unchanged_contents():
+    # Ancien index : ordre des listes inversées, quelconque
+    previous = PreviousIndex([2, 0, 1, 0], [7, 3, 3, 1])
+
+    rows = previous_rows(previous, [0, 0, 0, 1, 2], [1, 2, 3, 3, 7])
+
+    assert rows.tolist() == [3, -1, 1, 2, 0]
+    assert previous_rows(None, [0], [1]).tolist() == [-1]
@@ -0,0 +1,67 @@
+import pytest
+import sys
+import os
+import asyncio
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.data_pipeline_runner import (
+    STAGES, Stage, StageResult, topological_order, select_stages, run_pipeline, critical_path
+)
+
+
+def script(tmp_path, name, body):
+    path = tmp_path / f"{name}.py"
+    path.write_text(body, encoding="utf-8")
+    return str(path)
+
+
+def test_declared_pipeline_is_acyclic_and_parallel():
+    order = [stage.name for stage in topological_order(STAGES)]
+    assert order.index("clean") < order.index("keywords_scientific") < order.index("insert")
+    by_name = {stage.name: stage for stage in STAGES}
+    # Les deux extractions de mots-clés et le dump / nettoyage ne dépendent pas l'un de l'autre
+    assert "keywords" not in by_name["keywords_scientific"].depends_on
+    assert by_name["dump"].depends_on == by_name["cleanup"].depends_on == ["insert"]
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError):
+        topological_order([Stage("a", "a.py", depends_on=["b"]), Stage("b", "b.py", depends_on=["a"])])
+    with pytest.raises(ValueError):
+        topological_order([Stage("a", "a.py", depends_on=["absente"])])
+    assert [stage.depends_on for stage in select_stages(STAGES, ["insert", "dump"])] == [[], ["insert"]]
+
+
+def test_independent_stages_run_concurrently_and_failures_propagate(tmp_path):
+    sleep = script(tmp_path, "sleep", "import time; time.sleep(0.5)")
+    fail = script(tmp_path, "fail", "import sys; sys.exit(3)")
+    stages = [
+        Stage("left", sleep),
+        Stage("right", sleep),
+        Stage("join", sleep, depends_on=["left", "right"]),
+        Stage("broken", fail, retries=1, retry_delay=0.01),
+        Stage("after_broken", sleep, depends_on=["broken"]),
+        Stage("flaky", fail, optional=True),
+        Stage("after_flaky", sleep, depends_on=["flaky"]),
+    ]
+
+    results = asyncio.run(run_pipeline(stages, max_parallel=4))
+
+    assert results["join"].started >= max(results["left"].finished, results["right"].finished)
+    assert results["right"].started < results["left"].finished
+    assert (results["broken"].status, results["broken"].attempts) == ("échec", 2)
+    assert results["after_broken"].status == "ignorée"
+    assert results["after_flaky"].status == "ok"
+
+
+def test_critical_path_follows_longest_chain():
+    stages = [Stage("a", "a.py"), Stage("b", "b.py"), Stage("c", "c.py", depends_on=["a", "b"])]
+    results = {
+        "a": StageResult("a", "ok", 1, 0.0, 5.0),
+        "b": StageResult("b", "ok", 1, 0.0, 2.0),
+        "c": StageResult("c", "ok", 1, 5.0, 6.0),
+    }
+    assert critical_path(stages, results) == (["a", "c"], 6.0)
@@ -0,0 +1,124 @@
+import pytest
+import re
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from datetime import date, datetime
+from urllib.parse import urlparse
+from scripts.watermarks import Watermark
+from scripts.database_cleanup import (
+    VALID_LINK_PATTERN, CRITICAL_FIELDS, anomaly_report, id_ranges, delete_in_batches, save_step_timings
+)
+
+
+class ScriptedCursor:
+    """Curseur factice : enregistre les requêtes et renvoie les résultats prévus pour chaque SELECT."""
+
+    def __init__(self, results=(), rowcounts=()):
+        self.queries = []
+        self.results = list(results)
+        self.rowcounts = list(rowcounts)
+        self.rowcount = 0
+        self._last = []
+
+    def execute(self, query, params=()):
+        query = " ".join(query.split())
+        self.queries.append((query, tuple(params)))
+        if query.startswith("SELECT"):
+            self._last = self.results.pop(0)
+        elif query.startswith("DELETE a FROM"):
+            self.rowcount = self.rowcounts.pop(0)
+
+    def executemany(self, query, rows):
+        self.queries.append((" ".join(query.split()), list(rows)))
+
+    def fetchone(self):
+        return self._last[0] if self._last else None
+
+    def fetchall(self):
+        return self._last
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.parametrize("link", [
+    "https://techcrunch.com/2025/04/01/ai",
+    "http://example.org",
+    "ftp://files.example.org/a",
+    "not a link",
+    "www.example.com/page",
+    "https:///chemin-sans-hote",
+    "mailto:someone@example.com",
+    "/relative/path",
+])
+def test_valid_link_pattern_matches_urlparse(link):
+    parsed = urlparse(link)
+    assert bool(re.search(VALID_LINK_PATTERN, link)) == bool(parsed.scheme and parsed.netloc)
+
+
+def test_anomaly_report_counts_every_field_in_one_query():
+    cursor = ScriptedCursor(results=[[{field: index for index, field in enumerate(CRITICAL_FIELDS)}]])
+
+    report = anomaly_report(cursor, Watermark(None, 10, datetime(2025, 4, 3)))
+
+    assert report == {field: index for index, field in enumerate(CRITICAL_FIELDS)}
+    assert len(cursor.queries) == 1
+    query, params = cursor.queries[0]
+    assert query.count("SUM(CASE") == len(CRITICAL_FIELDS)
+    assert "publication_date IS NULL THEN" in query and "publication_date = ''" not in query
+    assert params == (10, datetime(2025, 4, 3))
+
+
+def test_id_ranges_cover_the_scope_in_bounded_batches():
+    assert id_ranges(ScriptedCursor(results=[[{"min_id": None, "max_id": None}]])) == []
+    cursor = ScriptedCursor(results=[[{"min_id": 5, "max_id": 23}]])
+
+    assert id_ranges(cursor, batch_size=10) == [(5, 14), (15, 23)]
+
+
+def test_delete_in_batches_commits_each_range_and_refreshes_touched_days():
+    cursor = ScriptedCursor(
+        results=[
+            [{"min_id": 1, "max_id": 20}],
+            [{"publication_date": date(2025, 4, 1)}],  # Jours du premier lot
+            [],  # Second lot : rien à supprimer
+        ],
+        rowcounts=[2, 0]
+    )
+    connection = FakeConnection()
+
+    deleted = delete_in_batches(connection, cursor, "a.keywords IS NULL", (), batch_size=10, archive=True)
+
+    assert deleted == 2
+    assert connection.commits == 2
+    deletes = [params for query, params in cursor.queries if query.startswith("DELETE a FROM articles a")]
+    assert [params[:2] for params in deletes] == [(1, 10), (11, 20)]
+    archives = [query for query, _ in cursor.queries if query.startswith("INSERT IGNORE INTO irrelevant_articles")]
+    assert len(archives) == 2 and "a.updated_at" not in archives[0]
+    # Cumuls quotidiens et génération du cache : uniquement pour le lot qui a supprimé des articles
+    assert sum("keyword_daily_counts" in query and query.startswith("DELETE") for query, _ in cursor.queries) == 1
+    assert sum("cache_generation" in query for query, _ in cursor.queries) == 1
+
+
+def test_save_step_timings_writes_one_row_per_step():
+    cursor = ScriptedCursor()
+    started_at = datetime(2025, 4, 3, 20, 0)
+
+    save_step_timings(cursor, started_at, [("anomaly_report", 0.12345, 4), ("delete_duplicates", 1.5, 0)])
+
+    query, rows = cursor.queries[0]
+    assert query.startswith("INSERT IGNORE INTO monitoring_logs")
+    assert rows == [
+        (started_at, "database_cleanup:anomaly_report", 0.123, 4),
+        (started_at, "database_cleanup:delete_duplicates", 1.5, 0),
+    ]
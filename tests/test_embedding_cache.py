@@ -0,0 +1,73 @@
+import sys
+import os
+import numpy as np
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.embedding_cache import EmbeddingCache, encode_batched, load_candidate_embeddings
+
+
+class CountingModel:
+    """Modèle factice : un vecteur déterministe par texte, appels enregistrés."""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True, show_progress_bar=False):
+        self.batches.append(list(texts))
+        return np.array([[len(text), 1.0, float(sum(map(ord, text)) % 7)] for text in texts], dtype=np.float32)
+
+
+def test_encode_batched_sorts_by_length_and_keeps_order():
+    model = CountingModel()
+    texts = ["a" * 9, "b", "c" * 5, "d" * 2]
+    vectors = encode_batched(model, texts, batch_size=2)
+
+    assert model.batches == [["b", "dd"], ["ccccc", "a" * 9]]
+    assert vectors.shape == (4, 3)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+    assert vectors[0][0] > vectors[1][0]
+
+
+def test_cache_only_encodes_new_contents(tmp_path):
+    model = CountingModel()
+    cache = EmbeddingCache(str(tmp_path / "embeddings.npz"))
+    first = cache.embed(model, ["article un", "article deux"])
+    cache.save()
+
+    reloaded = EmbeddingCache(str(tmp_path / "embeddings.npz"))
+    reloaded.load()
+    second = reloaded.embed(model, ["article deux", "article trois", "article un"])
+
+    assert model.batches[-1] == ["article trois"]
+    assert reloaded.hits == 2 and reloaded.misses == 1
+    np.testing.assert_allclose(second[0], first[1])
+    np.testing.assert_allclose(second[2], first[0])
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    model = CountingModel()
+    cache = EmbeddingCache(str(tmp_path / "embeddings.npz"), max_entries=2)
+    cache.embed(model, ["a", "b"])
+    cache.embed(model, ["a", "c"])
+    cache.save()
+
+    reloaded = EmbeddingCache(str(tmp_path / "embeddings.npz"))
+    reloaded.load()
+    reloaded.embed(model, ["a", "c"])
+    assert reloaded.misses == 0
+
+
+def test_candidate_embeddings_are_reused(tmp_path):
+    model = CountingModel()
+    candidates = ["GPT", "BERT", "Robotics"]
+    first = load_candidate_embeddings(model, "test/model", candidates, cache_dir=str(tmp_path))
+    second = load_candidate_embeddings(model, "test/model", candidates, cache_dir=str(tmp_path))
+
+    assert len(model.batches) == 1
+    np.testing.assert_allclose(first, second)
+
+    load_candidate_embeddings(model, "test/model", candidates + ["T5"], cache_dir=str(tmp_path))
+    assert len(model.batches) == 2
@@ -0,0 +1,40 @@
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.enrichment_cache import EnrichmentCache, cache_key
+
+
+def test_key_ignores_whitespace_but_not_model():
+    assert cache_key("bart", "AI  is\nhere ") == cache_key("bart", "AI is here")
+    assert cache_key("bart", "AI is here") != cache_key("distilbart", "AI is here")
+    assert cache_key("bart", "AI is here") != cache_key("bart", "AI was here")
+
+
+def test_results_persist_across_runs(tmp_path):
+    path = str(tmp_path / "enrichment.sqlite")
+    with EnrichmentCache(path) as cache:
+        assert cache.get_many("summary", "bart", ["texte un", "texte deux"]) == [None, None]
+        cache.put_many("summary", "bart", ["texte un", "texte deux"], ["résumé un", None])
+        cache.put_many("keywords", "minilm", ["texte un"], [["GPT", "BERT"]])
+
+    with EnrichmentCache(path) as cache:
+        assert cache.get_many("summary", "bart", ["texte deux", "texte  un"]) == [None, "résumé un"]
+        assert cache.get_many("keywords", "minilm", ["texte un"]) == [["GPT", "BERT"]]
+        assert cache.get_many("summary", "distilbart", ["texte un"]) == [None]
+        assert cache.hits == 2 and cache.misses == 2
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path):
+    path = str(tmp_path / "enrichment.sqlite")
+    cache = EnrichmentCache(path, max_mb=0.001)
+    cache.put_many("summary", "bart", ["ancien"], ["a" * 500])
+    cache.put_many("summary", "bart", ["récent"], ["b" * 500])
+    cache.put_many("summary", "bart", ["nouveau"], ["c" * 500])
+    cache.get_many("summary", "bart", ["récent"])
+    assert cache.evict() == 1
+    assert cache.get_many("summary", "bart", ["ancien", "récent", "nouveau"]) == [None, "b" * 500, "c" * 500]
+    cache.close()
@@ -37,3 +37,33 @@ def test_generate_summary_long_text():
     summary = generate_summary(text, max_length=150, min_length=50)
     assert isinstance(summary, str)
     assert len(summary.split()) >= 30
+
+
+def test_batched_summaries_keep_input_order():
+    from scripts.summarizers import get_summarizer
+    engine = get_summarizer("bart").engine
+    texts = [
+        "Machine learning is great. " * 60,
+        "",
+        "Robots are learning to walk on uneven terrain thanks to reinforcement learning. " * 5,
+    ]
+    summaries = engine.summarize(texts, [150, 100, 100], min_length=10)
+    assert len(summaries) == 3
+    assert all(isinstance(summary, str) for summary in summaries)
+
+
+def test_chunk_sentences_respects_segment_size_and_budget():
+    from scripts.summarization_engine import chunk_sentences
+    sentences = ["First.", "Second.", "Third.", "Fourth."]
+    assert chunk_sentences(sentences, [400, 400, 400, 400], 900, 4096) == ["First. Second.", "Third. Fourth."]
+    assert chunk_sentences(sentences, [400, 400, 400, 400], 900, 1000) == ["First. Second."]
+
+
+def test_long_text_is_split_into_chunks():
+    from scripts.summarizers import get_summarizer
+    engine = get_summarizer("bart").engine
+    text = " ".join(f"Paragraph {i} explains how transformers changed machine translation." for i in range(300))
+    chunks = engine.chunk_text(text)
+    assert len(chunks) > 1
+    summary = generate_summary(text, max_length=150, min_length=30)
+    assert isinstance(summary, str) and summary
@@ -0,0 +1,153 @@
+import pytest
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from datetime import date
+import scripts.insert_json as insert_json
+from scripts.insert_json import build_upsert_query, insert_monitoring_logs, UPSERT_TABLES, MONITORING_COLUMNS
+from scripts.watermarks import Watermark
+
+
+class BatchCursor:
+    """Curseur factice : enregistre les lots envoyés ; les doublons sont ignorés comme par INSERT IGNORE."""
+
+    def __init__(self, existing=()):
+        self.batches = []
+        self.seen = set(existing)
+        self.rowcount = 0
+
+    def executemany(self, query, rows):
+        self.batches.append((" ".join(query.split()), list(rows)))
+        new_rows = [row for row in rows if row[:2] not in self.seen]
+        self.seen.update(row[:2] for row in new_rows)
+        self.rowcount = len(new_rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.parametrize("table_name", list(UPSERT_TABLES))
+def test_build_upsert_query_updates_every_column_but_the_key(table_name):
+    key_column, columns = UPSERT_TABLES[table_name]
+    query = " ".join(build_upsert_query(table_name).split())
+
+    assert query.startswith(f"INSERT INTO {table_name} ({', '.join(columns)})")
+    assert query.count("%s") == len(columns)
+    updates = query.split("ON DUPLICATE KEY UPDATE ")[1]
+    assert f"{key_column} = VALUES({key_column})" not in updates
+    assert updates.count("= VALUES(") == len(columns) - 1
+
+
+def test_insert_monitoring_logs_sends_chunks_and_skips_loaded_entries():
+    entries = [{"timestamp": f"2025-04-0{day}T08:00:00", "script": "extract_keywords", "articles_count": day} for day in range(1, 6)]
+    cursor = BatchCursor(existing={("2025-04-01T08:00:00", "extract_keywords")})
+    connection = FakeConnection(cursor)
+
+    insert_monitoring_logs({"entries": entries + [{"script": "sans_timestamp"}]}, connection, chunk_size=2)
+
+    assert [len(rows) for _, rows in cursor.batches] == [2, 2, 1]
+    assert cursor.batches[0][0].startswith("INSERT IGNORE INTO monitoring_logs")
+    assert len(cursor.batches[0][1][0]) == len(MONITORING_COLUMNS)
+    assert len(cursor.seen) == 5
+    assert connection.commits == 3
+
+
+class UpsertCursor:
+    """
+    Curseur factice : lignes existantes {clé: (id, date, mots-clés)} et leurs
+    colonnes enregistrées {clé: {colonne: valeur}}, upserts enregistrés.
+    """
+
+    def __init__(self, existing, stored=None):
+        self.existing = dict(existing)
+        self.stored = stored or {}
+        self.upserted = []
+        self.rows = []
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        if " IN (" not in query:
+            self.rows = []
+        elif "full_content" in query:
+            columns = insert_json.UPSERT_TABLES["articles"][1]
+            self.rows = [
+                (key, *[self.stored[key].get(column) for column in columns]) for key in params if key in self.stored
+            ]
+        else:
+            self.rows = [(key, *self.existing[key]) for key in params if key in self.existing]
+
+    def executemany(self, query, rows):
+        rows = list(rows)
+        if "INTO articles" not in query:
+            return
+        self.upserted.extend(rows)
+        for row in rows:
+            self.existing.setdefault(row[6], (100 + len(self.existing), row[2], row[8]))
+        self.rowcount = len(rows)
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def stub_keyword_updates(monkeypatch):
+    monkeypatch.setattr(insert_json, "sync_keywords", lambda cursor, table_name, rows: 0)
+    monkeypatch.setattr(insert_json, "refresh_daily_counts", lambda cursor, table_name, days: None)
+    monkeypatch.setattr(insert_json, "bump_cache_generation", lambda cursor: None)
+
+
+OLD_ARTICLE = {
+    "link": "https://a.com/old", "source": "Source", "publication_date": "2025-01-02", "keywords": "AI",
+    "title": "Titre", "summary": "Résumé",
+}
+
+
+def test_insert_skips_only_stale_rows_already_in_database(monkeypatch):
+    stub_keyword_updates(monkeypatch)
+    cursor = UpsertCursor(
+        {"https://a.com/old": (1, date(2025, 1, 2), "AI")},
+        {"https://a.com/old": {**OLD_ARTICLE, "publication_date": date(2025, 1, 2), "author": ""}}
+    )
+    watermarks = {"articles:Source": Watermark(date(2025, 4, 20), 1, None)}
+
+    insert_json.insert_or_update_data("articles", [
+        dict(OLD_ARTICLE),
+        {"link": "https://a.com/late", "source": "Source", "publication_date": "2025-01-03", "keywords": "AI"},
+        {"link": "https://a.com/new", "source": "Source", "publication_date": "2025-04-21", "keywords": "AI"},
+    ], FakeConnection(cursor), watermarks=watermarks)
+
+    assert [row[6] for row in cursor.upserted] == ["https://a.com/late", "https://a.com/new"]
+
+
+def test_insert_rewrites_old_rows_whose_content_changed(monkeypatch):
+    stub_keyword_updates(monkeypatch)
+    cursor = UpsertCursor(
+        {"https://a.com/old": (1, date(2025, 1, 2), "AI")},
+        {"https://a.com/old": {**OLD_ARTICLE, "publication_date": date(2025, 1, 2)}}
+    )
+    watermarks = {"articles:Source": Watermark(date(2025, 4, 20), 1, None)}
+
+    insert_json.insert_or_update_data(
+        "articles", [{**OLD_ARTICLE, "summary": "Résumé corrigé"}], FakeConnection(cursor), watermarks=watermarks
+    )
+
+    summary_position = insert_json.UPSERT_TABLES["articles"][1].index("summary")
+    assert [row[summary_position] for row in cursor.upserted] == ["Résumé corrigé"]
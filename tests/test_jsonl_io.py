@@ -0,0 +1,76 @@
+import pytest
+import sys
+import os
+import json
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.jsonl_io import JsonlWriter, iter_records, iter_chunks, iter_json_array, append_records, convert
+
+RECORDS = [
+    {"title": "Premier", "full_content": "Texte [avec] des {accolades}, \"guillemets\" et é" * 50},
+    {"title": "Second", "full_content": None, "keywords": ""},
+    {"title": "Troisième", "full_content": "Court"},
+]
+
+
+def test_json_array_is_decoded_across_small_reads(tmp_path):
+    path = tmp_path / "articles.json"
+    path.write_text(json.dumps(RECORDS, ensure_ascii=False, indent=4), encoding="utf-8")
+
+    with open(path, "r", encoding="utf-8") as file:
+        assert list(iter_json_array(file, buffer_size=16)) == RECORDS
+    assert list(iter_records(str(path))) == RECORDS
+
+
+@pytest.mark.parametrize("buffer_size", [1, 2, 3])
+def test_json_array_after_leading_whitespace_with_tiny_buffer(tmp_path, buffer_size):
+    path = tmp_path / "articles.json"
+    path.write_text("  \n [ ]", encoding="utf-8")
+    with open(path, "r", encoding="utf-8") as file:
+        assert list(iter_json_array(file, buffer_size=buffer_size)) == []
+
+    path.write_text("   " + json.dumps(RECORDS, ensure_ascii=False), encoding="utf-8")
+    with open(path, "r", encoding="utf-8") as file:
+        assert list(iter_json_array(file, buffer_size=buffer_size)) == RECORDS
+
+
+def test_json_array_rejects_other_content(tmp_path):
+    path = tmp_path / "articles.json"
+    for content in ["   ", '  {"title": "Seul"}']:
+        path.write_text(content, encoding="utf-8")
+        with open(path, "r", encoding="utf-8") as file:
+            with pytest.raises(ValueError):
+                list(iter_json_array(file, buffer_size=1))
+
+
+def test_convert_then_rewrite_in_place(tmp_path):
+    source, destination = tmp_path / "articles.json", tmp_path / "articles.jsonl"
+    source.write_text(json.dumps(RECORDS, ensure_ascii=False), encoding="utf-8")
+
+    assert convert(str(source), str(destination)) == 3
+    assert len(destination.read_text(encoding="utf-8").splitlines()) == 3
+
+    # Le fichier lu peut être réécrit pendant sa lecture
+    with JsonlWriter(str(destination)) as writer:
+        for chunk in iter_chunks(iter_records(str(destination)), 2):
+            writer.write_many([{**record, "seen": True} for record in chunk])
+    assert [record["seen"] for record in iter_records(str(destination))] == [True] * 3
+
+    append_records(str(destination), [{"title": "Ajouté"}])
+    assert [record["title"] for record in iter_records(str(destination))][-1] == "Ajouté"
+
+
+def test_failed_rewrite_keeps_original(tmp_path):
+    path = tmp_path / "videos.jsonl"
+    append_records(str(path), RECORDS)
+
+    with pytest.raises(RuntimeError):
+        with JsonlWriter(str(path)) as writer:
+            writer.write({"title": "Partiel"})
+            raise RuntimeError("échec")
+
+    assert list(iter_records(str(path))) == RECORDS
+    assert not os.path.exists(f"{path}.tmp")
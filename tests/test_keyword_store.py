@@ -0,0 +1,64 @@
+import pytest
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from datetime import date
+from scripts.keyword_store import split_keywords, refresh_daily_counts, MAX_KEYWORD_LENGTH
+from app.keywords import keyword_filter
+
+
+def test_split_keywords_empty_values():
+    assert split_keywords(None) == []
+    assert split_keywords("") == []
+    assert split_keywords(";;") == []
+
+
+def test_split_keywords_strips_and_deduplicates_case_insensitively():
+    assert split_keywords(" AI ;Deep Learning;ai; deep learning ;NLP") == ["AI", "Deep Learning", "NLP"]
+
+
+def test_split_keywords_accepts_lists_and_truncates():
+    long_keyword = "x" * (MAX_KEYWORD_LENGTH + 10)
+    assert split_keywords(["GPT", long_keyword]) == ["GPT", "x" * MAX_KEYWORD_LENGTH]
+
+
+def test_keyword_filter_uses_link_table_equality():
+    clause, params = keyword_filter("scientific_articles", ["RAG", "NLP"])
+    assert "scientific_article_keywords" in clause
+    assert "k.name IN (%s, %s)" in clause
+    assert "LIKE" not in clause
+    assert params == ["RAG", "NLP"]
+
+
+class RecordingCursor:
+    """Curseur factice qui enregistre les requêtes exécutées."""
+
+    def __init__(self):
+        self.statements = []
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        self.statements.append((" ".join(query.split()), list(params)))
+        self.rowcount = 2
+
+
+def test_refresh_daily_counts_only_recomputes_touched_days():
+    cursor = RecordingCursor()
+    written = refresh_daily_counts(cursor, "articles", ["2025-04-02", date(2025, 4, 1), None, "2025-04-02"])
+
+    (delete_query, delete_params), (insert_query, insert_params) = cursor.statements
+    assert delete_query.startswith("DELETE FROM keyword_daily_counts")
+    assert delete_params == ["articles", "2025-04-01", "2025-04-02"]
+    assert "JOIN article_keywords" in insert_query
+    assert insert_params == ["articles", "2025-04-01", "2025-04-02"]
+    assert written == 2
+
+
+def test_refresh_daily_counts_without_days_is_a_no_op():
+    cursor = RecordingCursor()
+    assert refresh_daily_counts(cursor, "videos", [None]) == 0
+    assert cursor.statements == []
@@ -0,0 +1,80 @@
+import asyncio
+import subprocess
+import sys
+import os
+from fastapi.testclient import TestClient
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.model_server import MicroBatcher, create_app
+from scripts.model_client import ModelServerClient, RemoteEmbeddingModel, RemoteSummarizer
+
+
+def fake_run_batch(key, items):
+    if key[0] == "embed":
+        return [[float(len(text)), 1.0] for text in items]
+    _, backend, min_length = key
+    return [f"{backend}:{text[:max_length]}:{min_length}" for text, max_length in items]
+
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    def run_batch(key, items):
+        calls.append((key, list(items)))
+        return [item.upper() for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(run_batch, window_ms=50)
+        batcher.start()
+        results = await asyncio.gather(
+            batcher.submit(("embed", "m"), ["a", "b"]),
+            batcher.submit(("embed", "m"), ["c"]),
+            batcher.submit(("embed", "autre"), ["d"]),
+        )
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+    assert results == [["A", "B"], ["C"], ["D"]]
+    assert calls == [(("embed", "m"), ["a", "b", "c"]), (("embed", "autre"), ["d"])]
+
+
+def test_remote_models_round_trip():
+    app = create_app(run_batch=fake_run_batch, model_id=lambda backend: f"{backend}-model")
+    with TestClient(app) as http_client:
+        client = ModelServerClient(http_client=http_client)
+
+        vectors = RemoteEmbeddingModel("all-MiniLM-L6-v2", client).encode(["abc", "de"])
+        assert vectors.tolist() == [[3.0, 1.0], [2.0, 1.0]]
+
+        summarizer = RemoteSummarizer("distilbart", client)
+        assert summarizer.model_id == "distilbart-model"
+        assert summarizer.summarize(["long text", "other"], [4, 2], min_length=1) == [
+            "distilbart:long:1", "distilbart:ot:1"
+        ]
+        assert client.health()["batches"] == 2
+
+
+def test_summarize_rejects_mismatched_lengths():
+    app = create_app(run_batch=fake_run_batch)
+    with TestClient(app) as http_client:
+        response = http_client.post("/summarize", json={"backend": "bart", "texts": ["a"], "max_lengths": []})
+        assert response.status_code == 422
+
+
+def test_thin_clients_do_not_import_local_models():
+    # Avec un serveur de modèles, les scripts d'enrichissement ne chargent ni torch ni sentence-transformers
+    code = (
+        "import sys; sys.path.insert(0, 'scripts')\n"
+        "import generate_summaries, generate_keywords, generate_keywords_scientific_articles\n"
+        "generate_summaries.load_summarizer('bart')\n"
+        "print([m for m in ('torch', 'transformers', 'sentence_transformers') if m in sys.modules])"
+    )
+    env = {**os.environ, "MODEL_SERVER_URL": "http://127.0.0.1:1"}
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=project_root, env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+import time
+import pytest
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.monitoring_file import append_monitoring_entry, acquire_lock
+
+
+def test_append_releases_its_lock(tmp_path):
+    path = tmp_path / "monitoring.json"
+    append_monitoring_entry("first", {"count": 1}, str(path))
+    append_monitoring_entry("second", {"count": 2}, str(path))
+
+    entries = json.loads(path.read_text(encoding="utf-8"))["entries"]
+    assert [entry["script"] for entry in entries] == ["first", "second"]
+    assert not os.path.exists(f"{path}.lock")
+
+
+def test_stale_lock_is_taken_over(tmp_path):
+    path = tmp_path / "monitoring.json"
+    lock_path = f"{path}.lock"
+    open(lock_path, "w").close()
+    old = time.time() - 3600
+    os.utime(lock_path, (old, old))
+
+    append_monitoring_entry("after_crash", {}, str(path))
+
+    assert json.loads(path.read_text(encoding="utf-8"))["entries"][0]["script"] == "after_crash"
+    assert not os.path.exists(lock_path)
+
+
+def test_active_lock_times_out_without_being_removed(tmp_path):
+    lock_path = str(tmp_path / "monitoring.json.lock")
+    open(lock_path, "w").close()
+
+    with pytest.raises(TimeoutError):
+        acquire_lock(lock_path, timeout=0.1)
+    # Le verrou appartient à un autre processus : il reste en place
+    assert os.path.exists(lock_path)
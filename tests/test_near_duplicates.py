@@ -0,0 +1,89 @@
+import pytest
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+import numpy as np
+from scripts.near_duplicates import (
+    permutations, shingles, minhash, candidate_pairs, cluster, canonical_links, mark_near_duplicates,
+    remember_canonical, copy_from_canonical
+)
+from scripts.jsonl_io import write_records, iter_records
+
+STORY = (
+    "OpenAI announced on Tuesday a new reasoning model that it says outperforms previous systems on "
+    "mathematics and coding benchmarks while costing less to run. The company said the model will be "
+    "available to developers through its API starting next week, with enterprise customers getting early "
+    "access. Analysts noted the release intensifies competition with Google and Anthropic, which both "
+    "shipped comparable models this year. The model was trained with reinforcement learning on chains of "
+    "thought and can spend more computation on harder problems before answering."
+)
+
+
+def test_minhash_estimates_jaccard_similarity():
+    coefficients = permutations()
+    first, second = shingles(STORY), shingles(STORY.replace("next week", "on Monday"))
+    exact = len(np.intersect1d(first, second)) / len(np.union1d(first, second))
+
+    first_signature, second_signature = minhash(first, coefficients), minhash(second, coefficients)
+
+    assert np.array_equal(minhash(shingles(STORY.upper()), coefficients), first_signature)
+    assert abs(np.mean(first_signature == second_signature) - exact) < 0.15
+    assert minhash(shingles("trop court"), coefficients) is None
+
+
+def test_candidate_pairs_share_a_band():
+    signatures = np.array([[1, 2, 3, 4], [1, 2, 9, 9], [7, 7, 7, 7]], dtype=np.uint32)
+    assert candidate_pairs(signatures, num_bands=2) == {(0, 1)}
+
+
+def test_cluster_keeps_first_row_as_canonical():
+    signatures = np.array([[5, 5, 5, 5], [1, 1, 1, 1], [5, 5, 5, 5], [1, 1, 1, 1], [5, 5, 5, 5]], dtype=np.uint32)
+    assert cluster(signatures, threshold=0.9, num_bands=2) == [0, 1, 0, 1, 0]
+
+
+def test_canonical_links_groups_syndicated_copies():
+    articles = [
+        {"link": "https://techcrunch.com/a", "full_content": STORY},
+        {"link": "https://example.com/other", "full_content": "An unrelated article about robotics " * 20},
+        {"link": "https://venturebeat.com/a", "full_content": STORY + " Read the full report on our site."},
+        {"link": "https://theverge.com/a", "full_content": STORY.replace("Tuesday", "Wednesday")},
+        {"link": "https://example.com/empty", "full_content": ""},
+    ]
+
+    duplicates, counts = canonical_links(articles)
+
+    assert duplicates == {
+        "https://venturebeat.com/a": "https://techcrunch.com/a",
+        "https://theverge.com/a": "https://techcrunch.com/a",
+    }
+    assert counts == {"https://techcrunch.com/a": 2}
+
+
+def test_mark_near_duplicates_rewrites_file(tmp_path):
+    path = str(tmp_path / "articles.jsonl")
+    write_records(path, [
+        {"link": "a", "full_content": STORY},
+        {"link": "b", "full_content": STORY, "near_duplicates": 4},
+        {"link": "c", "full_content": "Different story about chips and data centers " * 10, "duplicate_of": "a"},
+    ])
+
+    assert mark_near_duplicates(path) == (1, 1, 3)
+    records = list(iter_records(path))
+    assert records[0]["near_duplicates"] == 1
+    assert records[1]["duplicate_of"] == "a" and "near_duplicates" not in records[1]
+    assert "duplicate_of" not in records[2]
+
+
+def test_duplicates_copy_canonical_results():
+    results = {}
+    remember_canonical(results, {"link": "a", "near_duplicates": 1, "summary": "Résumé"}, "summary")
+    remember_canonical(results, {"link": "b", "summary": "Autre"}, "summary")
+    duplicate = {"link": "c", "duplicate_of": "a"}
+
+    assert copy_from_canonical(results, duplicate, "summary")
+    assert duplicate["summary"] == "Résumé"
+    assert not copy_from_canonical(results, {"link": "d", "duplicate_of": "b"}, "summary")
@@ -0,0 +1,154 @@
+import asyncio
+import sys
+import os
+import httpx
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.scraping_engine import ScrapingEngine, parse_retry_after, MAX_RETRY_AFTER
+from scripts.http_validators import ValidatorStore
+
+
+def make_engine(handler, **kwargs):
+    kwargs.setdefault("requests_per_second", 0)
+    return ScrapingEngine(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5
+    assert parse_retry_after(None, default=7) == 7
+    assert parse_retry_after("3600") == MAX_RETRY_AFTER
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+def test_retries_after_429_with_retry_after():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.host)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, text="ok")
+
+    async def scenario():
+        async with make_engine(handler) as engine:
+            text = await engine.get_text("https://example.com/article")
+            return text, engine.stats
+
+    text, stats = asyncio.run(scenario())
+    assert text == "ok"
+    assert len(calls) == 2
+    assert stats["throttled"] == 1 and stats["retries"] == 1
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(404)
+
+    async def scenario():
+        async with make_engine(handler) as engine:
+            return await engine.get("https://example.com/missing"), engine.stats
+
+    response, stats = asyncio.run(scenario())
+    assert response is None
+    assert calls == ["/missing"]
+    assert stats["failures"] == 1
+
+
+def test_per_host_concurrency_limit():
+    active = {"current": 0, "max": 0}
+
+    async def handler(request):
+        active["current"] += 1
+        active["max"] = max(active["max"], active["current"])
+        await asyncio.sleep(0.01)
+        active["current"] -= 1
+        return httpx.Response(200, text=request.url.path)
+
+    async def scenario():
+        async with make_engine(handler) as engine:
+            engine.configure_host("slow.example.com", concurrency=2)
+            return await asyncio.gather(*(engine.get_text(f"https://slow.example.com/{i}") for i in range(6)))
+
+    pages = asyncio.run(scenario())
+    assert pages == [f"/{i}" for i in range(6)]
+    assert active["max"] == 2
+
+
+def test_conditional_get_replays_last_body_on_304(tmp_path):
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="<rss/>", headers={"ETag": '"v1"'})
+
+    async def scenario(validators):
+        async with make_engine(handler, validators=validators) as engine:
+            response = await engine.get("https://example.com/feed", conditional=True)
+            return response, engine.stats
+
+    path = tmp_path / "http_validators.json"
+    validators = ValidatorStore.load(str(path))
+    response, _ = asyncio.run(scenario(validators))
+    assert response.status_code == 200
+    validators.save()
+
+    # Un flux inchangé produit les mêmes éléments : les fichiers de sortie ne dépendent pas du 304
+    response, stats = asyncio.run(scenario(ValidatorStore.load(str(path))))
+    assert response.status_code == 200 and response.text == "<rss/>"
+    assert seen_headers == [None, '"v1"']
+    assert stats["not_modified"] == 1 and stats["bytes_saved"] == len("<rss/>")
+
+
+def test_conditional_get_without_stored_body_is_unconditional(tmp_path):
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("If-None-Match"))
+        return httpx.Response(200, text="<rss/>", headers={"ETag": '"v1"'})
+
+    async def scenario(validators):
+        async with make_engine(handler, validators=validators) as engine:
+            return await engine.get("https://example.com/feed", conditional=True)
+
+    # Validateurs d'une version précédente, sans corps mémorisé : un 304 ne pourrait pas être rejoué
+    path = tmp_path / "http_validators.json"
+    validators = ValidatorStore(str(path), {"https://example.com/feed": {"etag": '"v1"', "seen_at": "2999-01-01"}})
+    assert asyncio.run(scenario(validators)).status_code == 200
+    assert seen_headers == [None]
+    assert validators.cached_body("https://example.com/feed") == b"<rss/>"
+
+
+def test_skip_known_pages(tmp_path):
+    validators = ValidatorStore(str(tmp_path / "http_validators.json"))
+    engine = ScrapingEngine(validators=validators)
+    assert not engine.skip_known("https://example.com/article")
+
+    # Une page seulement récupérée reste à collecter tant que son article n'est pas en base
+    validators.update("https://example.com/article", httpx.Response(200, text="contenu"))
+    assert not engine.skip_known("https://example.com/article")
+
+    validators.mark_ingested(["https://example.com/article"])
+    assert engine.skip_known("https://example.com/article")
+    assert engine.stats["pages_skipped"] == 1
+
+
+def test_page_fetch_is_not_recorded(tmp_path):
+    def handler(request):
+        return httpx.Response(200, text="<html>illisible</html>", headers={"ETag": '"p1"'})
+
+    async def scenario(validators):
+        async with make_engine(handler, validators=validators) as engine:
+            await engine.get_text("https://example.com/article")
+
+    validators = ValidatorStore(str(tmp_path / "http_validators.json"))
+    asyncio.run(scenario(validators))
+    assert "https://example.com/article" not in validators
+    assert not validators.is_ingested("https://example.com/article")
@@ -0,0 +1,47 @@
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.summarization_engine import SummarizationEngine
+
+
+class WordTokenizer:
+    """Tokenizer factice : un token par mot ; compte les textes tronqués."""
+
+    def __init__(self):
+        self.truncated = 0
+
+    def __call__(self, texts, truncation=False, max_length=None, add_special_tokens=True, verbose=True):
+        input_ids = [list(range(len(text.split()))) for text in texts]
+        if truncation:
+            self.truncated += sum(len(ids) > max_length for ids in input_ids)
+            input_ids = [ids[:max_length] for ids in input_ids]
+        return {"input_ids": input_ids}
+
+
+def fake_engine(token_budget):
+    engine = SummarizationEngine("fake-model", token_budget=token_budget)
+    engine.tokenizer = WordTokenizer()
+    engine.model = object()
+
+    def generate_batch(input_ids, max_length, min_length):
+        # Un « résumé » de max_length mots
+        return [" ".join(["word"] * max_length) for _ in input_ids]
+
+    engine.generate_batch = generate_batch
+    return engine
+
+
+def test_large_budget_is_reduced_until_it_fits():
+    engine = fake_engine(token_budget=20000)
+    text = " ".join(f"Sentence number {i} talks about large language models and their uses." for i in range(1500))
+
+    summary, = engine.summarize([text], [200], min_length=10)
+
+    assert summary.split() == ["word"] * 200
+    # Sans réduction récursive, les ~17 résumés de segments mis bout à bout (≈2500 tokens) seraient tronqués
+    assert engine.stats["chunks"] > 10
+    assert engine.tokenizer.truncated == 0
@@ -0,0 +1,49 @@
+import sys
+import os
+import numpy as np
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from scripts.summarizers import (
+    split_sentences, textrank_scores, select_sentences, choose_backend, parse_backend_map, get_summarizer
+)
+
+
+def test_split_sentences():
+    text = "OpenAI released a model. It scores 90% on MMLU! Is it open? No, e.g. weights are private."
+    assert split_sentences(text) == [
+        "OpenAI released a model.", "It scores 90% on MMLU!", "Is it open?", "No, e.g. weights are private."
+    ]
+
+
+def test_textrank_prefers_central_sentences():
+    similarity = np.array([
+        [1.0, 0.9, 0.8],
+        [0.9, 1.0, 0.1],
+        [0.8, 0.1, 1.0],
+    ])
+    scores = textrank_scores(similarity)
+    assert scores.argmax() == 0
+    assert abs(scores.sum() - 1.0) < 1e-6
+
+
+def test_select_sentences_respects_budget_and_order():
+    sentences = ["one two three.", "four five.", "six seven eight nine."]
+    assert select_sentences(sentences, [0.2, 0.5, 0.3], max_words=5) == "one two three. four five."
+
+
+def test_choose_backend_by_source_then_length():
+    by_source = parse_backend_map("TechCrunch=distilbart, Azure Blog=textrank")
+    long_text = "word " * 500
+    assert choose_backend({"source": "Azure Blog", "full_content": long_text}, by_source, "textrank") == "textrank"
+    assert choose_backend({"source": "TechCrunch", "full_content": "short"}, by_source, "textrank") == "distilbart"
+    assert choose_backend({"source": "VentureBeat", "full_content": "short"}, by_source, "textrank") == "textrank"
+    assert choose_backend({"source": "VentureBeat", "full_content": long_text}, by_source, "textrank") == "bart"
+
+
+def test_textrank_backend_summarizes_within_budget():
+    text = " ".join(f"Sentence number {i} talks about machine learning models." for i in range(20))
+    summary, = get_summarizer("textrank").summarize([text], [30])
+    assert 0 < len(summary.split()) <= 30
@@ -0,0 +1,46 @@
+import pytest
+import sys
+import os
+# Obtient le chemin absolu du répertoire racine du projet
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Ajoute le répertoire racine à sys.path s'il n'y est pas déjà
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from datetime import date, datetime
+from scripts.watermarks import Watermark, EMPTY_WATERMARK, advance, is_recent, changed_rows_condition
+from scripts.insert_json import keywords_changed
+
+
+def test_is_recent_keeps_lookback_window_and_undated_records():
+    watermark = Watermark(date(2025, 4, 10), 120, None)
+
+    assert is_recent("2025-04-08", watermark, lookback_days=3)
+    assert not is_recent("2025-04-06", watermark, lookback_days=3)
+    assert is_recent(None, watermark)
+    assert is_recent("2020-01-01", None)
+    assert is_recent("2020-01-01", EMPTY_WATERMARK)
+
+
+def test_advance_keeps_the_most_recent_values():
+    watermark = advance(None, "2025-04-02", 7)
+    watermark = advance(watermark, "2025-03-30", 12)
+    watermark = advance(watermark, None, 3, run_at=datetime(2025, 4, 3, 20, 0))
+
+    assert watermark == Watermark(date(2025, 4, 2), 12, datetime(2025, 4, 3, 20, 0))
+
+
+def test_changed_rows_condition():
+    assert changed_rows_condition(None) == ("1 = 1", [])
+    since = datetime(2025, 4, 3, 20, 0)
+    clause, params = changed_rows_condition(Watermark(None, 42, since), alias="a1")
+    assert clause == "(a1.id > %s OR a1.updated_at >= %s)"
+    assert params == [42, since]
+
+
+def test_unchanged_records_do_not_touch_keyword_links():
+    existing = (5, date(2025, 4, 2), "AI;NLP")
+
+    assert not keywords_changed({"publication_date": "2025-04-02", "keywords": "AI;NLP"}, existing)
+    assert keywords_changed({"publication_date": "2025-04-03", "keywords": "AI;NLP"}, existing)
+    assert keywords_changed({"publication_date": "2025-04-02", "keywords": "AI"}, existing)
+    assert keywords_changed({"publication_date": "2025-04-02"}, None)
@@ -0,0 +1,86 @@
+import sys
+import os
+
+# Ajout du chemin racine du projet au sys.path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.tasks.alert_checker import AlertIndex, percolate
+
+PREFERENCES = [
+    {"user_id": 1, "source_preferences": "TechCrunch;The Verge", "keyword_preferences": "OpenAI;Robotics",
+     "video_channel_preferences": None},
+    {"user_id": 2, "source_preferences": None, "keyword_preferences": "openai", "video_channel_preferences": "Mistral AI"},
+    {"user_id": 3, "source_preferences": "VentureBeat", "keyword_preferences": "", "video_channel_preferences": ""},
+    {"user_id": 4, "source_preferences": None, "keyword_preferences": None, "video_channel_preferences": "Mistral AI"},
+]
+
+
+class FakeCursor:
+    """Curseur minimal : résultats prédéfinis par table, filtrés sur id > last_id."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.rows = []
+
+    def execute(self, query, params=()):
+        table_name = query.split(" FROM ")[1].split()[0]
+        if "MAX(id)" in query:
+            self.rows = [{"max_id": max((row["id"] for row in self.tables[table_name]), default=0)}]
+        else:
+            self.rows = [row for row in self.tables[table_name] if row["id"] > params[0]]
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+
+def test_article_needs_source_and_keyword_when_both_are_set():
+    index = AlertIndex(PREFERENCES)
+
+    assert index.match_article({"source": "TechCrunch", "keywords": "OpenAI;GPT"}) == {1, 2}
+    assert index.match_article({"source": "TechCrunch", "keywords": "Finance"}) == set()
+    assert index.match_article({"source": "Azure Blog", "keywords": "OpenAI"}) == {2}
+    assert index.match_article({"source": "VentureBeat", "keywords": None}) == {3}
+
+
+def test_video_matches_followed_channel():
+    index = AlertIndex(PREFERENCES)
+
+    assert index.match_video({"channel_name": "Mistral AI"}) == {2, 4}
+    assert index.match_video({"channel_name": "OpenAI"}) == set()
+
+
+def test_percolate_streams_only_new_rows():
+    cursor = FakeCursor({
+        "articles": [
+            {"id": 5, "source": "TechCrunch", "keywords": "OpenAI"},
+            {"id": 6, "source": "VentureBeat", "keywords": "Robotics"},
+            {"id": 7, "source": "The Verge", "keywords": "Robotics"},
+        ],
+        "videos": [{"id": 2, "channel_name": "Mistral AI"}],
+    })
+
+    alerts, last_ids = percolate(cursor, AlertIndex(PREFERENCES), {"articles": 5, "videos": 0})
+
+    assert alerts == {
+        1: {"articles": [7], "videos": []},
+        2: {"articles": [], "videos": [2]},
+        3: {"articles": [6], "videos": []},
+        4: {"articles": [], "videos": [2]},
+    }
+    assert last_ids == {"articles": 7, "videos": 2}
+
+
+def test_first_check_only_sets_watermark():
+    cursor = FakeCursor({"articles": [{"id": 9, "source": "TechCrunch", "keywords": "OpenAI"}], "videos": []})
+
+    alerts, last_ids = percolate(cursor, AlertIndex(PREFERENCES), {})
+
+    assert alerts == {}
+    assert last_ids == {"articles": 9, "videos": 0}
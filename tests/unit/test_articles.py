@@ -112,3 +112,41 @@ def test_get_latest_articles_success():
                 assert "source" in article
                 assert "publication_date" in article
                 assert "link" in article
+
+
+def test_get_all_articles_pagination():
+    """Test pour la pagination par curseur des articles."""
+    token = create_temp_user_and_get_token()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/articles/", params={"page_size": 2}, headers=headers)
+
+    assert response.status_code in [200, 404], f"Unexpected status: {response.status_code} - {response.text}"
+    if response.status_code == 200:
+        first_page = response.json()
+        assert len(first_page) <= 2
+
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor:
+            next_response = client.get(
+                "/articles/",
+                params={"page_size": 2, "cursor": next_cursor},
+                headers=headers
+            )
+            assert next_response.status_code in [200, 404]
+            if next_response.status_code == 200:
+                first_ids = {article["id"] for article in first_page}
+                assert not first_ids & {article["id"] for article in next_response.json()}
+
+
+def test_get_all_articles_invalid_cursor():
+    """Test avec un curseur de pagination invalide."""
+    token = create_temp_user_and_get_token()
+
+    response = client.get(
+        "/articles/",
+        params={"cursor": "invalide"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 400, f"Unexpected status: {response.status_code} - {response.text}"
@@ -0,0 +1,117 @@
+import pytest
+import sys
+import os
+import time
+import asyncio
+
+# Ajout du chemin racine du projet au sys.path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app import cache
+from app.cache import MemoryCacheBackend, RedisCacheBackend, CacheStats, build_key, cached
+
+
+class FakeRedis:
+    """Substitut local d'un client Redis (sous-ensemble utilisé par le cache)."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self.values) if key.startswith(pattern.rstrip("*"))]
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    """Cache en mémoire vierge et génération figée (aucun accès à la base)."""
+    monkeypatch.setattr(cache, "cache_backend", MemoryCacheBackend(max_entries=8))
+    monkeypatch.setattr(cache, "cache_stats", CacheStats())
+    monkeypatch.setattr(cache, "generation_state", {"value": 1, "checked_at": time.monotonic() + 3600})
+    return cache
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", 1, 60)
+    backend.set("b", 2, 60)
+    assert backend.get("a") == 1
+    backend.set("c", 3, 60)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.get("c") == 3
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend()
+    backend.set("a", 1, 0)
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_build_key_ignores_user_and_sorts_params():
+    first = build_key("trends", 3, {"limit": 10, "offset": 0, "user": {"sub": "1"}})
+    second = build_key("trends", 3, {"offset": 0, "limit": 10, "user": {"sub": "2"}})
+    assert first == second
+    assert first != build_key("trends", 4, {"limit": 10, "offset": 0})
+
+
+def test_cached_sync_route_counts_hits_and_invalidates_on_generation(fresh_cache):
+    calls = []
+
+    @cached("metrics.test")
+    def route(limit: int = 10, user=None):
+        calls.append(limit)
+        return [{"count": limit}]
+
+    assert route(limit=5, user={"sub": "1"}) == [{"count": 5}]
+    assert route(limit=5, user={"sub": "2"}) == [{"count": 5}]
+    assert calls == [5]
+
+    fresh_cache.generation_state["value"] = 2
+    route(limit=5)
+    assert calls == [5, 5]
+
+    stats = fresh_cache.cache_stats.snapshot()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["namespaces"]["metrics.test"] == {"hits": 1, "misses": 2}
+
+
+def test_cached_async_route_with_redis_compatible_backend(fresh_cache):
+    fresh_cache.cache_backend = RedisCacheBackend(FakeRedis())
+    calls = []
+
+    @cached("trends.test")
+    async def route(limit: int = 10):
+        calls.append(limit)
+        return {"trending_keywords": [{"keyword": "AI", "count": limit}]}
+
+    first = asyncio.run(route(limit=3))
+    second = asyncio.run(route(limit=3))
+    assert first == second == {"trending_keywords": [{"keyword": "AI", "count": 3}]}
+    assert calls == [3]
+
+
+def test_cached_does_not_store_errors(fresh_cache):
+    calls = []
+
+    @cached("articles.test")
+    def route():
+        calls.append(1)
+        raise ValueError("boom")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            route()
+    assert len(calls) == 2
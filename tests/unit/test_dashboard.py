@@ -56,3 +56,71 @@ def test_get_dashboard_success():
         assert "total_articles" in dashboard_data
         assert "total_videos" in dashboard_data
         assert "latest_trends" in dashboard_data
+
+
+def test_build_trends_from_daily_counts():
+    """Les tendances sont reconstruites à partir du cumul quotidien des mots-clés."""
+    from datetime import date
+    from app.routes.dashboard_route import build_trends
+
+    daily_counts = [
+        {"day": date(2025, 4, 1), "keyword": "AI", "count": 3},
+        {"day": date(2025, 4, 1), "keyword": "NLP", "count": 5},
+        {"day": date(2025, 4, 2), "keyword": "AI", "count": 2},
+    ]
+    trending, chart = build_trends(daily_counts, ["AI", "RAG"])
+
+    assert trending[0] == {"date": "2025-04-01", "keywords": [{"keyword": "NLP", "count": 5}, {"keyword": "AI", "count": 3}]}
+    assert chart["dates"] == ["2025-04-01", "2025-04-02"]
+    assert chart["keyword_trends"] == [{"keyword": "AI", "counts": [3, 2]}, {"keyword": "RAG", "counts": [0, 0]}]
+
+
+def test_split_total_removes_window_count():
+    from app.routes.dashboard_route import split_total
+
+    rows, total = split_total([{"id": 1, "total_count": 42}, {"id": 2, "total_count": 42}])
+    assert rows == [{"id": 1}, {"id": 2}]
+    assert total == 42
+    assert split_total([]) == ([], 0)
+
+
+def test_identical_preferences_share_a_snapshot_key():
+    from app.routes.dashboard_route import parse_preferences
+    from app.tasks.dashboard_snapshots import preferences_hash
+
+    first = parse_preferences({"source_preferences": "TechCrunch;Wired", "video_channel_preferences": None, "keyword_preferences": "AI"})
+    second = parse_preferences({"source_preferences": "TechCrunch;Wired", "video_channel_preferences": "", "keyword_preferences": "AI"})
+    other = parse_preferences({"source_preferences": "Wired", "video_channel_preferences": "", "keyword_preferences": "AI"})
+
+    assert preferences_hash(first) == preferences_hash(second)
+    assert preferences_hash(first) != preferences_hash(other)
+    assert len(preferences_hash(first)) == 64
+
+
+@pytest.mark.filterwarnings("error::RuntimeWarning")
+@pytest.mark.parametrize("preferences", [
+    {"sources": ["TechCrunch"], "channels": ["OpenAI"], "keywords": ["AI"]},
+    {"sources": [], "channels": [], "keywords": []},
+])
+def test_build_dashboard_awaits_every_section(monkeypatch, preferences):
+    """Aucune coroutine de section n'est abandonnée sans être attendue."""
+    import asyncio
+    import gc
+    import warnings
+    from app.routes import dashboard_route
+
+    queries = []
+
+    async def fake_fetch_all(query, params=()):
+        queries.append(query)
+        return []
+
+    monkeypatch.setattr(dashboard_route, "fetch_all", fake_fetch_all)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        dashboard = asyncio.run(dashboard_route.build_dashboard(preferences, 5, 30))
+        gc.collect()
+
+    assert not [warning for warning in caught if "never awaited" in str(warning.message)]
+    assert len(queries) == (5 if preferences["sources"] else 1)
+    assert dashboard["metrics"]["articles_count"] == 0
@@ -0,0 +1,34 @@
+import asyncio
+import sys
+import os
+
+# Ajout du chemin racine du projet au sys.path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app import database
+
+
+class FakePool:
+    closed = False
+
+
+def test_concurrent_first_requests_share_one_pool(monkeypatch):
+    created = []
+
+    async def fake_create_pool(**kwargs):
+        await asyncio.sleep(0.01)
+        created.append(FakePool())
+        return created[-1]
+
+    monkeypatch.setattr(database.aiomysql, "create_pool", fake_create_pool)
+
+    async def scenario():
+        return await asyncio.gather(*(database.get_async_pool() for _ in range(5)))
+
+    pools = asyncio.run(scenario())
+
+    assert len(created) == 1
+    assert all(pool is created[0] for pool in pools)
@@ -0,0 +1,77 @@
+import pytest
+import sys
+import os
+from contextlib import asynccontextmanager
+from datetime import date
+from fastapi.testclient import TestClient
+
+# Ajout du chemin racine du projet au sys.path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app import cache
+from app.main import app
+from app.security.jwt_handler import jwt_required
+from app.routes import articles_route, videos_route, scientific_articles_route
+
+# Une ligne datée et une ligne sans date (publication_date NULL) par type de contenu
+ROWS = {
+    articles_route: {
+        "title": "Titre", "source": "Source", "keywords": "AI", "summary": "Résumé", "link": "https://a.com"
+    },
+    videos_route: {"title": "Titre", "video_url": "https://v.com", "source": "Source", "description": "Vidéo"},
+    scientific_articles_route: {
+        "title": "Titre", "article_url": "https://s.com", "authors": "A. Auteur",
+        "keywords": "AI", "abstract": "Résumé"
+    },
+}
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, query, params=None):
+        pass
+
+    async def fetchall(self):
+        return [dict(row) for row in self.rows]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def generation():
+        return 0
+
+    monkeypatch.setattr(cache, "get_generation_async", generation)
+    monkeypatch.setattr(cache, "cache_backend", cache.MemoryCacheBackend())
+    app.dependency_overrides[jwt_required] = lambda: {"sub": "test@example.com"}
+    yield TestClient(app)
+    app.dependency_overrides.pop(jwt_required, None)
+
+
+@pytest.mark.parametrize("module, path", [
+    (articles_route, "/articles/"),
+    (articles_route, "/articles/latest"),
+    (videos_route, "/videos/"),
+    (videos_route, "/videos/latest"),
+    (scientific_articles_route, "/scientific-articles/"),
+    (scientific_articles_route, "/scientific-articles/latest"),
+])
+def test_rows_without_publication_date_are_listed(client, monkeypatch, module, path):
+    rows = [
+        {"id": 2, "publication_date": date(2025, 4, 20), **ROWS[module]},
+        {"id": 1, "publication_date": None, **ROWS[module]},
+    ]
+
+    @asynccontextmanager
+    async def fake_cursor():
+        yield FakeCursor(rows)
+
+    monkeypatch.setattr(module, "get_async_cursor", fake_cursor)
+    response = client.get(path)
+
+    assert response.status_code == 200, response.text
+    assert [item["publication_date"] for item in response.json()] == ["2025-04-20", None]
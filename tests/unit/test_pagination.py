@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+from datetime import date
+from fastapi import HTTPException
+
+# Ajout du chemin racine du projet au sys.path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.pagination import encode_cursor, decode_cursor, apply_keyset, paginate
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(date(2025, 4, 20), 42)
+    assert decode_cursor(cursor) == ("2025-04-20", 42)
+
+
+def test_decode_invalid_cursor():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("invalide")
+    assert exc_info.value.status_code == 400
+
+
+def test_apply_keyset_adds_position_and_limit():
+    params = ["2025-01-01"]
+    query = apply_keyset("SELECT id FROM articles WHERE publication_date >= %s", params, encode_cursor("2025-04-20", 42), 10)
+    assert "publication_date < %s OR (publication_date = %s AND id < %s)" in query
+    assert query.endswith("ORDER BY publication_date DESC, id DESC LIMIT %s")
+    assert params == ["2025-01-01", "2025-04-20", "2025-04-20", 42, 11]
+
+
+def test_paginate_returns_next_cursor_only_when_more_rows():
+    rows = [{"id": i, "publication_date": date(2025, 4, 20)} for i in range(5, 0, -1)]
+
+    page, next_cursor = paginate(rows, 4)
+    assert [row["id"] for row in page] == [5, 4, 3, 2]
+    assert decode_cursor(next_cursor) == ("2025-04-20", 2)
+
+    page, next_cursor = paginate(rows, 5)
+    assert len(page) == 5
+    assert next_cursor is None
+
+
+def test_cursor_on_row_without_date():
+    page, next_cursor = paginate([{"id": 9, "publication_date": None}, {"id": 3, "publication_date": None}], 1)
+    assert decode_cursor(next_cursor) == (None, 9)
+
+    params = []
+    query = apply_keyset("SELECT id FROM articles WHERE 1=1", params, next_cursor, 10)
+    assert "AND (publication_date IS NULL AND id < %s)" in query
+    assert params == [9, 11]
+
+
+def test_dated_cursor_keeps_rows_without_date_reachable():
+    params = []
+    query = apply_keyset("SELECT id FROM articles WHERE 1=1", params, encode_cursor("2025-04-20", 42), 10)
+    assert "OR publication_date IS NULL)" in query
+    assert params == ["2025-04-20", "2025-04-20", 42, 11]
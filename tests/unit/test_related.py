@@ -0,0 +1,74 @@
+import pytest
+from fastapi.testclient import TestClient
+import uuid
+import sys
+import os
+from datetime import date
+
+# Ajout du chemin racine du projet au sys.path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.main import app
+from app.related import related_content_query, format_related
+
+client = TestClient(app)
+
+
+def create_temp_user_and_get_token():
+    """Helper pour créer un utilisateur temporaire et récupérer un token."""
+    email = f"testuser_{uuid.uuid4().hex[:6]}@example.com"
+    username = f"user_{uuid.uuid4().hex[:6]}"
+    password = "TestPassword123!"
+
+    register_response = client.post("/auth/register", json={
+        "username": username,
+        "email": email,
+        "password": password
+    })
+    assert register_response.status_code in [200, 201], f"Register failed: {register_response.text}"
+
+    login_response = client.post("/auth/login", json={
+        "email": email,
+        "password": password
+    })
+    assert login_response.status_code == 200, f"Login failed: {login_response.text}"
+    return login_response.json()["access_token"]
+
+
+def test_related_content_query_reads_one_content_list():
+    query, params = related_content_query("videos", 12, 5)
+
+    assert query.count("UNION ALL") == 2
+    assert "JOIN scientific_articles c ON c.id = r.related_id" in query
+    assert query.endswith("ORDER BY rank_position LIMIT %s")
+    assert params == ["videos", 12, "articles", "videos", 12, "scientific_articles", "videos", 12, "videos", 5]
+
+
+def test_format_related():
+    rows = [{
+        "rank_position": 0, "score": 0.91, "type": "articles", "id": 4, "title": "Titre", "source": "TechCrunch",
+        "publication_date": date(2025, 4, 20), "excerpt": "Résumé", "url": "https://example.com"
+    }]
+    assert format_related(rows) == [{
+        "type": "articles", "id": 4, "title": "Titre", "source": "TechCrunch", "publication_date": "2025-04-20",
+        "excerpt": "Résumé", "url": "https://example.com", "score": pytest.approx(0.91)
+    }]
+
+
+@pytest.mark.parametrize("path", ["/articles/1/related", "/scientific-articles/1/related", "/videos/1/related"])
+def test_get_related_content(path):
+    """Test pour récupérer les contenus similaires d'un contenu."""
+    token = create_temp_user_and_get_token()
+
+    response = client.get(path, params={"limit": 3}, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code in [200, 404], f"Unexpected status: {response.status_code} - {response.text}"
+    if response.status_code == 200:
+        related = response.json()
+        assert len(related) <= 3
+        for item in related:
+            assert item["type"] in ["articles", "scientific_articles", "videos"]
+            assert "score" in item
@@ -0,0 +1,120 @@
+import pytest
+from fastapi.testclient import TestClient
+from fastapi import HTTPException
+import uuid
+import sys
+import os
+
+# Ajout du chemin racine du projet au sys.path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.main import app
+from app.search import search_terms, fulltext_filter
+from app.routes.search_route import build_search_query, parse_types, build_contents_query, order_by_matches
+
+client = TestClient(app)
+
+
+def create_temp_user_and_get_token():
+    """Helper pour créer un utilisateur temporaire et récupérer un token."""
+    email = f"testuser_{uuid.uuid4().hex[:6]}@example.com"
+    username = f"user_{uuid.uuid4().hex[:6]}"
+    password = "TestPassword123!"
+
+    register_response = client.post("/auth/register", json={
+        "username": username,
+        "email": email,
+        "password": password
+    })
+    assert register_response.status_code in [200, 201], f"Register failed: {register_response.text}"
+
+    login_response = client.post("/auth/login", json={
+        "email": email,
+        "password": password
+    })
+    assert login_response.status_code == 200, f"Login failed: {login_response.text}"
+    return login_response.json()["access_token"]
+
+
+def test_search_terms_strip_boolean_operators():
+    assert search_terms('+large -"language" models*') == ["large", "language", "models"]
+    assert search_terms("  ") == []
+    assert search_terms(None) == []
+
+
+def test_fulltext_filter_requires_every_term():
+    clause, params = fulltext_filter("scientific_articles", "diffusion models")
+    assert clause == "MATCH(title, abstract, keywords) AGAINST (%s IN BOOLEAN MODE)"
+    assert params == ["+diffusion +models"]
+    assert fulltext_filter("articles", "+-") is None
+
+
+def test_build_search_query_limits_each_type_before_merging():
+    query, params = build_search_query(["articles", "videos"], "agents", 10, start_date="2025-01-01")
+
+    assert query.count("UNION ALL") == 1
+    assert "MATCH(title, summary, full_content, keywords)" in query
+    assert "MATCH(title, description, keywords)" in query
+    assert query.endswith("ORDER BY score DESC, publication_date DESC LIMIT %s")
+    assert params == ["agents", "agents", "2025-01-01", 10, "agents", "agents", "2025-01-01", 10, 10]
+
+
+def test_parse_types_rejects_unknown_type():
+    assert parse_types(None) == ["articles", "scientific_articles", "videos"]
+    assert parse_types("videos, articles") == ["videos", "articles"]
+    with pytest.raises(HTTPException) as exc_info:
+        parse_types("podcasts")
+    assert exc_info.value.status_code == 400
+
+
+def test_semantic_results_keep_index_order_and_skip_deleted_contents():
+    matches = [("videos", 3, 0.9), ("articles", 8, 0.8), ("videos", 1, 0.7), ("articles", 5, 0.6)]
+
+    query, params = build_contents_query(matches)
+    assert query.count("UNION ALL") == 1
+    assert "FROM videos WHERE id IN (%s, %s)" in query
+    assert params == [3, 1, 8, 5]
+
+    rows = [{"type": "articles", "id": 8}, {"type": "videos", "id": 1}, {"type": "videos", "id": 3}]
+    results = order_by_matches(rows, matches)
+    assert [(result["type"], result["id"], result["score"]) for result in results] == [
+        ("videos", 3, 0.9), ("articles", 8, 0.8), ("videos", 1, 0.7)
+    ]
+
+
+def test_search_success():
+    """Test de la recherche plein texte sur tous les contenus."""
+    token = create_temp_user_and_get_token()
+
+    response = client.get(
+        "/search/",
+        params={"q": "generative AI", "limit": 5},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code in [200, 404], f"Unexpected status: {response.status_code} - {response.text}"
+    if response.status_code == 200:
+        results = response.json()
+        assert len(results) <= 5
+        scores = [result["score"] for result in results]
+        assert scores == sorted(scores, reverse=True)
+        for result in results:
+            assert result["type"] in ["articles", "scientific_articles", "videos"]
+            assert "title" in result
+            assert "url" in result
+
+
+def test_search_empty_query():
+    """Test avec une recherche sans terme."""
+    token = create_temp_user_and_get_token()
+
+    response = client.get(
+        "/search/",
+        params={"q": "+++"},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 400, f"Unexpected status: {response.status_code} - {response.text}"
@@ -0,0 +1,99 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Ajout du chemin racine du projet au sys.path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.vector_index import (
+    CONTENT_TYPES, VectorIndex, build_index, current_version, load_current_index, normalize,
+    exact_top_k, max_similarity
+)
+
+
+def clustered_vectors(count=600, dimension=16, clusters=12, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimension))
+    return normalize(centers[rng.integers(clusters, size=count)] + 0.1 * rng.normal(size=(count, dimension)))
+
+
+def test_full_probe_matches_exact_search(tmp_path):
+    vectors = clustered_vectors()
+    content_types = np.arange(len(vectors)) % len(CONTENT_TYPES)
+    content_ids = np.arange(len(vectors)) + 1000
+    directory = build_index(vectors, content_types, content_ids, "test-model", root=str(tmp_path), nlist=10)
+
+    index = VectorIndex(directory)
+    query = vectors[42]
+    results = index.search(query, k=5, nprobe=10)
+
+    exact = np.argsort(-(vectors.astype(np.float16).astype(np.float32) @ query))[:5]
+    assert [content_id for _, content_id, _ in results] == [int(content_ids[row]) for row in exact]
+    assert results[0][:2] == (CONTENT_TYPES[42 % 3], 1042)
+    assert index.model_name == "test-model"
+
+
+def test_search_filters_types_and_orders_scores(tmp_path):
+    vectors = clustered_vectors()
+    content_types = np.arange(len(vectors)) % len(CONTENT_TYPES)
+    build_index(vectors, content_types, np.arange(len(vectors)), "test-model", root=str(tmp_path), nlist=8)
+
+    index = load_current_index(str(tmp_path))
+    results = index.search(vectors[0], k=20, nprobe=3, types=["videos"])
+
+    assert results and all(content_type == "videos" for content_type, _, _ in results)
+    scores = [score for _, _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_publish_switches_version_and_keeps_two(tmp_path):
+    assert load_current_index(str(tmp_path)) is None
+    vectors = clustered_vectors(count=50)
+    versions = []
+    for _ in range(3):
+        build_index(vectors, np.zeros(50), np.arange(50), "test-model", root=str(tmp_path), nlist=4)
+        versions.append(current_version(str(tmp_path)))
+
+    assert len(set(versions)) == 3
+    remaining = sorted(name for name in os.listdir(tmp_path) if os.path.isdir(tmp_path / name))
+    assert remaining == versions[1:]
+    assert load_current_index(str(tmp_path)).directory.endswith(versions[-1])
+
+
+def test_exact_top_k_matches_brute_force_across_chunks():
+    vectors = clustered_vectors(count=300)
+    rows = np.array([0, 17, 299])
+
+    neighbour_rows, neighbour_scores = exact_top_k(vectors, vectors[rows], 5, exclude=rows, chunk_size=64)
+
+    similarities = vectors[rows] @ vectors.T
+    similarities[np.arange(3), rows] = -np.inf
+    expected = np.argsort(-similarities, axis=1)[:, :5]
+    assert neighbour_rows.tolist() == expected.tolist()
+    assert np.allclose(neighbour_scores, np.take_along_axis(similarities, expected, axis=1))
+    assert not np.isin(rows[:, None], neighbour_rows).any(axis=1).any()
+
+
+def test_exact_top_k_pads_small_corpora():
+    vectors = clustered_vectors(count=3)
+    neighbour_rows, _ = exact_top_k(vectors, vectors[:1], 4, exclude=np.array([0]))
+    assert sorted(neighbour_rows[0, :2].tolist()) == [1, 2]
+    assert neighbour_rows[0, 2:].tolist() == [-1, -1]
+
+
+def test_max_similarity_keeps_best_query_per_row():
+    vectors = clustered_vectors(count=100)
+    best = max_similarity(vectors, vectors[[3, 8]], chunk_size=32)
+    assert np.allclose(best, np.maximum(vectors @ vectors[3], vectors @ vectors[8]))
+
+
+def test_max_similarity_chunks_queries():
+    vectors = clustered_vectors(count=100)
+    queries = vectors[[1, 5, 9, 40, 77]]
+    best = max_similarity(vectors, queries, chunk_size=32, query_chunk_size=2)
+    assert np.allclose(best, (vectors @ queries.T).max(axis=1))
+    assert max_similarity(vectors, queries[:0]).tolist() == [-np.inf] * len(vectors)